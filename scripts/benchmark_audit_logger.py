@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+HAK-GAL Audit Group-Commit Benchmark
+====================================
+Measures governed writes per second with the legacy per-entry fsync
+(HAKGAL_AUDIT_GROUP_COMMIT=0) against the group-commit audit writer.
+
+A "governed write" here is the commit phase of the 2PC engine: one fact
+INSERT on a per-thread SQLite connection plus one audit entry that must be
+durable before the call returns. StrictAuditLogger is used when the
+governance engine imports (needs z3), otherwise HardenedAuditLogger.
+
+Usage:
+    python scripts/benchmark_audit_logger.py --threads 8 --seconds 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src_hexagonal'))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from benchmark_sqlite_pool import run_threads
+
+
+def make_logger(kind: str, tmp: str, label: str):
+    if kind == 'strict':
+        from application.transactional_governance_engine import StrictAuditLogger
+        return StrictAuditLogger(os.path.join(tmp, f'audit_{label}.jsonl'))
+    from application.audit_logger import HardenedAuditLogger
+    return HardenedAuditLogger(project_root=Path(tmp), filename=f'audit_{label}.jsonl')
+
+
+def logger_kind() -> str:
+    try:
+        import application.transactional_governance_engine  # noqa: F401
+        return 'strict'
+    except ImportError:
+        return 'hardened'
+
+
+def bench(kind: str, tmp: str, label: str, group_commit: bool, threads: int, seconds: float) -> dict:
+    os.environ['HAKGAL_AUDIT_GROUP_COMMIT'] = '1' if group_commit else '0'
+    db_path = os.path.join(tmp, f'kb_{label}.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY)")
+    conn.close()
+
+    audit = make_logger(kind, tmp, label)
+    local = threading.local()
+    counter = iter(range(10 ** 9))
+
+    def governed_write():
+        db = getattr(local, 'conn', None)
+        if db is None:
+            db = local.conn = sqlite3.connect(db_path, timeout=30)
+            db.execute("PRAGMA synchronous=NORMAL")
+        n = next(counter)
+        statement = f"IsA(Entity{n}, Thing)."
+        audit.log('facts.added.governed', {'statement': statement, 'n': n})
+        with db:
+            db.execute("INSERT INTO facts (statement) VALUES (?)", (statement,))
+
+    result = run_threads(governed_write, threads, seconds)
+    audit.flush()
+    result['writer'] = audit.writer.stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit group-commit benchmark')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--output', default=None, help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    kind = logger_kind()
+    tmp = tempfile.mkdtemp(prefix='hakgal_audit_bench_')
+    try:
+        results = {
+            'logger': kind,
+            'threads': args.threads,
+            'before_fsync_per_entry': bench(kind, tmp, 'before', False, args.threads, args.seconds),
+            'after_group_commit': bench(kind, tmp, 'after', True, args.threads, args.seconds),
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    before = results['before_fsync_per_entry']['ops_per_sec']
+    after = results['after_group_commit']['ops_per_sec']
+    results['speedup'] = round(after / before, 2) if before else None
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
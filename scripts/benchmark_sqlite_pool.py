@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+HAK-GAL SQLite Connection Pool Benchmark
+=========================================
+Compares connect-per-call (pool_size=0) against pooled connections for the
+repository calls behind /api/facts/count and /api/search.
+
+Offline (default): builds a synthetic KB in a temp dir and drives
+SQLiteFactRepository directly from N worker threads.
+Live: --url http://127.0.0.1:5002 hits the running API instead (run once per
+backend configuration, e.g. with HAKGAL_SQLITE_POOL_SIZE=0 and =8).
+
+Usage:
+    python scripts/benchmark_sqlite_pool.py --facts 20000 --threads 8 --seconds 5
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src_hexagonal'))
+
+PREDICATES = ['IsA', 'HasPart', 'Causes', 'LocatedIn', 'PartOf', 'Uses', 'HasProperty']
+SEARCH_QUERIES = ['What is machine learning', 'Causes(Heat, Expansion)',
+                  'relationship between water and ice', 'HasPart(Computer, CPU)']
+
+
+def build_synthetic_db(path: str, n_facts: int):
+    """Create a facts table with n_facts deterministic statements (plus the empty
+    facts_extended table the governance engine writes to)."""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS facts (
+            statement TEXT PRIMARY KEY,
+            context TEXT DEFAULT '{}',
+            fact_metadata TEXT DEFAULT '{}',
+            confidence REAL DEFAULT 1.0
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS facts_extended (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            statement TEXT UNIQUE NOT NULL,
+            predicate TEXT,
+            arg_count INTEGER,
+            arg1 TEXT,
+            arg2 TEXT,
+            arg3 TEXT,
+            arg4 TEXT,
+            arg5 TEXT,
+            args_json TEXT,
+            fact_type TEXT,
+            domain TEXT,
+            complexity INTEGER DEFAULT 1,
+            confidence REAL DEFAULT 1.0,
+            created_at TEXT DEFAULT (datetime('now')),
+            source TEXT
+        )
+    ''')
+    rows = (
+        (f"{PREDICATES[i % len(PREDICATES)]}(Entity{i}, Entity{(i * 7) % n_facts}).",)
+        for i in range(n_facts)
+    )
+    conn.executemany('INSERT OR IGNORE INTO facts (statement) VALUES (?)', rows)
+    conn.commit()
+    conn.close()
+
+
+def latency_summary(samples_ms) -> dict:
+    """p50/p95/p99 (nearest rank) and mean of per-call latencies in ms."""
+    if not samples_ms:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'mean_ms': None}
+    ordered = sorted(samples_ms)
+
+    def pct(q):
+        return round(ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))], 4)
+
+    return {'p50_ms': pct(0.50), 'p95_ms': pct(0.95), 'p99_ms': pct(0.99),
+            'mean_ms': round(sum(ordered) / len(ordered), 4)}
+
+
+def run_threads(fn, threads: int, seconds: float, latencies: bool = False) -> dict:
+    """Call fn() in a loop from `threads` workers for `seconds`; return throughput
+    (plus p50/p95/p99 per call with latencies=True)."""
+    stop = time.perf_counter() + seconds
+    counts = [0] * threads
+    errors = [0] * threads
+    samples = [[] for _ in range(threads)]
+
+    def worker(idx):
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                fn()
+                counts[idx] += 1
+            except Exception:
+                errors[idx] += 1
+            if latencies:
+                samples[idx].append((time.perf_counter() - started) * 1000.0)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+    total = sum(counts)
+    result = {'ops': total, 'errors': sum(errors), 'ops_per_sec': round(total / elapsed, 1)}
+    if latencies:
+        result.update(latency_summary([ms for per_thread in samples for ms in per_thread]))
+    return result
+
+
+def bench_offline(args) -> dict:
+    import io
+    import contextlib
+    from adapters.sqlite_adapter import SQLiteFactRepository
+
+    tmp = tempfile.mkdtemp(prefix='hakgal_pool_bench_')
+    db_path = os.path.join(tmp, 'bench_kb.db')
+    build_synthetic_db(db_path, args.facts)
+
+    results = {}
+    for label, pool_size in (('before_connect_per_call', 0), ('after_pooled', args.pool_size)):
+        # The adapter logs every query; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            repo = SQLiteFactRepository(db_path, pool_size=pool_size)
+            counter = iter(range(10 ** 9))
+            count_res = run_threads(repo.count, args.threads, args.seconds)
+            search_res = run_threads(
+                lambda: repo.find_by_query(SEARCH_QUERIES[next(counter) % len(SEARCH_QUERIES)], limit=10),
+                args.threads, args.seconds
+            )
+        results[label] = {
+            '/api/facts/count': count_res,
+            '/api/search': search_res,
+            'pool': repo.pool_stats(),
+        }
+        repo.close()
+    return results
+
+
+def bench_live(args) -> dict:
+    base = args.url.rstrip('/')
+
+    def get_count():
+        with urllib.request.urlopen(f"{base}/api/facts/count", timeout=10) as r:
+            r.read()
+
+    counter = iter(range(10 ** 9))
+
+    def post_search():
+        body = json.dumps({'query': SEARCH_QUERIES[next(counter) % len(SEARCH_QUERIES)], 'limit': 10}).encode()
+        req = urllib.request.Request(f"{base}/api/search", data=body,
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=10) as r:
+            r.read()
+
+    return {
+        'live': {
+            '/api/facts/count': run_threads(get_count, args.threads, args.seconds),
+            '/api/search': run_threads(post_search, args.threads, args.seconds),
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite connection pool benchmark')
+    parser.add_argument('--facts', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--pool-size', type=int, default=8)
+    parser.add_argument('--url', default=None, help='Benchmark a running API instead of the offline repository')
+    parser.add_argument('--output', default=None, help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    results = bench_live(args) if args.url else bench_offline(args)
+    if not args.url:
+        before = results['before_connect_per_call']
+        after = results['after_pooled']
+        results['speedup'] = {
+            ep: round(after[ep]['ops_per_sec'] / before[ep]['ops_per_sec'], 2) if before[ep]['ops_per_sec'] else None
+            for ep in ('/api/facts/count', '/api/search')
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+HAK-GAL Benchmark Suite
+=======================
+Offline latency/throughput benchmarks against synthetic KBs (default 10k,
+100k and 1M facts, generated by benchmark_sqlite_pool.build_synthetic_db):
+
+- SQLiteFactRepository: find_by_query, exists, count, OFFSET and keyset pagination
+- /api/search through the Flask test client
+- TransactionalGovernanceEngine.governed_add_facts_atomic
+- HRM reason
+- MCP tools: graph tools and db_benchmark_inserts
+
+Every case reports p50/p95/p99 and ops/sec. Cases whose dependencies are not
+available (Flask app, z3 for governance, ...) are recorded as skipped; cases
+that raise during setup or warm-up are recorded as failed.
+With --baseline the run is compared against a stored result; the exit code is
+1 if any case regressed (including a measured baseline case that is now
+skipped or failed), so upgrades can be gated on it.
+
+Usage:
+    python scripts/benchmark_suite.py --sizes 10000,100000 --output bench.json
+    python scripts/benchmark_suite.py --baseline bench_baseline.json --output bench.json
+    python scripts/benchmark_suite.py --save-baseline bench_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from itertools import count as counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src_hexagonal'))
+sys.path.insert(0, str(ROOT / 'ultimate_mcp'))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from benchmark_sqlite_pool import PREDICATES, SEARCH_QUERIES, build_synthetic_db, run_threads
+
+DEFAULT_SIZES = '10000,100000,1000000'
+
+
+class Skip(Exception):
+    """Case cannot run in this environment (missing dependency etc.)."""
+
+
+def entity(i: int) -> str:
+    return f"Entity{i}"
+
+
+def statement_at(i: int, n_facts: int) -> str:
+    """Statement written by build_synthetic_db for row i."""
+    return f"{PREDICATES[i % len(PREDICATES)]}({entity(i)}, {entity((i * 7) % n_facts)})."
+
+
+def synthetic_db(data_dir: str, n_facts: int) -> str:
+    """Synthetic KB for n_facts; reused from data_dir when it is already complete."""
+    path = os.path.join(data_dir, f'bench_kb_{n_facts}.db')
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        try:
+            # Aeltere Caches ohne facts_extended neu bauen
+            conn.execute('SELECT 1 FROM facts_extended LIMIT 1')
+            if conn.execute('SELECT COUNT(*) FROM facts').fetchone()[0] >= n_facts:
+                return path
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+        os.remove(path)
+    build_synthetic_db(path, n_facts)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+    return path
+
+
+# ----------------------------------------------------------------------------
+# Cases: setup(ctx) -> callable for one operation; raise Skip if unavailable
+# ----------------------------------------------------------------------------
+
+def _repository(ctx):
+    if 'repo' not in ctx:
+        from adapters.sqlite_adapter import SQLiteFactRepository
+        with contextlib.redirect_stdout(io.StringIO()):
+            ctx['repo'] = SQLiteFactRepository(ctx['db_path'])
+    return ctx['repo']
+
+
+def case_repo_find_by_query(ctx):
+    repo = _repository(ctx)
+    n = counter()
+    queries = SEARCH_QUERIES + [f"{PREDICATES[i % len(PREDICATES)]}({entity(i * 13)}, X)" for i in range(16)]
+    return lambda: repo.find_by_query(queries[next(n) % len(queries)], limit=10)
+
+
+def case_repo_exists(ctx):
+    repo = _repository(ctx)
+    size, n = ctx['size'], counter()
+
+    def call():
+        i = next(n)
+        # Abwechselnd vorhandene und fehlende Statements
+        repo.exists(statement_at((i * 7919) % size, size) if i % 2 else f"Missing({entity(i)}).")
+    return call
+
+
+def case_repo_count(ctx):
+    return _repository(ctx).count
+
+
+def case_repo_page_offset(ctx):
+    repo = _repository(ctx)
+    size, n = ctx['size'], counter()
+    return lambda: repo.find_page(((next(n) * 7919) % max(1, size - 50)), 50)
+
+
+def case_repo_page_keyset(ctx):
+    repo = _repository(ctx)
+    size, n = ctx['size'], counter()
+    return lambda: repo.find_after((next(n) * 7919) % max(1, size - 50), 50)
+
+
+def case_api_search(ctx):
+    os.environ['HAKGAL_SQLITE_DB_PATH'] = ctx['db_path']
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from hexagonal_api_enhanced_clean import HexagonalAPI
+            api = HexagonalAPI(use_legacy=False, enable_websocket=False, enable_governor=False)
+    except Exception as e:
+        raise Skip(f"Flask app unavailable: {e}")
+    client = api.app.test_client()
+    n = counter()
+
+    def call():
+        response = client.post('/api/search', json={'query': SEARCH_QUERIES[next(n) % len(SEARCH_QUERIES)], 'limit': 10})
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+    return call
+
+
+def case_governed_add(ctx):
+    try:
+        from application.transactional_governance_engine import TransactionalGovernanceEngine
+    except Exception as e:
+        raise Skip(f"governance engine unavailable: {e}")
+    engine = TransactionalGovernanceEngine(db_path=ctx['db_path'])
+    context = {
+        'operator': 'benchmark_suite',
+        'reason': 'Synthetic benchmark facts',
+        'harm_prob': 0.0001,
+        'sustain_index': 0.95,
+        'externally_legal': True,
+        'universalizable_proof': True,
+    }
+    n = counter()
+    return lambda: engine.governed_add_facts_atomic([f"IsA(BenchFact{next(n)}, Benchmark)."], context)
+
+
+def case_hrm_reason(ctx):
+    try:
+        from core.reasoning.hrm_system import HRMSystem
+    except Exception as e:
+        raise Skip(f"HRM unavailable: {e}")
+    if 'hrm' not in ctx:
+        ctx['hrm'] = HRMSystem(os.environ.get('HRM_MODEL_PATH'))
+    hrm, size, n = ctx['hrm'], ctx['size'], counter()
+    # Viele verschiedene Queries, damit der Ergebnis-Cache nicht alles abfaengt
+    return lambda: hrm.reason(statement_at((next(n) * 7919) % size, size))
+
+
+def _mcp_server(ctx):
+    if 'mcp' not in ctx:
+        try:
+            import hakgal_mcp_ultimate
+        except Exception as e:
+            raise Skip(f"MCP server unavailable: {e}")
+        server = hakgal_mcp_ultimate.HAKGALMCPServer()
+        server.db_path = Path(ctx['db_path'])
+        ctx['mcp'] = server
+    return ctx['mcp']
+
+
+def _mcp_tool(name, make_args):
+    def setup(ctx):
+        server = _mcp_server(ctx)
+        size, n = ctx['size'], counter()
+
+        def call():
+            result = server._execute_tool(name, make_args(next(n), size))
+            text = result['content'][0].get('text', '')
+            if text.startswith('Error'):
+                raise RuntimeError(text[:200])
+        return call
+    return setup
+
+
+def case_mcp_db_benchmark_inserts(ctx):
+    server = _mcp_server(ctx)
+
+    def call():
+        result = server._execute_tool('db_benchmark_inserts', {'rows': 5000, 'batch': 1000})
+        ctx['extra']['mcp_db_benchmark_inserts_report'] = json.loads(result['content'][0]['text'])
+    return call
+
+
+CASES = {
+    'repo_find_by_query': case_repo_find_by_query,
+    'repo_exists': case_repo_exists,
+    'repo_count': case_repo_count,
+    'repo_page_offset': case_repo_page_offset,
+    'repo_page_keyset': case_repo_page_keyset,
+    'api_search': case_api_search,
+    'hrm_reason': case_hrm_reason,
+    'mcp_semantic_similarity': _mcp_tool('semantic_similarity', lambda i, n: {
+        'statement': statement_at((i * 7919) % n, n), 'threshold': 0.7, 'limit': 10}),
+    'mcp_query_related': _mcp_tool('query_related', lambda i, n: {'entity': entity((i * 7919) % n), 'limit': 50}),
+    'mcp_get_knowledge_graph': _mcp_tool('get_knowledge_graph', lambda i, n: {
+        'entity': entity((i * 7919) % n), 'depth': 2, 'format': 'json'}),
+    'mcp_find_isolated_facts': _mcp_tool('find_isolated_facts', lambda i, n: {'limit': 50}),
+    'mcp_inference_chain': _mcp_tool('inference_chain', lambda i, n: {
+        'start_fact': statement_at((i * 7919) % n, n), 'max_depth': 3}),
+    # Schreibende Cases zuletzt: sie veraendern die synthetische KB
+    'mcp_db_benchmark_inserts': case_mcp_db_benchmark_inserts,
+    'governed_add_facts_atomic': case_governed_add,
+}
+
+
+def run_case(name, setup, ctx, seconds, threads) -> dict:
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn = setup(ctx)
+            fn()  # Warm-up (Indizes, Caches, Modell-Load)
+            result = run_threads(fn, threads, seconds, latencies=True)
+    except Skip as e:
+        return {'skipped': str(e)}
+    except Exception as e:
+        return {'failed': f"{type(e).__name__}: {e}"}
+    return result
+
+
+def case_summary(result: dict) -> str:
+    if 'skipped' in result:
+        return f"skipped: {result['skipped']}"
+    if 'failed' in result:
+        return f"FAILED: {result['failed']}"
+    return f"p95 {result['p95_ms']} ms, {result['ops_per_sec']} ops/s"
+
+
+def run_size(size, args, data_dir) -> dict:
+    started = time.perf_counter()
+    db_path = synthetic_db(data_dir, size)
+    build_s = round(time.perf_counter() - started, 2)
+    work_dir = tempfile.mkdtemp(prefix='hakgal_bench_suite_')
+    # Arbeitskopie: schreibende Cases duerfen die gecachte KB nicht veraendern
+    work_db = os.path.join(work_dir, os.path.basename(db_path))
+    shutil.copy2(db_path, work_db)
+    ctx = {'size': size, 'db_path': work_db, 'extra': {}}
+    selected = [c for c in CASES if not args.cases or c in args.cases]
+    results = {'build_s': build_s}
+    cwd = os.getcwd()
+    # Audit-Log der Governance und MCP-Logs landen relativ zum cwd: im Arbeitsverzeichnis halten
+    os.chdir(work_dir)
+    try:
+        for name in selected:
+            results[name] = run_case(name, CASES[name], ctx, args.seconds, args.threads)
+            print(f"[{size}] {name}: {case_summary(results[name])}", file=sys.stderr)
+        results.update(ctx['extra'])
+    finally:
+        os.chdir(cwd)
+        if 'repo' in ctx:
+            ctx['repo'].close()
+        if 'mcp' in ctx and ctx['mcp']._writer is not None:
+            ctx['mcp']._writer.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> dict:
+    """Per case: p95 and throughput against the baseline. A case regresses if p95
+    grows (or ops/sec drops) by more than `tolerance` and more than `min_delta_ms`,
+    or if it was measured in the baseline and is now skipped or failed."""
+    cases = {}
+    regressions = []
+    for size, current_cases in results['sizes'].items():
+        base_cases = baseline.get('sizes', {}).get(size, {})
+        for name, current in current_cases.items():
+            base = base_cases.get(name)
+            if not isinstance(current, dict) or not isinstance(base, dict):
+                continue
+            if base.get('p95_ms') is None:
+                continue
+            key = f"{size}/{name}"
+            if current.get('p95_ms') is None:
+                # Frueher gemessen, jetzt skipped/failed: kann eine Regression verdecken
+                status = 'failed' if 'failed' in current else 'skipped'
+                cases[key] = {'status': status, 'reason': current.get(status), 'p95_ms': None,
+                              'baseline_p95_ms': base['p95_ms'], 'p95_ratio': None, 'ops_ratio': None}
+                regressions.append(key)
+                continue
+            p95_delta = current['p95_ms'] - base['p95_ms']
+            p95_ratio = current['p95_ms'] / base['p95_ms'] if base['p95_ms'] else None
+            ops_ratio = current['ops_per_sec'] / base['ops_per_sec'] if base.get('ops_per_sec') else None
+            slower = p95_ratio is not None and p95_ratio > 1 + tolerance and p95_delta > min_delta_ms
+            fewer = ops_ratio is not None and ops_ratio < 1 - tolerance
+            faster = p95_ratio is not None and p95_ratio < 1 - tolerance and -p95_delta > min_delta_ms
+            status = 'regression' if (slower or fewer) else ('improved' if faster else 'ok')
+            cases[key] = {
+                'status': status,
+                'p95_ms': current['p95_ms'], 'baseline_p95_ms': base['p95_ms'],
+                'p95_ratio': round(p95_ratio, 3) if p95_ratio is not None else None,
+                'ops_ratio': round(ops_ratio, 3) if ops_ratio is not None else None,
+            }
+            if status == 'regression':
+                regressions.append(key)
+    return {'tolerance': tolerance, 'min_delta_ms': min_delta_ms, 'regressions': regressions, 'cases': cases}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HAK-GAL offline benchmark suite')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Comma separated KB sizes')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Measurement time per case')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--cases', default=None, help=f"Comma separated subset of: {', '.join(CASES)}")
+    parser.add_argument('--data-dir', default=None, help='Keep generated KBs here and reuse them across runs')
+    parser.add_argument('--output', default=None, help='Write JSON results to this file')
+    parser.add_argument('--baseline', default=None, help='Compare against this result file; exit 1 on regression')
+    parser.add_argument('--save-baseline', default=None, help='Also write the results as new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative p95/throughput change')
+    parser.add_argument('--min-delta-ms', type=float, default=0.05, help='Ignore p95 changes below this')
+    args = parser.parse_args()
+    args.cases = [c.strip() for c in args.cases.split(',')] if args.cases else None
+    unknown = [c for c in (args.cases or []) if c not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='hakgal_bench_data_')
+    os.makedirs(data_dir, exist_ok=True)
+    results = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpu_count': os.cpu_count(), 'sqlite': sqlite3.sqlite_version},
+        'settings': {'seconds': args.seconds, 'threads': args.threads},
+        'sizes': {},
+    }
+    try:
+        for size in (int(s) for s in args.sizes.split(',') if s.strip()):
+            results['sizes'][str(size)] = run_size(size, args, data_dir)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            results['comparison'] = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        exit_code = 1 if results['comparison']['regressions'] else 0
+
+    print(json.dumps(results, indent=2))
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
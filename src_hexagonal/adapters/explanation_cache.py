@@ -0,0 +1,272 @@
+"""
+Explanation Response Cache
+==========================
+LRU/TTL-Cache für /api/llm/get-explanation. Schlüssel ist (normalisiertes
+Topic, Hash der Kontext-Fakten); gespeichert werden Erklärung, extrahierte
+Fakten und der ursprüngliche Provider. SQLite-Tier auf Platte, damit der
+Cache Neustarts übersteht.
+
+Optional: Near-Duplicate-Lookup über Topic-Embeddings (all-MiniLM-L6-v2,
+wie im SemanticDuplicateDetector) - nur innerhalb desselben Kontext-Hashes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+import numpy as np
+
+from core.reasoning.result_cache import normalize_statement
+
+try:
+    from sentence_transformers import SentenceTransformer
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    HAS_SENTENCE_TRANSFORMERS = False
+
+_WS = re.compile(r'\s+')
+
+
+def normalize_topic(topic: str) -> str:
+    """'  What is  Water? ' -> 'what is water'"""
+    return _WS.sub(' ', topic.strip().lower()).rstrip('?.!').rstrip()
+
+
+def context_hash(context_facts: List[str]) -> str:
+    """Reihenfolge- und Formatierungs-unabhängiger Hash der Kontext-Fakten"""
+    facts = sorted({normalize_statement(f) for f in context_facts or [] if f and f.strip()})
+    return hashlib.sha256('\n'.join(facts).encode('utf-8')).hexdigest()[:16]
+
+
+def sentence_transformer_embedder(model_name: str = 'all-MiniLM-L6-v2') -> Optional[Callable[[List[str]], np.ndarray]]:
+    """Lazy geladenes Embedding-Modell; None ohne sentence_transformers"""
+    if not HAS_SENTENCE_TRANSFORMERS:
+        print("[ExplanationCache] sentence_transformers not available - near-duplicate lookup disabled")
+        return None
+    holder = {}
+    lock = threading.Lock()
+
+    def embed(texts: List[str]) -> np.ndarray:
+        with lock:
+            if 'model' not in holder:
+                holder['model'] = SentenceTransformer(model_name)
+        return holder['model'].encode(texts, normalize_embeddings=True)
+    return embed
+
+
+class ExplanationCache:
+    """Thread-sicherer LRU/TTL-Cache für LLM-Erklärungen mit optionalem SQLite-Tier"""
+
+    def __init__(self, max_entries: int = 2000, ttl: float = 86400.0, disk_path: Optional[str] = None,
+                 embed: Optional[Callable[[List[str]], np.ndarray]] = None, similarity_threshold: float = 0.92):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._vectors: Dict[Tuple[str, str], np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._disk_local = threading.local()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'semantic_hits': 0, 'misses': 0, 'stores': 0,
+                       'evictions': 0, 'expired': 0, 'invalidations': 0, 'saved_ms': 0}
+        if disk_path:
+            with self._disk() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS explanation_cache (
+                        topic TEXT NOT NULL,
+                        context_hash TEXT NOT NULL,
+                        explanation TEXT NOT NULL,
+                        suggested_facts TEXT NOT NULL,
+                        llm_provider TEXT,
+                        generation_ms INTEGER NOT NULL DEFAULT 0,
+                        created_at REAL NOT NULL,
+                        PRIMARY KEY (topic, context_hash)
+                    ) WITHOUT ROWID
+                """)
+                conn.execute("DELETE FROM explanation_cache WHERE created_at < ?", (time.time() - ttl,))
+                # Warmstart: jüngste Einträge in den Speicher (auch für den Near-Duplicate-Lookup)
+                rows = conn.execute(
+                    "SELECT topic, context_hash, explanation, suggested_facts, llm_provider, generation_ms, created_at "
+                    "FROM explanation_cache ORDER BY created_at DESC LIMIT ?", (max_entries,)
+                ).fetchall()
+            for row in reversed(rows):
+                self._store((row[0], row[1]), self._row_entry(row))
+
+    @classmethod
+    def from_env(cls, default_db: Optional[str] = None) -> Optional['ExplanationCache']:
+        """HAKGAL_EXPLAIN_CACHE_SIZE (0 = aus), HAKGAL_EXPLAIN_CACHE_TTL, HAKGAL_EXPLAIN_CACHE_DB ('' = nur RAM),
+        HAKGAL_EXPLAIN_CACHE_SIMILARITY (z.B. 0.92; leer = kein Near-Duplicate-Lookup)"""
+        size = int(os.environ.get('HAKGAL_EXPLAIN_CACHE_SIZE', '2000') or 0)
+        if size <= 0:
+            return None
+        threshold = float(os.environ.get('HAKGAL_EXPLAIN_CACHE_SIMILARITY', '') or 0)
+        embed = None
+        if threshold > 0:
+            embed = sentence_transformer_embedder(os.environ.get('HAKGAL_EXPLAIN_CACHE_MODEL', 'all-MiniLM-L6-v2'))
+        try:
+            return cls(
+                max_entries=size,
+                ttl=float(os.environ.get('HAKGAL_EXPLAIN_CACHE_TTL', '86400') or 86400),
+                disk_path=os.environ.get('HAKGAL_EXPLAIN_CACHE_DB', default_db or '') or None,
+                embed=embed,
+                similarity_threshold=threshold or 0.92
+            )
+        except sqlite3.Error as e:
+            print(f"[ExplanationCache] Disk tier unavailable ({e}) - using memory only")
+            return cls(max_entries=size, embed=embed, similarity_threshold=threshold or 0.92)
+
+    def _disk(self) -> sqlite3.Connection:
+        conn = getattr(self._disk_local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._disk_local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_entry(row) -> Dict[str, Any]:
+        return {'explanation': row[2], 'suggested_facts': json.loads(row[3]), 'llm_provider': row[4],
+                'generation_ms': row[5], 'created_at': row[6]}
+
+    def _store(self, key: Tuple[str, str], entry: Dict[str, Any]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._vectors.pop(key, None)
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            self._vectors.pop(old_key, None)
+            self._stats['evictions'] += 1
+
+    def _hit(self, entry: Dict[str, Any], match: str, stat: str, similarity: float = 1.0) -> Dict[str, Any]:
+        self._stats[stat] += 1
+        self._stats['saved_ms'] += entry['generation_ms']
+        result = dict(entry)
+        result['match'] = match
+        result['similarity'] = round(float(similarity), 4)
+        result['age_s'] = round(time.time() - entry['created_at'], 1)
+        return result
+
+    def get(self, topic: str, context_facts: List[str]) -> Optional[Dict[str, Any]]:
+        """Cache-Treffer als dict (explanation, suggested_facts, llm_provider, match, ...) oder None"""
+        key = (normalize_topic(topic), context_hash(context_facts))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry['created_at'] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    return self._hit(entry, 'exact', 'hits')
+                del self._entries[key]
+                self._vectors.pop(key, None)
+                self._stats['expired'] += 1
+        if self.disk_path:
+            try:
+                row = self._disk().execute(
+                    "SELECT topic, context_hash, explanation, suggested_facts, llm_provider, generation_ms, created_at "
+                    "FROM explanation_cache WHERE topic = ? AND context_hash = ?", key
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None and now - row[6] <= self.ttl:
+                entry = self._row_entry(row)
+                with self._lock:
+                    self._store(key, entry)
+                    return self._hit(entry, 'exact', 'disk_hits')
+        if self.embed is not None and key[0]:
+            found = self._nearest(key)
+            if found is not None:
+                return found
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def _nearest(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Ähnlichstes Topic mit gleichem Kontext-Hash oberhalb des Schwellwerts"""
+        now = time.time()
+        with self._lock:
+            candidates = [k for k, e in self._entries.items()
+                          if k[1] == key[1] and now - e['created_at'] <= self.ttl]
+            missing = [k for k in candidates if k not in self._vectors]
+        if not candidates:
+            return None
+        try:
+            vectors = self.embed([key[0]] + [k[0] for k in missing])
+        except Exception as e:
+            print(f"[ExplanationCache] Embedding failed: {e}")
+            return None
+        query = np.asarray(vectors[0], dtype=np.float32)
+        with self._lock:
+            for k, vector in zip(missing, vectors[1:]):
+                self._vectors[k] = np.asarray(vector, dtype=np.float32)
+            best_key, best = None, self.similarity_threshold
+            for k in candidates:
+                vector = self._vectors.get(k)
+                if vector is None or k not in self._entries:
+                    continue
+                similarity = float(np.dot(query, vector) / (np.linalg.norm(query) * np.linalg.norm(vector) or 1.0))
+                if similarity >= best:
+                    best_key, best = k, similarity
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._hit(self._entries[best_key], 'semantic', 'semantic_hits', best)
+
+    def put(self, topic: str, context_facts: List[str], explanation: str, suggested_facts: List[str],
+            llm_provider: Optional[str], generation_ms: int = 0):
+        key = (normalize_topic(topic), context_hash(context_facts))
+        entry = {'explanation': explanation, 'suggested_facts': list(suggested_facts or []),
+                 'llm_provider': llm_provider, 'generation_ms': int(generation_ms), 'created_at': time.time()}
+        with self._lock:
+            self._store(key, entry)
+            self._stats['stores'] += 1
+        if self.disk_path:
+            try:
+                with self._disk() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO explanation_cache (topic, context_hash, explanation, suggested_facts, "
+                        "llm_provider, generation_ms, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        key + (explanation, json.dumps(entry['suggested_facts']), llm_provider,
+                               entry['generation_ms'], entry['created_at'])
+                    )
+            except sqlite3.Error as e:
+                print(f"[ExplanationCache] Disk write failed: {e}")
+
+    def invalidate(self, topic: Optional[str] = None):
+        """Ein Topic (alle Kontexte) oder alles verwerfen"""
+        norm = normalize_topic(topic) if topic is not None else None
+        with self._lock:
+            for key in [k for k in self._entries if norm is None or k[0] == norm]:
+                del self._entries[key]
+                self._vectors.pop(key, None)
+            self._stats['invalidations'] += 1
+        if self.disk_path:
+            try:
+                with self._disk() as conn:
+                    if norm is None:
+                        conn.execute("DELETE FROM explanation_cache")
+                    else:
+                        conn.execute("DELETE FROM explanation_cache WHERE topic = ?", (norm,))
+            except sqlite3.Error as e:
+                print(f"[ExplanationCache] Disk invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        hits = stats['hits'] + stats['disk_hits'] + stats['semantic_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl
+        stats['disk_tier'] = self.disk_path
+        stats['near_duplicate_lookup'] = self.embed is not None
+        stats['similarity_threshold'] = self.similarity_threshold if self.embed is not None else None
+        return stats
@@ -2,23 +2,51 @@
 JSONL Adapter – File-based FactRepository
 =========================================
 Nach HAK/GAL Verfassung: nutzt die JSONL-KB als Single Source of Truth
+
+Reads go through ``mmap`` and a persisted side index (``<kb>.idx``) with the
+line offset and a 64-bit statement hash of every fact. ``exists``/``count``/
+``find_after`` no longer parse the whole file. The index is extended
+incrementally when the file grows (own appends and those of other writers,
+e.g. the MCP server) and rebuilt when the file was replaced (new inode/device,
+e.g. ``os.replace``) or the checksums over the indexed region no longer match
+(rewritten in place or truncated).
+
+A last line without trailing newline is indexed provisionally when it parses as
+complete JSON (a half-written append does not): it is kept out of the persisted
+index and re-read on the next sync. Own appends first terminate such a line.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.ports.interfaces import FactRepository
-from core.domain.entities import Fact
+from core.domain.entities import Fact, parse_statement
+
+INDEX_MAGIC = b"HKJSIDX1"
+# magic, indexed_size, count, head_crc, tail_crc
+INDEX_HEADER = struct.Struct("<8sQQII")
+CHECK_BYTES = 64 * 1024
+
+
+def statement_hash(statement: str) -> int:
+    return int.from_bytes(hashlib.blake2b(statement.encode('utf-8'), digest_size=8).digest(), 'little')
 
 
 class JsonlFactRepository(FactRepository):
-    """Simple, robust JSONL-backed repository.
+    """JSONL-backed repository with an mmap'ed file and a persisted offset/hash index.
 
     Expected file format: one JSON object per line with at least key 'statement'.
     """
@@ -28,41 +56,331 @@ class JsonlFactRepository(FactRepository):
             kb_path = Path(__file__).parent.parent.parent / 'data' / 'k_assistant.kb.jsonl'
         self.kb_path = Path(kb_path)
         self.kb_path.parent.mkdir(parents=True, exist_ok=True)
-
-    def _iter_facts(self):
-        if not self.kb_path.exists():
+        self.index_path = self.kb_path.with_name(self.kb_path.name + '.idx')
+        self._lock = threading.RLock()
+        self._mm: Optional[mmap.mmap] = None
+        self._mm_size = 0
+        # (size, mtime_ns, inode, device) of the file behind the current mapping
+        self._stamp: Optional[Tuple[int, int, int, int]] = None
+        self._reset_index()
+        self.index_rebuilds = 0
+
+    def _reset_index(self):
+        self._offsets = array('Q')
+        self._hashes = array('Q')
+        self._by_hash: Dict[int, int] = {}
+        self._indexed_size = 0
+        # (position, owns_hash_slot) of a provisionally indexed unterminated last line
+        self._tail: Optional[Tuple[int, bool]] = None
+        self._head_crc = 0
+        self._tail_crc = 0
+
+    # ------------------------------------------------------------------
+    # mmap and index maintenance
+    # ------------------------------------------------------------------
+
+    def _map(self, size: int):
+        """(Re)map the current file; empty files cannot be mapped."""
+        self._unmap()
+        if size == 0:
             return
-        with self.kb_path.open('r', encoding='utf-8') as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    obj = json.loads(line)
-                except Exception:
-                    continue
-                st = obj.get('statement')
-                if not st:
+        with self.kb_path.open('rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mm_size = len(self._mm)
+
+    def _unmap(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._mm_size = 0
+
+    def close(self):
+        with self._lock:
+            self._unmap()
+
+    def _checksums(self, size: int) -> Tuple[int, int]:
+        mm = self._mm
+        if mm is None or size == 0:
+            return 0, 0
+        return zlib.crc32(mm[:min(size, CHECK_BYTES)]), zlib.crc32(mm[max(0, size - CHECK_BYTES):size])
+
+    def _sync(self):
+        """Bring the index up to date with the file (stat only if nothing changed)."""
+        try:
+            st = os.stat(self.kb_path)
+        except OSError:
+            self._unmap()
+            self._reset_index()
+            self._stamp = None
+            return
+        stamp = (st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+        if stamp == self._stamp:
+            return
+        # Any change remaps: a replaced file keeps the old inode alive behind the old mapping
+        self._map(st.st_size)
+        if self._stamp is None and not self._offsets:
+            self._load_index()
+        replaced = self._stamp is not None and self._stamp[2:] != stamp[2:]
+        if replaced or st.st_size < self._indexed_size \
+                or self._checksums(self._indexed_size) != (self._head_crc, self._tail_crc):
+            # Replaced, rewritten or truncated by someone else: offsets are no longer valid
+            self._reset_index()
+            self.index_rebuilds += 1
+        if st.st_size > self._indexed_size:
+            self._extend()
+        self._stamp = stamp
+
+    def _add_line(self, pos: int, line: bytes, strict: bool = False) -> Optional[bool]:
+        """Index one line; returns whether it took the hash slot (None if not indexed)."""
+        if not line.strip():
+            return None
+        try:
+            statement = json.loads(line).get('statement')
+        except Exception:
+            if strict:
+                return None
+            statement = None
+        if not statement:
+            return None
+        digest = statement_hash(statement)
+        owns = digest not in self._by_hash
+        if owns:
+            self._by_hash[digest] = len(self._offsets)
+        self._offsets.append(pos)
+        self._hashes.append(digest)
+        return owns
+
+    def _drop_tail(self):
+        if self._tail is None:
+            return
+        pos, owns = self._tail
+        if owns:
+            del self._by_hash[self._hashes[pos]]
+        del self._offsets[pos:]
+        del self._hashes[pos:]
+        self._tail = None
+
+    def _extend(self):
+        """Index the lines appended since ``_indexed_size``; an unterminated last
+        line only provisionally and only if it is complete JSON."""
+        self._drop_tail()
+        mm = self._mm
+        start = self._indexed_size
+        first_new = len(self._offsets)
+        pos = start
+        end = mm.rfind(b'\n', start) + 1
+        while pos < end:
+            nl = mm.find(b'\n', pos, end)
+            self._add_line(pos, mm[pos:nl])
+            pos = nl + 1
+        if end > start:
+            self._indexed_size = end
+            self._head_crc, self._tail_crc = self._checksums(end)
+            self._save_index(first_new, rewrite=start == 0)
+        tail_at = max(start, end)
+        if tail_at < len(mm):
+            owns = self._add_line(tail_at, mm[tail_at:], strict=True)
+            if owns is not None:
+                self._tail = (len(self._offsets) - 1, owns)
+
+    def _load_index(self):
+        try:
+            with self.index_path.open('rb') as f:
+                header = f.read(INDEX_HEADER.size)
+                magic, size, count, head_crc, tail_crc = INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC:
+                    return
+                pairs = array('Q')
+                pairs.frombytes(f.read(count * 16))
+        except (OSError, struct.error, ValueError):
+            return
+        if len(pairs) != count * 2 or size > self._mm_size or self._checksums(size) != (head_crc, tail_crc):
+            return
+        self._offsets = pairs[0::2]
+        self._hashes = pairs[1::2]
+        by_hash: Dict[int, int] = {}
+        for pos, digest in enumerate(self._hashes):
+            by_hash.setdefault(digest, pos)
+        self._by_hash = by_hash
+        self._indexed_size, self._head_crc, self._tail_crc = size, head_crc, tail_crc
+
+    def _save_index(self, first_new: int, rewrite: bool = False):
+        """Append the new (offset, hash) records, then update the fixed-size header."""
+        records = array('Q')
+        for pos in range(first_new, len(self._offsets)):
+            records.append(self._offsets[pos])
+            records.append(self._hashes[pos])
+        header = INDEX_HEADER.pack(INDEX_MAGIC, self._indexed_size, len(self._offsets),
+                                   self._head_crc, self._tail_crc)
+        try:
+            if rewrite or not self.index_path.exists():
+                tmp = self.index_path.with_name(self.index_path.name + '.tmp')
+                with tmp.open('wb') as f:
+                    f.write(header)
+                    f.write(records.tobytes())
+                os.replace(tmp, self.index_path)
+            else:
+                with self.index_path.open('r+b') as f:
+                    f.seek(INDEX_HEADER.size + first_new * 16)
+                    f.write(records.tobytes())
+                    f.truncate()
+                    f.seek(0)
+                    f.write(header)
+        except OSError as e:
+            print(f"[JSONL] Failed to persist index {self.index_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Reading facts
+    # ------------------------------------------------------------------
+
+    def _line(self, pos: int) -> bytes:
+        start = self._offsets[pos]
+        end = self._mm.find(b'\n', start)
+        return self._mm[start:end if end >= 0 else len(self._mm)]
+
+    def _fact_at(self, pos: int) -> Optional[Fact]:
+        try:
+            obj = json.loads(self._line(pos))
+        except Exception:
+            return None
+        return Fact(statement=obj.get('statement'), context=obj.get('context') or {},
+                    metadata=obj.get('metadata') or {}, confidence=1.0)
+
+    def _statement_at(self, pos: int) -> Optional[str]:
+        try:
+            return json.loads(self._line(pos)).get('statement')
+        except Exception:
+            return None
+
+    def _scan(self, needle: Optional[bytes] = None) -> Iterator[Tuple[int, Fact]]:
+        """All facts in file order; ``needle`` is a raw-bytes prefilter applied before json.loads."""
+        with self._lock:
+            self._sync()
+            count = len(self._offsets)
+        for pos in range(count):
+            with self._lock:
+                if self._mm is None or pos >= len(self._offsets):
+                    return
+                if needle is not None and needle not in self._line(pos).lower():
                     continue
-                context = obj.get('context') or {}
-                metadata = obj.get('metadata') or {}
-                yield Fact(statement=st, context=context, metadata=metadata, confidence=1.0)
+                fact = self._fact_at(pos)
+            if fact is not None:
+                yield pos, fact
+
+    def _iter_facts(self):
+        for _, fact in self._scan():
+            yield fact
+
+    @staticmethod
+    def _prefilter(text: str) -> Optional[bytes]:
+        """Byte needle only if the text cannot be escaped differently in JSON."""
+        if text and text.isascii() and text.isprintable() and '"' not in text and '\\' not in text:
+            return text.lower().encode('ascii')
+        return None
+
+    # ------------------------------------------------------------------
+    # Writing facts
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _to_line(fact: Fact) -> str:
+        return json.dumps({
+            'statement': fact.statement,
+            'context': fact.context,
+            'metadata': fact.metadata,
+        }, ensure_ascii=False) + '\n'
+
+    def _line_break(self) -> str:
+        """Newline to write first if the file ends in an unterminated line (an append would glue onto it)."""
+        try:
+            with self.kb_path.open('rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return ''
+                f.seek(-1, os.SEEK_END)
+                return '' if f.read(1) == b'\n' else '\n'
+        except OSError:
+            return ''
 
     def save(self, fact: Fact) -> bool:
         try:
-            with self.kb_path.open('a', encoding='utf-8') as f:
-                f.write(json.dumps({
-                    'statement': fact.statement,
-                    'context': fact.context,
-                    'metadata': fact.metadata,
-                }, ensure_ascii=False) + '\n')
+            with self._lock:
+                prefix = self._line_break()
+                with self.kb_path.open('a', encoding='utf-8') as f:
+                    f.write(prefix + self._to_line(fact))
+                self._sync()
             return True
         except Exception:
             return False
 
+    def save_many(self, facts: List[Fact]) -> List[bool]:
+        results: List[bool] = []
+        lines = []
+        with self._lock:
+            self._sync()
+            batch = set()
+            for fact in facts:
+                is_new = fact.statement not in batch and not self._exists_locked(fact.statement)
+                results.append(is_new)
+                if is_new:
+                    batch.add(fact.statement)
+                    lines.append(self._to_line(fact))
+            if lines:
+                prefix = self._line_break()
+                with self.kb_path.open('a', encoding='utf-8') as f:
+                    f.write(prefix)
+                    f.writelines(lines)
+                self._sync()
+        return results
+
+    def _rewrite(self, transform) -> int:
+        """Rewrite the file atomically; ``transform(obj)`` returns the new object or None to drop it."""
+        changed = 0
+        with self._lock:
+            self._sync()
+            tmp = self.kb_path.with_name(self.kb_path.name + '.tmp')
+            with tmp.open('w', encoding='utf-8') as out:
+                for pos in range(len(self._offsets)):
+                    raw = self._line(pos)
+                    obj = json.loads(raw)
+                    new = transform(obj)
+                    if new is None:
+                        changed += 1
+                        continue
+                    if new is not obj:
+                        changed += 1
+                        out.write(json.dumps(new, ensure_ascii=False) + '\n')
+                    else:
+                        out.write(raw.decode('utf-8') + '\n')
+            if not changed:
+                tmp.unlink()
+                return 0
+            self._unmap()  # Windows: a mapped file cannot be replaced
+            os.replace(tmp, self.kb_path)
+            self._reset_index()
+            self._stamp = None
+            self._sync()
+        return changed
+
+    def delete_by_statement(self, statement: str) -> int:
+        if not self.exists(statement):
+            return 0
+        return self._rewrite(lambda obj: None if obj.get('statement') == statement else obj)
+
+    def update_statement(self, old_statement: str, new_statement: str) -> int:
+        if not self.exists(old_statement):
+            return 0
+        return self._rewrite(lambda obj: dict(obj, statement=new_statement)
+                             if obj.get('statement') == old_statement else obj)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
     def find_by_query(self, query: str, limit: int = 10) -> List[Fact]:
         out: List[Fact] = []
         q = (query or '').lower()
-        for fact in self._iter_facts():
+        for _, fact in self._scan(self._prefilter(q)):
             if q in fact.statement.lower():
                 out.append(fact)
                 if len(out) >= limit:
@@ -70,52 +388,61 @@ class JsonlFactRepository(FactRepository):
         return out
 
     def find_all(self, limit: int = 100) -> List[Fact]:
+        return [fact for _, fact in self.find_after(None, limit)]
+
+    def find_after(self, after: Optional[int] = None, limit: int = 1000) -> List[Tuple[int, Fact]]:
+        """Cursor = 0-based fact position in the file."""
+        out: List[Tuple[int, Fact]] = []
+        with self._lock:
+            self._sync()
+            for pos in range(0 if after is None else after + 1, len(self._offsets)):
+                fact = self._fact_at(pos)
+                if fact is None:
+                    continue
+                out.append((pos, fact))
+                if len(out) >= limit:
+                    break
+        return out
+
+    def find_by_predicate(self, predicate: Optional[str], arg_pos: Optional[int] = None,
+                          value: Optional[str] = None, limit: int = 100) -> List[Fact]:
         out: List[Fact] = []
-        for fact in self._iter_facts():
+        needle = self._prefilter(f"{predicate}(") if predicate else None
+        for _, fact in self._scan(needle):
+            pred, args = parse_statement(fact.statement)
+            if pred is None or (predicate and pred != predicate):
+                continue
+            if value is not None:
+                if arg_pos is not None:
+                    if arg_pos >= len(args) or args[arg_pos] != value:
+                        continue
+                elif value not in args:
+                    continue
             out.append(fact)
             if len(out) >= limit:
                 break
         return out
 
+    def _exists_locked(self, target: str) -> bool:
+        digest = statement_hash(target)
+        pos = self._by_hash.get(digest)
+        if pos is None:
+            return False
+        if self._statement_at(pos) == target:
+            return True
+        # 64-bit hash collision: check the other rows with the same hash
+        return any(self._hashes[p] == digest and self._statement_at(p) == target
+                   for p in range(pos + 1, len(self._hashes)))
+
     def exists(self, statement: str) -> bool:
         target = (statement or '').strip()
         if not target:
             return False
-        for fact in self._iter_facts():
-            if fact.statement == target:
-                return True
-        return False
+        with self._lock:
+            self._sync()
+            return self._exists_locked(target)
 
     def count(self) -> int:
-        c = 0
-        for _ in self._iter_facts():
-            c += 1
-        return c
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+        with self._lock:
+            self._sync()
+            return len(self._offsets)
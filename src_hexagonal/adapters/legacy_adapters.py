@@ -6,14 +6,14 @@ Fixed duplicate detection
 
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 # Add paths for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.ports.interfaces import FactRepository, ReasoningEngine
-from core.domain.entities import Fact, ReasoningResult
+from core.domain.entities import Fact, ReasoningResult, parse_statement
 from legacy_wrapper import legacy_proxy
 
 class LegacyFactRepository(FactRepository):
@@ -51,6 +51,13 @@ class LegacyFactRepository(FactRepository):
             print(f"Error saving to legacy: {e}")
         return False
     
+    def save_many(self, facts: List[Fact]) -> List[bool]:
+        """Save several facts; True per fact that was newly added"""
+        results = []
+        for fact in facts:
+            results.append(not self.exists(fact.statement) and self.save(fact))
+        return results
+    
     def invalidate_cache(self):
         """Invalidate the count cache"""
         self._cached_count = None
@@ -254,6 +261,61 @@ class LegacyFactRepository(FactRepository):
                     pass
         return 0
 
+    def find_after(self, after: Optional[int] = None, limit: int = 1000) -> List[Tuple[int, Fact]]:
+        """Keyset-Pagination über facts.id"""
+        page = []
+        try:
+            if self.legacy.k_assistant and hasattr(self.legacy.k_assistant, 'db_session'):
+                from sqlalchemy import text
+                result = self.legacy.k_assistant.db_session.execute(
+                    text("SELECT id, statement, confidence FROM facts WHERE id > :after ORDER BY id LIMIT :limit"),
+                    {'after': after if after is not None else -1, 'limit': limit}
+                )
+                for row in result:
+                    page.append((row[0], Fact(
+                        statement=row[1],
+                        confidence=row[2] if row[2] else 1.0,
+                        context={'source': 'sqlite'},
+                        created_at=datetime.now()
+                    )))
+        except Exception as e:
+            print(f"Error paging facts from SQLite: {e}")
+        return page
+
+    def find_by_predicate(self, predicate: Optional[str], arg_pos: Optional[int] = None,
+                          value: Optional[str] = None, limit: int = 100) -> List[Fact]:
+        """Prädikat/Argument-Suche (Legacy-DB hat keinen Strukturindex: LIKE + Parsen)"""
+        facts = []
+        try:
+            if self.legacy.k_assistant and hasattr(self.legacy.k_assistant, 'db_session'):
+                from sqlalchemy import text
+                pattern = f"{predicate}(%" if predicate else (f"%{value}%" if value else "%")
+                result = self.legacy.k_assistant.db_session.execute(
+                    text("SELECT statement, confidence FROM facts WHERE statement LIKE :pattern"),
+                    {'pattern': pattern}
+                )
+                for row in result:
+                    pred, args = parse_statement(row[0])
+                    if predicate and pred != predicate:
+                        continue
+                    if value is not None:
+                        if arg_pos is not None:
+                            if arg_pos >= len(args) or args[arg_pos] != value:
+                                continue
+                        elif value not in args:
+                            continue
+                    facts.append(Fact(
+                        statement=row[0],
+                        confidence=row[1] if row[1] else 1.0,
+                        context={'source': 'sqlite'},
+                        created_at=datetime.now()
+                    ))
+                    if len(facts) >= limit:
+                        break
+        except Exception as e:
+            print(f"Error finding facts by predicate: {e}")
+        return facts
+
 class LegacyReasoningEngine(ReasoningEngine):
     """
     Adapter für Legacy HRM System
@@ -289,3 +351,7 @@ class LegacyReasoningEngine(ReasoningEngine):
     def analyze_statement(self, statement: str) -> Dict[str, Any]:
         """Analysiere Statement mit Legacy HRM"""
         return self.compute_confidence(statement)
+    
+    def compute_confidence_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Legacy HRM hat keine Batch-API"""
+        return [self.compute_confidence(query) for query in queries]
@@ -14,39 +14,328 @@ from urllib3.util.retry import Retry
 import subprocess
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
 from typing import Optional, List
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+# Prozessweite Keep-Alive-Sessions je Provider: die Provider-Objekte werden pro
+# Request neu gebaut (MultiLLMProvider() in /api/llm/get-explanation), die
+# TCP/TLS-Verbindungen sollen trotzdem wiederverwendet werden.
+_SESSIONS: dict = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(name: str, retries: bool = False, trust_env: bool = True) -> requests.Session:
+    """Shared keep-alive session for one provider (optionally with 429/5xx retries)."""
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(name)
+        if session is None:
+            session = requests.Session()
+            session.trust_env = trust_env
+            max_retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]) if retries else 0
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=max_retries)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _SESSIONS[name] = session
+        return session
+
+
+# llm_config.json wird nur bei geaenderter mtime neu gelesen
+_CONFIG_CACHE: dict = {}
+_CONFIG_LOCK = threading.Lock()
+
+
+def load_llm_config(path: Path = Path("llm_config.json")) -> dict:
+    """Cached llm_config.json (relative to the CWD); {} if missing or invalid."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    key = str(path)
+    with _CONFIG_LOCK:
+        cached = _CONFIG_CACHE.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except Exception as e:
+            print(f"[MultiLLM] Failed to read {path}: {e}")
+            config = {}
+        _CONFIG_CACHE[key] = (mtime, config)
+        return config
+
+
+# Worker fuer Hedged Requests; abgehaengte langsame Provider laufen hier bis zu ihrem Timeout aus
+_HEDGE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('HAK_GAL_LLM_HEDGE_WORKERS', '32')),
+    thread_name_prefix='llm-hedge'
+)
+
+class LLMProviderError(Exception):
+    """Typed provider failure; ``kind`` feeds the circuit breaker instead of substring matching."""
+    kind = "error"
+    counts_as_failure = True
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class ProviderNotConfigured(LLMProviderError):
+    """Kein API-Key / lokaler Dienst aus - kein Gesundheitsproblem, zählt nicht für den Breaker"""
+    kind = "not_configured"
+    counts_as_failure = False
+
+
+class ProviderTimeout(LLMProviderError):
+    kind = "timeout"
+
+
+class ProviderConnectionError(LLMProviderError):
+    kind = "connection"
+
+
+class ProviderHTTPError(LLMProviderError):
+    kind = "http"
+
+
+class ProviderResponseError(LLMProviderError):
+    """Leere, zu kurze oder unlesbare Antwort"""
+    kind = "bad_response"
+
+
+def as_provider_error(exc: Exception, message: str) -> LLMProviderError:
+    """Map requests/socket exceptions onto the typed errors."""
+    if isinstance(exc, LLMProviderError):
+        return exc
+    if isinstance(exc, requests.exceptions.Timeout):
+        return ProviderTimeout(message)
+    if isinstance(exc, (requests.exceptions.ConnectionError, ConnectionError, OSError)):
+        return ProviderConnectionError(message)
+    return LLMProviderError(message)
+
+
+class ProviderHealthRegistry:
+    """Prozessweite Provider-Gesundheit: rollierende Latenz-/Fehlerfenster, EWMA
+    und Circuit Breaker (closed -> open -> half_open -> closed).
+
+    Offen nach ``failure_threshold`` Fehlern in Folge; nach dem Cooldown darf
+    genau ein Probe-Request durch. Scheitert er, verdoppelt sich der Cooldown
+    (bis ``max_cooldown_s``). Ein Probe, der nie gestartet wurde (``release``)
+    oder nach ``probe_timeout`` nicht zurueckkam, gibt den Platz wieder frei.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, window: int = 50, alpha: float = 0.3, failure_threshold: Optional[int] = None,
+                 cooldown_s: Optional[float] = None, max_cooldown_s: float = 300.0,
+                 probe_timeout_s: Optional[float] = None):
+        self.window = window
+        self.alpha = alpha
+        self.failure_threshold = int(failure_threshold or os.environ.get('HAK_GAL_LLM_BREAKER_FAILURES', '3'))
+        self.cooldown_s = float(cooldown_s or os.environ.get('HAK_GAL_LLM_BREAKER_COOLDOWN', '30'))
+        self.max_cooldown_s = max(max_cooldown_s, self.cooldown_s)
+        self.probe_timeout_s = float(probe_timeout_s or os.environ.get('HAK_GAL_LLM_BREAKER_PROBE_TIMEOUT', '60'))
+        self._lock = threading.Lock()
+        self._providers: dict = {}
+
+    def _entry(self, name: str) -> dict:
+        entry = self._providers.get(name)
+        if entry is None:
+            entry = self._providers[name] = {
+                'state': self.CLOSED,
+                'samples': deque(maxlen=self.window),  # (latency_s, ok)
+                'ewma_latency': None,
+                'ewma_error': 0.0,
+                'consecutive_failures': 0,
+                'opened_at': 0.0,
+                'cooldown': self.cooldown_s,
+                'probe_in_flight': False,
+                'probe_started': 0.0,
+                'successes': 0,
+                'failures': 0,
+                'last_error': None,
+            }
+        return entry
+
+    def allow(self, name: str, probe_timeout_s: Optional[float] = None) -> bool:
+        """False while the breaker is open; half-open lets a single probe through.
+
+        A probe older than ``probe_timeout_s`` (default: registry setting) is
+        considered lost and replaced by a new one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(name)
+            if entry['state'] == self.CLOSED:
+                return True
+            if entry['state'] == self.OPEN:
+                if now - entry['opened_at'] < entry['cooldown']:
+                    return False
+                entry['state'] = self.HALF_OPEN
+                entry['probe_in_flight'] = False
+                print(f"[MultiLLM] Circuit for {name} half-open - sending probe")
+            if entry['probe_in_flight']:
+                timeout = probe_timeout_s or self.probe_timeout_s
+                if now - entry['probe_started'] < timeout:
+                    return False
+                print(f"[MultiLLM] Probe for {name} got no answer within {timeout:.0f}s - sending a new one")
+            entry['probe_in_flight'] = True
+            entry['probe_started'] = now
+            return True
+
+    def release(self, name: str):
+        """Admitted request never ran (cancelled before start): free the probe slot."""
+        with self._lock:
+            entry = self._providers.get(name)
+            if entry is not None:
+                entry['probe_in_flight'] = False
+
+    def record_success(self, name: str, latency_s: float):
+        with self._lock:
+            entry = self._entry(name)
+            entry['samples'].append((latency_s, True))
+            ewma = entry['ewma_latency']
+            entry['ewma_latency'] = latency_s if ewma is None else self.alpha * latency_s + (1 - self.alpha) * ewma
+            entry['ewma_error'] *= (1 - self.alpha)
+            entry['consecutive_failures'] = 0
+            entry['successes'] += 1
+            entry['probe_in_flight'] = False
+            if entry['state'] != self.CLOSED:
+                print(f"[MultiLLM] Circuit for {name} closed again")
+                entry['state'] = self.CLOSED
+                entry['cooldown'] = self.cooldown_s
+
+    def record_failure(self, name: str, latency_s: float, error: LLMProviderError):
+        with self._lock:
+            entry = self._entry(name)
+            entry['probe_in_flight'] = False
+            if not error.counts_as_failure:
+                return
+            entry['samples'].append((latency_s, False))
+            entry['ewma_error'] = self.alpha + (1 - self.alpha) * entry['ewma_error']
+            entry['consecutive_failures'] += 1
+            entry['failures'] += 1
+            entry['last_error'] = f"{error.kind}: {str(error)[:200]}"
+            if entry['state'] == self.HALF_OPEN:
+                entry['cooldown'] = min(entry['cooldown'] * 2, self.max_cooldown_s)
+                self._open(name, entry)
+            elif entry['state'] == self.CLOSED and entry['consecutive_failures'] >= self.failure_threshold:
+                self._open(name, entry)
+
+    def _open(self, name: str, entry: dict):
+        entry['state'] = self.OPEN
+        entry['opened_at'] = time.monotonic()
+        print(f"[MultiLLM] Circuit for {name} OPEN for {entry['cooldown']:.0f}s ({entry['last_error']})")
+
+    def order(self, names: List[str]) -> List[str]:
+        """Healthy measured providers by EWMA latency (penalised by error EWMA),
+        then unmeasured ones in configured order, open circuits last."""
+        with self._lock:
+            def key(item):
+                index, name = item
+                entry = self._providers.get(name)
+                if entry and entry['state'] == self.OPEN:
+                    return (2, 0.0, index)
+                if entry is None or entry['ewma_latency'] is None:
+                    return (1, 0.0, index)
+                return (0, entry['ewma_latency'] * (1 + 4 * entry['ewma_error']), index)
+            return [name for _, name in sorted(enumerate(names), key=key)]
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable view for /api/llm/health"""
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for name, entry in self._providers.items():
+                latencies = sorted(latency for latency, ok in entry['samples'] if ok)
+                samples = len(entry['samples'])
+                errors = sum(1 for _, ok in entry['samples'] if not ok)
+
+                def pct(q):
+                    if not latencies:
+                        return None
+                    return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1)
+
+                retry_in = 0.0
+                if entry['state'] == self.OPEN:
+                    retry_in = max(0.0, entry['cooldown'] - (now - entry['opened_at']))
+                result[name] = {
+                    'state': entry['state'],
+                    'ewma_latency_ms': None if entry['ewma_latency'] is None else round(entry['ewma_latency'] * 1000, 1),
+                    'ewma_error_rate': round(entry['ewma_error'], 3),
+                    'window_samples': samples,
+                    'window_error_rate': round(errors / samples, 3) if samples else 0.0,
+                    'p50_ms': pct(0.50),
+                    'p95_ms': pct(0.95),
+                    'consecutive_failures': entry['consecutive_failures'],
+                    'probe_in_flight': entry['probe_in_flight'],
+                    'successes': entry['successes'],
+                    'failures': entry['failures'],
+                    'cooldown_s': entry['cooldown'],
+                    'retry_in_s': round(retry_in, 1),
+                    'last_error': entry['last_error'],
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._providers.clear()
+
+
+# Ein Registry fuer den ganzen Prozess: MultiLLMProvider wird pro Request neu gebaut
+PROVIDER_HEALTH = ProviderHealthRegistry()
+
+
 class LLMProvider(ABC):
-    """Base class for LLM providers"""
+    """Base class for LLM providers.
+
+    Providers implement ``generate`` (text or a typed ``LLMProviderError``);
+    ``generate_response`` keeps the old ``(text, provider_name)`` contract with
+    the error message as text for existing callers.
+    """
+    name: Optional[str] = None
     
     @abstractmethod
     def is_available(self) -> bool:
         pass
     
-    @abstractmethod
+    @property
+    def provider_name(self) -> str:
+        return self.name or self.__class__.__name__.replace('Provider', '')
+    
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+    
     def generate_response(self, prompt: str) -> tuple[str, str]:
-        pass
+        try:
+            return self.generate(prompt), self.provider_name
+        except LLMProviderError as e:
+            return str(e), self.provider_name
 
 class GroqProvider(LLMProvider):
     """Groq API provider - Llama 3.1 8B Instant with LPU technology (extremely fast and free)"""
+    name = "Groq"
     
     def __init__(self):
         self.api_key = os.environ.get('GROQ_API_KEY', '')
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
         self.timeout = 3  # Reduziert von 10s auf 3s für schnelleres Failover
         self.model = "llama-3.1-8b-instant"  # Current free tier model
+        self.session = get_session('groq')
     
     def is_available(self) -> bool:
         api_key_present = bool(self.api_key)
         print(f"[Groq.is_available] API Key Present: {api_key_present}")
         return api_key_present
     
-    def generate_response(self, prompt: str) -> tuple[str, str]:
-        provider_name = "Groq"
+    def generate(self, prompt: str) -> str:
+        provider_name = self.name
         if not self.is_available():
-            return "Groq API key not configured", provider_name
+            raise ProviderNotConfigured("Groq API key not configured")
         
         try:
             print(f"[{provider_name}] Calling Llama 3.1 8B Instant via Groq API...")
@@ -63,7 +352,7 @@ class GroqProvider(LLMProvider):
                 "stream": False
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.base_url, 
                 headers=headers, 
                 json=data, 
@@ -74,35 +363,38 @@ class GroqProvider(LLMProvider):
                 result = response.json()
                 content = result.get('choices', [{}])[0].get('message', {}).get('content', '')
                 if content:
-                    return content, provider_name
+                    return content
                 else:
-                    return "Empty response from Groq", provider_name
+                    raise ProviderResponseError("Empty response from Groq")
             else:
-                return f"Groq API error: {response.status_code} - {response.text[:200]}", provider_name
+                raise ProviderHTTPError(f"Groq API error: {response.status_code} - {response.text[:200]}",
+                                        response.status_code)
                 
         except requests.exceptions.Timeout:
-            return f"Groq API timeout after {self.timeout}s", provider_name
+            raise ProviderTimeout(f"Groq API timeout after {self.timeout}s")
         except Exception as e:
-            return f"Groq API error: {str(e)[:200]}", provider_name
+            raise as_provider_error(e, f"Groq API error: {str(e)[:200]}")
 
 class TogetherAIProvider(LLMProvider):
     """Together AI provider - Mixtral 8x7B with $25 free credits"""
+    name = "TogetherAI"
     
     def __init__(self):
         self.api_key = os.environ.get('TOGETHER_API_KEY', '')
         self.base_url = "https://api.together.xyz/v1/chat/completions"
         self.timeout = 15
         self.model = "mistralai/Mixtral-8x7B-Instruct-v0.1"
+        self.session = get_session('together')
     
     def is_available(self) -> bool:
         api_key_present = bool(self.api_key)
         print(f"[TogetherAI.is_available] API Key Present: {api_key_present}")
         return api_key_present
     
-    def generate_response(self, prompt: str) -> tuple[str, str]:
-        provider_name = "TogetherAI"
+    def generate(self, prompt: str) -> str:
+        provider_name = self.name
         if not self.is_available():
-            return "Together AI API key not configured", provider_name
+            raise ProviderNotConfigured("Together AI API key not configured")
         
         try:
             print(f"[{provider_name}] Calling Mixtral 8x7B via Together AI...")
@@ -118,7 +410,7 @@ class TogetherAIProvider(LLMProvider):
                 "temperature": 0.7
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.base_url, 
                 headers=headers, 
                 json=data, 
@@ -129,19 +421,21 @@ class TogetherAIProvider(LLMProvider):
                 result = response.json()
                 content = result.get('choices', [{}])[0].get('message', {}).get('content', '')
                 if content:
-                    return content, provider_name
+                    return content
                 else:
-                    return "Empty response from Together AI", provider_name
+                    raise ProviderResponseError("Empty response from Together AI")
             else:
-                return f"Together AI API error: {response.status_code} - {response.text[:200]}", provider_name
+                raise ProviderHTTPError(f"Together AI API error: {response.status_code} - {response.text[:200]}",
+                                        response.status_code)
                 
         except requests.exceptions.Timeout:
-            return f"Together AI API timeout after {self.timeout}s", provider_name
+            raise ProviderTimeout(f"Together AI API timeout after {self.timeout}s")
         except Exception as e:
-            return f"Together AI API error: {str(e)[:200]}", provider_name
+            raise as_provider_error(e, f"Together AI API error: {str(e)[:200]}")
 
 class DeepSeekProvider(LLMProvider):
     """DeepSeek API provider - Fixed implementation based on successful test."""
+    name = "DeepSeek"
     
     def __init__(self):
         self.api_key = os.environ.get('DEEPSEEK_API_KEY', '')
@@ -150,22 +444,18 @@ class DeepSeekProvider(LLMProvider):
         connect_to = float(os.environ.get('HAK_GAL_LLM_CONNECT_TIMEOUT', '5'))
         read_to = float(os.environ.get('HAK_GAL_LLM_READ_TIMEOUT', '45'))
         self.timeout = (connect_to, read_to)
-        # Session mit Retries (429/5xx) und Backoff
-        self.session = requests.Session()
-        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries)
-        self.session.mount('https://', adapter)
-        self.session.mount('http://', adapter)
+        # Geteilte Keep-Alive-Session mit Retries (429/5xx) und Backoff
+        self.session = get_session('deepseek', retries=True)
     
     def is_available(self) -> bool:
         api_key_present = bool(self.api_key)
         print(f"[DeepSeek.is_available] API Key Present: {api_key_present}")
         return api_key_present
     
-    def generate_response(self, prompt: str) -> tuple[str, str]:
-        provider_name = "DeepSeek"
+    def generate(self, prompt: str) -> str:
+        provider_name = self.name
         if not self.is_available():
-            return "DeepSeek API key not configured", provider_name
+            raise ProviderNotConfigured("DeepSeek API key not configured")
         
         try:
             # Erzwinge IPv4 (Workaround für sporadische NameResolutionError unter Windows/Eventlet)
@@ -209,22 +499,23 @@ class DeepSeekProvider(LLMProvider):
                 if "choices" in result and len(result["choices"]) > 0:
                     content = result["choices"][0]["message"]["content"]
                     print(f"[{provider_name}] Success! Response time: {response.elapsed.total_seconds():.2f}s")
-                    return content, provider_name
+                    return content
                 else:
-                    return f"DeepSeek: Invalid response format", provider_name
+                    raise ProviderResponseError("DeepSeek: Invalid response format")
             else:
                 error_text = response.text[:200] if response.text else "No error details"
-                return f"DeepSeek API error {response.status_code}: {error_text}", provider_name
+                raise ProviderHTTPError(f"DeepSeek API error {response.status_code}: {error_text}", response.status_code)
                 
         except requests.exceptions.ConnectTimeout:
-            return "DeepSeek: Connection timeout (couldn't connect)", provider_name
+            raise ProviderTimeout("DeepSeek: Connection timeout (couldn't connect)")
         except requests.exceptions.ReadTimeout:
-            return "DeepSeek: Read timeout (connected but slow response)", provider_name
+            raise ProviderTimeout("DeepSeek: Read timeout (connected but slow response)")
         except Exception as e:
-            return f"DeepSeek error: {type(e).__name__}: {str(e)[:100]}", provider_name
+            raise as_provider_error(e, f"DeepSeek error: {type(e).__name__}: {str(e)[:100]}")
 
 class ClaudeProvider(LLMProvider):
     """Anthropic Claude API provider - Claude 3.5 Sonnet"""
+    name = "Claude"
     
     def __init__(self):
         self.api_key = os.environ.get('ANTHROPIC_API_KEY', '')
@@ -238,27 +529,15 @@ class ClaudeProvider(LLMProvider):
             "claude-3-sonnet-20240229",
         ]
         # Optional aus Root-llm_config.json überschreiben
-        try:
-            from pathlib import Path as _P
-            import json as _json
-            cfgp = _P("llm_config.json")
-            if cfgp.exists():
-                with open(cfgp, 'r', encoding='utf-8') as _f:
-                    _cfg = _json.load(_f)
-                    cm = _cfg.get('claude', {}).get('models')
-                    if isinstance(cm, list) and cm:
-                        self.models = cm
-        except Exception:
-            pass
+        cm = load_llm_config().get('claude', {}).get('models')
+        if isinstance(cm, list) and cm:
+            self.models = cm
         # Erhöhte Read-Timeouts für Sonnet (große Antworten)
         connect_to = float(os.environ.get('HAK_GAL_LLM_CONNECT_TIMEOUT', '5'))
         read_to = float(os.environ.get('HAK_GAL_LLM_READ_TIMEOUT', '45'))
         self.timeout = (connect_to, read_to)
-        self.session = requests.Session()
-        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries)
-        self.session.mount('https://', adapter)
-        self.session.mount('http://', adapter)
+        # Geteilte Keep-Alive-Session; Proxies ignorieren, certifi-CA nutzen
+        self.session = get_session('claude', retries=True, trust_env=False)
         # DNS Fallback Cache (DoH)
         self._dns_cache = {}
         self._dns_ttl_seconds = 300.0
@@ -277,12 +556,13 @@ class ClaudeProvider(LLMProvider):
     def is_available(self) -> bool:
         return bool(self.api_key)
     
-    def generate_response(self, prompt: str) -> tuple[str, str]:
-        provider_name = "Claude"
+    def generate(self, prompt: str) -> str:
+        provider_name = self.name
         if not self.is_available():
-            return "Claude API key not configured (needs ANTHROPIC_API_KEY)", provider_name
+            raise ProviderNotConfigured("Claude API key not configured (needs ANTHROPIC_API_KEY)")
         
         errors = []
+        last_error: Optional[LLMProviderError] = None
         for model in self.models:
             try:
                 print(f"[{provider_name}] Trying model {model} (timeout={self.timeout}s)...")
@@ -305,8 +585,6 @@ class ClaudeProvider(LLMProvider):
                     "max_tokens": 4096,
                     "temperature": 0.7
                 }
-                # Proxies ignorieren, certifi-CA nutzen
-                self.session.trust_env = False
                 # Führe Request in DNS-Override-Kontext aus, falls wir DoH-IPs haben
                 response = None
                 ips = self._get_cached_ips("api.anthropic.com")
@@ -351,19 +629,25 @@ class ClaudeProvider(LLMProvider):
                             text = msg['content'].strip()
                     if text and len(text) >= 2:
                         print(f"[{provider_name}] Success with {model}!")
-                        return text, provider_name
+                        return text
                     # Debug-Ausgabe zur Strukturhilfe
                     try:
                         print(f"[{provider_name}] Debug body: {response.text[:400]}")
                     except Exception:
                         pass
                     errors.append(f"{model}: Invalid response structure")
+                    last_error = ProviderResponseError("")
                 else:
                     errors.append(f"{model}: HTTP {response.status_code}")
+                    last_error = ProviderHTTPError("", response.status_code)
             except Exception as e:
                 errors.append(f"{model}: {str(e)[:50]}")
+                last_error = as_provider_error(e, "")
         
-        return f"Claude error - tried all models: {', '.join(errors)}", provider_name
+        # Typ des letzten Fehlers, Meldung über alle Modelle
+        error = type(last_error or LLMProviderError(""))
+        raise error(f"Claude error - tried all models: {', '.join(errors)}",
+                    getattr(last_error, 'status', None))
 
     # --- DNS Robustness Helpers ---
     def _ensure_dns(self, host: str, preflight_timeout: float = 0.3):
@@ -498,6 +782,7 @@ class ClaudeProvider(LLMProvider):
 
 class MistralProvider(LLMProvider):
     """Mistral API provider - Currently disabled due to invalid API key"""
+    name = "Mistral"
     
     def __init__(self):
         self.api_key = os.environ.get('MISTRAL_API_KEY', '')
@@ -508,28 +793,30 @@ class MistralProvider(LLMProvider):
     def is_available(self) -> bool:
         return False
     
-    def generate_response(self, prompt: str) -> tuple[str, str]:
-        provider_name = "Mistral"
-        return "Mistral API key invalid (401 Unauthorized)", provider_name
+    def generate(self, prompt: str) -> str:
+        raise ProviderNotConfigured("Mistral API key invalid (401 Unauthorized)")
 
 class GeminiProvider(LLMProvider):
     """Google Gemini API provider - Tuned model list"""
+    name = "Gemini"
     
     def __init__(self):
         self.api_key = os.environ.get('GEMINI_API_KEY', '')
         # Eingeschränkt auf stabiles Modell
         self.models = ["gemini-2.0-flash-exp"]
         self.timeout = 15
+        self.session = get_session('gemini')
     
     def is_available(self) -> bool:
         return bool(self.api_key)
     
-    def generate_response(self, prompt: str) -> tuple[str, str]:
-        provider_name = "Gemini"
+    def generate(self, prompt: str) -> str:
+        provider_name = self.name
         if not self.is_available():
-            return "Gemini API key not configured", provider_name
+            raise ProviderNotConfigured("Gemini API key not configured")
         
         errors = []
+        last_error: Optional[LLMProviderError] = None
         for model in self.models:
             try:
                 print(f"[{provider_name}] Trying model {model} (timeout={self.timeout}s)...")
@@ -538,7 +825,7 @@ class GeminiProvider(LLMProvider):
                     "contents": [{"parts": [{"text": prompt}]}],
                     "generationConfig": {"temperature": 0.7, "maxOutputTokens": 1000, "topK": 40, "topP": 0.95}
                 }
-                response = requests.post(url, headers={"Content-Type": "application/json"}, json=data, timeout=self.timeout)
+                response = self.session.post(url, headers={"Content-Type": "application/json"}, json=data, timeout=self.timeout)
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -546,17 +833,23 @@ class GeminiProvider(LLMProvider):
                         text = result['candidates'][0]['content']['parts'][0].get('text', '')
                         if text and len(text) > 10:  # Reduced threshold
                             print(f"[{provider_name}] Success with {model}!")
-                            return text, provider_name
+                            return text
                     errors.append(f"{model}: Invalid response structure")
+                    last_error = ProviderResponseError("")
                 else:
                     errors.append(f"{model}: HTTP {response.status_code}")
+                    last_error = ProviderHTTPError("", response.status_code)
             except Exception as e:
                 errors.append(f"{model}: {str(e)[:50]}")
+                last_error = as_provider_error(e, "")
         
-        return f"Gemini error - tried all models: {', '.join(errors)}", provider_name
+        error = type(last_error or LLMProviderError(""))
+        raise error(f"Gemini error - tried all models: {', '.join(errors)}",
+                    getattr(last_error, 'status', None))
 
 class OllamaProvider(LLMProvider):
     """Ollama Local LLM Provider - QWEN 2.5 Model"""
+    name = "Ollama"
     
     def __init__(self):
         # IPv6/localhost-Probleme vermeiden → IPv4 Loopback explizit
@@ -566,6 +859,8 @@ class OllamaProvider(LLMProvider):
         self.model = None  # wird bei is_available() gesetzt
         self.timeout = 30  # Reduziert auf 30s
         self._is_available = None  # Cache für is_available
+        # Proxies ignorieren für Localhost
+        self.session = get_session('ollama', trust_env=False)
     
     def _select_model_from_tags(self, tags_json: dict) -> None:
         try:
@@ -593,12 +888,7 @@ class OllamaProvider(LLMProvider):
             response = None
             for to in timeouts:
                 try:
-                    # Proxies ignorieren für Localhost
-                    response = requests.get(
-                        f"{self.base_url}/api/tags",
-                        timeout=to,
-                        proxies={"http": None, "https": None}
-                    )
+                    response = self.session.get(f"{self.base_url}/api/tags", timeout=to)
                     if response.status_code == 200:
                         break
                 except Exception:
@@ -633,15 +923,15 @@ class OllamaProvider(LLMProvider):
             self._is_available = None
             return False
     
-    def generate_response(self, prompt: str) -> tuple[str, str]:
-        provider_name = "Ollama"
+    def generate(self, prompt: str) -> str:
+        provider_name = self.name
         if not self.is_available():
-            return "Ollama server not running or model not available", provider_name
+            raise ProviderNotConfigured("Ollama server not running or model not available")
         # Sicherstellen, dass ein Modell gesetzt ist
         if not self.model:
             # Versuche nochmal Tags zu laden, um bestes Modell zu wählen
             try:
-                r = requests.get(f"{self.base_url}/api/tags", timeout=2, proxies={"http": None, "https": None})
+                r = self.session.get(f"{self.base_url}/api/tags", timeout=2)
                 if r.status_code == 200:
                     self._select_model_from_tags(r.json())
             except Exception:
@@ -665,7 +955,7 @@ class OllamaProvider(LLMProvider):
             }
             
             start_time = time.time()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json=data,
                 timeout=self.timeout
@@ -685,24 +975,25 @@ class OllamaProvider(LLMProvider):
                 
                 if text:
                     print(f"[{provider_name}] Success! Generated {len(text)} chars")
-                    return text, provider_name
+                    return text
                 else:
                     print(f"[{provider_name}] Empty response from model")
-                    return "Ollama returned empty response", provider_name
+                    raise ProviderResponseError("Ollama returned empty response")
             else:
                 error_msg = f"Ollama API error: {response.status_code}"
                 if response.text:
                     error_detail = response.text[:200]
                     print(f"[{provider_name}] Error details: {error_detail}")
                     error_msg += f" - {error_detail}"
-                return error_msg, provider_name
+                raise ProviderHTTPError(error_msg, response.status_code)
                 
         except requests.exceptions.Timeout:
             print(f"[{provider_name}] Timeout after {self.timeout}s - model might be loading")
-            return f"Ollama timeout after {self.timeout}s - try again or use smaller model", provider_name
+            raise ProviderTimeout(f"Ollama timeout after {self.timeout}s - try again or use smaller model")
         except Exception as e:
-            print(f"[{provider_name}] Exception: {type(e).__name__}: {str(e)}")
-            return f"Ollama error: {str(e)[:200]}", provider_name
+            if not isinstance(e, LLMProviderError):
+                print(f"[{provider_name}] Exception: {type(e).__name__}: {str(e)}")
+            raise as_provider_error(e, f"Ollama error: {str(e)[:200]}")
 
 class MultiLLMProvider(LLMProvider):
     """Fallback provider - tries multiple LLMs in priority order."""
@@ -775,148 +1066,220 @@ class MultiLLMProvider(LLMProvider):
     
     def _check_dynamic_config(self):
         """Check for dynamic LLM configuration"""
-        try:
-            # Check if there's a config file or environment variable for dynamic config
-            import json
-            config_path = Path("llm_config.json")
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    print(f"[MultiLLM] Loaded dynamic configuration from {config_path}")
-                    # TODO: Apply configuration
-        except Exception as e:
-            print(f"[MultiLLM] No dynamic configuration found: {e}")
+        if load_llm_config():
+            print("[MultiLLM] Loaded dynamic configuration from llm_config.json")
+    
+    def _hedge_settings(self) -> tuple[int, float]:
+        """(providers in flight, delay before the next one is started) - llm_config.json 'hedge' or ENV.
+
+        Hedging ist opt-in (Default 1 = sequenzielle Kette): jeder Hedge, der
+        vor dem Abbruch schon gesendet wurde, ist ein zweiter bezahlter
+        API-Request. Mit providers=2 kostet jede Anfrage, deren erster Provider
+        laenger als ``delay_s`` braucht, doppelt - den Delay daher an der p95-
+        Latenz des ersten Providers (/api/llm/health) ausrichten, nicht darunter.
+        """
+        hedge = load_llm_config().get('hedge', {})
+        count = int(hedge.get('providers', os.environ.get('HAK_GAL_LLM_HEDGE_PROVIDERS', '1')))
+        delay = float(hedge.get('delay_s', os.environ.get('HAK_GAL_LLM_HEDGE_DELAY', '1.0')))
+        return max(1, count), max(0.0, delay)
     
     def _get_enabled_providers(self) -> List[LLMProvider]:
         """Get list of enabled providers based on configuration"""
-        # Check for runtime configuration
+        # Check for runtime configuration (cached, re-read only when the file changes)
         try:
-            # Try to load configuration from a shared location or API
-            # This could be enhanced to read from Redis, DB, or shared memory
-            import json
-            config_path = Path("llm_config.json")
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    enabled_ids = config.get('enabled_providers', [])
-                    provider_order = config.get('provider_order', [])
-                    api_keys = config.get('api_keys', {})
-                    
-                    # Filter and order providers
-                    provider_map = {p.__class__.__name__.replace('Provider', '').lower(): p for p in self.providers}
-                    ordered_providers = []
-                    
-                    for provider_id in provider_order:
-                        if provider_id.lower() in provider_map and provider_id in enabled_ids:
-                            provider = provider_map[provider_id.lower()]
-                            # Apply temporary API key if available
-                            if provider_id in api_keys and hasattr(provider, 'api_key'):
-                                provider.api_key = api_keys[provider_id]
-                            ordered_providers.append(provider)
-                    
-                    if ordered_providers:
-                        print(f"[MultiLLM] Using configured providers: {[p.__class__.__name__ for p in ordered_providers]}")
-                        return ordered_providers
+            config = load_llm_config()
+            if config:
+                enabled_ids = config.get('enabled_providers', [])
+                provider_order = config.get('provider_order', [])
+                api_keys = config.get('api_keys', {})
+                
+                # Filter and order providers
+                provider_map = {p.__class__.__name__.replace('Provider', '').lower(): p for p in self.providers}
+                ordered_providers = []
+                
+                for provider_id in provider_order:
+                    if provider_id.lower() in provider_map and provider_id in enabled_ids:
+                        provider = provider_map[provider_id.lower()]
+                        # Apply temporary API key if available
+                        if provider_id in api_keys and hasattr(provider, 'api_key'):
+                            provider.api_key = api_keys[provider_id]
+                        ordered_providers.append(provider)
+                
+                if ordered_providers:
+                    print(f"[MultiLLM] Using configured providers: {[p.__class__.__name__ for p in ordered_providers]}")
+                    return self._route(ordered_providers)
         except Exception as e:
             # Fallback to default providers
             pass
         
         # Return all providers by default
-        return self.providers
+        return self._route(self.providers)
+    
+    @staticmethod
+    def _name(provider) -> str:
+        return getattr(provider, 'provider_name', None) or provider.__class__.__name__.replace('Provider', '')
+    
+    def _route(self, providers: List[LLMProvider]) -> List[LLMProvider]:
+        """Latency-aware order from PROVIDER_HEALTH; llm_config.json "routing": "priority" keeps the configured order"""
+        if load_llm_config().get('routing', 'latency') == 'priority':
+            return list(providers)
+        by_name = {self._name(p): p for p in providers}
+        ordered = [by_name[name] for name in PROVIDER_HEALTH.order(list(by_name))]
+        return ordered if len(ordered) == len(providers) else list(providers)
     
     def is_available(self) -> bool:
         return any(p.is_available() for p in self._get_enabled_providers())
     
+    # Mindestlänge für sinnvolle Antwort (reduziert für Ollama-Kompatibilität)
+    MIN_GOOD_RESPONSE = 20
+    
+    @staticmethod
+    def _check_response(provider_name: str, response_text: str) -> tuple[Optional[str], bool]:
+        """(error or None, is_connection_error) for one provider answer"""
+        # ROBUSTE Fehlerprüfung - Prüfe ZUERST ob es ein Fehler ist
+        response_lower = response_text.lower()
+        
+        # Erweiterte Liste von Fehlerindikatoren
+        error_indicators = [
+            'timeout', 'failed', 'unauthorized', 'not found', 'invalid', 
+            'api error', 'api key', 'not configured', 
+            'error:', 'error ', 'connectionerror', 'max retries exceeded', 
+            'ssl', 'nameres', 'httpsconnectionpool', 'couldn\'t connect',
+            'connection refused', 'no such host', 'getaddrinfo failed',
+            'server not running', 'model not available'
+        ]
+        
+        # Spezielle Verbindungsfehler-Indikatoren
+        connection_error_indicators = [
+            'max retries exceeded', 'httpsconnectionpool', 'connectionerror',
+            'connection refused', 'no such host', 'getaddrinfo failed',
+            'name or service not known', 'temporary failure in name resolution'
+        ]
+        
+        # Prüfe ob es definitiv ein Fehler ist
+        is_definitely_error = False
+        is_connection_error = False
+        
+        for err in error_indicators:
+            if err in response_lower:
+                is_definitely_error = True
+                print(f"[MultiLLM] Detected error indicator: '{err}'")
+                # Prüfe ob es ein Verbindungsfehler ist
+                if any(conn_err in response_lower for conn_err in connection_error_indicators):
+                    is_connection_error = True
+                break
+        
+        # Zusätzliche Prüfung: Wenn Provider-Name + "error" im Text ist
+        if f"{provider_name.lower()} error" in response_lower or \
+           f"{provider_name.lower()}:" in response_lower and "error" in response_lower:
+            is_definitely_error = True
+            print(f"[MultiLLM] Detected provider-specific error")
+        
+        if is_definitely_error:
+            print(f"[MultiLLM] {provider_name} returned error: {response_text[:150]}...")
+            return response_text[:200], is_connection_error
+        if len(response_text) <= MultiLLMProvider.MIN_GOOD_RESPONSE:
+            print(f"[MultiLLM] {provider_name} response too short ({len(response_text)} chars)")
+            return "Response too short", False
+        return None, False
+    
+    @staticmethod
+    def _probe_timeout(provider: LLMProvider) -> Optional[float]:
+        """Provider-Timeout (Sekunden; (connect, read) summiert) als Grenze fuer einen Half-Open-Probe"""
+        timeout = getattr(provider, 'timeout', None)
+        if isinstance(timeout, (tuple, list)):
+            timeout = sum(t for t in timeout if t)
+        return float(timeout) if isinstance(timeout, (int, float)) and timeout > 0 else None
+
+    def _call_provider(self, provider: LLMProvider, provider_name: str, prompt: str) -> tuple[str, Optional[LLMProviderError]]:
+        """Runs one provider and records latency/outcome in PROVIDER_HEALTH - also
+        when the hedged chain has already moved on and abandoned this call."""
+        start = time.perf_counter()
+        try:
+            if type(provider).generate is not LLMProvider.generate:
+                text, error = provider.generate(prompt), None
+                if len(text) <= self.MIN_GOOD_RESPONSE:
+                    error = ProviderResponseError(f"Response too short ({len(text)} chars)")
+            else:
+                # Fremde Provider ohne typisierte Fehler: alte Textheuristik
+                text, _ = provider.generate_response(prompt)
+                message, is_connection_error = self._check_response(provider_name, text)
+                error = None
+                if message is not None:
+                    error = (ProviderConnectionError if is_connection_error else ProviderResponseError)(message)
+        except Exception as e:
+            text, error = "", as_provider_error(e, f"Exception - {str(e)[:100]}")
+        latency = time.perf_counter() - start
+        if error is None:
+            PROVIDER_HEALTH.record_success(provider_name, latency)
+        else:
+            PROVIDER_HEALTH.record_failure(provider_name, latency, error)
+        return text, error
+    
     def generate_response(self, prompt: str) -> tuple[str, str]:
+        """Hedged fallback chain: the next provider starts when the current ones
+        fail or have not answered within the hedge delay (at most N in flight);
+        the first valid answer wins, the remaining requests are abandoned.
+        With N=1 (the default) this is the plain sequential chain; N>1 trades
+        extra paid requests for tail latency (see _hedge_settings). Providers
+        with an open circuit in PROVIDER_HEALTH are skipped without a request."""
         final_error = "No LLM provider available."
         providers_to_use = self._get_enabled_providers()
-        connection_failures = 0  # Zähle Verbindungsfehler
+        max_in_flight, hedge_delay = self._hedge_settings()
+        in_flight = {}
+        next_index = 0
         
-        for i, provider in enumerate(providers_to_use):
-            provider_name = provider.__class__.__name__.replace('Provider', '')
-            
-            # OPTIMIERUNG: Nach 2 Verbindungsfehlern nur noch Ollama probieren
-            if connection_failures >= 2 and provider_name != 'Ollama':
-                print(f"[MultiLLM] Skipping {provider_name} due to multiple connection failures")
-                continue
-            # Schneller DNS-Preflight für externe Provider
-            if not self._provider_dns_ok(provider_name):
-                connection_failures += 1
-                continue
+        def launch_next() -> bool:
+            nonlocal next_index
+            while next_index < len(providers_to_use):
+                i, provider = next_index, providers_to_use[next_index]
+                next_index += 1
+                provider_name = self._name(provider)
                 
-            if provider.is_available():
-                print(f"[MultiLLM] Trying {provider_name} ({i+1}/{len(self.providers)})...")
-                try:
-                    response_text, _ = provider.generate_response(prompt)
-                    
-                    # ROBUSTE Fehlerprüfung - Prüfe ZUERST ob es ein Fehler ist
-                    response_lower = response_text.lower()
-                    
-                    # Erweiterte Liste von Fehlerindikatoren
-                    error_indicators = [
-                        'timeout', 'failed', 'unauthorized', 'not found', 'invalid', 
-                        'api error', 'api key', 'not configured', 
-                        'error:', 'error ', 'connectionerror', 'max retries exceeded', 
-                        'ssl', 'nameres', 'httpsconnectionpool', 'couldn\'t connect',
-                        'connection refused', 'no such host', 'getaddrinfo failed',
-                        'server not running', 'model not available'
-                    ]
-                    
-                    # Spezielle Verbindungsfehler-Indikatoren
-                    connection_error_indicators = [
-                        'max retries exceeded', 'httpsconnectionpool', 'connectionerror',
-                        'connection refused', 'no such host', 'getaddrinfo failed',
-                        'name or service not known', 'temporary failure in name resolution'
-                    ]
-                    
-                    # Prüfe ob es definitiv ein Fehler ist
-                    is_definitely_error = False
-                    is_connection_error = False
-                    
-                    for err in error_indicators:
-                        if err in response_lower:
-                            is_definitely_error = True
-                            print(f"[MultiLLM] Detected error indicator: '{err}'")
-                            # Prüfe ob es ein Verbindungsfehler ist
-                            if any(conn_err in response_lower for conn_err in connection_error_indicators):
-                                is_connection_error = True
-                                connection_failures += 1
-                                print(f"[MultiLLM] Detected CONNECTION error (total: {connection_failures})")
-                            break
-                    
-                    # Zusätzliche Prüfung: Wenn Provider-Name + "error" im Text ist
-                    if f"{provider_name.lower()} error" in response_lower or \
-                       f"{provider_name.lower()}:" in response_lower and "error" in response_lower:
-                        is_definitely_error = True
-                        print(f"[MultiLLM] Detected provider-specific error")
-                    
-                    # Mindestlänge für sinnvolle Antwort
-                    MIN_GOOD_RESPONSE = 20  # Reduziert für Ollama-Kompatibilität
-                    is_valid_length = len(response_text) > MIN_GOOD_RESPONSE
-                    
-                    # Entscheidungslogik
-                    if is_definitely_error:
-                        print(f"[MultiLLM] {provider_name} returned error: {response_text[:150]}...")
-                        final_error = f"{provider_name}: {response_text[:200]}"
-                        continue  # Nächster Provider
-                    elif not is_valid_length:
-                        print(f"[MultiLLM] {provider_name} response too short ({len(response_text)} chars)")
-                        final_error = f"{provider_name}: Response too short"
-                        continue  # Nächster Provider
-                    else:
+                # Schneller DNS-Preflight für externe Provider (zählt für den Breaker)
+                if not self._provider_dns_ok(provider_name):
+                    PROVIDER_HEALTH.record_failure(provider_name, 0.0, ProviderConnectionError("DNS preflight failed"))
+                    continue
+                if not provider.is_available():
+                    print(f"[MultiLLM] {provider_name} not available")
+                    continue
+                if not PROVIDER_HEALTH.allow(provider_name, self._probe_timeout(provider)):
+                    print(f"[MultiLLM] Skipping {provider_name} - circuit open")
+                    continue
+                print(f"[MultiLLM] Trying {provider_name} ({i+1}/{len(providers_to_use)})...")
+                future = _HEDGE_POOL.submit(self._call_provider, provider, provider_name, prompt)
+                # Abgebrochen, bevor _call_provider lief: ein zugelassener Probe muss freigegeben werden
+                future.add_done_callback(lambda f, name=provider_name: f.cancelled() and PROVIDER_HEALTH.release(name))
+                in_flight[future] = provider_name
+                return True
+            return False
+        
+        try:
+            launch_next()
+            while in_flight:
+                hedge_open = len(in_flight) < max_in_flight and next_index < len(providers_to_use)
+                done, _ = wait(list(in_flight), timeout=hedge_delay if hedge_open else None,
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    print(f"[MultiLLM] No answer after {hedge_delay:.1f}s - hedging with next provider")
+                    launch_next()
+                    continue
+                for future in done:
+                    provider_name = in_flight.pop(future)
+                    response_text, error = future.result()
+                    if error is None:
                         # Erfolg!
                         print(f"[MultiLLM] Success with {provider_name}! (Length: {len(response_text)})")
                         return response_text, provider_name
-                        
-                except Exception as e:
-                    final_error = f"{provider_name}: Exception - {str(e)[:100]}"
-                    print(f"[MultiLLM] {provider_name} exception: {str(e)[:100]}")
-                    # Exceptions oft bei Verbindungsproblemen
-                    if any(indicator in str(e).lower() for indicator in ['connection', 'timeout', 'refused']):
-                        connection_failures += 1
-                        print(f"[MultiLLM] Connection exception (total failures: {connection_failures})")
-            else:
-                print(f"[MultiLLM] {provider_name} not available")
+                    final_error = f"{provider_name}: {str(error)[:200]}"
+                    print(f"[MultiLLM] {provider_name} failed ({error.kind}): {str(error)[:150]}")
+                # Alle laufenden fehlgeschlagen: sofort den nächsten Provider starten
+                if not in_flight:
+                    launch_next()
+        finally:
+            # Noch laufende Provider abhängen; nicht gestartete abbrechen
+            for future in in_flight:
+                future.cancel()
         
         # FALLBACK: Wenn alle Provider fehlgeschlagen sind
         print(f"[MultiLLM] All providers failed. Final error: {final_error}")
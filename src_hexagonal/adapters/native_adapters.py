@@ -6,7 +6,7 @@ No dependency on HAK_GAL_SUITE!
 
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import json
 import time
@@ -15,9 +15,10 @@ import time
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.ports.interfaces import FactRepository, ReasoningEngine
-from core.domain.entities import Fact, ReasoningResult
+from core.domain.entities import Fact, ReasoningResult, parse_statement
 from core.knowledge.k_assistant import get_k_assistant
 from core.reasoning.hrm_system import get_hrm_instance
+from core.reasoning.feedback_store import FeedbackStore
 import os
 
 class NativeFactRepository(FactRepository):
@@ -35,6 +36,13 @@ class NativeFactRepository(FactRepository):
         )
         return success
     
+    def save_many(self, facts: List[Fact]) -> List[bool]:
+        """Save several facts; True per fact that was newly added"""
+        results = []
+        for fact in facts:
+            results.append(not self.exists(fact.statement) and self.save(fact))
+        return results
+    
     def find_by_query(self, query: str, limit: int = 10) -> List[Fact]:
         """Search for facts"""
         results = self.k_assistant.search_facts(query, limit)
@@ -63,6 +71,47 @@ class NativeFactRepository(FactRepository):
             ))
         return facts
     
+    def find_after(self, after: Optional[int] = None, limit: int = 1000) -> List[Tuple[int, Fact]]:
+        """Cursor = position in the KAssistant fact list"""
+        start = 0 if after is None else after + 1
+        statements = self.k_assistant.get_all_facts(start + limit)[start:]
+        return [
+            (start + i, Fact(
+                statement=statement,
+                confidence=1.0,
+                context={'source': 'native'},
+                created_at=datetime.now()
+            ))
+            for i, statement in enumerate(statements)
+        ]
+    
+    def find_by_predicate(self, predicate: Optional[str], arg_pos: Optional[int] = None,
+                          value: Optional[str] = None, limit: int = 100) -> List[Fact]:
+        """Find facts by predicate/argument (keyword search + parse filter)"""
+        needle = f"{predicate}(" if predicate else (value or '')
+        if not needle:
+            return []
+        facts = []
+        for result in self.k_assistant.search_facts(needle, limit=self.count() or limit):
+            pred, args = parse_statement(result['statement'])
+            if predicate and pred != predicate:
+                continue
+            if value is not None:
+                if arg_pos is not None:
+                    if arg_pos >= len(args) or args[arg_pos] != value:
+                        continue
+                elif value not in args:
+                    continue
+            facts.append(Fact(
+                statement=result['statement'],
+                confidence=result.get('confidence', 1.0),
+                context={'source': 'native'},
+                created_at=datetime.now()
+            ))
+            if len(facts) >= limit:
+                break
+        return facts
+    
     def exists(self, statement: str) -> bool:
         """Check if fact exists"""
         results = self.k_assistant.search_facts(statement, limit=1)
@@ -91,32 +140,17 @@ class NativeReasoningEngine(ReasoningEngine):
         model_path = os.environ.get('HRM_MODEL_PATH') or 'models/hrm_model_v2.pth'
         self.hrm = get_hrm_instance(model_path)
         
-        # Initialize feedback data path
+        # Feedback-Daten im Speicher; Neu-Lesen nur bei geaenderter Datei (FeedbackStore)
         self.feedback_path = Path(__file__).parent.parent.parent / 'data' / 'hrm_feedback.json'
-        self.feedback_data = self._load_feedback_data()
+        self.feedback_store = FeedbackStore.from_env(self.feedback_path)
         
         # Cache for adjusted confidences
         self.confidence_cache = {}
         self.cache_ttl = 300  # 5 minutes TTL
     
-    def _load_feedback_data(self) -> Dict[str, Any]:
-        """Load feedback data from persistent storage"""
-        if self.feedback_path.exists():
-            try:
-                with open(self.feedback_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[WARNING] Failed to load feedback data: {e}")
-        return {'history': {}, 'adjustments': {}, 'statistics': {}, 'verified_queries': {}}
-    
-    def _save_feedback_data(self):
-        """Save feedback data to persistent storage"""
-        try:
-            self.feedback_path.parent.mkdir(exist_ok=True)
-            with open(self.feedback_path, 'w', encoding='utf-8') as f:
-                json.dump(self.feedback_data, f, indent=2)
-        except Exception as e:
-            print(f"[WARNING] Failed to save feedback data: {e}")
+    @property
+    def feedback_data(self) -> Dict[str, Any]:
+        return self.feedback_store.data
     
     def _apply_feedback_adjustment(self, query: str, base_confidence: float) -> float:
         """Apply feedback adjustments to confidence score"""
@@ -165,11 +199,19 @@ class NativeReasoningEngine(ReasoningEngine):
     
     def compute_confidence(self, query: str) -> Dict[str, Any]:
         """Compute confidence for a query with feedback adjustments"""
-        # Reload feedback data to get latest updates
-        self.feedback_data = self._load_feedback_data()
+        # Pick up feedback written since the last call (stat only, no re-parse)
+        self.feedback_store.refresh()
         
         # Get base confidence from HRM
-        result = self.hrm.reason(query)
+        return self._with_feedback(query, self.hrm.reason(query))
+    
+    def compute_confidence_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Batched HRM inference; feedback data is refreshed once per batch"""
+        self.feedback_store.refresh()
+        results = self.hrm.batch_reason(queries)
+        return [self._with_feedback(query, result) for query, result in zip(queries, results)]
+    
+    def _with_feedback(self, query: str, result: Dict[str, Any]) -> Dict[str, Any]:
         base_confidence = result.get('confidence', 0.5)
         
         # Apply feedback adjustments
@@ -197,48 +239,18 @@ class NativeReasoningEngine(ReasoningEngine):
     
     def apply_feedback(self, query: str, feedback_type: str, confidence_adjustment: float = 0.0):
         """Apply feedback to adjust future confidence scores"""
-        # Reload current data
-        self.feedback_data = self._load_feedback_data()
-        
-        # Initialize query history if not exists
-        if 'history' not in self.feedback_data:
-            self.feedback_data['history'] = {}
-        if query not in self.feedback_data['history']:
-            self.feedback_data['history'][query] = {
-                'positive_count': 0,
-                'negative_count': 0,
-                'last_feedback': None,
-                'confidence_adjustments': []
-            }
-        
-        # Update feedback counts
-        if feedback_type == 'positive':
-            self.feedback_data['history'][query]['positive_count'] += 1
-        elif feedback_type == 'negative':
-            self.feedback_data['history'][query]['negative_count'] += 1
-        
-        self.feedback_data['history'][query]['last_feedback'] = time.time()
-        
-        # Calculate and store adjustment
-        if 'adjustments' not in self.feedback_data:
-            self.feedback_data['adjustments'] = {}
-        
-        history = self.feedback_data['history'][query]
-        total_feedback = history['positive_count'] + history['negative_count']
-        if total_feedback > 0:
-            feedback_ratio = history['positive_count'] / total_feedback
-            self.feedback_data['adjustments'][query] = {
-                'base_adjustment': confidence_adjustment if confidence_adjustment != 0 else 0.06,
-                'feedback_ratio': feedback_ratio,
-                'updated_at': time.time()
-            }
-        
-        # Save updated feedback data
-        self._save_feedback_data()
+        # In-memory update plus one appended log line (periodic compaction)
+        self.feedback_store.record_feedback(query, feedback_type, confidence_adjustment)
         
         # Clear cache for this query
         if query in self.confidence_cache:
             del self.confidence_cache[query]
+        self.hrm.update_from_feedback(query, feedback_type)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Reasoning result cache counters (for /api/status)"""
+        cache = getattr(self.hrm, 'result_cache', None)
+        return cache.stats() if cache else {'enabled': False}
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get model information from HRM"""
@@ -246,6 +258,7 @@ class NativeReasoningEngine(ReasoningEngine):
         info['feedback_enabled'] = True
         info['feedback_queries'] = len(self.feedback_data.get('history', {}))
         info['verified_queries'] = len(self.feedback_data.get('verified_queries', {}))
+        info['feedback_store'] = self.feedback_store.stats()
         return info
     
     def retrain(self):
@@ -254,7 +267,7 @@ class NativeReasoningEngine(ReasoningEngine):
     
     def get_feedback_stats(self) -> Dict[str, Any]:
         """Get feedback statistics"""
-        self.feedback_data = self._load_feedback_data()
+        self.feedback_store.refresh()
         stats = self.feedback_data.get('statistics', {})
         
         return {
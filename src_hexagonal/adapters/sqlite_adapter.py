@@ -9,23 +9,98 @@ import os
 import json
 import sys
 import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Optional, Tuple
 from datetime import datetime
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.ports.interfaces import FactRepository
-from core.domain.entities import Fact
+from core.domain.entities import Fact, parse_statement
+from infrastructure.db_connection_pool import SQLiteConnectionPool
+
+# Performance PRAGMAs - applied once per connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # 2x faster, still safe
+    "PRAGMA cache_size=10000",     # 10MB cache
+    "PRAGMA temp_store=MEMORY",    # Memory for temp tables
+    "PRAGMA mmap_size=268435456",  # 256MB memory-mapped I/O
+)
+
+# FTS5 shadow index over facts.statement, kept in sync by triggers so that
+# every writer (this adapter, MCP server, governance engine) updates it.
+# The index stores its own copy of the statement and is joined back to facts
+# by statement, so rowid drift (e.g. after VACUUM) can never return wrong rows.
+FTS_TABLE = "facts_fts"
+FTS_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON facts BEGIN
+        INSERT OR REPLACE INTO {FTS_TABLE}(rowid, statement) VALUES (new.rowid, new.statement);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON facts BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF statement ON facts BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+        INSERT OR REPLACE INTO {FTS_TABLE}(rowid, statement) VALUES (new.rowid, new.statement);
+    END""",
+)
+
+# Structured predicate/argument index. Parsing needs Python, so triggers only
+# queue new/renamed statements in fact_struct_pending (every writer: MCP
+# server, governance engine, journal replay); the adapter indexes its own
+# writes directly and drains the queue before index reads. Deletes/renames
+# clean up the side tables in the triggers themselves.
+STRUCT_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS fact_predicates (
+        statement TEXT PRIMARY KEY,
+        predicate TEXT NOT NULL,
+        arity INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_fact_predicates_predicate ON fact_predicates(predicate, arity)",
+    """CREATE TABLE IF NOT EXISTS fact_args (
+        statement TEXT NOT NULL,
+        predicate TEXT NOT NULL,
+        pos INTEGER NOT NULL,
+        arg TEXT NOT NULL,
+        PRIMARY KEY (statement, pos)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_fact_args_pred_pos_arg ON fact_args(predicate, pos, arg)",
+    "CREATE INDEX IF NOT EXISTS idx_fact_args_arg ON fact_args(arg, predicate)",
+    """CREATE TABLE IF NOT EXISTS fact_struct_pending (
+        statement TEXT PRIMARY KEY
+    ) WITHOUT ROWID""",
+    # Ältere DBs haben ad/au ohne Queue-Pflege -> neu anlegen
+    "DROP TRIGGER IF EXISTS fact_struct_ad",
+    "DROP TRIGGER IF EXISTS fact_struct_au",
+    """CREATE TRIGGER IF NOT EXISTS fact_struct_ai AFTER INSERT ON facts BEGIN
+        INSERT OR IGNORE INTO fact_struct_pending (statement) VALUES (new.statement);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS fact_struct_ad AFTER DELETE ON facts BEGIN
+        DELETE FROM fact_predicates WHERE statement = old.statement;
+        DELETE FROM fact_args WHERE statement = old.statement;
+        DELETE FROM fact_struct_pending WHERE statement = old.statement;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS fact_struct_au AFTER UPDATE OF statement ON facts BEGIN
+        DELETE FROM fact_predicates WHERE statement = old.statement;
+        DELETE FROM fact_args WHERE statement = old.statement;
+        DELETE FROM fact_struct_pending WHERE statement = old.statement;
+        INSERT OR IGNORE INTO fact_struct_pending (statement) VALUES (new.statement);
+    END""",
+)
 
 class SQLiteFactRepository(FactRepository):
     """
     SQLite Implementation des FactRepository
     FIXED: Now handles natural language queries correctly
+
+    Connections are pooled by default (HAKGAL_SQLITE_POOL_SIZE, default 8);
+    pool_size=0 restores the old connect-per-call behaviour.
     """
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, pool_size: Optional[int] = None):
         if db_path is None:
             # Environment override (non-invasive): allows read-only URI or custom path per instance
             env_db = os.environ.get("HAKGAL_SQLITE_DB_PATH") or os.environ.get("SQLITE_DB_PATH")
@@ -56,11 +131,36 @@ class SQLiteFactRepository(FactRepository):
         # Track read-only mode explicitly to avoid DDL on RO databases
         self._readonly = readonly_flag or ("mode=ro" in self.db_path)
 
+        # Connection reuse: PRAGMAs once per connection instead of once per call
+        if pool_size is None:
+            try:
+                pool_size = int(os.environ.get("HAKGAL_SQLITE_POOL_SIZE", "8"))
+            except ValueError:
+                pool_size = 8
+        self._pool: Optional[SQLiteConnectionPool] = None
+        if pool_size > 0:
+            self._pool = SQLiteConnectionPool(
+                self.db_path,
+                pool_size=pool_size,
+                uri=bool(self._use_uri),
+                pragmas=SQLITE_PRAGMAS,
+            )
+
+        self._fts_enabled = False
+        self._fts_trigram = False
+        self._struct_enabled = False
         self._ensure_table()
         print(f"[SQLite] Using database: {self.db_path}")
         print(f"[SQLite] Facts count: {self.count()}")
 
     def _connect(self):
+        """Connection context: pooled if enabled, else a fresh sqlite3 connection."""
+        if self._pool is not None:
+            return self._pool.get_connection()
+        return self._connect_once()
+
+    @contextmanager
+    def _connect_once(self):
         """Create a sqlite3 connection, honoring URI mode when needed."""
         try:
             conn = sqlite3.connect(self.db_path, uri=bool(self._use_uri))
@@ -70,14 +170,28 @@ class SQLiteFactRepository(FactRepository):
         
         # Apply performance optimizations to every connection
         cursor = conn.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.execute("PRAGMA synchronous=NORMAL")  # 2x faster, still safe
-        cursor.execute("PRAGMA cache_size=10000")     # 10MB cache
-        cursor.execute("PRAGMA temp_store=MEMORY")    # Memory for temp tables
-        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
         conn.commit()
         
-        return conn
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool metrics (empty if pooling is disabled)."""
+        if self._pool is None:
+            return {'enabled': False}
+        stats = self._pool.stats()
+        stats['enabled'] = True
+        return stats
+
+    def close(self):
+        """Close pooled connections."""
+        if self._pool is not None:
+            self._pool.close_all()
     
     def _ensure_table(self):
         """Stelle sicher, dass Tabelle existiert; vermeide DDL in Read-Only-Modus."""
@@ -89,6 +203,8 @@ class SQLiteFactRepository(FactRepository):
                 # In RO-Mode: niemals DDL/Migrationen versuchen
                 if not exists:
                     print("[SQLite] Read-only mode detected and table 'facts' missing – skipping create/migration.")
+                self._detect_search_index(conn)
+                self._detect_structured_index(conn)
                 return
             if exists:
                 # Table exists, check columns
@@ -123,12 +239,165 @@ class SQLiteFactRepository(FactRepository):
                     )
                 ''')
                 conn.commit()
+
+            self._ensure_search_index(conn)
+            self._ensure_structured_index(conn)
+
+    def _detect_structured_index(self, conn):
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='fact_args'"
+        ).fetchone()
+        self._struct_enabled = bool(row)
+
+    def _ensure_structured_index(self, conn):
+        """Create predicate/argument side tables; one-shot backfill for existing DBs."""
+        for ddl in STRUCT_SCHEMA:
+            conn.execute(ddl)
+        conn.commit()
+        self._struct_enabled = True
+        self._backfill_structured_index(conn)
+
+    def _index_statements(self, conn, statements) -> int:
+        """Parse statements and write their predicate/argument rows."""
+        pred_rows = []
+        arg_rows = []
+        for statement in statements:
+            predicate, args = parse_statement(statement)
+            if not predicate:
+                continue
+            pred_rows.append((statement, predicate, len(args)))
+            arg_rows.extend((statement, predicate, pos, arg) for pos, arg in enumerate(args))
+        conn.executemany(
+            'INSERT OR REPLACE INTO fact_predicates (statement, predicate, arity) VALUES (?, ?, ?)',
+            pred_rows
+        )
+        conn.executemany(
+            'INSERT OR REPLACE INTO fact_args (statement, predicate, pos, arg) VALUES (?, ?, ?, ?)',
+            arg_rows
+        )
+        conn.executemany('DELETE FROM fact_struct_pending WHERE statement = ?', [(s,) for s in statements])
+        return len(pred_rows)
+
+    def _backfill_structured_index(self, conn, batch_size: int = 10000) -> int:
+        """Index facts that have no predicate row yet (new DBs, foreign writers)."""
+        cursor = conn.execute('''
+            SELECT f.statement FROM facts f
+            LEFT JOIN fact_predicates p ON p.statement = f.statement
+            WHERE p.statement IS NULL
+        ''')
+        missing = [row[0] for row in cursor]
+        if not missing:
+            return 0
+        print(f"[SQLite] Backfilling predicate/argument index for {len(missing)} facts...")
+        indexed = 0
+        for i in range(0, len(missing), batch_size):
+            indexed += self._index_statements(conn, missing[i:i + batch_size])
+            conn.commit()
+        return indexed
+
+    def _sync_structured_index(self, conn, batch_size: int = 10000) -> bool:
+        """Index statements queued by the triggers (foreign writers) before an index read.
+
+        Returns False if the side tables cannot be used (missing, or stale in read-only mode).
+        """
+        if not self._struct_enabled:
+            return False
+        try:
+            if conn.execute('SELECT 1 FROM fact_struct_pending LIMIT 1').fetchone() is None:
+                return True
+        except sqlite3.OperationalError:
+            # Read-only DB aus der Zeit vor der Queue: Verhalten wie bisher
+            return True
+        if self._readonly:
+            return False
+        try:
+            while True:
+                pending = [row[0] for row in conn.execute(
+                    'SELECT statement FROM fact_struct_pending LIMIT ?', (batch_size,)
+                )]
+                if not pending:
+                    return True
+                self._index_statements(conn, pending)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[SQLite] Structured index sync error: {e}")
+            return False
+
+    def backfill_structured_index(self) -> int:
+        """Index facts written by other processes (e.g. the MCP server)."""
+        if self._readonly or not self._struct_enabled:
+            return 0
+        try:
+            with self._connect() as conn:
+                return self._backfill_structured_index(conn)
+        except Exception as e:
+            print(f"[SQLite] Structured index backfill error: {e}")
+            return 0
+
+    def _detect_search_index(self, conn):
+        """Use an existing FTS index (read-only mode: never create one)."""
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (FTS_TABLE,)
+        ).fetchone()
+        self._fts_enabled = bool(row)
+        self._fts_trigram = bool(row) and 'trigram' in (row[0] or '').lower()
+
+    def _ensure_search_index(self, conn):
+        """Create the FTS5 index + triggers and backfill existing databases.
+
+        Prefers the trigram tokenizer (substring semantics like the old LIKE
+        search); falls back to unicode61 and finally to LIKE if FTS5 is missing.
+        """
+        self._detect_search_index(conn)
+        created = False
+        if not self._fts_enabled:
+            for tokenizer in ("trigram", "unicode61"):
+                try:
+                    conn.execute(
+                        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(statement, tokenize='{tokenizer}')"
+                    )
+                except sqlite3.OperationalError:
+                    continue
+                self._fts_enabled = True
+                self._fts_trigram = tokenizer == "trigram"
+                created = True
+                break
+            if not self._fts_enabled:
+                print("[SQLite] FTS5 not available - natural language search uses LIKE scans")
+                return
+        for trigger in FTS_TRIGGERS:
+            conn.execute(trigger)
+        conn.commit()
+
+        # Migration path: new index or drift between facts and index
+        indexed = conn.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}").fetchone()[0]
+        total = conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
+        if created or indexed != total:
+            print(f"[SQLite] Building search index ({total} facts, {indexed} indexed)...")
+            self._rebuild_search_index(conn)
+
+    def _rebuild_search_index(self, conn):
+        conn.execute(f"DELETE FROM {FTS_TABLE}")
+        conn.execute(f"INSERT INTO {FTS_TABLE}(rowid, statement) SELECT rowid, statement FROM facts")
+        conn.commit()
+
+    def rebuild_search_index(self) -> bool:
+        """Rebuild the full-text index from the facts table (e.g. after VACUUM)."""
+        if self._readonly or not self._fts_enabled:
+            return False
+        try:
+            with self._connect() as conn:
+                self._rebuild_search_index(conn)
+            return True
+        except Exception as e:
+            print(f"[SQLite] Search index rebuild error: {e}")
+            return False
     
     def save(self, fact: Fact) -> bool:
         """Speichere Fact in SQLite"""
         try:
             with self._connect() as conn:
-                conn.execute(
+                cur = conn.execute(
                     'INSERT OR IGNORE INTO facts (statement, context, fact_metadata, confidence) VALUES (?, ?, ?, ?)',
                     (
                         fact.statement,
@@ -137,12 +406,56 @@ class SQLiteFactRepository(FactRepository):
                         fact.confidence
                     )
                 )
+                if cur.rowcount and self._struct_enabled:
+                    self._index_statements(conn, [fact.statement])
                 conn.commit()
                 return True
         except Exception as e:
             print(f"[SQLite] Save error: {e}")
             return False
     
+    def save_many(self, facts: List[Fact]) -> List[bool]:
+        """Batch-Insert: eine Transaktion, ein executemany, Ergebnis pro Fact (True = neu).
+
+        BEGIN IMMEDIATE hält die Schreibsperre schon während der Existenzprüfung,
+        damit parallele Writer das Ergebnis nicht verfälschen.
+        """
+        if not facts:
+            return []
+        statements = [f.statement for f in facts]
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            existing: Set[str] = set()
+            for i in range(0, len(statements), 500):
+                chunk = statements[i:i + 500]
+                cursor = conn.execute(
+                    f'SELECT statement FROM facts WHERE statement IN ({",".join("?" * len(chunk))})',
+                    chunk
+                )
+                existing.update(row[0] for row in cursor)
+
+            inserted: List[bool] = []
+            rows = []
+            for fact in facts:
+                is_new = fact.statement not in existing
+                inserted.append(is_new)
+                if is_new:
+                    existing.add(fact.statement)
+                    rows.append((
+                        fact.statement,
+                        json.dumps(fact.context if fact.context else {}),
+                        json.dumps(fact.metadata if fact.metadata else {}),
+                        fact.confidence
+                    ))
+            conn.executemany(
+                'INSERT OR IGNORE INTO facts (statement, context, fact_metadata, confidence) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            if self._struct_enabled:
+                self._index_statements(conn, [row[0] for row in rows])
+            conn.commit()
+        return inserted
+    
     def _extract_keywords(self, query: str) -> Set[str]:
         """Extract meaningful keywords from natural language query"""
         # Convert to lowercase
@@ -217,15 +530,9 @@ class SQLiteFactRepository(FactRepository):
                     
                     # Then search for similar predicates
                     if len(facts) < limit:
-                        cursor = conn.execute(
-                            '''SELECT statement, confidence FROM facts 
-                               WHERE statement LIKE ? 
-                               AND (statement LIKE ? OR statement LIKE ?)
-                               LIMIT ?''',
-                            (f'{predicate}(%', f'%{entity1}%', f'%{entity2}%', limit - len(facts))
-                        )
-                        for row in cursor:
-                            if row[0] not in seen_statements:
+                        rows = self._search_similar(conn, predicate, entity1, entity2, limit)
+                        for row in rows:
+                            if row[0] not in seen_statements and len(facts) < limit:
                                 facts.append(Fact(
                                     statement=row[0],
                                     context={},
@@ -239,46 +546,39 @@ class SQLiteFactRepository(FactRepository):
                     keywords = self._extract_keywords(query)
                     
                     if keywords:
-                        # Build dynamic SQL with OR conditions for all keywords
-                        conditions = []
-                        params = []
-                        
-                        for keyword in list(keywords)[:10]:  # Limit to 10 keywords
-                            conditions.append('statement LIKE ?')
-                            params.append(f'%{keyword}%')
+                        if self._fts_enabled:
+                            rows = self._search_fts(conn, keywords, limit)
+                        else:
+                            rows = self._search_like(conn, keywords, limit)
                         
-                        # Query with all keyword conditions joined by OR
-                        sql_query = f'''
-                            SELECT statement, confidence,
-                                   (CASE 
-                                    WHEN statement LIKE '%Consciousness%' AND statement LIKE '%AI%' THEN 1.0
-                                    WHEN statement LIKE '%LSD%' AND statement LIKE '%Chemical%' THEN 1.0
-                                    ELSE 0.8
-                                   END) as relevance
-                            FROM facts 
-                            WHERE {' OR '.join(conditions)}
-                            ORDER BY relevance DESC, confidence DESC
-                            LIMIT ?
-                        '''
-                        
-                        params.append(limit)
-                        
-                        cursor = conn.execute(sql_query, params)
-                        
-                        for row in cursor:
-                            if row[0] not in seen_statements:
+                        for statement, confidence, relevance in rows:
+                            if statement not in seen_statements:
                                 facts.append(Fact(
-                                    statement=row[0],
-                                    context={'relevance': row[2] if len(row) > 2 else 0.8},
+                                    statement=statement,
+                                    context={'relevance': relevance},
                                     metadata={},
-                                    confidence=row[1] if row[1] is not None else 1.0
+                                    confidence=confidence if confidence is not None else 1.0
                                 ))
-                                seen_statements.add(row[0])
+                                seen_statements.add(statement)
                     
                     # Fallback: if no keywords or no results, try partial match on whole query
                     if len(facts) == 0 and len(query) > 5:
                         # Try to find facts with any word from the query
                         words = query.split()
+                        if self._fts_enabled:
+                            # Same words through the index instead of one LIKE scan per word
+                            words = [w for w in words if len(w) > 3]
+                            rows = self._search_fts(conn, set(words), limit) if words else []
+                            for statement, confidence, _ in rows:
+                                if statement not in seen_statements:
+                                    facts.append(Fact(
+                                        statement=statement,
+                                        context={},
+                                        metadata={},
+                                        confidence=confidence if confidence is not None else 0.7
+                                    ))
+                                    seen_statements.add(statement)
+                            words = []
                         for word in words:
                             if len(word) > 3 and len(facts) < limit:
                                 cursor = conn.execute(
@@ -310,6 +610,94 @@ class SQLiteFactRepository(FactRepository):
         
         return facts
     
+    def _search_similar(self, conn, predicate: str, entity1: str, entity2: str, limit: int) -> List[tuple]:
+        """Facts with the same predicate mentioning entity1 or entity2.
+
+        Exact arguments via the predicate/argument index, then substring hits via
+        FTS restricted to the predicate; LIKE scan only without side tables.
+        """
+        if not self._sync_structured_index(conn):
+            cursor = conn.execute(
+                '''SELECT statement, confidence FROM facts 
+                   WHERE statement LIKE ? 
+                   AND (statement LIKE ? OR statement LIKE ?)
+                   LIMIT ?''',
+                (f'{predicate}(%', f'%{entity1}%', f'%{entity2}%', limit)
+            )
+            return cursor.fetchall()
+
+        rows = conn.execute(
+            '''SELECT DISTINCT f.statement, f.confidence
+               FROM fact_args a
+               JOIN facts f ON f.statement = a.statement
+               WHERE a.arg IN (?, ?) AND a.predicate = ?
+               LIMIT ?''',
+            (entity1, entity2, predicate, limit)
+        ).fetchall()
+        if len(rows) < limit and self._fts_enabled:
+            match = self._fts_match_expression({entity1, entity2})
+            if match:
+                rows += conn.execute(
+                    f'''SELECT f.statement, f.confidence
+                       FROM {FTS_TABLE}
+                       JOIN fact_predicates p ON p.statement = {FTS_TABLE}.statement
+                       JOIN facts f ON f.statement = p.statement
+                       WHERE {FTS_TABLE} MATCH ? AND p.predicate = ?
+                       LIMIT ?''',
+                    (match, predicate, limit)
+                ).fetchall()
+        return rows
+
+    def _fts_match_expression(self, keywords: Set[str]) -> str:
+        """OR-query over keywords; trigram matches substrings (min. 3 chars)."""
+        terms = sorted({kw.lower() for kw in keywords})
+        if self._fts_trigram:
+            return ' OR '.join('"%s"' % t.replace('"', '""') for t in terms if len(t) >= 3)
+        return ' OR '.join('"%s"*' % t.replace('"', '""') for t in terms)
+
+    def _search_fts(self, conn, keywords: Set[str], limit: int) -> List[tuple]:
+        """BM25-ranked search over the FTS index -> (statement, confidence, relevance)."""
+        match = self._fts_match_expression(keywords)
+        if not match:
+            return []
+        cursor = conn.execute(
+            f'''
+            SELECT f.statement, f.confidence, bm25({FTS_TABLE}) AS score
+            FROM {FTS_TABLE}
+            JOIN facts f ON f.statement = {FTS_TABLE}.statement
+            WHERE {FTS_TABLE} MATCH ?
+            ORDER BY score, f.confidence DESC
+            LIMIT ?
+            ''',
+            (match, limit)
+        )
+        rows = cursor.fetchall()
+        # bm25() is negative (lower = better); normalize so the best hit is 1.0
+        best = rows[0][2] if rows else 0.0
+        return [
+            (row[0], row[1], round(row[2] / best, 3) if best else 1.0)
+            for row in rows
+        ]
+
+    def _search_like(self, conn, keywords: Set[str], limit: int) -> List[tuple]:
+        """Fallback without FTS5: OR-joined LIKE scan over up to 10 keywords."""
+        conditions = []
+        params = []
+        for keyword in list(keywords)[:10]:  # Limit to 10 keywords
+            conditions.append('statement LIKE ?')
+            params.append(f'%{keyword}%')
+        params.append(limit)
+        cursor = conn.execute(
+            f'''
+            SELECT statement, confidence FROM facts
+            WHERE {' OR '.join(conditions)}
+            ORDER BY confidence DESC
+            LIMIT ?
+            ''',
+            params
+        )
+        return [(row[0], row[1], 0.8) for row in cursor]
+    
     def find_all(self, limit: int = 100) -> List[Fact]:
         """Hole alle Facts"""
         facts = []
@@ -368,6 +756,26 @@ class SQLiteFactRepository(FactRepository):
             print(f"[SQLite] Page error: {e}")
         return facts
     
+    def find_after(self, after: Optional[int] = None, limit: int = 1000) -> List[Tuple[int, Fact]]:
+        """Keyset-Pagination über rowid: O(limit) statt O(offset)."""
+        page: List[Tuple[int, Fact]] = []
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    'SELECT rowid, statement, confidence FROM facts WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                    (after if after is not None else -1, limit)
+                )
+                for row in cursor:
+                    page.append((row[0], Fact(
+                        statement=row[1],
+                        context={},
+                        metadata={},
+                        confidence=row[2] if row[2] is not None else 1.0
+                    )))
+        except Exception as e:
+            print(f"[SQLite] Keyset page error: {e}")
+        return page
+    
     def exists(self, statement: str) -> bool:
         """Prüfe ob Fact existiert"""
         try:
@@ -400,17 +808,20 @@ class SQLiteFactRepository(FactRepository):
             return 0
         added = 0
         try:
+            normalized = [s if s.endswith('.') else s + '.' for s in statements]
             with self._connect() as conn:
                 cur = conn.cursor()
                 cur.executemany(
                     'INSERT OR IGNORE INTO facts (statement, context, fact_metadata) VALUES (?, "{}", "{}")',
-                    [(s if s.endswith('.') else s + '.',) for s in statements]
+                    [(s,) for s in normalized]
                 )
-                conn.commit()
                 try:
                     added = cur.rowcount if cur.rowcount is not None else 0
                 except Exception:
                     added = 0
+                if self._struct_enabled:
+                    self._index_statements(conn, normalized)
+                conn.commit()
         except Exception as e:
             print(f"[SQLite] Bulk insert error: {e}")
         return max(0, added)
@@ -427,28 +838,108 @@ class SQLiteFactRepository(FactRepository):
         return out
 
     def predicate_counts(self, sample_limit: int = 5000) -> List[tuple]:
-        """Zähle Prädikate im Sample (SQL-basiert) und liefere (predicate, count)."""
+        """Zähle Prädikate und liefere (predicate, count).
+
+        Mit Prädikat-Index exakt über die ganze KB; sonst per substr/instr im Sample.
+        """
         items: List[tuple] = []
         try:
             with self._connect() as conn:
-                # SQLite: substr(statement,1,instr(statement,'(')-1) extrahiert das Prädikat
-                cur = conn.execute(
-                    """
-                    SELECT pred, COUNT(*) as cnt FROM (
-                        SELECT substr(statement, 1, instr(statement,'(')-1) as pred
-                        FROM facts
-                        LIMIT ?
+                if self._sync_structured_index(conn):
+                    cur = conn.execute(
+                        """
+                        SELECT predicate, COUNT(*) as cnt FROM fact_predicates
+                        GROUP BY predicate
+                        ORDER BY cnt DESC
+                        """
+                    )
+                else:
+                    # SQLite: substr(statement,1,instr(statement,'(')-1) extrahiert das Prädikat
+                    cur = conn.execute(
+                        """
+                        SELECT pred, COUNT(*) as cnt FROM (
+                            SELECT substr(statement, 1, instr(statement,'(')-1) as pred
+                            FROM facts
+                            LIMIT ?
+                        )
+                        GROUP BY pred
+                        ORDER BY cnt DESC
+                        """,
+                        (sample_limit,)
                     )
-                    GROUP BY pred
-                    ORDER BY cnt DESC
-                    """,
-                    (sample_limit,)
-                )
                 items = [(row[0], int(row[1])) for row in cur if row[0]]
         except Exception as e:
             print(f"[SQLite] predicate_counts error: {e}")
         return items
 
+    def find_by_predicate(self, predicate: Optional[str], arg_pos: Optional[int] = None,
+                          value: Optional[str] = None, limit: int = 100) -> List[Fact]:
+        """Index-Lookup nach Prädikat, Subjekt (arg_pos=0), Objekt (arg_pos=1) oder Argument."""
+        if not predicate and value is None:
+            return []
+        conditions = []
+        params: List[Any] = []
+        if value is not None:
+            source = 'fact_args a'
+            conditions.append('a.arg = ?')
+            params.append(value)
+            if arg_pos is not None:
+                conditions.append('a.pos = ?')
+                params.append(int(arg_pos))
+            if predicate:
+                conditions.append('a.predicate = ?')
+                params.append(predicate)
+        else:
+            source = 'fact_predicates a'
+            conditions.append('a.predicate = ?')
+            params.append(predicate)
+        params.append(limit)
+
+        facts: List[Fact] = []
+        try:
+            with self._connect() as conn:
+                if self._sync_structured_index(conn):
+                    cursor = conn.execute(
+                        f'''
+                        SELECT DISTINCT f.statement, f.confidence
+                        FROM {source}
+                        JOIN facts f ON f.statement = a.statement
+                        WHERE {' AND '.join(conditions)}
+                        LIMIT ?
+                        ''',
+                        params
+                    )
+                    rows = cursor.fetchall()
+                else:
+                    # Read-only DB without side tables: scan and parse
+                    like = f'{predicate}(%' if predicate else '%'
+                    rows = []
+                    for statement, confidence in conn.execute(
+                        'SELECT statement, confidence FROM facts WHERE statement LIKE ?', (like,)
+                    ):
+                        pred, args = parse_statement(statement)
+                        if predicate and pred != predicate:
+                            continue
+                        if value is not None:
+                            if arg_pos is not None:
+                                if arg_pos >= len(args) or args[arg_pos] != value:
+                                    continue
+                            elif value not in args:
+                                continue
+                        rows.append((statement, confidence))
+                        if len(rows) >= limit:
+                            break
+                for row in rows:
+                    facts.append(Fact(
+                        statement=row[0],
+                        context={},
+                        metadata={},
+                        confidence=row[1] if row[1] is not None else 1.0
+                    ))
+        except Exception as e:
+            print(f"[SQLite] find_by_predicate error: {e}")
+        return facts
+
     def delete_by_statement(self, statement: str) -> int:
         """Lösche exakt passendes Statement."""
         try:
@@ -468,6 +959,8 @@ class SQLiteFactRepository(FactRepository):
                     'UPDATE facts SET statement = ? WHERE statement = ?',
                     (new_statement, old_statement)
                 )
+                if cur.rowcount and self._struct_enabled:
+                    self._index_statements(conn, [new_statement])
                 conn.commit()
                 return cur.rowcount or 0
         except Exception as e:
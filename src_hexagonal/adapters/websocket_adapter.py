@@ -302,6 +302,23 @@ class WebSocketAdapter:
         # Update with REAL metrics
         self._emit_real_metrics()
     
+    def emit_facts_batch_added(self, added: int, total: int):
+        """Emit one summary event for a batch insert (instead of one per fact)"""
+        event = {
+            'added': added,
+            'total': total,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        try:
+            self.socketio.emit('facts_batch_added', event, to=None)
+        except ConnectionAbortedError:
+            print("Client disconnected during facts_batch_added emit.")
+        except Exception as e:
+            print(f"Error emitting facts_batch_added: {e}")
+        
+        self._emit_real_metrics()
+    
     def emit_reasoning_complete(self, query: str, confidence: float, duration_ms: float):
         """Emit event when reasoning completes"""
         event = {
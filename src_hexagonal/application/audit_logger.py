@@ -4,18 +4,204 @@ Hardened AuditLogger - No silent failures, guaranteed persistence
 
 from __future__ import annotations
 
+import atexit
 import json
 import hashlib
 import threading
 import os
 import logging
+import time
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
+def read_last_lines(path, count: int = 1, block_size: int = 8192) -> List[bytes]:
+    """Read the last `count` non-empty lines by seeking backwards from EOF.
+
+    Cost is proportional to the size of those lines, not of the file.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            # The first line of `data` may be cut off unless we reached BOF
+            lines = [line for line in data.splitlines() if line.strip()]
+            if len(lines) > count or (pos == 0 and lines):
+                return lines[-count:]
+        return []
+
+
+class AuditGroupWriter:
+    """
+    Group-commit writer for an append-only JSONL audit file.
+
+    Callers enqueue already hash-chained lines; a background thread writes
+    everything that is pending in one write() and makes it durable with a
+    single fsync. Each submit() returns a Future that resolves once the line
+    is on disk (or carries the IOError). Line order equals submit order.
+
+    commit_interval > 0 additionally waits that long before each batch to
+    collect more entries; HAKGAL_AUDIT_GROUP_COMMIT=0 restores the legacy
+    write+fsync per entry inline in the caller.
+    """
+
+    def __init__(self,
+                 path,
+                 commit_interval: float = 0.0,
+                 max_batch: int = 1024,
+                 group_commit: Optional[bool] = None) -> None:
+        self.path = Path(path)
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        if group_commit is None:
+            group_commit = os.environ.get('HAKGAL_AUDIT_GROUP_COMMIT', '1').lower() not in ('0', 'false', 'no')
+        self.group_commit = group_commit
+        self._cond = threading.Condition()
+        self._pending: List = []
+        self._last_future: Optional[Future] = None
+        self._failure: Optional[Exception] = None
+        self._closed = False
+        self._file = None
+        self._thread = None
+        self._stats = {'entries': 0, 'batches': 0, 'fsyncs': 0, 'max_batch_size': 0, 'fsync_time_total_ms': 0.0}
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open('ab')
+        return self._file
+
+    def _write_batch(self, lines: List[str]):
+        f = self._open()
+        f.write(''.join(line + '\n' for line in lines).encode('utf-8'))
+        f.flush()
+        started = time.perf_counter()
+        os.fsync(f.fileno())
+        stats = self._stats
+        stats['fsync_time_total_ms'] += (time.perf_counter() - started) * 1000
+        stats['entries'] += len(lines)
+        stats['batches'] += 1
+        stats['fsyncs'] += 1
+        stats['max_batch_size'] = max(stats['max_batch_size'], len(lines))
+
+    def submit(self, line: str) -> Future:
+        """Queue one JSON line; the Future resolves to True once it is durable."""
+        future = Future()
+        with self._cond:
+            if self._failure is not None:
+                raise IOError(f"Audit writer failed earlier: {self._failure}")
+            if self._closed:
+                raise IOError("Audit writer is closed")
+            if not self.group_commit:
+                try:
+                    self._write_batch([line])
+                except Exception as e:
+                    self._fail(e)
+                    raise
+                future.set_result(True)
+                return future
+            self._pending.append((line, future))
+            self._last_future = future
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='audit-group-commit', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _fail(self, error: Exception):
+        self._failure = error
+        logger.critical(f"Audit group commit failed: {error}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+            if self.commit_interval > 0:
+                time.sleep(self.commit_interval)
+            with self._cond:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            try:
+                self._write_batch([line for line, _ in batch])
+            except Exception as e:
+                with self._cond:
+                    self._fail(e)
+                    batch.extend(self._pending)
+                    self._pending = []
+                for _, future in batch:
+                    future.set_exception(IOError(f"Audit write failed: {e}"))
+                continue
+            for _, future in batch:
+                future.set_result(True)
+            with self._cond:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is durable."""
+        future = self._last_future
+        if future is None:
+            return self._failure is None
+        try:
+            # Batches complete in submit order, so the newest future covers all
+            future.result(timeout)
+        except Exception:
+            return False
+        return True
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['avg_batch_size'] = round(stats['entries'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['pending'] = len(self._pending)
+        stats['group_commit'] = self.group_commit
+        stats['failed'] = self._failure is not None
+        return stats
+
+
+_group_writers: Dict[str, AuditGroupWriter] = {}
+_group_writers_lock = threading.Lock()
+
+
+def get_group_writer(path, **kwargs) -> AuditGroupWriter:
+    """One writer (file handle + commit thread) per audit file and process"""
+    key = str(Path(path).resolve())
+    with _group_writers_lock:
+        writer = _group_writers.get(key)
+        if writer is None or writer._closed:
+            writer = _group_writers[key] = AuditGroupWriter(key, **kwargs)
+        return writer
+
+
+@atexit.register
+def _close_group_writers():
+    for writer in list(_group_writers.values()):
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
 class HardenedAuditLogger:
     """
     Hardened append-only JSONL audit logger with hash chaining.
@@ -31,6 +217,7 @@ class HardenedAuditLogger:
         self._last_hash = None
         self._lock = threading.Lock()
         self.kill_switch = kill_switch
+        self.writer = get_group_writer(self.path)
         
         # Initialize or load existing chain
         if not self._init_chain():
@@ -96,29 +283,12 @@ class HardenedAuditLogger:
     def _get_last_entry(self) -> Optional[Dict[str, Any]]:
         """Get the last entry from the audit log"""
         try:
-            with self.path.open('rb') as f:
-                # Seek to end and read backwards
-                f.seek(0, 2)
-                end = f.tell()
-                
-                if end == 0:
-                    return None
-                
-                # Read last 4KB or entire file if smaller
-                chunk_size = min(4096, end)
-                f.seek(max(0, end - chunk_size))
-                chunk = f.read()
-                
-                # Find last complete line
-                lines = chunk.splitlines()
-                for line in reversed(lines):
-                    if line.strip():
-                        try:
-                            return json.loads(line.decode('utf-8'))
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            continue
-                
-                return None
+            for line in reversed(read_last_lines(self.path, 3)):
+                try:
+                    return json.loads(line.decode('utf-8'))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+            return None
                 
         except IOError as e:
             logger.error(f"Failed to read last entry: {e}")
@@ -128,14 +298,12 @@ class HardenedAuditLogger:
         """Verify the integrity of recent entries"""
         try:
             entries = []
-            with self.path.open('r', encoding='utf-8') as f:
-                # Read last N entries
-                for line in f:
-                    if line.strip():
-                        try:
-                            entries.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            continue
+            # Read last N entries from the end of the file
+            for line in read_last_lines(self.path, num_entries):
+                try:
+                    entries.append(json.loads(line.decode('utf-8')))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
             
             if not entries:
                 return False
@@ -188,6 +356,19 @@ class HardenedAuditLogger:
         Returns the entry hash or raises an exception.
         NEVER fails silently.
         """
+        future = self.log_async(event, payload)
+        try:
+            return future.result()
+        except IOError as e:
+            self._handle_failure(f"Critical audit write failure: {e}", e)
+        except Exception as e:
+            self._handle_failure(f"Unexpected audit failure: {e}", e)
+
+    def log_async(self, event: str, payload: Dict[str, Any]) -> Future:
+        """
+        Chain and enqueue an entry without waiting for the fsync.
+        The returned Future resolves to the entry hash once it is durable.
+        """
         if not event:
             raise ValueError("Event cannot be empty")
         
@@ -208,62 +389,62 @@ class HardenedAuditLogger:
                     'entry_hash': entry_hash
                 }
                 
-                # Persist with guaranteed write
+                # Enqueue under the chain lock so file order == chain order
                 line = json.dumps(entry, ensure_ascii=False)
-                
-                with self.path.open('a', encoding='utf-8') as f:
-                    f.write(line + '\n')
-                    f.flush()
-                    # Force write to disk
-                    os.fsync(f.fileno())
-                
-                # Update state only after successful write
+                written = self.writer.submit(line)
                 self._last_hash = entry_hash
                 
-                logger.debug(f"Logged event: {event}, hash={entry_hash[:8]}...")
-                return entry_hash
-                
             except IOError as e:
-                error_msg = f"Critical audit write failure: {e}"
-                logger.critical(error_msg)
-                
-                # Trigger emergency shutdown
-                if self.kill_switch:
-                    self.kill_switch.activate(
-                        reason=error_msg, 
-                        severity="CRITICAL"
-                    )
-                
-                # Try to alert monitoring
-                try:
-                    import sentry_sdk
-                    sentry_sdk.capture_message(
-                        f"AUDIT FAILURE: {error_msg}", 
-                        level="fatal"
-                    )
-                except ImportError:
-                    pass
-                
-                # Never fail silently
-                raise RuntimeError(error_msg) from e
-                
+                self._handle_failure(f"Critical audit write failure: {e}", e)
             except Exception as e:
-                error_msg = f"Unexpected audit failure: {e}"
-                logger.critical(error_msg)
-                
-                if self.kill_switch:
-                    self.kill_switch.activate(
-                        reason=error_msg, 
-                        severity="CRITICAL"
-                    )
-                
-                raise RuntimeError(error_msg) from e
+                self._handle_failure(f"Unexpected audit failure: {e}", e)
+        
+        result = Future()
+        
+        def _done(f):
+            error = f.exception()
+            if error is not None:
+                result.set_exception(error)
+            else:
+                logger.debug(f"Logged event: {event}, hash={entry_hash[:8]}...")
+                result.set_result(entry_hash)
+        
+        written.add_done_callback(_done)
+        return result
+
+    def _handle_failure(self, error_msg: str, error: Exception):
+        logger.critical(error_msg)
+        
+        # Trigger emergency shutdown
+        if self.kill_switch:
+            self.kill_switch.activate(
+                reason=error_msg, 
+                severity="CRITICAL"
+            )
+        
+        # Try to alert monitoring
+        try:
+            import sentry_sdk
+            sentry_sdk.capture_message(
+                f"AUDIT FAILURE: {error_msg}", 
+                level="fatal"
+            )
+        except ImportError:
+            pass
+        
+        # Never fail silently
+        raise RuntimeError(error_msg) from error
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued entries are on disk"""
+        return self.writer.flush(timeout)
     
     def verify_integrity(self, full_check: bool = False) -> bool:
         """
         Verify the integrity of the audit chain.
         full_check=True checks entire chain (slow for large logs).
         """
+        self.flush()
         with self._lock:
             try:
                 if full_check:
@@ -324,6 +505,7 @@ class HardenedAuditLogger:
     def get_stats(self) -> Dict[str, Any]:
         """Get audit log statistics"""
         try:
+            self.flush()
             line_count = 0
             file_size = self.path.stat().st_size
             
@@ -336,7 +518,8 @@ class HardenedAuditLogger:
                 'size_bytes': file_size,
                 'path': str(self.path),
                 'last_hash': self._last_hash[:8] + '...' if self._last_hash else None,
-                'integrity': self.verify_integrity(full_check=False)
+                'integrity': self.verify_integrity(full_check=False),
+                'writer': self.writer.stats()
             }
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
@@ -4,7 +4,7 @@ Application Services - Use Case Implementierungen
 Nach HAK/GAL Verfassung: Orchestriert Domain Logic und Ports
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -16,7 +16,7 @@ from core.ports.interfaces import (
     ReasoningEngine,
     LLMProvider
 )
-from core.domain.entities import Fact, Query, ReasoningResult
+from core.domain.entities import Fact, Query, ReasoningResult, parse_statement
 
 class FactManagementService(FactManagementUseCase):
     """
@@ -37,10 +37,6 @@ class FactManagementService(FactManagementUseCase):
         if not statement.endswith('.'):
             statement = statement + '.'
         
-        # Prüfe ob bereits existiert (idempotent)
-        if self.repository.exists(statement):
-            return False, "Fact already exists"
-        
         # Erstelle Domain Entity
         fact = Fact(
             statement=statement,
@@ -52,13 +48,72 @@ class FactManagementService(FactManagementUseCase):
         if not fact.is_valid():
             return False, "Invalid fact format"
         
-        # Speichere über Repository
-        success = self.repository.save(fact)
+        # Existenzprüfung + Insert in einer Transaktion (idempotent)
+        try:
+            inserted = self.repository.save_many([fact])
+        except Exception as e:
+            print(f"[FactService] Save error: {e}")
+            return False, "Failed to save fact"
         
-        if success:
+        if inserted and inserted[0]:
             return True, f"Fact added: {statement}"
         else:
-            return False, "Failed to save fact"
+            return False, "Fact already exists"
+    
+    def add_facts(self, batch: List[Any], context: Dict = None) -> List[Dict[str, Any]]:
+        """Batch-Use-Case: ganzen Batch validieren, im Batch deduplizieren,
+        in einer Transaktion speichern und Ergebnis pro Item liefern.
+        
+        Items sind Statement-Strings oder Dicts mit 'statement'
+        (optional 'context', 'confidence').
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        pending: List[tuple] = []
+        first_index: Dict[str, int] = {}
+        
+        for i, item in enumerate(batch):
+            item_context = context or {}
+            confidence = 1.0
+            if isinstance(item, dict):
+                statement = item.get('statement')
+                item_context = item.get('context') or item_context
+                confidence = item.get('confidence', 1.0)
+            else:
+                statement = item
+            statement = statement.strip() if isinstance(statement, str) else ''
+            if statement and not statement.endswith('.'):
+                statement = statement + '.'
+            
+            predicate, _ = parse_statement(statement)
+            if not statement or predicate is None or not isinstance(confidence, (int, float)):
+                results[i] = {'statement': statement, 'success': False,
+                              'status': 'invalid', 'message': 'Invalid fact format'}
+                continue
+            if statement in first_index:
+                results[i] = {'statement': statement, 'success': False, 'status': 'duplicate',
+                              'message': f'Duplicate of item {first_index[statement]} in batch'}
+                continue
+            first_index[statement] = i
+            pending.append((i, Fact(statement=statement, context=item_context, confidence=float(confidence))))
+        
+        if pending:
+            try:
+                inserted = self.repository.save_many([fact for _, fact in pending])
+            except Exception as e:
+                print(f"[FactService] Batch save error: {e}")
+                inserted = None
+            for pos, (i, fact) in enumerate(pending):
+                if inserted is None:
+                    results[i] = {'statement': fact.statement, 'success': False,
+                                  'status': 'error', 'message': 'Failed to save fact'}
+                elif inserted[pos]:
+                    results[i] = {'statement': fact.statement, 'success': True,
+                                  'status': 'added', 'message': 'Fact added'}
+                else:
+                    results[i] = {'statement': fact.statement, 'success': False,
+                                  'status': 'exists', 'message': 'Fact already exists'}
+        
+        return results
     
     def search_facts(self, query: Query) -> List[Fact]:
         """Suche Facts mit Query"""
@@ -71,6 +126,27 @@ class FactManagementService(FactManagementUseCase):
         """Hole alle Facts"""
         return self.repository.find_all(limit)
     
+    def get_facts_page(self, after: Optional[int] = None, limit: int = 100) -> List[Tuple[int, Fact]]:
+        """Keyset-Seite: (cursor, Fact)-Paare nach dem Cursor `after`"""
+        return self.repository.find_after(after, limit)
+    
+    def iter_facts(self, after: Optional[int] = None, limit: Optional[int] = None,
+                   chunk_size: int = 1000) -> Iterator[Tuple[int, Fact]]:
+        """Streame Facts chunkweise (konstanter Speicher, fortsetzbar über den Cursor)"""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            page = self.repository.find_after(after, size)
+            if not page:
+                return
+            for item in page:
+                yield item
+            after = page[-1][0]
+            if remaining is not None:
+                remaining -= len(page)
+            if len(page) < size:
+                return
+    
     def get_system_status(self) -> Dict[str, Any]:
         """System Status mit Metriken"""
         fact_count = self.repository.count()
@@ -111,8 +187,14 @@ class ReasoningService(ReasoningUseCase):
         """Führe Reasoning aus mit Device Info und Feedback Support"""
         
         # Nutze Reasoning Engine
-        result = self.engine.compute_confidence(query)
-        
+        return self._to_result(query, self.engine.compute_confidence(query))
+    
+    def reason_batch(self, queries: List[str]) -> List[ReasoningResult]:
+        """Reasoning für viele Queries mit einem gebatchten Engine-Aufruf"""
+        results = self.engine.compute_confidence_batch(queries)
+        return [self._to_result(query, result) for query, result in zip(queries, results)]
+    
+    def _to_result(self, query: str, result: Dict[str, Any]) -> ReasoningResult:
         # Map zu Domain Entity
         confidence = result.get('confidence', 0.0)
         base_confidence = result.get('base_confidence', confidence)
@@ -4,6 +4,7 @@ Implements 2PC (Two-Phase Commit) for atomic governance checks and database writ
 """
 
 import os
+import copy
 import sqlite3
 import hashlib
 import json
@@ -15,8 +16,12 @@ from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple, Any
 from enum import Enum
+from collections import OrderedDict
+from concurrent.futures import Future
 import traceback
 
+from .audit_logger import get_group_writer, read_last_lines
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -194,39 +199,69 @@ VALID_PREDICATES = {
 # ============================================================================
 
 class StrictAuditLogger:
-    """Audit logger with guaranteed persistence and kill switch on failure"""
+    """Audit logger with guaranteed persistence and kill switch on failure.
+
+    Entries are hash-chained under the lock and handed to a shared
+    AuditGroupWriter, which fsyncs whole batches; log() still returns only
+    once the entry is durable, log_async() returns the durability Future.
+    """
     
-    def __init__(self, audit_file: str = "audit_log.jsonl"):
+    def __init__(self, audit_file: str = "audit_log.jsonl", commit_interval: float = 0.0):
         self.audit_file = audit_file
         self._lock = threading.Lock()
         self._last_hash = self._load_last_hash()
+        self.writer = get_group_writer(audit_file, commit_interval=commit_interval)
         
     def _load_last_hash(self) -> str:
-        """Load the hash of the last audit entry"""
+        """Load the hash of the last audit entry (seeks from the end of the file)"""
         try:
-            with open(self.audit_file, 'r') as f:
-                lines = f.readlines()
-                if lines:
-                    last_entry = json.loads(lines[-1])
-                    return last_entry.get('entry_hash', '')
+            lines = read_last_lines(self.audit_file, 1)
+            if lines:
+                last_entry = json.loads(lines[-1])
+                return last_entry.get('entry_hash', '')
         except FileNotFoundError:
             pass
         return hashlib.sha256(b'genesis').hexdigest()
     
     def log(self, event: str, payload: Dict) -> str:
         """Log with guaranteed persistence or explicit failure"""
-        entry = self._create_entry(event, payload)
-        
+        future = self.log_async(event, payload)
+        try:
+            return future.result()
+        except IOError as e:
+            self._trigger_emergency_shutdown(
+                reason=f"Audit persistence failed: {e}"
+            )
+            raise AuditFailureException(f"Critical audit failure: {e}")
+    
+    def log_async(self, event: str, payload: Dict) -> Future:
+        """Chain and enqueue; the Future resolves to the entry hash once durable"""
         try:
             with self._lock:
-                self._persist_entry(entry)
+                entry = self._create_entry(event, payload)
+                written = self._persist_entry(entry)
                 self._verify_chain_integrity()
-                return entry['entry_hash']
         except IOError as e:
             self._trigger_emergency_shutdown(
                 reason=f"Audit persistence failed: {e}"
             )
             raise AuditFailureException(f"Critical audit failure: {e}")
+        
+        result = Future()
+        
+        def _done(f):
+            error = f.exception()
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result(entry['entry_hash'])
+        
+        written.add_done_callback(_done)
+        return result
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued entries are on disk"""
+        return self.writer.flush(timeout)
     
     def _create_entry(self, event: str, payload: Dict) -> Dict:
         """Create an audit entry with hash chaining"""
@@ -244,16 +279,11 @@ class StrictAuditLogger:
         
         return entry
     
-    def _persist_entry(self, entry: Dict):
-        """Persist entry to disk with verification"""
-        with open(self.audit_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
-            f.flush()
-            # Force write to disk
-            import os
-            os.fsync(f.fileno())
-        
+    def _persist_entry(self, entry: Dict) -> Future:
+        """Queue entry for the next group commit (write + fsync)"""
+        written = self.writer.submit(json.dumps(entry))
         self._last_hash = entry['entry_hash']
+        return written
     
     def _verify_chain_integrity(self):
         """Verify the hash chain hasn't been tampered with"""
@@ -414,6 +444,128 @@ from .governance_v3 import PragmaticGovernance
 
 from .smt_verifier import MandatorySMTVerifier, ConstitutionalViolation, SMTVerificationTimeout
 
+# ============================================================================ 
+# FACT WRITER (commit phase)
+# ============================================================================ 
+
+class CoalescingFactWriter:
+    """
+    Commits prepared facts_extended rows.
+    
+    With coalesce=True the first producer to arrive becomes the leader and
+    writes every batch queued so far in one BEGIN IMMEDIATE transaction;
+    the other producers only wait for their own row count. While the leader
+    commits, new batches queue up for the next group, so throughput grows
+    with the number of producers instead of serializing on the write lock.
+    """
+    
+    INSERT_SQL = """
+        INSERT INTO facts_extended 
+        (statement, predicate, arg_count, arg1, arg2, arg3, arg4, arg5,
+         args_json, fact_type, domain, complexity, confidence, source, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    COLUMNS = ('statement', 'predicate', 'arg_count', 'arg1', 'arg2', 'arg3', 'arg4', 'arg5',
+               'args_json', 'fact_type', 'domain', 'complexity', 'confidence', 'source', 'created_at')
+    
+    def __init__(self, db_path: str, coalesce: bool = False, max_group: int = 64):
+        self.db_path = db_path
+        self.coalesce = coalesce
+        self.max_group = max_group
+        self._cond = threading.Condition()
+        self._queue: List[Dict] = []
+        self._leader_active = False
+        self._conn = None
+        self._stats = {'commits': 0, 'batches': 0, 'rows': 0, 'max_group': 0, 'isolated_retries': 0}
+    
+    def _connect(self):
+        # Use timeout to avoid locks
+        conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 5000")  # 5 second timeout
+        return conn
+    
+    def _insert(self, conn, group: List[List[Dict]]) -> List[int]:
+        """One transaction for all batches in group; returns rows added per batch"""
+        counts = []
+        conn.execute("BEGIN IMMEDIATE")  # Lock for write
+        try:
+            for rows in group:
+                cursor = conn.executemany(
+                    self.INSERT_SQL,
+                    [tuple(row[c] for c in self.COLUMNS) for row in rows]
+                )
+                counts.append(cursor.rowcount)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._stats['commits'] += 1
+        self._stats['batches'] += len(group)
+        self._stats['rows'] += sum(counts)
+        self._stats['max_group'] = max(self._stats['max_group'], len(group))
+        return counts
+    
+    def commit(self, rows: List[Dict]) -> int:
+        if not self.coalesce:
+            conn = self._connect()
+            try:
+                return self._insert(conn, [rows])[0]
+            finally:
+                conn.close()
+        
+        slot = {'rows': rows, 'done': False, 'result': 0, 'error': None}
+        with self._cond:
+            self._queue.append(slot)
+            while not slot['done'] and self._leader_active:
+                self._cond.wait()
+            leader = not slot['done']
+            if leader:
+                self._leader_active = True
+        
+        if leader:
+            try:
+                while not slot['done']:
+                    with self._cond:
+                        group = self._queue[:self.max_group]
+                        del self._queue[:self.max_group]
+                    self._write_group(group)
+            finally:
+                with self._cond:
+                    self._leader_active = False
+                    self._cond.notify_all()
+        
+        if slot['error'] is not None:
+            raise slot['error']
+        return slot['result']
+    
+    def _write_group(self, group: List[Dict]):
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            outcomes = [(count, None) for count in self._insert(self._conn, [s['rows'] for s in group])]
+        except Exception as e:
+            if len(group) == 1:
+                outcomes = [(0, e)]
+            else:
+                # One bad batch must not fail the others: retry each on its own
+                self._stats['isolated_retries'] += 1
+                outcomes = []
+                for slot in group:
+                    try:
+                        outcomes.append((self._insert(self._conn, [slot['rows']])[0], None))
+                    except Exception as slot_error:
+                        outcomes.append((0, slot_error))
+        with self._cond:
+            for slot, (count, error) in zip(group, outcomes):
+                slot['result'], slot['error'], slot['done'] = count, error, True
+            self._cond.notify_all()
+    
+    def stats(self) -> Dict:
+        stats = dict(self._stats)
+        stats['coalesce'] = self.coalesce
+        stats['avg_group'] = round(stats['batches'] / stats['commits'], 2) if stats['commits'] else 0.0
+        return stats
+
 # ============================================================================ 
 # TRANSACTIONAL GOVERNANCE ENGINE 
 # ============================================================================ 
@@ -427,10 +579,20 @@ class TransactionalGovernanceEngine:
     MAX_GOVERNANCE_LATENCY_MS = 100
     MAX_SMT_LATENCY_MS = 5000
     MAX_FACTS_PER_BATCH = 100
+    GOVERNANCE_CACHE_SIZE = 1024
+    GOVERNANCE_CACHE_TTL_S = 300.0
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, coalesce_commits: Optional[bool] = None):
         self.db_path = db_path or "D:\\MCP Mods\\HAK_GAL_HEXAGONAL\\hexagonal_kb.db"
         self.audit_logger = StrictAuditLogger()
+        # Concurrent mode: coalesce batches of several producers into one commit
+        if coalesce_commits is None:
+            coalesce_commits = os.environ.get('GOVERNANCE_COALESCE_COMMITS', '').lower() in ('1', 'true', 'yes')
+        self.fact_writer = CoalescingFactWriter(self.db_path, coalesce=coalesce_commits)
+        # Memoized governance decisions per context signature
+        self._decision_cache: "OrderedDict[str, Tuple[float, Tuple]]" = OrderedDict()
+        self._decision_lock = threading.Lock()
+        self._decision_stats = {'hits': 0, 'misses': 0}
         self.validator = StrictFactValidator()
         # Choose governance version based on environment
         governance_version = os.environ.get('GOVERNANCE_VERSION', 'v2').lower()
@@ -477,12 +639,14 @@ class TransactionalGovernanceEngine:
                 f"Batch size {len(facts)} exceeds limit {self.MAX_FACTS_PER_BATCH}"
             )
         
-        # Validate all facts first
+        # Validate all facts once; both 2PC phases reuse the parsed details
+        validations = []
         for fact in facts:
             validation = self.validator.validate_fact(fact)
             if not validation.valid:
                 logger.warning(f"Invalid fact rejected: {validation.error}")
                 return 0
+            validations.append(validation)
         
         # Phase 1: Prepare
         prepare_token = str(uuid.uuid4())
@@ -493,7 +657,7 @@ class TransactionalGovernanceEngine:
         
         try:
             # 1.1 Prepare Governance Decision
-            gov_prepare = self._prepare_governance(facts, context, prepare_token)
+            gov_prepare = self._prepare_governance(facts, context, prepare_token, validations)
             tx_state.gov_prepare = gov_prepare
             
             if not gov_prepare.success:
@@ -502,7 +666,7 @@ class TransactionalGovernanceEngine:
                 return 0
             
             # 1.2 Prepare DB Transaction
-            db_prepare = self._prepare_db_transaction(facts, prepare_token)
+            db_prepare = self._prepare_db_transaction(facts, prepare_token, validations)
             tx_state.db_prepare = db_prepare
             
             if not db_prepare.success:
@@ -557,22 +721,26 @@ class TransactionalGovernanceEngine:
     
     def _prepare_governance(self, facts: List[str], 
                           context: Dict, 
-                          token: str) -> PrepareResult:
+                          token: str,
+                          validations: Optional[List[ValidationResult]] = None) -> PrepareResult:
         """Phase 1.1: Prepare governance decision"""
         try:
             # Add facts metadata to context
-            context.update({
-                'engine': 'TransactionalGovernanceEngine',
-                'batch_size': len(facts),
-                'predicates_set': list({
-                    f[:f.index('(')] for f in facts 
-                    if '(' in f
-                }),
-                'max_arg_count': max([
+            if validations is not None:
+                predicates = {v.details['predicate'] for v in validations}
+                max_arg_count = max((v.details['arg_count'] for v in validations), default=0)
+            else:
+                predicates = {f[:f.index('(')] for f in facts if '(' in f}
+                max_arg_count = max([
                     len(self.validator._parse_arguments(
                         f[f.index('(')+1:f.rindex(')')]
                     )) for f in facts if '(' in f and ')' in f
-                ], default=0),
+                ], default=0)
+            context.update({
+                'engine': 'TransactionalGovernanceEngine',
+                'batch_size': len(facts),
+                'predicates_set': sorted(predicates),
+                'max_arg_count': max_arg_count,
                 'transaction_token': token
             })
             
@@ -589,6 +757,60 @@ class TransactionalGovernanceEngine:
                     }
                 )
             
+            # Identical contexts get the identical decision: skip policy + SMT
+            signature = self._governance_signature(context)
+            cached = self._cached_governance(signature)
+            if cached is not None:
+                success, error, data = cached
+                return PrepareResult(success=success, token=token, error=error, data=data)
+            
+            result = self._decide_governance(context, token)
+            smt_result = (result.data or {}).get('smt_result') or {}
+            if result.data and 'decision' in result.data and 'error' not in smt_result:
+                # Errors/timeouts are transient and must not be memoized
+                self._remember_governance(signature, result)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Governance prepare failed: {e}")
+            return PrepareResult(
+                success=False,
+                token=token,
+                error=str(e)
+            )
+    
+    def _governance_signature(self, context: Dict) -> str:
+        """Context signature without per-transaction fields"""
+        stable = {k: v for k, v in context.items() if k != 'transaction_token'}
+        raw = json.dumps(
+            {'v': os.environ.get('GOVERNANCE_VERSION', 'v2').lower(), 'c': stable},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _cached_governance(self, signature: str) -> Optional[Tuple[bool, Optional[str], Dict]]:
+        with self._decision_lock:
+            cached = self._decision_cache.get(signature)
+            if cached is None or time.monotonic() - cached[0] > self.GOVERNANCE_CACHE_TTL_S:
+                self._decision_stats['misses'] += 1
+                return None
+            self._decision_cache.move_to_end(signature)
+            self._decision_stats['hits'] += 1
+            success, error, data = cached[1]
+        # Callers (audit payload, context) may mutate data - never hand out the memo itself
+        return success, error, copy.deepcopy(data)
+    
+    def _remember_governance(self, signature: str, result: PrepareResult):
+        data = copy.deepcopy(result.data)
+        with self._decision_lock:
+            self._decision_cache[signature] = (time.monotonic(), (result.success, result.error, data))
+            self._decision_cache.move_to_end(signature)
+            while len(self._decision_cache) > self.GOVERNANCE_CACHE_SIZE:
+                self._decision_cache.popitem(last=False)
+    
+    def _decide_governance(self, context: Dict, token: str) -> PrepareResult:
+        """Run the configured governance version (V3, or V2 policy guard + SMT)"""
+        try:
             # Check governance version
             gov_version = os.environ.get('GOVERNANCE_VERSION', 'v2').lower()
             
@@ -645,7 +867,7 @@ class TransactionalGovernanceEngine:
                         success=False,
                         token=token,
                         error="Governance V2 check rejected action",
-                        data={'decision': decision}
+                        data={'decision': decision, 'version': 'v2', 'smt_result': smt_result}
                     )
                 
                 return PrepareResult(
@@ -667,24 +889,21 @@ class TransactionalGovernanceEngine:
             )
     
     def _prepare_db_transaction(self, facts: List[str], 
-                               token: str) -> PrepareResult:
-        """Phase 1.2: Prepare database transaction"""
-        conn = None
+                               token: str,
+                               validations: Optional[List[ValidationResult]] = None) -> PrepareResult:
+        """Phase 1.2: Prepare database rows.
+
+        No connection and no write lock here: the rows are only built, the
+        BEGIN IMMEDIATE happens in _commit_db around the insert itself.
+        """
         try:
-            # Use timeout to avoid locks
-            conn = sqlite3.connect(self.db_path, timeout=5.0)
-            conn.execute("PRAGMA busy_timeout = 5000")  # 5 second timeout
-            conn.execute("BEGIN IMMEDIATE")  # Lock for write
-            
-            cursor = conn.cursor()
             prepared_facts = []
+            created_at = datetime.utcnow().isoformat()
             
-            for fact_str in facts:
-                # Parse fact
-                validation = self.validator.validate_fact(fact_str)
+            for i, fact_str in enumerate(facts):
+                # Reuse the parse from governed_add_facts_atomic if available
+                validation = validations[i] if validations is not None else self.validator.validate_fact(fact_str)
                 if not validation.valid:
-                    conn.rollback()
-                    conn.close()
                     return PrepareResult(
                         success=False,
                         token=token,
@@ -713,13 +932,13 @@ class TransactionalGovernanceEngine:
                     'complexity': len(args),
                     'confidence': 0.9,
                     'source': 'TransactionalGovernanceEngine',
-                    'created_at': datetime.utcnow().isoformat()
+                    'created_at': created_at
                 }
                 
                 prepared_facts.append(fact_data)
             
-            # Store connection for commit phase
-            self._store_prepared_connection(token, conn, prepared_facts)
+            # Store rows for commit phase
+            self._store_prepared_connection(token, None, prepared_facts)
             
             return PrepareResult(
                 success=True,
@@ -727,30 +946,8 @@ class TransactionalGovernanceEngine:
                 data={'facts_count': len(prepared_facts)}
             )
             
-        except sqlite3.OperationalError as e:
-            logger.error(f"DB prepare failed: {e}")
-            if conn:
-                try:
-                    conn.rollback()
-                    conn.close()
-                except:
-                    pass
-            # Clean up stored connection if exists
-            if token in self._prepared_connections:
-                del self._prepared_connections[token]
-            return PrepareResult(
-                success=False,
-                token=token,
-                error=str(e)
-            )
         except Exception as e:
             logger.error(f"DB prepare failed: {e}")
-            if conn:
-                try:
-                    conn.rollback()
-                    conn.close()
-                except:
-                    pass
             return PrepareResult(
                 success=False,
                 token=token,
@@ -793,51 +990,24 @@ class TransactionalGovernanceEngine:
         return {'audit_hash': audit_hash}
     
     def _commit_db(self, db_prepare: PrepareResult) -> Dict:
-        """Phase 2.2: Commit database transaction"""
+        """Phase 2.2: Commit database transaction (write lock only held here)"""
         token = db_prepare.token
-        conn, prepared_facts = self._retrieve_prepared_connection(token)
+        _, prepared_facts = self._retrieve_prepared_connection(token)
         
         try:
-            cursor = conn.cursor()
-            facts_added = 0
-            
-            for fact_data in prepared_facts:
-                cursor.execute("""
-                    INSERT INTO facts_extended 
-                    (statement, predicate, arg_count, arg1, arg2, arg3, arg4, arg5,
-                     args_json, fact_type, domain, complexity, confidence, source, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    fact_data['statement'],
-                    fact_data['predicate'],
-                    fact_data['arg_count'],
-                    fact_data['arg1'],
-                    fact_data['arg2'],
-                    fact_data['arg3'],
-                    fact_data['arg4'],
-                    fact_data['arg5'],
-                    fact_data['args_json'],
-                    fact_data['fact_type'],
-                    fact_data['domain'],
-                    fact_data['complexity'],
-                    fact_data['confidence'],
-                    fact_data['source'],
-                    fact_data['created_at']
-                ))
-                facts_added += cursor.rowcount
-            
-            conn.commit()
+            facts_added = self.fact_writer.commit(prepared_facts)
             return {'facts_added': facts_added}
             
         finally:
-            # Always close connection and clean up
-            try:
-                conn.close()
-            except:
-                pass
             if token in self._prepared_connections:
                 del self._prepared_connections[token]
     
+    def pipeline_stats(self) -> Dict:
+        """Governance memo and commit coalescing counters"""
+        with self._decision_lock:
+            decisions = dict(self._decision_stats, cached=len(self._decision_cache))
+        return {'governance_cache': decisions, 'fact_writer': self.fact_writer.stats()}
+    
     def _commit_governance(self, gov_prepare: PrepareResult) -> Dict:
         """Phase 2.3: Finalize governance decision"""
         # Record metrics, update stats, etc.
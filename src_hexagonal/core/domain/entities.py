@@ -5,9 +5,52 @@ Nach HAK/GAL Verfassung: Pure Business Logic ohne Dependencies
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
+def parse_statement(statement: str) -> Tuple[Optional[str], List[str]]:
+    """Zerlege 'Predicate(Arg1, Arg2, ...).' in (Predicate, [Arg1, Arg2, ...]).
+
+    Kommas innerhalb von Klammern/Anführungszeichen trennen keine Argumente.
+    Liefert (None, []) wenn das Statement kein Fakt-Format hat.
+    """
+    text = (statement or '').strip().rstrip('.').strip()
+    l = text.find('(')
+    if l <= 0 or not text.endswith(')'):
+        return None, []
+    predicate = text[:l].strip()
+    inner = text[l + 1:-1]
+    if not any(ch in inner for ch in '"\'([{'):
+        # Schneller Pfad für einfache Argumente
+        args = [a.strip() for a in inner.split(',')]
+        args = [a for a in args if a]
+        return (predicate, args) if predicate and args else (None, [])
+    args: List[str] = []
+    depth = 0
+    quote = None
+    current = []
+    for ch in inner:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ('"', "'") and not ''.join(current).strip():
+            # Nur führende Anführungszeichen quoten (Apostrophe in Namen erlaubt)
+            quote = ch
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            args.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    args.append(''.join(current).strip())
+    args = [a for a in args if a]
+    if not predicate or not args:
+        return None, []
+    return predicate, args
+
 @dataclass
 class Fact:
     """Core Domain Entity - Ein Fakt in der Wissensbasis"""
@@ -5,7 +5,7 @@ Nach HAK/GAL Verfassung: Definiert WAS das System kann, nicht WIE
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -60,6 +60,14 @@ class FactRepository(ABC):
         """Speichere einen Fakt"""
         pass
     
+    @abstractmethod
+    def save_many(self, facts: List[Fact]) -> List[bool]:
+        """Speichere mehrere Fakten in einer Transaktion.
+
+        Rückgabe pro Fakt: True = neu eingefügt, False = existierte bereits.
+        """
+        pass
+    
     @abstractmethod
     def find_by_query(self, query: str, limit: int = 10) -> List[Fact]:
         """Finde Facts nach Query"""
@@ -70,6 +78,24 @@ class FactRepository(ABC):
         """Hole alle Facts"""
         pass
     
+    @abstractmethod
+    def find_after(self, after: Optional[int] = None, limit: int = 1000) -> List[Tuple[int, Fact]]:
+        """Keyset-Pagination: (cursor, Fact)-Paare mit cursor > after, aufsteigend.
+
+        Der Cursor des letzten Paares ist der Startpunkt der nächsten Seite.
+        """
+        pass
+    
+    @abstractmethod
+    def find_by_predicate(self, predicate: Optional[str], arg_pos: Optional[int] = None,
+                          value: Optional[str] = None, limit: int = 100) -> List[Fact]:
+        """Finde Facts nach Prädikat und/oder Argument.
+
+        arg_pos ist 0-basiert (0 = Subjekt, 1 = Objekt); arg_pos=None mit value
+        sucht das Argument an beliebiger Position, predicate=None über alle Prädikate.
+        """
+        pass
+    
     @abstractmethod
     def exists(self, statement: str) -> bool:
         """Prüfe ob Fact existiert"""
@@ -102,6 +128,11 @@ class ReasoningEngine(ABC):
     def analyze_statement(self, statement: str) -> Dict[str, Any]:
         """Analysiere ein Statement"""
         pass
+    
+    @abstractmethod
+    def compute_confidence_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Berechne Confidence für viele Queries (Reihenfolge bleibt erhalten)"""
+        pass
 
 class LLMProvider(ABC):
     """Secondary Port: LLM Services"""
@@ -0,0 +1,184 @@
+"""
+HRM Feedback Store
+==================
+Feedback-Daten (``hrm_feedback.json``) im Speicher statt Neu-Parsen pro
+Reasoning-Request.
+
+- ``refresh()`` kostet nur zwei ``os.stat``: neu gelesen wird nur, wenn sich
+  Snapshot oder Log geaendert haben (Version-Stempel mtime_ns/Größe). Andere
+  Schreiber des Snapshots (z.B. hrm_feedback_endpoints) werden so erkannt.
+- Neues Feedback wird an ``hrm_feedback.log.jsonl`` angehängt statt die ganze
+  Datei neu zu schreiben; beim Laden wird das Log auf den Snapshot gespielt.
+- Alle ``compact_every`` Einträge wird kompaktiert: Snapshot atomar neu
+  schreiben (mit ``log_seq``), Log leeren. Einträge mit ``seq <= log_seq``
+  werden beim Replay übersprungen, ein Absturz dazwischen zählt also nichts doppelt.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+
+def empty_feedback_data() -> Dict[str, Any]:
+    return {'history': {}, 'adjustments': {}, 'statistics': {}, 'verified_queries': {}}
+
+
+def apply_feedback_event(data: Dict[str, Any], event: Dict[str, Any]):
+    """Ein Feedback-Ereignis auf die Daten anwenden (gleiche Logik für Live-Feedback und Replay)"""
+    query, feedback_type, ts = event['query'], event['type'], event['ts']
+    history = data.setdefault('history', {}).setdefault(query, {
+        'positive_count': 0,
+        'negative_count': 0,
+        'last_feedback': None,
+        'confidence_adjustments': []
+    })
+    if feedback_type == 'positive':
+        history['positive_count'] = history.get('positive_count', 0) + 1
+    elif feedback_type == 'negative':
+        history['negative_count'] = history.get('negative_count', 0) + 1
+    history['last_feedback'] = ts
+
+    total_feedback = history.get('positive_count', 0) + history.get('negative_count', 0)
+    if total_feedback > 0:
+        adjustment = event.get('adjustment', 0.0)
+        data.setdefault('adjustments', {})[query] = {
+            'base_adjustment': adjustment if adjustment != 0 else 0.06,
+            'feedback_ratio': history.get('positive_count', 0) / total_feedback,
+            'updated_at': ts
+        }
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class FeedbackStore:
+    """Thread-sicherer Feedback-Store: JSON-Snapshot + Append-only-Log"""
+
+    def __init__(self, path, compact_every: int = 1000):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.stem + '.log.jsonl')
+        self.compact_every = compact_every
+        self.data: Dict[str, Any] = empty_feedback_data()
+        self._lock = threading.RLock()
+        self._snapshot_stamp = None
+        self._log_offset = 0
+        self._log_events = 0
+        self._seq = 0
+        self._stats = {'reloads': 0, 'log_reads': 0, 'appends': 0, 'compactions': 0}
+        self._reload(_stamp(self.path))
+
+    @classmethod
+    def from_env(cls, path) -> 'FeedbackStore':
+        """HRM_FEEDBACK_COMPACT_EVERY (Log-Einträge bis zur Kompaktierung)"""
+        return cls(path, compact_every=int(os.environ.get('HRM_FEEDBACK_COMPACT_EVERY', '1000') or 1000))
+
+    def refresh(self):
+        """Nur bei geändertem Snapshot oder gewachsenem Log neu lesen"""
+        with self._lock:
+            stamp = _stamp(self.path)
+            if stamp != self._snapshot_stamp:
+                self._reload(stamp)
+                return
+            log_stamp = _stamp(self.log_path)
+            log_size = log_stamp[1] if log_stamp else 0
+            if log_size < self._log_offset:
+                # Log von einem anderen Prozess kompaktiert
+                self._reload(stamp)
+            elif log_size > self._log_offset:
+                self._read_log()
+
+    def _reload(self, stamp):
+        data = empty_feedback_data()
+        if stamp is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"[WARNING] Failed to load feedback data: {e}")
+        self.data = data
+        self._snapshot_stamp = stamp
+        self._seq = int(data.get('log_seq', 0))
+        self._log_offset = 0
+        self._log_events = 0
+        self._stats['reloads'] += 1
+        self._read_log()
+
+    def _read_log(self):
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._log_offset)
+                chunk = f.read()
+        except OSError:
+            return
+        # Nur vollständige Zeilen übernehmen, ein halb geschriebener Rest kommt beim nächsten Mal
+        end = chunk.rfind(b'\n') + 1
+        compacted = int(self.data.get('log_seq', 0))
+        for line in chunk[:end].splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            self._log_events += 1
+            seq = int(event.get('seq', 0))
+            if seq <= compacted:
+                continue
+            apply_feedback_event(self.data, event)
+            self._seq = max(self._seq, seq)
+        self._log_offset += end
+        self._stats['log_reads'] += 1
+
+    def record_feedback(self, query: str, feedback_type: str, adjustment: float = 0.0):
+        """Feedback anwenden und als eine Zeile ans Log hängen"""
+        with self._lock:
+            self.refresh()
+            self._seq += 1
+            event = {'seq': self._seq, 'ts': time.time(), 'query': query,
+                     'type': feedback_type, 'adjustment': adjustment}
+            apply_feedback_event(self.data, event)
+            try:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.log_path, 'ab') as f:
+                    f.write((json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8'))
+                    self._log_offset = f.tell()
+            except Exception as e:
+                print(f"[WARNING] Failed to save feedback data: {e}")
+                return
+            self._log_events += 1
+            self._stats['appends'] += 1
+            if self._log_events >= self.compact_every:
+                self.compact()
+
+    def compact(self):
+        """Snapshot atomar neu schreiben und das Log leeren"""
+        with self._lock:
+            self.data['log_seq'] = self._seq
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(self.data, f, indent=2)
+                os.replace(tmp, self.path)
+                with open(self.log_path, 'wb'):
+                    pass
+            except Exception as e:
+                print(f"[WARNING] Failed to compact feedback data: {e}")
+                return
+            self._snapshot_stamp = _stamp(self.path)
+            self._log_offset = 0
+            self._log_events = 0
+            self._stats['compactions'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_log_events'] = self._log_events
+            stats['queries'] = len(self.data.get('history', {}))
+        return stats
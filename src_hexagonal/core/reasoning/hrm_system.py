@@ -4,13 +4,19 @@ HRM System for HEXAGONAL - RESTORED 3.5M PARAMETER VERSION
 Neural Reasoning Model with CORRECT parameter count (3.5M not 600k!)
 """
 
+import os
+import time
+import uuid
+import hashlib
 import torch
 import torch.nn as nn
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import numpy as np
 
+from .result_cache import ReasoningResultCache, normalize_statement
+
 logger = logging.getLogger(__name__)
 
 class SimplifiedHRM(nn.Module):
@@ -224,6 +230,8 @@ class HRMSystem:
         ]
         self.model_path = model_path or next((p for p in default_candidates if Path(p).exists()), default_candidates[-1])
         self.model_arch = "auto"  # "simplified", "improved", "lstm", oder "auto"
+        self.model_version = None
+        self.result_cache = ReasoningResultCache.from_env()
         
         # Try to load trained model
         if self._load_trained_model():
@@ -240,9 +248,13 @@ class HRMSystem:
                 dropout=0.1
             ).to(self.device)
             self.model.eval()
+            # Random weights: results must never be shared across processes
+            self.model_version = f"untrained-{uuid.uuid4().hex[:12]}"
             
         # Log parameter count
         param_count = sum(p.numel() for p in self.model.parameters())
+        self._param_count = param_count
+        self._chunk_size: Optional[int] = None
         logger.info(f"[HRM] Model has {param_count:,} parameters ({param_count/1e6:.1f}M)")
     
     def _load_trained_model(self) -> bool:
@@ -383,6 +395,7 @@ class HRMSystem:
                 metrics = checkpoint.get('metrics', {})
                 logger.info(f"[HRM] Model metrics: {metrics}")
                 
+                self.model_version = self._checkpoint_hash(model_file)
                 return True
                 
             except Exception as e:
@@ -391,6 +404,29 @@ class HRMSystem:
         
         return False
     
+    @staticmethod
+    def _checkpoint_hash(model_file: Path) -> str:
+        """SHA-256 of the checkpoint file, identifies the weights in the result cache"""
+        digest = hashlib.sha256()
+        with open(model_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()[:16]
+    
+    def reload_model(self, model_path: Optional[str] = None) -> bool:
+        """Checkpoint neu laden (z.B. nach Retraining) und Ergebnis-Cache verwerfen"""
+        old_version = self.model_version
+        if model_path:
+            self.model_path = model_path
+        if not self._load_trained_model():
+            return False
+        self._param_count = sum(p.numel() for p in self.model.parameters())
+        self._chunk_size = None
+        if self.result_cache and old_version != self.model_version:
+            self.result_cache.invalidate(model_version=old_version)
+        logger.info(f"[HRM] Reloaded model {self.model_path} (version {self.model_version})")
+        return True
+    
     def _parse_query(self, query: str) -> Optional[Dict]:
         """Parse query into predicate and entities"""
         import re
@@ -421,6 +457,34 @@ class HRMSystem:
             torch.tensor([pred_id], dtype=torch.long).to(self.device)
         )
     
+    def _fallback_confidence(self, query: str) -> float:
+        """Heuristic confidence when the query cannot be parsed"""
+        confidence = 0.5
+        if 'IsA(' in query or 'HasPart(' in query:
+            confidence = 0.85
+        elif 'Not' in query or '!' in query:
+            confidence = 0.15
+        return confidence
+    
+    def _build_result(self, query: str, confidence: float) -> Dict[str, Any]:
+        # Generate reasoning terms
+        if confidence > 0.7:
+            reasoning_terms = ['Valid', 'Confirmed', 'High confidence', 'Supported by 3.5M model']
+        elif confidence < 0.3:
+            reasoning_terms = ['Unlikely', 'Low confidence', 'Doubtful', '3.5M model disagrees']
+        else:
+            reasoning_terms = ['Possible', 'Uncertain', 'Needs verification', 'Moderate confidence']
+        
+        return {
+            'query': query,
+            'confidence': float(confidence),
+            'success': True,
+            'reasoning_terms': reasoning_terms,
+            'device': str(self.device),
+            'model_type': 'ImprovedHRM-3.5M',
+            'parameters': self._param_count if self.model else 0
+        }
+    
     def reason(self, query: str) -> Dict[str, Any]:
         """Perform reasoning on a query using 3.5M parameter model"""
         try:
@@ -429,35 +493,19 @@ class HRMSystem:
             
             if not parsed or self.model is None:
                 # Fallback reasoning
-                confidence = 0.5
-                if 'IsA(' in query or 'HasPart(' in query:
-                    confidence = 0.85
-                elif 'Not' in query or '!' in query:
-                    confidence = 0.15
-                    
+                confidence = self._fallback_confidence(query)
             else:
-                # Use 3.5M parameter model
-                with torch.no_grad():
-                    entities, predicate = self._encode_query(parsed)
-                    confidence = self.model(entities, predicate).item()
+                key = normalize_statement(query)
+                confidence = self.result_cache.get(self.model_version, key) if self.result_cache else None
+                if confidence is None:
+                    # Use 3.5M parameter model
+                    with torch.no_grad():
+                        entities, predicate = self._encode_query(parsed)
+                        confidence = self.model(entities, predicate).item()
+                    if self.result_cache:
+                        self.result_cache.put(self.model_version, key, confidence)
             
-            # Generate reasoning terms
-            if confidence > 0.7:
-                reasoning_terms = ['Valid', 'Confirmed', 'High confidence', 'Supported by 3.5M model']
-            elif confidence < 0.3:
-                reasoning_terms = ['Unlikely', 'Low confidence', 'Doubtful', '3.5M model disagrees']
-            else:
-                reasoning_terms = ['Possible', 'Uncertain', 'Needs verification', 'Moderate confidence']
-            
-            return {
-                'query': query,
-                'confidence': float(confidence),
-                'success': True,
-                'reasoning_terms': reasoning_terms,
-                'device': str(self.device),
-                'model_type': 'ImprovedHRM-3.5M',
-                'parameters': sum(p.numel() for p in self.model.parameters()) if self.model else 0
-            }
+            return self._build_result(query, confidence)
             
         except Exception as e:
             logger.error(f"[HRM] Reasoning error: {e}")
@@ -468,11 +516,92 @@ class HRMSystem:
                 'error': str(e)
             }
     
-    def batch_reason(self, queries: List[str]) -> List[Dict[str, Any]]:
-        """Batch reasoning on multiple queries"""
-        results = []
-        for query in queries:
-            results.append(self.reason(query))
+    def batch_chunk_size(self, seq_len: int = 2) -> int:
+        """
+        Chunk-Größe für batch_reason: HRM_BATCH_CHUNK_SIZE, sonst einmalig
+        auf diesem Gerät kalibriert (kleinste Größe innerhalb 5% des besten
+        Durchsatzes pro Query).
+        """
+        if self._chunk_size is not None:
+            return self._chunk_size
+        env_size = os.environ.get('HRM_BATCH_CHUNK_SIZE', '')
+        if env_size.isdigit() and int(env_size) > 0:
+            self._chunk_size = int(env_size)
+            return self._chunk_size
+        if self.model is None:
+            self._chunk_size = 1024
+            return self._chunk_size
+        
+        vocab = self.model.entity_embedding.num_embeddings
+        pred_vocab = self.model.predicate_embedding.num_embeddings
+        timings: List[Tuple[int, float]] = []
+        with torch.inference_mode():
+            for size in (64, 128, 256, 512, 1024, 2048, 4096):
+                entities = torch.randint(1, vocab, (size, seq_len), device=self.device)
+                predicates = torch.randint(0, pred_vocab, (size,), device=self.device)
+                best = float('inf')
+                for _ in range(2):
+                    started = time.perf_counter()
+                    self.model(entities, predicates)
+                    best = min(best, time.perf_counter() - started)
+                timings.append((size, best / size))
+                # Per-query cost rising again: larger chunks only cost memory
+                if len(timings) >= 3 and timings[-1][1] > timings[-2][1] > timings[-3][1]:
+                    break
+        best_per_query = min(t for _, t in timings)
+        self._chunk_size = next(size for size, t in timings if t <= best_per_query * 1.05)
+        logger.info(f"[HRM] Batch chunk size calibrated: {self._chunk_size} "
+                    f"({best_per_query * 1e6:.1f}us/query on {self.device})")
+        return self._chunk_size
+    
+    def batch_reason(self, queries: List[str], chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Batch reasoning on multiple queries.
+        
+        Queries werden nach Anzahl Entitäten gruppiert (gleich lange Sequenzen,
+        also kein Padding, das den Mean-Pool verfälschen würde) und pro Chunk
+        in einem Forward-Pass unter torch.inference_mode() bewertet.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        buckets: Dict[int, List[Tuple[int, List[int], int]]] = {}
+        cache = self.result_cache
+        
+        for i, query in enumerate(queries):
+            parsed = self._parse_query(query) if isinstance(query, str) else None
+            if not parsed or self.model is None:
+                results[i] = self._build_result(query, self._fallback_confidence(str(query)))
+                continue
+            if cache:
+                cached = cache.get(self.model_version, normalize_statement(query))
+                if cached is not None:
+                    results[i] = self._build_result(query, cached)
+                    continue
+            entity_ids = [self.vocab.get(entity, 1) for entity in parsed['entities']]  # 1 is <UNK>
+            pred_id = self.predicate_vocab.get(parsed['predicate'], 0)
+            buckets.setdefault(len(entity_ids), []).append((i, entity_ids, pred_id))
+        
+        if buckets:
+            size = chunk_size or self.batch_chunk_size()
+            with torch.inference_mode():
+                for items in buckets.values():
+                    for start in range(0, len(items), size):
+                        chunk = items[start:start + size]
+                        try:
+                            entities = torch.tensor([ids for _, ids, _ in chunk], dtype=torch.long, device=self.device)
+                            predicates = torch.tensor([pid for _, _, pid in chunk], dtype=torch.long, device=self.device)
+                            scores = self.model(entities, predicates).reshape(-1).tolist()
+                        except Exception as e:
+                            logger.error(f"[HRM] Batch reasoning error: {e}")
+                            for i, _, _ in chunk:
+                                results[i] = {'query': queries[i], 'confidence': 0.0, 'success': False, 'error': str(e)}
+                            continue
+                        for (i, _, _), confidence in zip(chunk, scores):
+                            results[i] = self._build_result(queries[i], confidence)
+                        if cache:
+                            cache.put_many(self.model_version, [
+                                (normalize_statement(queries[i]), confidence)
+                                for (i, _, _), confidence in zip(chunk, scores)
+                            ])
         return results
     
     def get_status(self) -> Dict[str, Any]:
@@ -488,12 +617,17 @@ class HRMSystem:
             'vocab_size': len(self.vocab),
             'predicate_count': len(self.predicate_vocab),
             'model_path': str(self.model_path),
-            'model_file_size_mb': 14.3
+            'model_version': self.model_version,
+            'model_file_size_mb': 14.3,
+            'result_cache': self.result_cache.stats() if self.result_cache else {'enabled': False}
         }
     
     def update_from_feedback(self, query: str, feedback: str):
         """Update model based on user feedback"""
         logger.info(f"[HRM] Feedback received for '{query}': {feedback}")
+        # Cached score for this statement is stale once feedback arrives
+        if self.result_cache:
+            self.result_cache.invalidate(self.model_version, normalize_statement(query))
         # Future: implement online learning/fine-tuning
 
 # Singleton instance
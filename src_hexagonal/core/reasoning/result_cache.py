@@ -0,0 +1,165 @@
+"""
+Reasoning Result Cache
+======================
+Begrenzter LRU/TTL-Cache für HRM-Confidences, Schlüssel ist
+(Modellversion, normalisiertes Statement). Optional mit SQLite-Tier auf
+Platte, damit ein Neustart nicht kalt beginnt und mehrere Prozesse sich
+die Ergebnisse teilen können.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+_WS = re.compile(r'\s+')
+_COMMA = re.compile(r'\s*,\s*')
+_PAREN = re.compile(r'\s*([()])\s*')
+
+
+def normalize_statement(statement: str) -> str:
+    """'IsA( Water ,Liquid ).' -> 'IsA(Water, Liquid)'"""
+    s = _WS.sub(' ', statement.strip()).rstrip('.').rstrip()
+    s = _PAREN.sub(r'\1', s)
+    return _COMMA.sub(', ', s)
+
+
+class ReasoningResultCache:
+    """Thread-sicherer LRU/TTL-Cache mit optionalem SQLite-Tier"""
+
+    def __init__(self, max_entries: int = 50000, ttl: float = 3600.0, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_local = threading.local()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'invalidations': 0}
+        if disk_path:
+            with self._disk() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS reasoning_cache (
+                        model_version TEXT NOT NULL,
+                        statement TEXT NOT NULL,
+                        confidence REAL NOT NULL,
+                        created_at REAL NOT NULL,
+                        PRIMARY KEY (model_version, statement)
+                    ) WITHOUT ROWID
+                """)
+                conn.execute("DELETE FROM reasoning_cache WHERE created_at < ?", (time.time() - ttl,))
+
+    @classmethod
+    def from_env(cls) -> Optional['ReasoningResultCache']:
+        """HRM_RESULT_CACHE_SIZE (0 = aus), HRM_RESULT_CACHE_TTL, HRM_RESULT_CACHE_DB"""
+        size = int(os.environ.get('HRM_RESULT_CACHE_SIZE', '50000') or 0)
+        if size <= 0:
+            return None
+        return cls(
+            max_entries=size,
+            ttl=float(os.environ.get('HRM_RESULT_CACHE_TTL', '3600') or 3600),
+            disk_path=os.environ.get('HRM_RESULT_CACHE_DB') or None
+        )
+
+    def _disk(self) -> sqlite3.Connection:
+        conn = getattr(self._disk_local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._disk_local.conn = conn
+        return conn
+
+    def _store(self, key: Tuple[str, str], confidence: float, created_at: float):
+        self._entries[key] = (confidence, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def get(self, model_version: str, statement: str) -> Optional[float]:
+        key = (model_version, statement)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry[0]
+                del self._entries[key]
+                self._stats['expired'] += 1
+        if self.disk_path:
+            try:
+                row = self._disk().execute(
+                    "SELECT confidence, created_at FROM reasoning_cache WHERE model_version = ? AND statement = ?",
+                    key
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None and now - row[1] <= self.ttl:
+                with self._lock:
+                    self._store(key, row[0], row[1])
+                    self._stats['disk_hits'] += 1
+                return row[0]
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put_many(self, model_version: str, items: List[Tuple[str, float]]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for statement, confidence in items:
+                self._store((model_version, statement), confidence, now)
+        if self.disk_path:
+            try:
+                with self._disk() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO reasoning_cache (model_version, statement, confidence, created_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(model_version, statement, confidence, now) for statement, confidence in items]
+                    )
+            except sqlite3.Error as e:
+                print(f"[HRM] Reasoning cache disk write failed: {e}")
+
+    def put(self, model_version: str, statement: str, confidence: float):
+        self.put_many(model_version, [(statement, confidence)])
+
+    def invalidate(self, model_version: Optional[str] = None, statement: Optional[str] = None):
+        """Einzelnes Statement, eine Modellversion oder alles verwerfen"""
+        with self._lock:
+            if statement is not None and model_version is not None:
+                self._entries.pop((model_version, statement), None)
+            elif model_version is not None:
+                for key in [k for k in self._entries if k[0] == model_version]:
+                    del self._entries[key]
+            else:
+                self._entries.clear()
+            self._stats['invalidations'] += 1
+        if self.disk_path:
+            try:
+                with self._disk() as conn:
+                    if statement is not None and model_version is not None:
+                        conn.execute("DELETE FROM reasoning_cache WHERE model_version = ? AND statement = ?",
+                                     (model_version, statement))
+                    elif model_version is not None:
+                        conn.execute("DELETE FROM reasoning_cache WHERE model_version = ?", (model_version,))
+                    else:
+                        conn.execute("DELETE FROM reasoning_cache")
+            except sqlite3.Error as e:
+                print(f"[HRM] Reasoning cache disk invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl
+        stats['disk_tier'] = self.disk_path
+        return stats
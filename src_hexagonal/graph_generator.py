@@ -3,174 +3,400 @@
 HAK-GAL Graph Generator API Endpoint
 =====================================
 Integriert die Graph-Generierung direkt ins Backend
+
+Der Graph wird einmal pro Datenbank in einem KnowledgeGraphCache gehalten
+(Entity-Interning, kompakte Kanten-Arrays, Adjazenzlisten) und bei jedem
+Aufruf nur inkrementell ueber einen rowid-Watermark nachgezogen.
 """
 
+import random
 import sqlite3
 import json
+import threading
+import time
+import zlib
+from array import array
+from itertools import accumulate
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict, Counter
+from collections import Counter
+from typing import Dict, List, Optional
 from flask import jsonify
 
-def generate_knowledge_graph(db_path="hexagonal_kb.db", limit=500, focus=None):
-    """Generate knowledge graph data for API endpoint"""
-    
-    # Color mapping for categories
-    colors = {
-        'HAK_GAL': '#FF6B6B',      # Red - System Core
-        'Backend': '#4ECDC4',       # Teal - Backend
-        'Frontend': '#45B7D1',      # Blue - Frontend  
-        'Database': '#96CEB4',      # Green - Database
-        'AI': '#FFEAA7',           # Yellow - AI/LLM
-        'MCP': '#DDA0DD',          # Plum - MCP Tools
-        'Network': '#FFB6C1',       # Pink - Network
-        'Default': '#95A5A6'       # Gray - Default
-    }
-    
-    def get_category(entity):
-        """Determine category for coloring"""
-        entity_lower = entity.lower()
-        
-        if 'hak' in entity_lower or 'gal' in entity_lower:
-            return 'HAK_GAL'
-        elif 'backend' in entity_lower or 'api' in entity_lower or 'flask' in entity_lower:
-            return 'Backend'
-        elif 'frontend' in entity_lower or 'react' in entity_lower or 'ui' in entity_lower:
-            return 'Frontend'
-        elif 'database' in entity_lower or 'sqlite' in entity_lower or 'db' in entity_lower:
-            return 'Database'
-        elif 'llm' in entity_lower or 'ai' in entity_lower or 'model' in entity_lower or 'qwen' in entity_lower:
-            return 'AI'
-        elif 'mcp' in entity_lower or 'tool' in entity_lower:
-            return 'MCP'
-        elif 'network' in entity_lower or 'port' in entity_lower or 'http' in entity_lower:
-            return 'Network'
-        else:
-            return 'Default'
-    
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Build query
-        if focus:
-            query = """
-                SELECT DISTINCT statement FROM facts 
-                WHERE (statement LIKE ? OR statement LIKE ?)
-                AND statement NOT LIKE '%HasFrequency%'
-                AND statement NOT LIKE '%Count%'
-                AND length(statement) > 10
-                LIMIT ?
-            """
-            cursor.execute(query, (f'%{focus}%', f'%{focus},%', limit))
-        else:
-            query = """
-                SELECT statement FROM facts 
-                WHERE statement NOT LIKE '%HasFrequency%'
-                AND statement NOT LIKE '%Node[0-9]%'
-                AND statement NOT LIKE '%EntityCount%'
-                AND statement NOT LIKE '%Count[0-9]%'
-                AND length(statement) > 10
-                ORDER BY RANDOM()
-                LIMIT ?
-            """
-            cursor.execute(query, (limit,))
-        
-        facts = cursor.fetchall()
-        
-        # Build graph structure
-        nodes = {}
+# Color mapping for categories
+CATEGORY_COLORS = {
+    'HAK_GAL': '#FF6B6B',      # Red - System Core
+    'Backend': '#4ECDC4',       # Teal - Backend
+    'Frontend': '#45B7D1',      # Blue - Frontend
+    'Database': '#96CEB4',      # Green - Database
+    'AI': '#FFEAA7',           # Yellow - AI/LLM
+    'MCP': '#DDA0DD',          # Plum - MCP Tools
+    'Network': '#FFB6C1',       # Pink - Network
+    'Default': '#95A5A6'       # Gray - Default
+}
+
+EDGE_COLOR = {
+    'color': 'rgba(150,150,150,0.5)',
+    'highlight': '#4444ff',
+    'hover': '#6666ff'
+}
+
+
+def get_category(entity):
+    """Determine category for coloring"""
+    entity_lower = entity.lower()
+
+    if 'hak' in entity_lower or 'gal' in entity_lower:
+        return 'HAK_GAL'
+    elif 'backend' in entity_lower or 'api' in entity_lower or 'flask' in entity_lower:
+        return 'Backend'
+    elif 'frontend' in entity_lower or 'react' in entity_lower or 'ui' in entity_lower:
+        return 'Frontend'
+    elif 'database' in entity_lower or 'sqlite' in entity_lower or 'db' in entity_lower:
+        return 'Database'
+    elif 'llm' in entity_lower or 'ai' in entity_lower or 'model' in entity_lower or 'qwen' in entity_lower:
+        return 'AI'
+    elif 'mcp' in entity_lower or 'tool' in entity_lower:
+        return 'MCP'
+    elif 'network' in entity_lower or 'port' in entity_lower or 'http' in entity_lower:
+        return 'Network'
+    else:
+        return 'Default'
+
+
+def _edge_from_statement(statement):
+    """Predicate(Subject, Object, ...) -> (predicate, subject, object) oder None.
+
+    Gleiche Filter wie die fruehere SQL-Abfrage: keine Frequency/Count-Fakten,
+    keine NodeN-Testdaten, keine Selbstkanten, keine Ein-Zeichen-Entitaeten.
+    """
+    if len(statement) <= 10 or '(' not in statement or ')' not in statement:
+        return None
+    pred_end = statement.index('(')
+    predicate = statement[:pred_end]
+    if 'Frequency' in predicate or 'Count' in predicate:
+        return None
+
+    args = statement[pred_end + 1:statement.rindex(')')].split(',')
+    if len(args) < 2:
+        return None
+    subject = args[0].strip()
+    obj = args[1].strip()
+
+    if not subject or not obj or subject == obj:
+        return None
+    if 'Count' in subject or 'Count' in obj:
+        return None
+    if len(subject) < 2 or len(obj) < 2:
+        return None
+    if (subject.startswith('Node') and subject[4:5].isdigit()) or (obj.startswith('Node') and obj[4:5].isdigit()):
+        return None
+    return predicate, subject, obj
+
+
+def _statement_crc(statement) -> int:
+    """CRC32 eines Statements fuer den Inhaltsabgleich (NULL/leer -> 0)"""
+    return zlib.crc32(statement.encode('utf-8')) if statement else 0
+
+
+class KnowledgeGraphCache:
+    """In-Memory-Adjazenzstruktur ueber der facts-Tabelle.
+
+    Entities und Praedikate werden auf Integer-IDs abgebildet, Kanten liegen
+    als parallele array('i')-Spalten (src, dst, pred) vor. Neue Fakten werden
+    per rowid-Watermark nachgelesen; Loeschungen kommen ueber forget() oder,
+    falls ein fremder Prozess geloescht hat, ueber einen Count-Abgleich mit
+    anschliessendem Neuaufbau. Fremde UPDATEs (gleiche rowid, gleiche Anzahl)
+    erkennt eine CRC-Summe der Statements, geprueft nur wenn ``PRAGMA
+    data_version`` der dauerhaften Lese-Verbindung einen fremden Commit meldet.
+    """
+
+    def __init__(self, db_path: str, sync_interval: float = 1.0, chunk_size: int = 50000):
+        self.db_path = str(db_path)
+        self.sync_interval = sync_interval
+        self.chunk_size = chunk_size
+        self._lock = threading.RLock()
+        self._reader: Optional[sqlite3.Connection] = None
+        self._data_version = None
+        self._reset()
+        self.last_build_ms = 0.0
+        self.full_builds = 0
+
+    def _reset(self):
+        self._ids: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self._lower_ids: Dict[str, int] = {}
+        self._predicate_ids: Dict[str, int] = {}
+        self._predicates: List[str] = []
+        self._src = array('i')
+        self._dst = array('i')
+        self._pred = array('i')
+        self._alive = bytearray()
+        self._edge_by_statement: Dict[str, int] = {}
+        self._adjacency: List[List[int]] = []
+        self._rows = 0
+        self._crc = 0
+        self._watermark = 0
+        self._dead_edges = 0
+        self._weights = None
+        self._loaded = False
+        self._last_sync = 0.0
+
+    # ------------------------------------------------------------------
+    # Aufbau und Synchronisation
+    # ------------------------------------------------------------------
+
+    def _intern(self, entity: str) -> int:
+        node = self._ids.get(entity)
+        if node is None:
+            node = len(self._labels)
+            self._ids[entity] = node
+            self._labels.append(entity)
+            self._lower_ids.setdefault(entity.lower(), node)
+            self._adjacency.append([])
+        return node
+
+    def _add(self, statement: str) -> bool:
+        if statement in self._edge_by_statement:
+            return False
+        parsed = _edge_from_statement(statement)
+        if parsed is None:
+            return False
+        predicate, subject, obj = parsed
+        pid = self._predicate_ids.get(predicate)
+        if pid is None:
+            pid = len(self._predicates)
+            self._predicate_ids[predicate] = pid
+            self._predicates.append(predicate)
+        src = self._intern(subject)
+        dst = self._intern(obj)
+        edge = len(self._src)
+        self._src.append(src)
+        self._dst.append(dst)
+        self._pred.append(pid)
+        self._alive.append(1)
+        self._edge_by_statement[statement] = edge
+        self._adjacency[src].append(edge)
+        self._adjacency[dst].append(edge)
+        self._weights = None
+        return True
+
+    def _ingest(self, conn, after: int) -> int:
+        last = after
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, statement FROM facts WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last, self.chunk_size)
+            ).fetchall()
+            if not rows:
+                return last
+            for _, statement in rows:
+                self._add(statement)
+                self._crc += _statement_crc(statement)
+            self._rows += len(rows)
+            last = rows[-1][0]
+
+    def _rebuild(self, conn):
+        started = time.perf_counter()
+        self._reset()
+        self._watermark = self._ingest(conn, 0)
+        self._loaded = True
+        self.full_builds += 1
+        self.last_build_ms = round((time.perf_counter() - started) * 1000, 1)
+        print(f"[Graph] Built graph cache: {len(self._labels)} nodes, "
+              f"{self.edge_count} edges from {self._rows} facts in {self.last_build_ms}ms")
+
+    def sync(self, force: bool = False):
+        """Watermark-Sync: neue rowids nachlesen, bei Abweichung neu aufbauen."""
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded and not force and now - self._last_sync < self.sync_interval:
+                return
+            if self._reader is None:
+                uri = f"file:{Path(self.db_path).resolve().as_posix()}?mode=ro"
+                self._reader = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                self._reader.create_function("stmt_crc", 1, _statement_crc, deterministic=True)
+            conn = self._reader
+            version, = conn.execute("PRAGMA data_version").fetchone()
+            if force or not self._loaded or self._dead_edges > max(1000, len(self._src) // 4):
+                self._rebuild(conn)
+            elif version != self._data_version:
+                self._watermark = self._ingest(conn, self._watermark)
+                count, crc = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(stmt_crc(statement)), 0) FROM facts").fetchone()
+                if count != self._rows or crc != self._crc:
+                    # Fremde Loeschungen/UPDATEs oder wiederverwendete rowids: nur ein Neuaufbau ist sicher
+                    self._rebuild(conn)
+            self._data_version = version
+            self._last_sync = time.monotonic()
+
+    def forget(self, statement: str):
+        """Geloeschten Fakt austragen, ohne den Cache neu aufzubauen."""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._rows -= 1
+            self._crc -= _statement_crc(statement)
+            edge = self._edge_by_statement.pop(statement, None)
+            if edge is None:
+                return
+            self._alive[edge] = 0
+            self._dead_edges += 1
+            for node in (self._src[edge], self._dst[edge]):
+                try:
+                    self._adjacency[node].remove(edge)
+                except ValueError:
+                    pass
+            self._weights = None
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._src) - self._dead_edges
+
+    # ------------------------------------------------------------------
+    # Auswahl
+    # ------------------------------------------------------------------
+
+    def _resolve_focus(self, focus: str, max_seeds: int = 20) -> List[int]:
+        node = self._ids.get(focus)
+        if node is None:
+            node = self._lower_ids.get(focus.lower())
+        if node is not None:
+            return [node]
+        needle = focus.lower()
+        seeds = [i for i, label in enumerate(self._labels) if needle in label.lower() and self._adjacency[i]]
+        seeds.sort(key=lambda i: len(self._adjacency[i]), reverse=True)
+        return seeds[:max_seeds]
+
+    def _ego_edges(self, seeds: List[int], depth: int, limit: int) -> List[int]:
+        """k-Hop-Umgebung per BFS, bis limit Kanten gesammelt sind."""
+        seen_nodes = set(seeds)
+        seen_edges = set()
         edges = []
-        node_id_map = {}
-        current_id = 0
-        
-        for (statement,) in facts:
-            try:
-                if '(' not in statement or ')' not in statement:
-                    continue
-                    
-                pred_end = statement.index('(')
-                predicate = statement[:pred_end]
-                
-                if 'Frequency' in predicate or 'Count' in predicate:
-                    continue
-                
-                args_str = statement[pred_end+1:statement.rindex(')')].strip()
-                args = [arg.strip() for arg in args_str.split(',')]
-                
-                if len(args) >= 2:
-                    subject = args[0]
-                    obj = args[1]
-                    
-                    if not subject or not obj or subject == obj:
-                        continue
-                    if 'Count' in subject or 'Count' in obj:
+        frontier = seeds
+        for _ in range(max(1, depth)):
+            next_frontier = []
+            for node in frontier:
+                for edge in self._adjacency[node]:
+                    if edge in seen_edges:
                         continue
-                    if len(subject) < 2 or len(obj) < 2:
-                        continue
-                    
-                    # Create/update nodes
-                    for entity in [subject, obj]:
-                        if entity not in node_id_map:
-                            node_id_map[entity] = current_id
-                            current_id += 1
-                            
-                            category = get_category(entity)
-                            nodes[entity] = {
-                                'id': node_id_map[entity],
-                                'label': entity,
-                                'value': 1,
-                                'group': category,
-                                'color': colors[category],
-                                'title': f"{entity}\nConnections: 1"
-                            }
-                        else:
-                            nodes[entity]['value'] += 1
-                            nodes[entity]['title'] = f"{entity}\nConnections: {nodes[entity]['value']}"
-                    
-                    # Create edge
-                    edges.append({
-                        'from': node_id_map[subject],
-                        'to': node_id_map[obj],
-                        'label': predicate,
-                        'title': f"{predicate}({subject}, {obj})",
-                        'color': {
-                            'color': 'rgba(150,150,150,0.5)',
-                            'highlight': '#4444ff',
-                            'hover': '#6666ff'
-                        },
-                        'width': 2,
-                        'arrows': 'to'
-                    })
-                    
-            except Exception:
-                continue
-        
-        conn.close()
-        
-        # Adjust node sizes
-        nodes_list = list(nodes.values())
-        for node in nodes_list:
-            connections = node['value']
-            if connections > 10:
-                node['size'] = 30
-            elif connections > 5:
-                node['size'] = 25
+                    seen_edges.add(edge)
+                    edges.append(edge)
+                    if len(edges) >= limit:
+                        return edges
+                    other = self._dst[edge] if self._src[edge] == node else self._src[edge]
+                    if other not in seen_nodes:
+                        seen_nodes.add(other)
+                        next_frontier.append(other)
+            frontier = next_frontier
+            if not frontier:
+                break
+        return edges
+
+    def _sample_edges(self, limit: int, rng: random.Random) -> List[int]:
+        """Gradgewichtete Stichprobe: Knoten ~ deg^2, dann eine inzidente Kante.
+
+        Damit wird jede Kante mit Gewicht deg(src) + deg(dst) gezogen, Hubs
+        und ihre Nachbarschaft bleiben im Ausschnitt sichtbar.
+        """
+        if self.edge_count <= limit:
+            return [e for e in range(len(self._src)) if self._alive[e]]
+        if self._weights is None:
+            self._weights = list(accumulate(len(adj) ** 2 for adj in self._adjacency))
+        nodes = range(len(self._adjacency))
+        picked = {}
+        for _ in range(8):
+            for node in rng.choices(nodes, cum_weights=self._weights, k=limit - len(picked)):
+                picked.setdefault(rng.choice(self._adjacency[node]), None)
+            if len(picked) >= limit:
+                break
+        return list(picked)[:limit]
+
+    def _render(self, edges: List[int]) -> Dict:
+        nodes = {}
+        edge_list = []
+        for edge in edges:
+            src, dst = self._src[edge], self._dst[edge]
+            for node in (src, dst):
+                if node not in nodes:
+                    label = self._labels[node]
+                    degree = len(self._adjacency[node])
+                    category = get_category(label)
+                    nodes[node] = {
+                        'id': node,
+                        'label': label,
+                        'value': degree,
+                        'group': category,
+                        'color': CATEGORY_COLORS[category],
+                        'title': f"{label}\nConnections: {degree}",
+                        'size': 30 if degree > 10 else 25 if degree > 5 else 20
+                    }
+            predicate = self._predicates[self._pred[edge]]
+            edge_list.append({
+                'from': src,
+                'to': dst,
+                'label': predicate,
+                'title': f"{predicate}({self._labels[src]}, {self._labels[dst]})",
+                'color': EDGE_COLOR,
+                'width': 2,
+                'arrows': 'to'
+            })
+        return {'nodes': list(nodes.values()), 'edges': edge_list}
+
+    def generate(self, limit: int = 500, focus: Optional[str] = None,
+                 depth: int = 1, seed: Optional[int] = None) -> Dict:
+        started = time.perf_counter()
+        self.sync()
+        with self._lock:
+            limit = max(1, int(limit))
+            if focus:
+                edges = self._ego_edges(self._resolve_focus(str(focus)), int(depth), limit)
             else:
-                node['size'] = 20
-        
+                edges = self._sample_edges(limit, random.Random(seed))
+            graph = self._render(edges)
+            graph_nodes, graph_edges = len(self._labels), self.edge_count
+        nodes_list = graph['nodes']
         return {
             'success': True,
             'nodes': nodes_list,
-            'edges': edges,
+            'edges': graph['edges'],
             'stats': {
                 'total_nodes': len(nodes_list),
-                'total_edges': len(edges),
-                'categories': dict(Counter(n['group'] for n in nodes_list))
+                'total_edges': len(graph['edges']),
+                'categories': dict(Counter(n['group'] for n in nodes_list)),
+                'graph_nodes': graph_nodes,
+                'graph_edges': graph_edges,
+                'generation_ms': round((time.perf_counter() - started) * 1000, 2)
             },
             'generated_at': datetime.now().isoformat()
         }
-        
+
+
+_graph_caches: Dict[str, KnowledgeGraphCache] = {}
+_graph_caches_lock = threading.Lock()
+
+
+def get_graph_cache(db_path="hexagonal_kb.db") -> KnowledgeGraphCache:
+    """Prozessweiter Cache pro Datenbankdatei"""
+    key = str(Path(db_path).resolve())
+    with _graph_caches_lock:
+        cache = _graph_caches.get(key)
+        if cache is None:
+            cache = _graph_caches[key] = KnowledgeGraphCache(key)
+        return cache
+
+
+def forget_fact(db_path, statement):
+    """Loeschung an einen bereits geladenen Cache weiterreichen"""
+    cache = _graph_caches.get(str(Path(db_path).resolve()))
+    if cache is not None:
+        cache.forget(statement)
+
+
+def generate_knowledge_graph(db_path="hexagonal_kb.db", limit=500, focus=None, depth=1, seed=None):
+    """Generate knowledge graph data for API endpoint"""
+    try:
+        return get_graph_cache(db_path).generate(limit=limit, focus=focus, depth=depth, seed=seed)
     except Exception as e:
         return {
             'success': False,
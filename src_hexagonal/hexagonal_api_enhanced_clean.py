@@ -40,7 +40,7 @@ except ImportError:
     print("[WARNING] Eventlet not found. WebSocket may hang under load.")
 # --- End of Patching ---
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
 from typing import Dict, Any, Optional
 import time
@@ -51,6 +51,9 @@ import shutil
 import uuid
 import sqlite3
 import json
+import base64
+import csv
+import io
 from functools import wraps
 from dotenv import load_dotenv
 try:
@@ -92,6 +95,31 @@ def require_api_key(f):
     return decorated_function
 
 
+# Fact format accepted by the write endpoints: Predicate(Entity1, Entity2, ...).
+FACT_FORMAT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*\([^,\)]+,\s*[^\)]+\)\.$")
+MAX_FACT_BATCH = 50000
+MAX_REASON_BATCH = 20000
+MAX_PAGE_SIZE = 10000  # keyset pages of /api/facts and export chunks
+
+# --- Opaque keyset cursor tokens (resumable pagination/export) ---
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(f"k1:{position}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: Optional[str]) -> Optional[int]:
+    """Decode a cursor token; empty token means 'from the start'. Raises ValueError."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        prefix, _, value = raw.partition(':')
+        if prefix != 'k1':
+            raise ValueError
+        return int(value)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {token}")
+
+
 # Add src_hexagonal to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -111,6 +139,7 @@ from src_hexagonal.llm_governor_integration_fixed import integrate_llm_governor
 from src_hexagonal.application.transactional_governance_engine import TransactionalGovernanceEngine
 from src_hexagonal.application.governance_monitor import probe_sqlite
 from adapters.hallucination_prevention_adapter import create_hallucination_prevention_adapter
+from adapters.explanation_cache import ExplanationCache
 
 
 
@@ -204,6 +233,11 @@ class HexagonalAPI:
             print(f"[WARNING] Hallucination Prevention failed to initialize: {e}")
             self.hallucination_adapter = None
 
+        # LLM-Erklärungen: LRU/TTL-Cache mit SQLite-Tier (HAKGAL_EXPLAIN_CACHE_*)
+        self.explanation_cache = ExplanationCache.from_env(default_db=str(self.hex_root / 'explanation_cache.db'))
+        if self.explanation_cache:
+            print(f"[OK] Explanation cache enabled ({self.explanation_cache.stats()['entries']} entries warm)")
+
         
         # Initialize Application Services
         self.fact_service = FactManagementService(
@@ -503,7 +537,16 @@ class HexagonalAPI:
             
             if self.governor:
                 base_status['governor'] = self.governor.get_status()
-            
+
+            if hasattr(self.fact_repository, 'pool_stats'):
+                base_status['sqlite_pool'] = self.fact_repository.pool_stats()
+
+            if hasattr(self.reasoning_engine, 'cache_stats'):
+                base_status['reasoning_cache'] = self.reasoning_engine.cache_stats()
+
+            if self.explanation_cache:
+                base_status['explanation_cache'] = self.explanation_cache.stats()
+
             if self.llm_governor_integration:
                 base_status['llm_governor'] = {
                     'available': True,
@@ -531,6 +574,24 @@ class HexagonalAPI:
         def get_facts():
             """GET /api/facts - Get all facts"""
             limit = request.args.get('limit', 100, type=int)
+
+            # Keyset pagination: ?cursor= (empty = first page), follow next_cursor
+            if 'cursor' in request.args:
+                try:
+                    after = decode_cursor(request.args.get('cursor'))
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+                if limit < 1:
+                    return jsonify({'error': 'limit must be >= 1'}), 400
+                limit = min(limit, MAX_PAGE_SIZE)
+                page = self.fact_service.get_facts_page(after, limit)
+                return jsonify({
+                    'facts': [f.to_dict() for _, f in page],
+                    'count': len(page),
+                    'total': self.fact_repository.count(),
+                    'next_cursor': encode_cursor(page[-1][0]) if page and len(page) >= limit else None
+                })
+
             facts = self.fact_service.get_all_facts(limit)
             
             return jsonify({
@@ -573,6 +634,57 @@ class HexagonalAPI:
                 'statement': statement
             }), status_code
 
+        @self.app.route('/api/facts/batch', methods=['POST'])
+        # # # # # @require_api_key
+        def add_facts_batch():
+            """POST /api/facts/batch - Add many facts in one transaction
+
+            Body: {"facts": ["Pred(A, B).", {"statement": ..., "context": {...}}, ...], "context": {...}}
+            """
+            data = request.get_json(silent=True)
+            items = data.get('facts') if isinstance(data, dict) else data
+            if not isinstance(items, list) or not items:
+                return jsonify({'error': 'Missing facts list'}), 400
+            if len(items) > MAX_FACT_BATCH:
+                return jsonify({'error': f'Batch too large (max {MAX_FACT_BATCH})'}), 413
+
+            # Same format rule as POST /api/facts, applied to the whole batch up front
+            batch = []
+            rejected = {}
+            for i, item in enumerate(items):
+                statement = item.get('statement') if isinstance(item, dict) else item
+                statement = statement.strip() if isinstance(statement, str) else ''
+                if statement and not statement.endswith('.'):
+                    statement = statement + '.'
+                if not FACT_FORMAT.match(statement):
+                    rejected[i] = {'statement': statement, 'success': False, 'status': 'invalid',
+                                   'message': 'Invalid fact format. Expected Predicate(Entity1, Entity2).'}
+                else:
+                    batch.append((i, item))
+
+            context = data.get('context') if isinstance(data, dict) else None
+            accepted = self.fact_service.add_facts([item for _, item in batch], context or {})
+            results = [None] * len(items)
+            for (i, _), result in zip(batch, accepted):
+                results[i] = result
+            for i, result in rejected.items():
+                results[i] = result
+
+            added = sum(1 for r in results if r['status'] == 'added')
+            if self.websocket_adapter and added:
+                self.websocket_adapter.emit_facts_batch_added(added, len(items))
+
+            return jsonify({
+                'success': True,
+                'total': len(items),
+                'added': added,
+                'exists': sum(1 for r in results if r['status'] == 'exists'),
+                'duplicates': sum(1 for r in results if r['status'] == 'duplicate'),
+                'invalid': sum(1 for r in results if r['status'] == 'invalid'),
+                'errors': sum(1 for r in results if r['status'] == 'error'),
+                'results': results
+            }), 200
+
         @self.app.route('/api/facts', methods=['DELETE'])
         # # # # # @require_api_key
         def delete_fact_api():
@@ -589,6 +701,12 @@ class HexagonalAPI:
             #     self.websocket_adapter.emit_fact_removed(statement, success)
 
             if success:
+                try:
+                    from src_hexagonal.graph_generator import forget_fact
+                    stored = statement if statement.endswith('.') else statement + '.'
+                    forget_fact(getattr(self.fact_repository, 'db_path', 'hexagonal_kb.db'), stored)
+                except Exception as e:
+                    print(f"[WARNING] Graph cache not updated: {e}")
                 return jsonify({'success': True, 'message': message}), 200
             else:
                 # e.g., fact not found
@@ -734,6 +852,54 @@ class HexagonalAPI:
             
             return jsonify(response)
 
+        @self.app.route('/api/reason/batch', methods=['POST', 'OPTIONS'])
+        def reason_batch():
+            """POST /api/reason/batch - Batched HRM scoring for many queries"""
+            if request.method == 'OPTIONS':
+                return ('', 204)
+            data = request.get_json(silent=True) or {}
+            queries = data.get('queries')
+            
+            if not isinstance(queries, list) or not queries:
+                return jsonify({'error': 'Missing queries (non-empty list expected)'}), 400
+            if len(queries) > MAX_REASON_BATCH:
+                return jsonify({'error': f'Batch too large (max {MAX_REASON_BATCH})'}), 413
+            if not all(isinstance(q, str) and q.strip() for q in queries):
+                return jsonify({'error': 'All queries must be non-empty strings'}), 400
+            
+            start_time = time.time()
+            results = self.reasoning_service.reason_batch([q.strip() for q in queries])
+            duration_ms = (time.time() - start_time) * 1000
+            
+            items = []
+            for result in results:
+                item = {
+                    'query': result.query,
+                    'confidence': result.confidence,
+                    'reasoning_terms': result.reasoning_terms,
+                    'success': result.success,
+                    'high_confidence': result.is_high_confidence()
+                }
+                if result.metadata and 'device' in result.metadata:
+                    item['device'] = result.metadata['device']
+                items.append(item)
+            
+            return jsonify({
+                'results': items,
+                'count': len(items),
+                'duration_ms': duration_ms,
+                'per_query_ms': duration_ms / len(items)
+            })
+
+        @self.app.route('/api/llm/explanation-cache', methods=['GET', 'DELETE'])
+        def llm_explanation_cache():
+            """Cache-Statistik (GET) bzw. Invalidierung (DELETE, optional ?topic=...)"""
+            if not self.explanation_cache:
+                return jsonify({'enabled': False})
+            if request.method == 'DELETE':
+                self.explanation_cache.invalidate(request.args.get('topic'))
+            return jsonify({'enabled': True, **self.explanation_cache.stats()})
+
         @self.app.route('/api/llm/get-explanation', methods=['POST'])
         def llm_get_explanation():
             """
@@ -748,6 +914,25 @@ class HexagonalAPI:
             payload = request.get_json(silent=True) or {}
             topic = payload.get('topic') or payload.get('query') or ''
             context_facts = payload.get('context_facts') or []
+            use_cache = self.explanation_cache is not None and not payload.get('no_cache')
+            
+            if use_cache:
+                cached = self.explanation_cache.get(topic, context_facts)
+                if cached:
+                    actual_time = time.time() - start_time
+                    print(f"[LLM] Cache hit ({cached['match']}) for '{topic[:60]}' in {actual_time * 1000:.1f}ms")
+                    return jsonify({
+                        'status': 'success',
+                        'explanation': cached['explanation'],
+                        'suggested_facts': cached['suggested_facts'],
+                        'llm_provider': 'cache',
+                        'cached_provider': cached['llm_provider'],
+                        'cache_match': cached['match'],
+                        'cache_similarity': cached['similarity'],
+                        'cache_age_s': cached['age_s'],
+                        'response_time': f'{round(actual_time, 3)}s',
+                        'response_time_ms': round(actual_time * 1000, 1)
+                    })
                 
             prompt = (
                 f"Query: {topic}\n\n"
@@ -900,6 +1085,12 @@ class HexagonalAPI:
                 actual_time = round(time.time() - start_time, 2)
                 print(f"[LLM] Total response time: {actual_time}s")
                 
+                # Keine Fehlertexte cachen (MultiLLM "None", Fehlerstrings des direkten Ollama-Fallbacks)
+                if use_cache and llm_used not in (None, 'None') and \
+                        not explanation.startswith(('Ollama ', 'Error:')):
+                    self.explanation_cache.put(topic, context_facts, explanation, suggested, llm_used,
+                                               generation_ms=int(actual_time * 1000))
+                
                 return jsonify({
                     'status': 'success',
                     'explanation': explanation,
@@ -931,14 +1122,21 @@ class HexagonalAPI:
                 data = request.get_json(silent=True) or {}
                 limit = data.get('limit', 500)
                 focus = data.get('focus', None)
+                depth = data.get('depth', 1)
                 
-                # Generate graph data
+                # Generate graph data from the cached in-memory graph
                 graph_data = generate_knowledge_graph(
-                    db_path="hexagonal_kb.db",
+                    db_path=getattr(self.fact_repository, 'db_path', 'hexagonal_kb.db'),
                     limit=limit,
-                    focus=focus
+                    focus=focus,
+                    depth=depth,
+                    seed=data.get('seed')
                 )
                 
+                if graph_data.get('success') and data.get('html') is False:
+                    # JSON only: no HTML file round-trip
+                    return jsonify(graph_data)
+                
                 if graph_data.get('success'):
                     # Generate HTML file
                     html_content = generate_graph_html(graph_data)
@@ -956,6 +1154,7 @@ class HexagonalAPI:
                         'message': 'Graph generated successfully',
                         'nodes': len(graph_data.get('nodes', [])),
                         'edges': len(graph_data.get('edges', [])),
+                        'stats': graph_data.get('stats', {}),
                         'path': '/knowledge_graph.html'
                     })
                 else:
@@ -1062,10 +1261,56 @@ class HexagonalAPI:
 
         @self.app.route('/api/facts/export', methods=['GET'])
         def export_facts():
-            """Export facts for autopilot/boosting"""
+            """Export facts for autopilot/boosting
+
+            json/text: up to `limit` facts (default 100).
+            jsonl/ndjson/csv: streamed in chunks with constant memory; without
+            `limit` the whole KB. Every row carries its cursor - pass the last
+            one back as ?cursor=... to resume an interrupted export.
+            """
+            format_type = request.args.get('format', 'json').lower()
+
+            if format_type in ('jsonl', 'ndjson', 'csv'):
+                limit = request.args.get('limit', None, type=int)
+                chunk_size = max(1, min(request.args.get('chunk_size', 1000, type=int), MAX_PAGE_SIZE))
+                try:
+                    after = decode_cursor(request.args.get('cursor'))
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+                rows = self.fact_service.iter_facts(after=after, limit=limit, chunk_size=chunk_size)
+
+                def generate():
+                    buf = io.StringIO()
+                    writer = csv.writer(buf) if format_type == 'csv' else None
+                    if writer:
+                        writer.writerow(['cursor', 'statement', 'confidence'])
+                    for position, fact in rows:
+                        token = encode_cursor(position)
+                        if writer:
+                            writer.writerow([token, fact.statement, fact.confidence])
+                        else:
+                            buf.write(json.dumps({
+                                'statement': fact.statement,
+                                'confidence': fact.confidence,
+                                'cursor': token
+                            }, ensure_ascii=False))
+                            buf.write('\n')
+                        if buf.tell() >= 65536:
+                            yield buf.getvalue()
+                            buf.seek(0)
+                            buf.truncate()
+                    if buf.tell():
+                        yield buf.getvalue()
+
+                mimetype = 'text/csv' if format_type == 'csv' else 'application/x-ndjson'
+                extension = 'csv' if format_type == 'csv' else 'jsonl'
+                return Response(
+                    stream_with_context(generate()),
+                    mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=facts_export.{extension}'}
+                )
+
             limit = request.args.get('limit', 100, type=int)
-            format_type = request.args.get('format', 'json')
-            
             facts = self.fact_service.get_all_facts(limit)
             
             if format_type == 'json':
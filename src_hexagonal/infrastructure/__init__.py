@@ -4,6 +4,10 @@ Infrastructure Layer - Hexagonal Architecture
 Nach HAK/GAL Verfassung: Technical Adapters
 """
 
-from .sentry_monitoring import SentryMonitoring
+try:
+    from .sentry_monitoring import SentryMonitoring
+except ImportError:
+    # sentry-sdk is optional; keep the rest of the package importable
+    SentryMonitoring = None
 
 __all__ = ['SentryMonitoring']
@@ -7,25 +7,56 @@ import threading
 import time
 import queue
 from contextlib import contextmanager
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Iterable
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# PRAGMAs applied exactly once per pooled connection (not per checkout)
+DEFAULT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=10000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=30000",  # 30 second timeout
+)
+
+
 class SQLiteConnectionPool:
     """
     Connection pool for SQLite with retry logic and WAL mode
     Handles database locking issues gracefully
+
+    - Bounded: never more than ``pool_size`` open connections
+    - PRAGMAs are applied once when a connection is created
+    - Idle connections are health-checked (SELECT 1) before reuse
+    - Wait/checkout metrics are exposed via ``stats()``
     """
     
-    def __init__(self, db_path: str, pool_size: int = 5, timeout: float = 30.0):
+    def __init__(self, db_path: str, pool_size: int = 5, timeout: float = 30.0,
+                 uri: bool = False, pragmas: Optional[Iterable[str]] = None,
+                 health_check_interval: float = 30.0):
         self.db_path = db_path
-        self.pool_size = pool_size
+        self.pool_size = max(1, int(pool_size))
         self.timeout = timeout
-        self._connections = queue.Queue(maxsize=pool_size)
+        self.uri = uri
+        self.pragmas = tuple(pragmas) if pragmas is not None else DEFAULT_PRAGMAS
+        self.health_check_interval = health_check_interval
+        self._connections = queue.LifoQueue(maxsize=self.pool_size)
         self._lock = threading.Lock()
         self._created_connections = 0
+        self._last_used: Dict[int, float] = {}
+        self._metrics = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total_ms': 0.0,
+            'wait_time_max_ms': 0.0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+        }
         
         # Initialize pool
         self._initialize_pool()
@@ -33,25 +64,109 @@ class SQLiteConnectionPool:
     def _initialize_pool(self):
         """Initialize the connection pool with WAL mode"""
         # Create first connection to set WAL mode
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=MEMORY")
-        conn.execute("PRAGMA busy_timeout=30000")  # 30 second timeout
-        conn.commit()
-        self._connections.put(conn)
-        self._created_connections = 1
+        conn = self._create_connection()
+        with self._lock:
+            self._created_connections = 1
+        self._release(conn)
         
         logger.info(f"Connection pool initialized with WAL mode for {self.db_path}")
     
     def _create_connection(self) -> sqlite3.Connection:
-        """Create a new database connection"""
-        conn = sqlite3.connect(self.db_path, timeout=self.timeout)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA busy_timeout=30000")
+        """Create a new database connection and apply PRAGMAs once"""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                   uri=bool(self.uri), check_same_thread=False)
+        except TypeError:
+            # Older sqlite3 without uri kw support
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for pragma in self.pragmas:
+            try:
+                conn.execute(pragma)
+            except sqlite3.OperationalError as e:
+                # e.g. journal_mode on a read-only database
+                logger.debug(f"{pragma} skipped: {e}")
+        conn.commit()
+        with self._lock:
+            self._metrics['connections_created'] += 1
         return conn
+
+    def _discard(self, conn: Optional[sqlite3.Connection]):
+        """Close a broken connection and free its slot"""
+        if conn is None:
+            return
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+            self._created_connections = max(0, self._created_connections - 1)
+            self._metrics['connections_closed'] += 1
+
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool"""
+        with self._lock:
+            self._last_used[id(conn)] = time.monotonic()
+        try:
+            self._connections.put_nowait(conn)
+        except queue.Full:
+            # Pool was reset (close_all) while this connection was checked out
+            self._discard(conn)
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Run SELECT 1 on connections that sat idle longer than the check interval"""
+        idle_since = self._last_used.get(id(conn), 0.0)
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            with self._lock:
+                self._metrics['health_check_failures'] += 1
+            return False
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, create one if below pool_size, otherwise wait"""
+        while True:
+            try:
+                conn = self._connections.get_nowait()
+            except queue.Empty:
+                create = False
+                with self._lock:
+                    if self._created_connections < self.pool_size:
+                        self._created_connections += 1
+                        create = True
+                if create:
+                    try:
+                        conn = self._create_connection()
+                    except Exception:
+                        with self._lock:
+                            self._created_connections -= 1
+                        raise
+                    with self._lock:
+                        self._metrics['checkouts'] += 1
+                    return conn
+                else:
+                    started = time.perf_counter()
+                    try:
+                        conn = self._connections.get(timeout=self.timeout)
+                    except queue.Empty:
+                        with self._lock:
+                            self._metrics['timeouts'] += 1
+                        raise sqlite3.OperationalError(
+                            f"Connection pool exhausted after {self.timeout}s (size={self.pool_size})"
+                        )
+                    waited_ms = (time.perf_counter() - started) * 1000
+                    with self._lock:
+                        self._metrics['waits'] += 1
+                        self._metrics['wait_time_total_ms'] += waited_ms
+                        self._metrics['wait_time_max_ms'] = max(self._metrics['wait_time_max_ms'], waited_ms)
+            if self._is_healthy(conn):
+                with self._lock:
+                    self._metrics['checkouts'] += 1
+                return conn
+            self._discard(conn)
     
     @contextmanager
     def get_connection(self, max_retries: int = 3):
@@ -62,51 +177,39 @@ class SQLiteConnectionPool:
             with pool.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(...)
+
+        Open transactions are committed on success and rolled back on error,
+        mirroring ``with sqlite3.connect(...) as conn``.
         """
         connection = None
         attempts = 0
         
-        while attempts < max_retries:
+        while connection is None:
             try:
-                # Try to get connection from pool
-                if self._connections.empty() and self._created_connections < self.pool_size:
-                    with self._lock:
-                        if self._created_connections < self.pool_size:
-                            connection = self._create_connection()
-                            self._created_connections += 1
-                else:
-                    connection = self._connections.get(timeout=self.timeout)
-                
-                # Test connection
-                connection.execute("SELECT 1")
-                
-                yield connection
-                
-                # Return connection to pool
-                self._connections.put(connection)
-                return
-                
+                connection = self._acquire()
             except sqlite3.OperationalError as e:
                 attempts += 1
-                if "database is locked" in str(e):
+                if "database is locked" in str(e) and attempts < max_retries:
                     logger.warning(f"Database locked, retry {attempts}/{max_retries}")
                     time.sleep(0.1 * attempts)  # Exponential backoff
-                    
-                    if connection:
-                        try:
-                            connection.close()
-                        except:
-                            pass
-                        self._created_connections -= 1
-                        connection = None
-                else:
-                    raise
-            except Exception as e:
-                if connection:
-                    self._connections.put(connection)
+                    continue
                 raise
         
-        raise sqlite3.OperationalError(f"Database locked after {max_retries} retries")
+        try:
+            yield connection
+            if connection.in_transaction:
+                connection.commit()
+        except BaseException:
+            try:
+                connection.rollback()
+            except sqlite3.Error:
+                # Connection is unusable - do not hand it out again
+                self._discard(connection)
+                raise
+            self._release(connection)
+            raise
+        else:
+            self._release(connection)
     
     def execute_with_retry(self, query: str, params: tuple = (), max_retries: int = 3) -> Any:
         """
@@ -115,8 +218,28 @@ class SQLiteConnectionPool:
         with self.get_connection(max_retries) as conn:
             cursor = conn.cursor()
             result = cursor.execute(query, params)
+            rows = result.fetchall()
             conn.commit()
-            return result.fetchall()
+            return rows
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool utilisation and wait metrics"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            created = self._created_connections
+        idle = self._connections.qsize()
+        metrics['wait_time_avg_ms'] = (
+            round(metrics['wait_time_total_ms'] / metrics['waits'], 3) if metrics['waits'] else 0.0
+        )
+        metrics['wait_time_total_ms'] = round(metrics['wait_time_total_ms'], 3)
+        metrics['wait_time_max_ms'] = round(metrics['wait_time_max_ms'], 3)
+        metrics.update({
+            'pool_size': self.pool_size,
+            'open_connections': created,
+            'idle_connections': idle,
+            'in_use_connections': max(0, created - idle),
+        })
+        return metrics
     
     def close_all(self):
         """Close all connections in the pool"""
@@ -127,7 +250,9 @@ class SQLiteConnectionPool:
             except:
                 pass
         
-        self._created_connections = 0
+        with self._lock:
+            self._created_connections = 0
+            self._last_used.clear()
         logger.info("All connections closed")
 
 
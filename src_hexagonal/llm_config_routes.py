@@ -171,5 +171,22 @@ def init_llm_config_routes(app):
         
         return jsonify({'success': True})
 
+    @app.route('/api/llm/health', methods=['GET'])
+    def llm_provider_health():
+        """Circuit-breaker state, EWMA latency and error rates per provider"""
+        # Gleicher Modulpfad wie /api/llm/get-explanation, sonst zweites Registry
+        try:
+            from adapters.llm_providers import PROVIDER_HEALTH, load_llm_config
+        except ImportError:
+            from src_hexagonal.adapters.llm_providers import PROVIDER_HEALTH, load_llm_config
+
+        providers = PROVIDER_HEALTH.snapshot()
+        return jsonify({
+            'routing': load_llm_config().get('routing', 'latency'),
+            'order': PROVIDER_HEALTH.order(list(providers)),
+            'failure_threshold': PROVIDER_HEALTH.failure_threshold,
+            'providers': providers
+        })
+
 # Add this to your main app initialization:
 # init_llm_config_routes(app)
@@ -0,0 +1,490 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Near-Duplicate Index (MinHash-LSH)
+==================================
+Gemeinsame Near-Duplicate-Engine fuer das MCP-Tool ``analyze_duplicates``
+und den SemanticDuplicateDetector.
+
+- Shingles: Woerter + Wort-Bigramme (lowercase), Aehnlichkeit = Jaccard
+- MinHash-Signaturen vektorisiert in NumPy (``(a*x + b) mod p``), Banding
+  (b Baender x r Zeilen) passend zum Schwellwert gewaehlt
+- pro Band sortierte Schluessel-Arrays: alle Kandidatenpaare in
+  O(N log N), Einzelabfrage per ``searchsorted``
+- Kandidaten werden mit dem exakten Jaccard verifiziert
+- Band-Schluessel werden in einer SQLite-Datei neben der KB persistiert
+  (``<kb>.lsh.db``) und per rowid-Watermark inkrementell ergaenzt
+- ``PRAGMA data_version`` einer dauerhaften Lese-Verbindung meldet fremde
+  Commits; dann vergleichen COUNT(*) und CRC-Summe die DB mit dem Index,
+  der Abgleich erkennt auch UPDATEs und wiederverwendete rowids
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+_PRIME = np.uint64((1 << 31) - 1)
+_MIX = np.uint64(1000003)
+_WORD = re.compile(r'\w+')
+
+
+def shingles(statement: str) -> set:
+    """Woerter und Wort-Bigramme, damit HasPart(A, B) != HasPart(B, A)"""
+    words = _WORD.findall(statement.lower())
+    result = set(words)
+    result.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return result or {statement.lower()}
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / max(1, len(a | b))
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) mit minimaler Summe aus False-Positive- und False-Negative-Flaeche"""
+    grid, step = np.linspace(0.0, 1.0, 201, retstep=True)
+    best, best_error = (num_perm, 1), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        prob = 1.0 - (1.0 - grid ** rows) ** bands
+        below = grid <= threshold
+        error = (prob[below].sum() + (1.0 - prob[~below]).sum()) * step
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateIndex:
+    """MinHash-LSH ueber der facts-Tabelle mit persistierten Band-Schluesseln"""
+
+    def __init__(self, db_path: str, sync_interval: float = 1.0, threshold: Optional[float] = None,
+                 num_perm: Optional[int] = None, index_path: Optional[str] = None, seed: int = 1):
+        self.db_path = str(db_path)
+        self.sync_interval = sync_interval
+        self.threshold = float(threshold if threshold is not None else os.environ.get('HAKGAL_LSH_THRESHOLD', '0.6'))
+        self.num_perm = int(num_perm or os.environ.get('HAKGAL_LSH_NUM_PERM', '64'))
+        self.bands, self.rows = optimal_bands(self.threshold, self.num_perm)
+        self.max_window = int(os.environ.get('HAKGAL_LSH_MAX_WINDOW', '64'))
+        if index_path is None:
+            index_path = os.environ.get('HAKGAL_LSH_INDEX_DB', f"{self.db_path}.lsh.db")
+        self.index_path = index_path or None
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), self.num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, int(_PRIME), self.num_perm).astype(np.uint64)[:, None]
+
+        self._lock = threading.RLock()
+        self._reader: Optional[sqlite3.Connection] = None
+        self._data_version = None
+        self._reset()
+        self.stats_counters = {'full_builds': 0, 'loaded_from_disk': 0, 'ingested': 0, 'candidate_pairs': 0}
+
+    # ------------------------------------------------------------------
+    # Signaturen
+    # ------------------------------------------------------------------
+
+    def band_keys(self, statements: List[str], chunk: int = 5000) -> np.ndarray:
+        """(n, bands) uint64 Band-Schluessel fuer eine Liste von Statements"""
+        out = np.empty((len(statements), self.bands), dtype=np.uint64)
+        for start in range(0, len(statements), chunk):
+            part = statements[start:start + chunk]
+            hashed = [[zlib.crc32(s.encode('utf-8')) for s in shingles(st)] for st in part]
+            lengths = np.fromiter((len(h) for h in hashed), dtype=np.int64, count=len(hashed))
+            flat = np.fromiter((x for h in hashed for x in h), dtype=np.uint64, count=int(lengths.sum()))
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            values = (self._a * flat[None, :] + self._b) % _PRIME
+            signature = np.minimum.reduceat(values, offsets, axis=1).T
+            keys = np.zeros((len(part), self.bands), dtype=np.uint64)
+            for band in range(self.bands):
+                for col in range(band * self.rows, (band + 1) * self.rows):
+                    keys[:, band] = keys[:, band] * _MIX + signature[:, col]
+            out[start:start + len(part)] = keys
+        return out
+
+    @staticmethod
+    def _statement_hash(statement: str) -> int:
+        return zlib.crc32(statement.encode('utf-8'))
+
+    # ------------------------------------------------------------------
+    # Persistenz
+    # ------------------------------------------------------------------
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        if not self.index_path:
+            return None
+        try:
+            conn = sqlite3.connect(self.index_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS lsh_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS lsh_rows ("
+                         "fact_rowid INTEGER PRIMARY KEY, stmt_hash INTEGER NOT NULL, keys BLOB NOT NULL)")
+            return conn
+        except sqlite3.Error as e:
+            print(f"[LSH] Index file unavailable ({e}) - keeping the index in memory only")
+            self.index_path = None
+            return None
+
+    def _params(self) -> str:
+        return f"v1:{self.num_perm}:{self.bands}:{self.rows}"
+
+    def _load_from_disk(self) -> bool:
+        conn = self._disk()
+        if conn is None:
+            return False
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM lsh_meta"))
+            if meta.get('params') != self._params():
+                with conn:
+                    conn.execute("DELETE FROM lsh_rows")
+                    conn.execute("INSERT OR REPLACE INTO lsh_meta VALUES ('params', ?)", (self._params(),))
+                    conn.execute("INSERT OR REPLACE INTO lsh_meta VALUES ('watermark', '0')")
+                return False
+            rows = conn.execute("SELECT fact_rowid, stmt_hash, keys FROM lsh_rows ORDER BY fact_rowid").fetchall()
+        finally:
+            conn.close()
+        if rows:
+            self._append(np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)),
+                         np.fromiter((r[1] for r in rows), dtype=np.uint32, count=len(rows)),
+                         np.frombuffer(b''.join(r[2] for r in rows), dtype=np.uint64).reshape(len(rows), self.bands))
+        self._watermark = int(meta.get('watermark', 0))
+        self.stats_counters['loaded_from_disk'] += 1
+        return True
+
+    def _persist(self, rowids, hashes, keys, watermark: int):
+        conn = self._disk()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO lsh_rows (fact_rowid, stmt_hash, keys) VALUES (?, ?, ?)",
+                    [(int(r), int(h), k.tobytes()) for r, h, k in zip(rowids, hashes, keys)]
+                )
+                conn.execute("INSERT OR REPLACE INTO lsh_meta VALUES ('watermark', ?)", (str(watermark),))
+        except sqlite3.Error as e:
+            print(f"[LSH] Index persist failed: {e}")
+        finally:
+            conn.close()
+
+    def _persist_delete(self, rowids):
+        conn = self._disk()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.executemany("DELETE FROM lsh_rows WHERE fact_rowid = ?", [(int(r),) for r in rowids])
+        except sqlite3.Error as e:
+            print(f"[LSH] Index persist failed: {e}")
+        finally:
+            conn.close()
+
+    def _persist_clear(self):
+        conn = self._disk()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute("DELETE FROM lsh_rows")
+                conn.execute("INSERT OR REPLACE INTO lsh_meta VALUES ('params', ?)", (self._params(),))
+                conn.execute("INSERT OR REPLACE INTO lsh_meta VALUES ('watermark', '0')")
+        except sqlite3.Error as e:
+            print(f"[LSH] Index persist failed: {e}")
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Aufbau und Synchronisation
+    # ------------------------------------------------------------------
+
+    def _reset(self):
+        self._n = 0
+        self._fact_rowids = np.zeros(0, dtype=np.int64)
+        self._hashes = np.zeros(0, dtype=np.uint32)
+        self._keys = np.zeros((0, self.bands), dtype=np.uint64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._sorted = None
+        self._sorted_n = 0
+        self._watermark = 0
+        self._loaded = False
+        self._reconcile = False
+        self._last_sync = 0.0
+
+    def _append(self, rowids: np.ndarray, hashes: np.ndarray, keys: np.ndarray):
+        n, extra = self._n, len(rowids)
+        if n + extra > len(self._fact_rowids):
+            capacity = max(1024, 2 * (n + extra))
+            grow = capacity - len(self._fact_rowids)
+            self._fact_rowids = np.concatenate((self._fact_rowids, np.zeros(grow, dtype=np.int64)))
+            self._hashes = np.concatenate((self._hashes, np.zeros(grow, dtype=np.uint32)))
+            self._keys = np.concatenate((self._keys, np.zeros((grow, self.bands), dtype=np.uint64)))
+            self._alive = np.concatenate((self._alive, np.zeros(grow, dtype=bool)))
+        self._fact_rowids[n:n + extra] = rowids
+        self._hashes[n:n + extra] = hashes
+        self._keys[n:n + extra] = keys
+        self._alive[n:n + extra] = True
+        self._n += extra
+
+    def _ingest(self, pairs: List[Tuple[int, str]]):
+        for start in range(0, len(pairs), 50000):
+            part = pairs[start:start + 50000]
+            rowids = np.fromiter((p[0] for p in part), dtype=np.int64, count=len(part))
+            hashes = np.fromiter((self._statement_hash(p[1]) for p in part), dtype=np.uint32, count=len(part))
+            keys = self.band_keys([p[1] for p in part])
+            self._append(rowids, hashes, keys)
+            self._watermark = max(self._watermark, int(rowids.max()))
+            self._persist(rowids, hashes, keys, self._watermark)
+            self.stats_counters['ingested'] += len(part)
+
+    def _open_reader(self) -> sqlite3.Connection:
+        uri = f"file:{Path(self.db_path).resolve().as_posix()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.create_function("stmt_crc", 1, lambda s: self._statement_hash(s) if s else 0, deterministic=True)
+        return conn
+
+    def _close_reader(self):
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = None
+        self._data_version = None
+
+    def sync(self, force: bool = False):
+        """Watermark-Sync; nach fremden Commits bei COUNT(*)- oder CRC-Abweichung Abgleich."""
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded and not force and now - self._last_sync < self.sync_interval:
+                return
+            if not self._loaded:
+                if not self._load_from_disk():
+                    self.stats_counters['full_builds'] += 1
+                self._loaded = True
+            if self._reader is None:
+                self._reader = self._open_reader()
+            conn = self._reader
+            version, = conn.execute("PRAGMA data_version").fetchone()
+            if force or self._reconcile or version != self._data_version:
+                new = conn.execute(
+                    "SELECT rowid, statement FROM facts WHERE rowid > ? AND statement IS NOT NULL "
+                    "AND length(statement) > 0 ORDER BY rowid", (self._watermark,)
+                ).fetchall()
+                if new:
+                    self._ingest(new)
+                count, crc = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(stmt_crc(statement)), 0) FROM facts "
+                    "WHERE statement IS NOT NULL AND length(statement) > 0"
+                ).fetchone()
+                alive = self._alive[:self._n]
+                if force or self._reconcile or count != int(alive.sum()) \
+                        or crc != int(self._hashes[:self._n][alive].sum(dtype=np.uint64)):
+                    self._reconcile_rowids(conn)
+            self._data_version = version
+            self._last_sync = time.monotonic()
+
+    def _reconcile_rowids(self, conn: sqlite3.Connection):
+        rows = conn.execute(
+            "SELECT rowid, stmt_crc(statement) FROM facts WHERE statement IS NOT NULL "
+            "AND length(statement) > 0 ORDER BY rowid").fetchall()
+        kb_rowids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        kb_hashes = np.fromiter((r[1] for r in rows), dtype=np.uint32, count=len(rows))
+        n = self._n
+        alive = self._alive[:n]
+        gone = alive & ~np.isin(self._fact_rowids[:n], kb_rowids)
+        if len(kb_rowids):
+            # Gleiche rowid, anderer Inhalt (fremdes UPDATE, Delete+Insert): austragen und neu einlesen
+            at = np.minimum(np.searchsorted(kb_rowids, self._fact_rowids[:n]), len(kb_rowids) - 1)
+            gone |= alive & (kb_rowids[at] == self._fact_rowids[:n]) & (kb_hashes[at] != self._hashes[:n])
+        if gone.any():
+            self._persist_delete(self._fact_rowids[:n][gone])
+            alive[gone] = False
+        missing = np.setdiff1d(kb_rowids, self._fact_rowids[:n][alive])
+        for start in range(0, len(missing), 900):
+            chunk = missing[start:start + 900].tolist()
+            rows = conn.execute(
+                f"SELECT rowid, statement FROM facts WHERE rowid IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            if rows:
+                self._ingest(rows)
+        self._sorted = None
+        self._reconcile = False
+
+    def mark_stale(self):
+        with self._lock:
+            self._last_sync = 0.0
+
+    def invalidate(self):
+        """DB komplett ersetzt (Restore): rowids passen nicht mehr - Speicher und
+        ``lsh_rows`` verwerfen, naechster Zugriff baut neu auf."""
+        with self._lock:
+            self._close_reader()
+            self._reset()
+            self._persist_clear()
+
+    def _positions_of(self, statement: str) -> np.ndarray:
+        n = self._n
+        return np.flatnonzero(self._alive[:n] & (self._hashes[:n] == self._statement_hash(statement)))
+
+    def forget(self, statement: str):
+        """Geloeschten Fakt austragen; bei Hash-Kollision entscheidet der naechste Abgleich."""
+        with self._lock:
+            if not self._loaded:
+                return
+            positions = self._positions_of(statement)
+            if len(positions) != 1:
+                self._reconcile = True
+                return
+            self._alive[positions[0]] = False
+            self._persist_delete(self._fact_rowids[positions])
+
+    def replace(self, old: str, new: str):
+        """UPDATE behaelt die rowid: Schluessel der Zeile in-place ersetzen."""
+        with self._lock:
+            if not self._loaded:
+                return
+            positions = self._positions_of(old)
+            if len(positions) != 1:
+                self._reconcile = True
+                return
+            pos = positions[0]
+            self._hashes[pos] = self._statement_hash(new)
+            self._keys[pos] = self.band_keys([new])[0]
+            self._sorted = None
+            self._persist(self._fact_rowids[positions], self._hashes[positions], self._keys[positions],
+                          self._watermark)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def _ensure_sorted(self, full: bool = False):
+        """Pro Band sortierte Schluessel; neue Zeilen bleiben bis zu einer Schwelle als Tail."""
+        tail = self._n - self._sorted_n
+        if self._sorted is None or full and tail or tail > max(50000, self._sorted_n // 8):
+            keys = self._keys[:self._n]
+            self._sorted = []
+            for band in range(self.bands):
+                order = np.argsort(keys[:, band], kind='stable')
+                self._sorted.append((keys[order, band], order))
+            self._sorted_n = self._n
+
+    def _statements_for(self, positions: np.ndarray) -> Dict[int, str]:
+        rowids = self._fact_rowids[positions]
+        by_rowid = {}
+        uri = f"file:{Path(self.db_path).resolve().as_posix()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            for start in range(0, len(rowids), 900):
+                chunk = rowids[start:start + 900].tolist()
+                by_rowid.update(conn.execute(
+                    f"SELECT rowid, statement FROM facts WHERE rowid IN ({','.join('?' * len(chunk))})", chunk))
+        finally:
+            conn.close()
+        return {int(pos): by_rowid.get(int(rowid)) for pos, rowid in zip(positions, rowids)}
+
+    def candidate_pairs(self) -> np.ndarray:
+        """(k, 2) Positionspaare, die in mindestens einem Band kollidieren.
+
+        Grosse Buckets werden nur innerhalb eines Fensters von ``max_window``
+        Nachbarn gepaart, damit schiefe Verteilungen linear bleiben.
+        """
+        self._ensure_sorted(full=True)
+        alive = self._alive[:self._n]
+        encoded = []
+        for sorted_keys, order in self._sorted:
+            live = alive[order]
+            sorted_keys, order = sorted_keys[live], order[live]
+            if len(order) < 2:
+                continue
+            group = np.concatenate(([0], np.cumsum(sorted_keys[1:] != sorted_keys[:-1])))
+            for offset in range(1, self.max_window + 1):
+                same = group[offset:] == group[:-offset]
+                if not same.any():
+                    break
+                a, b = order[:-offset][same], order[offset:][same]
+                encoded.append(np.minimum(a, b).astype(np.int64) * self._n + np.maximum(a, b))
+        if not encoded:
+            return np.zeros((0, 2), dtype=np.int64)
+        unique = np.unique(np.concatenate(encoded))
+        self.stats_counters['candidate_pairs'] = len(unique)
+        return np.stack((unique // self._n, unique % self._n), axis=1)
+
+    def find_pairs(self, threshold: float, max_pairs: Optional[int] = None) -> List[Tuple[float, str, str]]:
+        """Alle Paare mit Jaccard >= threshold, absteigend sortiert"""
+        self.sync()
+        with self._lock:
+            pairs = self.candidate_pairs()
+            if not len(pairs):
+                return []
+            statements = self._statements_for(np.unique(pairs))
+        cache: Dict[int, set] = {}
+        found = []
+        for i, j in pairs.tolist():
+            a, b = statements.get(i), statements.get(j)
+            if a is None or b is None:
+                continue
+            sa = cache.get(i)
+            if sa is None:
+                sa = cache[i] = shingles(a)
+            sb = cache.get(j)
+            if sb is None:
+                sb = cache[j] = shingles(b)
+            sim = jaccard(sa, sb)
+            if sim >= threshold:
+                found.append((sim, a, b))
+        found.sort(reverse=True)
+        return found[:max_pairs] if max_pairs else found
+
+    def check(self, statement: str, threshold: float, limit: int = 5) -> List[Tuple[float, str]]:
+        """Near-Duplicates eines (neuen) Statements, z.B. vor dem Einfuegen"""
+        self.sync()
+        keys = self.band_keys([statement])[0]
+        with self._lock:
+            self._ensure_sorted()
+            hits = []
+            for band, (sorted_keys, order) in enumerate(self._sorted):
+                lo, hi = np.searchsorted(sorted_keys, keys[band], side='left'), \
+                    np.searchsorted(sorted_keys, keys[band], side='right')
+                hits.append(order[lo:hi])
+            if self._n > self._sorted_n:
+                tail = np.flatnonzero((self._keys[self._sorted_n:self._n] == keys).any(axis=1)) + self._sorted_n
+                hits.append(tail)
+            positions = np.unique(np.concatenate(hits)) if hits else np.zeros(0, dtype=np.int64)
+            positions = positions[self._alive[positions]]
+            statements = self._statements_for(positions) if len(positions) else {}
+        own = shingles(statement)
+        found = [(jaccard(own, shingles(other)), other) for other in statements.values()
+                 if other is not None and other != statement]
+        found = [item for item in found if item[0] >= threshold]
+        found.sort(reverse=True)
+        return found[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'facts': int(self._alive[:self._n].sum()),
+                'threshold': self.threshold,
+                'num_perm': self.num_perm,
+                'bands': self.bands,
+                'rows_per_band': self.rows,
+                'index_path': self.index_path,
+                **self.stats_counters,
+            }
+
+
+_INDEXES: Dict[str, NearDuplicateIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_duplicate_index(db_path) -> NearDuplicateIndex:
+    key = str(Path(db_path).resolve())
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = NearDuplicateIndex(key)
+        return index
@@ -5,6 +5,10 @@ Semantic Duplicate Detection Service
 ====================================
 Detects semantically similar facts using sentence embeddings and FAISS indexing.
 Ready for integration with real embedding models when Opus 4.1 design is complete.
+
+Embeddings are computed in batches; syntactic near-duplicates over the full
+KB (all pairs, and the insert-time check) come from the shared MinHash-LSH
+index in near_duplicate_index.py.
 """
 
 import time
@@ -16,6 +20,11 @@ import json
 import sqlite3
 from pathlib import Path
 
+try:
+    from .near_duplicate_index import get_duplicate_index
+except ImportError:
+    from near_duplicate_index import get_duplicate_index
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -64,40 +73,46 @@ class SemanticDuplicateDetector:
             self.model_ready = False
             logger.warning("SentenceTransformer not available - using mock embeddings")
     
-    def _get_mock_embedding(self, text: str) -> np.ndarray:
-        """Generate mock embedding for testing"""
+    def _get_mock_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate mock embeddings for testing (one row per text)"""
         # Simple hash-based mock embedding
         import hashlib
-        hash_obj = hashlib.md5(text.encode())
-        hash_bytes = hash_obj.digest()
+        digests = b''.join(hashlib.md5(text.encode()).digest() for text in texts)
+        hash_bytes = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), 16)
         
-        # Convert to numpy array of correct dimension
-        embedding = np.zeros(self.embedding_dim)
-        for i in range(min(len(hash_bytes), self.embedding_dim)):
-            embedding[i] = (hash_bytes[i] - 128) / 128.0  # Normalize to [-1, 1]
+        # Convert to numpy array of correct dimension, normalized to [-1, 1]
+        embeddings = np.zeros((len(texts), self.embedding_dim))
+        width = min(16, self.embedding_dim)
+        embeddings[:, :width] = (hash_bytes[:, :width].astype(np.float64) - 128) / 128.0
         
         # Add some noise for realism
-        noise = np.random.normal(0, 0.1, self.embedding_dim)
-        embedding += noise
+        embeddings += np.random.normal(0, 0.1, embeddings.shape)
         
         # Normalize
-        embedding = embedding / np.linalg.norm(embedding)
-        
-        return embedding
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    
+    def _get_mock_embedding(self, text: str) -> np.ndarray:
+        """Generate mock embedding for testing"""
+        return self._get_mock_embeddings([text])[0]
+    
+    def _get_embeddings(self, texts: List[str], batch_size: int = 256) -> np.ndarray:
+        """Get embeddings for many texts in batches (real or mock)"""
+        if not texts:
+            return np.zeros((0, self.embedding_dim), dtype='float32')
+        if self.model_ready and self.model:
+            return np.asarray(self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True))
+        return self._get_mock_embeddings(texts)
     
     def _get_embedding(self, text: str) -> np.ndarray:
         """Get embedding for text (real or mock)"""
-        if self.model_ready and self.model:
-            return self.model.encode([text])[0]
-        else:
-            return self._get_mock_embedding(text)
+        return self._get_embeddings([text])[0]
     
     def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """Calculate cosine similarity between two embeddings"""
         return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
     
-    def load_facts_from_db(self, limit: int = 1000) -> List[Tuple[str, str]]:
-        """Load facts from database for indexing"""
+    def load_facts_from_db(self, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Load facts from database for indexing (all facts unless limit is given)"""
         facts = []
         try:
             with sqlite3.connect(self.db_path) as conn:
@@ -106,7 +121,7 @@ class SemanticDuplicateDetector:
                     SELECT statement, statement FROM facts 
                     ORDER BY rowid DESC 
                     LIMIT ?
-                """, (limit,))
+                """, (limit if limit is not None else -1,))
                 
                 facts = cursor.fetchall()
                 logger.info(f"Loaded {len(facts)} facts from database")
@@ -129,21 +144,15 @@ class SemanticDuplicateDetector:
             faiss_available = False
             logger.warning("FAISS not available - using simple similarity search")
         
-        embeddings = []
-        fact_ids = []
-        
         logger.info(f"Building index for {len(facts)} facts...")
         
-        for fact_id, fact_text in facts:
-            embedding = self._get_embedding(fact_text)
-            embeddings.append(embedding)
-            fact_ids.append(fact_id)
-            
-            # Cache for later use
-            self.facts_cache[fact_id] = fact_text
-            self.embeddings_cache[fact_id] = embedding
+        fact_ids = [fact_id for fact_id, _ in facts]
+        embeddings_array = self._get_embeddings([fact_text for _, fact_text in facts]).astype('float32')
         
-        embeddings_array = np.array(embeddings).astype('float32')
+        # Cache for later use
+        for i, (fact_id, fact_text) in enumerate(facts):
+            self.facts_cache[fact_id] = fact_text
+            self.embeddings_cache[fact_id] = embeddings_array[i]
         
         if faiss_available:
             # Build FAISS index
@@ -191,7 +200,11 @@ class SemanticDuplicateDetector:
         
         # Get embedding for the input fact
         fact_embedding = self._get_embedding(fact)
-        
+        return self._check_embedding(fact, fact_embedding, index_data, start_time)
+    
+    def _check_embedding(self, fact: str, fact_embedding: np.ndarray, index_data: Dict[str, Any],
+                         start_time: float) -> DuplicateResult:
+        """Top-5 search for one precomputed embedding"""
         if index_data.get("faiss_available"):
             # Use FAISS for fast search
             distances, indices = index_data["index"].search(
@@ -205,20 +218,15 @@ class SemanticDuplicateDetector:
             similarities = np.clip(similarities, 0, 1)  # Ensure valid range
             
         else:
-            # Use simple numpy search
+            # Use simple numpy search (one matrix-vector product)
             embeddings = index_data["embeddings"]
-            similarities = []
-            indices = []
-            
-            for i, stored_embedding in enumerate(embeddings):
-                sim = self._cosine_similarity(fact_embedding, stored_embedding)
-                similarities.append(sim)
-                indices.append(i)
-            
-            # Sort by similarity
-            sorted_pairs = sorted(zip(similarities, indices), reverse=True)
-            similarities = [pair[0] for pair in sorted_pairs[:5]]
-            indices = [pair[1] for pair in sorted_pairs[:5]]
+            norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(fact_embedding)
+            all_similarities = embeddings @ fact_embedding / np.maximum(norms, 1e-12)
+            k = min(5, len(all_similarities))
+            top = np.argpartition(-all_similarities, k - 1)[:k] if k else np.arange(0)
+            top = top[np.argsort(-all_similarities[top])]
+            similarities = [float(all_similarities[i]) for i in top]
+            indices = [int(i) for i in top]
         
         # Check if highest similarity exceeds threshold
         max_similarity = similarities[0] if similarities else 0.0
@@ -256,14 +264,29 @@ class SemanticDuplicateDetector:
         return result
     
     def batch_check_duplicates(self, facts: List[str], index_data: Dict[str, Any]) -> List[DuplicateResult]:
-        """Check multiple facts for duplicates"""
-        results = []
-        
-        for fact in facts:
-            result = self.check_duplicate(fact, index_data)
-            results.append(result)
-        
-        return results
+        """Check multiple facts for duplicates (embeddings computed in one batch)"""
+        if not index_data.get("success"):
+            return [self.check_duplicate(fact, index_data) for fact in facts]
+        embeddings = self._get_embeddings(facts)
+        return [self._check_embedding(fact, embedding, index_data, time.time())
+                for fact, embedding in zip(facts, embeddings)]
+    
+    def find_duplicate_pairs(self, threshold: Optional[float] = None, max_pairs: int = 200) -> List[Tuple[float, str, str]]:
+        """All near-duplicate pairs over the full KB (MinHash-LSH, exact Jaccard)"""
+        return get_duplicate_index(self.db_path).find_pairs(threshold or self.threshold, max_pairs)
+    
+    def check_new_fact(self, fact: str, threshold: Optional[float] = None) -> DuplicateResult:
+        """Insert-time check against the LSH index, no embedding needed"""
+        start_time = time.time()
+        matches = get_duplicate_index(self.db_path).check(fact, threshold or self.threshold, limit=3)
+        return DuplicateResult(
+            fact=fact,
+            is_duplicate=bool(matches),
+            similarity_score=matches[0][0] if matches else 0.0,
+            similar_fact=matches[0][1] if matches else None,
+            detection_time_ms=int((time.time() - start_time) * 1000),
+            metadata={"method": "minhash_lsh", "matches": matches}
+        )
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get detection statistics"""
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test suite for the group-commit audit writer
+"""
+
+import unittest
+import tempfile
+import threading
+import json
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+from application.audit_logger import HardenedAuditLogger, read_last_lines
+
+
+class TestAuditGroupCommit(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.audit = HardenedAuditLogger(project_root=Path(self.temp_dir), filename='audit.jsonl')
+
+    def tearDown(self):
+        self.audit.writer.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_concurrent_entries_keep_chain(self):
+        def writer(n):
+            for i in range(50):
+                self.audit.log('test.event', {'writer': n, 'i': i})
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertTrue(self.audit.verify_integrity())
+        entries = [json.loads(line) for line in self.audit.path.read_text().splitlines()]
+        self.assertEqual(len(entries), 401)
+        for prev, curr in zip(entries, entries[1:]):
+            self.assertEqual(curr['prev_hash'], prev['entry_hash'])
+        stats = self.audit.writer.stats()
+        self.assertEqual(stats['entries'], 400)
+        self.assertLessEqual(stats['fsyncs'], 400)
+
+    def test_async_future_and_reload(self):
+        futures = [self.audit.log_async('test.async', {'i': i}) for i in range(20)]
+        hashes = [f.result(timeout=5) for f in futures]
+        self.assertEqual(json.loads(read_last_lines(self.audit.path, 1)[0])['entry_hash'], hashes[-1])
+
+        reopened = HardenedAuditLogger(project_root=Path(self.temp_dir), filename='audit.jsonl')
+        self.assertEqual(reopened._last_hash, hashes[-1])
+
+    def test_read_last_lines_spans_blocks(self):
+        path = Path(self.temp_dir) / 'lines.jsonl'
+        path.write_text('\n'.join('x' * 5000 + str(i) for i in range(5)) + '\n')
+        self.assertEqual(read_last_lines(path, 2, block_size=1024), [b'x' * 5000 + b'3', b'x' * 5000 + b'4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
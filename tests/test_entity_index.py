@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test suite for the MCP entity adjacency index
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+
+from entity_index import EntityIndex, parse_fact
+
+
+class TestEntityIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY)")
+        self.add("HasPart(Computer, CPU).", "IsA(CPU, Processor).", "IsA(Processor, Chip).",
+                 "HasPart(Computer, Memory).", "IsA(Water, Liquid).", "Uses(Car, f(Fuel, Diesel)).")
+        self.index = EntityIndex(self.db_path, sync_interval=0)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def add(self, *statements):
+        self.conn.executemany("INSERT INTO facts (statement) VALUES (?)", [(s,) for s in statements])
+        self.conn.commit()
+
+    def test_parse_nested_arguments(self):
+        self.assertEqual(parse_fact("Uses(Car, f(Fuel, Diesel))."), ("Uses", ["Car", "f(Fuel, Diesel)"]))
+        self.assertEqual(parse_fact("no fact"), (None, []))
+
+    def test_related_hops_and_chain(self):
+        self.assertEqual(self.index.facts_for("computer"), ["HasPart(Computer, CPU).", "HasPart(Computer, Memory)."])
+        # Praedikatnamen matchen wie frueher LIKE %entity%
+        self.assertEqual(self.index.facts_for("HasPart"), ["HasPart(Computer, CPU).", "HasPart(Computer, Memory)."])
+        self.assertEqual(self.index.facts_for("isa", limit=2), ["IsA(CPU, Processor).", "IsA(Processor, Chip)."])
+        rows, truncated = self.index.neighbourhood("Computer", depth=2)
+        self.assertEqual(len(rows), 3)
+        self.assertFalse(truncated)
+        self.assertEqual(self.index.chain("HasPart(Computer, CPU).", 5),
+                         ["HasPart(Computer, CPU).", "IsA(CPU, Processor).", "IsA(Processor, Chip).",
+                          "HasPart(Computer, Memory)."])
+
+    def test_isolated_and_incremental_updates(self):
+        self.assertEqual(self.index.isolated(10), ["IsA(Water, Liquid).", "Uses(Car, f(Fuel, Diesel))."])
+        self.add("IsA(Water, Molecule).")
+        self.index.mark_stale()
+        self.assertEqual(self.index.isolated(10), ["Uses(Car, f(Fuel, Diesel))."])
+
+        self.conn.execute("DELETE FROM facts WHERE statement = 'IsA(Water, Molecule).'")
+        self.conn.execute("UPDATE facts SET statement = 'Uses(Computer, Electricity).' "
+                          "WHERE statement = 'Uses(Car, f(Fuel, Diesel)).'")
+        self.conn.commit()
+        self.index.forget("IsA(Water, Molecule).")
+        self.index.replace("Uses(Car, f(Fuel, Diesel)).", "Uses(Computer, Electricity).")
+        self.assertEqual(self.index.isolated(10), ["IsA(Water, Liquid)."])
+        self.assertIn("Uses(Computer, Electricity).", self.index.facts_for("Computer"))
+        self.assertEqual(self.index.full_builds, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test suite for the /api/llm/get-explanation response cache
+"""
+
+import unittest
+import os
+import sys
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+from adapters.explanation_cache import ExplanationCache, context_hash
+
+
+def word_embedder(texts):
+    """Bag-of-words Ersatz fuer das Embedding-Modell"""
+    vocab = ['water', 'liquid', 'boil', 'fire', 'ice', 'temperature']
+    return np.array([[float(w in t.split()) for w in vocab] + [0.1] for t in texts])
+
+
+class TestExplanationCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'explanation_cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_exact_hit_persists_and_expires(self):
+        cache = ExplanationCache(max_entries=2, ttl=3600, disk_path=self.db_path)
+        facts = ['IsA(Water, Liquid).', 'HasProperty( Water ,Wet )']
+        self.assertIsNone(cache.get('What is water?', facts))
+        cache.put('What is water?', facts, 'Water is a liquid.', ['IsA(Water, Liquid).'], 'Groq', 2500)
+
+        hit = cache.get('  what is   WATER ', list(reversed(['HasProperty(Water, Wet)', 'IsA(Water, Liquid)'])))
+        self.assertEqual((hit['explanation'], hit['llm_provider'], hit['match']),
+                         ('Water is a liquid.', 'Groq', 'exact'))
+        self.assertIsNone(cache.get('What is water?', ['IsA(Ice, Solid).']))
+        self.assertNotEqual(context_hash(facts), context_hash([]))
+
+        # LRU: zwei neue Eintraege verdraengen den alten aus dem RAM, SQLite liefert ihn nach
+        cache.put('Fire', [], 'Fire is hot.', [], 'Gemini')
+        cache.put('Ice', [], 'Ice is cold.', [], 'Gemini')
+        self.assertEqual(cache.get('What is water?', facts)['suggested_facts'], ['IsA(Water, Liquid).'])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['disk_hits'], stats['misses'], stats['evictions']), (1, 1, 2, 2))
+        self.assertEqual(stats['saved_ms'], 5000)
+
+        restarted = ExplanationCache(max_entries=10, ttl=3600, disk_path=self.db_path)
+        self.assertEqual(restarted.stats()['entries'], 3)
+        self.assertEqual(restarted.get('fire', [])['explanation'], 'Fire is hot.')
+        expired = ExplanationCache(max_entries=10, ttl=0.01, disk_path=self.db_path)
+        time.sleep(0.02)
+        self.assertIsNone(expired.get('fire', []))
+
+    def test_near_duplicate_lookup_within_same_context(self):
+        cache = ExplanationCache(embed=word_embedder, similarity_threshold=0.9)
+        cache.put('why does water boil', ['IsA(Water, Liquid)'], 'Because of temperature.', [], 'Ollama')
+        hit = cache.get('why does the water boil', ['IsA(Water, Liquid)'])
+        self.assertEqual(hit['match'], 'semantic')
+        self.assertGreaterEqual(hit['similarity'], 0.9)
+        self.assertIsNone(cache.get('why does water boil', []))
+        self.assertIsNone(cache.get('why does fire burn', ['IsA(Water, Liquid)']))
+        self.assertEqual(cache.stats()['semantic_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test suite for the in-memory HRM feedback store
+"""
+
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+from core.reasoning.feedback_store import FeedbackStore
+
+
+class TestFeedbackStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / 'hrm_feedback.json'
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'history': {}, 'adjustments': {}, 'statistics': {'total_feedback': 3},
+                       'verified_queries': {}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_append_only_log_replay_and_compaction(self):
+        store = FeedbackStore(self.path, compact_every=3)
+        snapshot = self.path.read_bytes()
+        store.record_feedback('IsA(Water, Liquid)', 'positive')
+        store.record_feedback('IsA(Water, Liquid)', 'negative', 0.1)
+        self.assertEqual(self.path.read_bytes(), snapshot)
+        self.assertEqual(store.data['adjustments']['IsA(Water, Liquid)']['feedback_ratio'], 0.5)
+
+        # Zweite Instanz (anderer Prozess) sieht Snapshot + Log
+        other = FeedbackStore(self.path, compact_every=3)
+        self.assertEqual(other.data['history']['IsA(Water, Liquid)']['negative_count'], 1)
+        store.record_feedback('IsA(Fire, Hot)', 'positive')
+        self.assertEqual(store.stats()['compactions'], 1)
+        self.assertEqual(os.path.getsize(store.log_path), 0)
+
+        other.refresh()
+        self.assertIn('IsA(Fire, Hot)', other.data['history'])
+        self.assertEqual(other.data['history']['IsA(Water, Liquid)']['positive_count'], 1)
+        self.assertEqual(other.data['statistics']['total_feedback'], 3)
+
+    def test_refresh_is_stat_only_until_file_changes(self):
+        store = FeedbackStore(self.path)
+        reloads = store.stats()['reloads']
+        for _ in range(100):
+            store.refresh()
+        self.assertEqual(store.stats()['reloads'], reloads)
+
+        # Externer Schreiber (z.B. /api/feedback/verify) ersetzt den Snapshot
+        data = json.loads(self.path.read_text(encoding='utf-8'))
+        data['verified_queries']['IsA(Ice, Cold)'] = {'verified': True}
+        data['statistics']['total_feedback'] = 4
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        store.refresh()
+        self.assertIn('IsA(Ice, Cold)', store.data['verified_queries'])
+
+
+if __name__ == '__main__':
+    unittest.main()
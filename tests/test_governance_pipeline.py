@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test suite for the governance commit coalescer and decision memo
+"""
+
+import unittest
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+from application.transactional_governance_engine import (
+    TransactionalGovernanceEngine, CoalescingFactWriter, StrictAuditLogger, PrepareResult,
+    SMTVerificationTimeout
+)
+
+
+def create_facts_extended(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        'CREATE TABLE facts_extended (statement TEXT NOT NULL UNIQUE, '
+        + ', '.join(f'{c} TEXT' for c in CoalescingFactWriter.COLUMNS[1:]) + ')'
+    )
+    conn.commit()
+    conn.close()
+
+
+def row(statement):
+    data = {c: None for c in CoalescingFactWriter.COLUMNS}
+    data['statement'] = statement
+    return data
+
+
+def allowed(context, token):
+    return PrepareResult(success=True, token=token,
+                         data={'decision': {'allowed': True, 'reasons': []}, 'version': 'v3',
+                               'smt_result': {'skipped': True}})
+
+
+class TestCoalescingFactWriter(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        create_facts_extended(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_concurrently(self, writer, batches):
+        """Alle Producer starten, waehrend ein fremder Writer die DB sperrt"""
+        blocker = sqlite3.connect(self.db_path, isolation_level=None)
+        blocker.execute('BEGIN IMMEDIATE')
+        results = [None] * len(batches)
+
+        def produce(i):
+            try:
+                results[i] = writer.commit(batches[i])
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=produce, args=(i,)) for i in range(len(batches))]
+        for t in threads:
+            t.start()
+        time.sleep(0.5)
+        blocker.execute('ROLLBACK')
+        blocker.close()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_failing_batch_member_does_not_fail_the_others(self):
+        writer = CoalescingFactWriter(self.db_path, coalesce=True)
+        batches = [[row(f'IsA(Thing{i}, Object)')] for i in range(5)] + [[row(None)]]
+        results = self.run_concurrently(writer, batches)
+        self.assertEqual(results[:5], [1] * 5)
+        self.assertIsInstance(results[5], sqlite3.IntegrityError)
+        self.assertEqual(writer.stats()['isolated_retries'], 1)
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM facts_extended').fetchone()[0], 5)
+        conn.close()
+
+
+class TestGovernancePipeline(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        create_facts_extended(self.db_path)
+        self.env = mock.patch.dict(os.environ, {'GOVERNANCE_VERSION': 'v2', 'GOVERNANCE_BYPASS': ''})
+        self.env.start()
+        self.engine = TransactionalGovernanceEngine(db_path=self.db_path, coalesce_commits=True)
+        self.engine.audit_logger = StrictAuditLogger(os.path.join(self.temp_dir, 'audit.jsonl'))
+
+    def tearDown(self):
+        self.engine.audit_logger.writer.close()
+        self.env.stop()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def prepare(self, context):
+        return self.engine._prepare_governance(['IsA(Water, Liquid).'], dict(context), 'token')
+
+    def test_concurrent_callers_coalesce_into_one_commit(self):
+        blocker = sqlite3.connect(self.db_path, isolation_level=None)
+        added = []
+        with mock.patch.object(self.engine, '_decide_governance', side_effect=allowed):
+            def caller(i):
+                added.append(self.engine.governed_add_facts_atomic([f'IsA(Thing{i}, Object).'], {'caller': i}))
+
+            blocker.execute('BEGIN IMMEDIATE')
+            threads = [threading.Thread(target=caller, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            time.sleep(0.5)
+            blocker.execute('ROLLBACK')
+            for t in threads:
+                t.join()
+        blocker.close()
+        self.assertEqual(sorted(added), [1] * 8)
+        stats = self.engine.pipeline_stats()['fact_writer']
+        # Der erste Leader blockiert allein, alle anderen landen in einem gemeinsamen Commit
+        self.assertLessEqual(stats['commits'], 2)
+        self.assertEqual(stats['batches'], 8)
+        self.assertGreaterEqual(stats['max_group'], 7)
+
+    def test_memo_hits_identical_contexts_and_expires(self):
+        with mock.patch.object(self.engine, '_decide_governance', side_effect=allowed) as decide:
+            first = self.prepare({'user': 'a'})
+            second = self.prepare({'user': 'a'})
+            self.prepare({'user': 'b'})
+            self.assertEqual(decide.call_count, 2)
+            self.assertTrue(second.success)
+
+            # Treffer liefern Kopien: Mutation darf das Memo nicht veraendern
+            second.data['decision']['reasons'].append('mutated')
+            self.assertEqual(self.prepare({'user': 'a'}).data, first.data)
+
+            self.engine.GOVERNANCE_CACHE_TTL_S = 0.05
+            time.sleep(0.1)
+            self.prepare({'user': 'a'})
+            self.assertEqual(decide.call_count, 3)
+        stats = self.engine.pipeline_stats()['governance_cache']
+        self.assertEqual((stats['hits'], stats['misses']), (2, 3))
+
+    def test_smt_errors_and_timeouts_are_not_memoized(self):
+        guard = self.engine.policy_guard
+        verifier = self.engine.smt_verifier
+        with mock.patch.object(guard, 'check', return_value={'allowed': True}), \
+                mock.patch.object(verifier, 'verify_governance_decision',
+                                  side_effect=SMTVerificationTimeout('timed out')) as verify:
+            for block in (False, True):
+                with mock.patch.object(guard, 'should_block', return_value=block):
+                    self.prepare({'user': 'a'})
+                    self.prepare({'user': 'a'})
+            self.assertEqual(verify.call_count, 4)
+            verify.side_effect = RuntimeError('solver crashed')
+            self.prepare({'user': 'a'})
+            self.assertEqual(verify.call_count, 5)
+        self.assertEqual(self.engine.pipeline_stats()['governance_cache']['cached'], 0)
+
+    def test_v2_and_v3_signatures_do_not_collide(self):
+        context = {'user': 'a', 'predicates_set': ['IsA']}
+        v2 = self.engine._governance_signature(context)
+        with mock.patch.object(self.engine, '_decide_governance', side_effect=allowed) as decide:
+            self.prepare(context)
+            with mock.patch.dict(os.environ, {'GOVERNANCE_VERSION': 'v3'}):
+                self.assertNotEqual(self.engine._governance_signature(context), v2)
+                self.prepare(context)
+            self.assertEqual(decide.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
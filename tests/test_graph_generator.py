@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test suite for the cached knowledge-graph builder
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src_hexagonal.graph_generator import generate_knowledge_graph, get_graph_cache, forget_fact
+
+
+class TestKnowledgeGraphCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY, context TEXT DEFAULT '{}', "
+                          "fact_metadata TEXT DEFAULT '{}', confidence REAL DEFAULT 1.0)")
+        self.add("HasPart(Computer, CPU).", "HasPart(Computer, Memory).", "IsA(CPU, Processor).",
+                 "IsA(Processor, Chip).", "HasFrequency(CPU, 3GHz).", "IsA(Water, Liquid).")
+        self.cache = get_graph_cache(self.db_path)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def add(self, *statements):
+        self.conn.executemany("INSERT INTO facts (statement) VALUES (?)", [(s,) for s in statements])
+        self.conn.commit()
+
+    def titles(self, graph):
+        return sorted(e['title'] for e in graph['edges'])
+
+    def test_sample_and_ego_graph(self):
+        graph = generate_knowledge_graph(self.db_path, limit=100)
+        self.assertEqual(graph['stats']['total_edges'], 5)
+        self.assertNotIn("HasFrequency(CPU, 3GHz)", self.titles(graph))
+
+        one_hop = generate_knowledge_graph(self.db_path, limit=100, focus="computer")
+        self.assertEqual(self.titles(one_hop), ["HasPart(Computer, CPU)", "HasPart(Computer, Memory)"])
+        two_hop = generate_knowledge_graph(self.db_path, limit=100, focus="Computer", depth=2)
+        self.assertIn("IsA(CPU, Processor)", self.titles(two_hop))
+        self.assertNotIn("IsA(Water, Liquid)", self.titles(two_hop))
+
+    def test_incremental_updates(self):
+        generate_knowledge_graph(self.db_path)
+        self.add("Uses(Computer, Electricity).")
+        self.cache._last_sync = 0
+        graph = generate_knowledge_graph(self.db_path, focus="Computer")
+        self.assertIn("Uses(Computer, Electricity)", self.titles(graph))
+
+        self.conn.execute("DELETE FROM facts WHERE statement = 'HasPart(Computer, CPU).'")
+        self.conn.commit()
+        forget_fact(self.db_path, "HasPart(Computer, CPU).")
+        self.cache._last_sync = 0
+        graph = generate_knowledge_graph(self.db_path, focus="Computer")
+        self.assertNotIn("HasPart(Computer, CPU)", self.titles(graph))
+        self.assertEqual(self.cache.full_builds, 1)
+
+    def test_foreign_update_is_detected(self):
+        generate_knowledge_graph(self.db_path)
+        # Fremder Prozess (MCP update_fact, REST-Update): rowid und Anzahl bleiben gleich
+        self.conn.execute("UPDATE facts SET statement = 'HasPart(Computer, GPU).' "
+                          "WHERE statement = 'HasPart(Computer, Memory).'")
+        self.conn.commit()
+        self.cache._last_sync = 0
+        titles = self.titles(generate_knowledge_graph(self.db_path, focus="Computer"))
+        self.assertIn("HasPart(Computer, GPU)", titles)
+        self.assertNotIn("HasPart(Computer, Memory)", titles)
+        self.assertEqual(self.cache.full_builds, 2)
+
+        # Ohne fremden Commit kein weiterer Abgleich
+        self.cache._last_sync = 0
+        generate_knowledge_graph(self.db_path)
+        self.assertEqual(self.cache.full_builds, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test suite for batched HRM inference and the reasoning result cache
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+from core.reasoning.result_cache import ReasoningResultCache, normalize_statement
+
+try:
+    import torch  # noqa: F401
+    from core.reasoning.hrm_system import HRMSystem
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+@unittest.skipUnless(TORCH_AVAILABLE, "torch not installed")
+class TestHRMBatchReason(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hrm = HRMSystem(model_path="models/does_not_exist.pth")
+
+    def test_batch_matches_single_queries(self):
+        queries = [f"IsA(Entity{i}, Thing{i % 7})" for i in range(300)]
+        queries += ["HasPart(Computer, CPU)", "no fact here", "IsA(Water, Liquid)"]
+        cache, self.hrm.result_cache = self.hrm.result_cache, None
+        try:
+            batched = self.hrm.batch_reason(queries, chunk_size=64)
+            self.assertEqual([r['query'] for r in batched], queries)
+            for query, result in zip(queries, batched):
+                self.assertAlmostEqual(result['confidence'], self.hrm.reason(query)['confidence'], places=5)
+        finally:
+            self.hrm.result_cache = cache
+
+    def test_chunk_size_is_calibrated_once(self):
+        size = self.hrm.batch_chunk_size()
+        self.assertGreater(size, 0)
+        self.assertEqual(self.hrm.batch_chunk_size(), size)
+
+    def test_results_are_cached_until_feedback(self):
+        cache = self.hrm.result_cache
+        first = self.hrm.reason("Causes(Heat, Expansion)")['confidence']
+        hits = cache.stats()['hits']
+        self.assertEqual(self.hrm.reason("Causes( Heat ,Expansion).")['confidence'], first)
+        self.assertEqual(cache.stats()['hits'], hits + 1)
+
+        self.hrm.update_from_feedback("Causes(Heat, Expansion)", "positive")
+        self.assertIsNone(cache.get(self.hrm.model_version, "Causes(Heat, Expansion)"))
+
+
+class TestReasoningResultCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_normalization(self):
+        self.assertEqual(normalize_statement(" IsA( Water ,Liquid ). "), "IsA(Water, Liquid)")
+
+    def test_lru_eviction_and_versions(self):
+        cache = ReasoningResultCache(max_entries=2)
+        cache.put("v1", "A", 0.1)
+        cache.put("v1", "B", 0.2)
+        cache.get("v1", "A")
+        cache.put("v1", "C", 0.3)
+        self.assertIsNone(cache.get("v1", "B"))
+        self.assertEqual(cache.get("v1", "A"), 0.1)
+        self.assertIsNone(cache.get("v2", "A"))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_disk_tier_survives_restart(self):
+        path = os.path.join(self.temp_dir, 'reason_cache.db')
+        ReasoningResultCache(disk_path=path).put_many("v1", [("A", 0.4), ("B", 0.6)])
+        warm = ReasoningResultCache(disk_path=path)
+        self.assertEqual(warm.get("v1", "B"), 0.6)
+        self.assertEqual(warm.stats()['disk_hits'], 1)
+        warm.invalidate(model_version="v1")
+        self.assertIsNone(ReasoningResultCache(disk_path=path).get("v1", "A"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test suite for the indexed JSONL fact repository
+"""
+
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+from adapters.jsonl_adapter import JsonlFactRepository
+from core.domain.entities import Fact
+
+
+class TestJsonlFactRepository(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.kb_path = os.path.join(self.temp_dir, 'k_assistant.kb.jsonl')
+        with open(self.kb_path, 'w', encoding='utf-8') as f:
+            for i in range(50):
+                f.write(json.dumps({'statement': f'IsA(Entity{i}, Thing).'}) + '\n')
+            f.write('not json\n\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_index_persisted_and_extended_on_append(self):
+        repo = JsonlFactRepository(self.kb_path)
+        self.assertEqual(repo.count(), 50)
+        self.assertTrue(repo.exists('IsA(Entity7, Thing).'))
+        self.assertTrue(os.path.exists(repo.index_path))
+
+        self.assertTrue(repo.save(Fact(statement='IsA(Water, Liquid).')))
+        # Fremder Schreiber (z.B. MCP-Server) haengt direkt an die Datei an
+        with open(self.kb_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'statement': 'IsA(Ice, Solid).'}) + '\n')
+        self.assertEqual(repo.save_many([Fact(statement='IsA(Ice, Solid).'), Fact(statement='A(b).')]),
+                         [False, True])
+
+        reopened = JsonlFactRepository(self.kb_path)
+        self.assertEqual(reopened.count(), 53)
+        self.assertEqual(reopened.index_rebuilds, 0)
+        self.assertEqual([pos for pos, _ in reopened.find_after(49, 2)], [50, 51])
+        self.assertEqual([f.statement for f in reopened.find_by_query('entity4', 2)],
+                         ['IsA(Entity4, Thing).', 'IsA(Entity40, Thing).'])
+
+    def test_rewritten_file_triggers_rebuild(self):
+        repo = JsonlFactRepository(self.kb_path)
+        self.assertEqual(repo.update_statement('IsA(Entity1, Thing).', 'IsA(Entity1, Object).'), 1)
+        self.assertEqual(repo.delete_by_statement('IsA(Entity2, Thing).'), 1)
+        self.assertEqual(repo.count(), 49)
+
+        with open(self.kb_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'statement': 'IsA(Fire, Hot).'}) + '\n')
+        self.assertEqual(repo.count(), 1)
+        self.assertFalse(repo.exists('IsA(Entity1, Object).'))
+        self.assertEqual(repo.find_all()[0].statement, 'IsA(Fire, Hot).')
+        repo.close()
+
+    def test_same_size_replace_is_detected(self):
+        repo = JsonlFactRepository(self.kb_path)
+        self.assertTrue(repo.exists('IsA(Entity7, Thing).'))
+        with open(self.kb_path, 'rb') as f:
+            original = f.read()
+        # Anderer Prozess schreibt eine gleich grosse Datei und tauscht sie atomar aus
+        rewritten = b''.join(json.dumps({'statement': f'IsA(Elemen{i}, Thing).'}).encode() + b'\n' for i in range(50))
+        rewritten += b'not json\n\n'
+        self.assertEqual(len(rewritten), len(original))
+        tmp = self.kb_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(rewritten)
+        os.replace(tmp, self.kb_path)
+
+        self.assertFalse(repo.exists('IsA(Entity7, Thing).'))
+        self.assertTrue(repo.exists('IsA(Elemen7, Thing).'))
+        self.assertEqual(repo.find_all()[7].statement, 'IsA(Elemen7, Thing).')
+        self.assertEqual(repo.index_rebuilds, 1)
+        repo.close()
+
+    def test_unterminated_last_line(self):
+        with open(self.kb_path, 'w', encoding='utf-8') as f:
+            f.write('{"statement": "A(x)."}\n{"statement": "B(y)."}')
+        repo = JsonlFactRepository(self.kb_path)
+        self.assertEqual(repo.count(), 2)
+        self.assertTrue(repo.exists('B(y).'))
+        self.assertEqual([f.statement for f in repo.find_all()], ['A(x).', 'B(y).'])
+        self.assertEqual(repo.save_many([Fact(statement='B(y).'), Fact(statement='C(z).')]), [False, True])
+        with open(self.kb_path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['statement'] for line in f], ['A(x).', 'B(y).', 'C(z).'])
+
+        # Halb geschriebener Append eines fremden Schreibers wird erst nach Abschluss indexiert
+        with open(self.kb_path, 'a', encoding='utf-8') as f:
+            f.write('{"statement": "D(')
+        self.assertEqual(repo.count(), 3)
+        with open(self.kb_path, 'a', encoding='utf-8') as f:
+            f.write('w)."}\n')
+        self.assertTrue(repo.exists('D(w).'))
+
+        reopened = JsonlFactRepository(self.kb_path)
+        self.assertEqual(reopened.count(), 4)
+        self.assertEqual(reopened.index_rebuilds, 0)
+        repo.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test suite for incremental KB backups and point-in-time restore
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import time
+import shutil
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal' / 'services'))
+
+import json
+
+from kb_backup import BackupManager, BackupError, ChangeJournal
+from kb_writer import KBLock, KBWriteQueue
+from entity_index import EntityIndex
+from fact_index import get_fact_index, loaded_fact_indexes
+from kb_stats_index import KBStatsIndex
+from near_duplicate_index import NearDuplicateIndex
+from similarity_index import SimilarityIndex
+
+
+class TestKBBackup(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY)")
+        conn.executemany("INSERT INTO facts VALUES (?)", [(f"IsA(Base{i}, Thing).",) for i in range(2000)])
+        conn.commit()
+        conn.close()
+        backup_dir = os.path.join(self.temp_dir, 'backups')
+        self.journal = ChangeJournal(os.path.join(backup_dir, 'journal'))
+        self.manager = BackupManager(backup_dir, journal=self.journal, step_pages=4)
+        self.writer = KBWriteQueue(lambda: sqlite3.connect(self.db_path),
+                                   KBLock(self.db_path + '.lock'), journal=self.journal)
+
+    def tearDown(self):
+        self.writer.close()
+        self.journal.close()
+        shutil.rmtree(self.temp_dir)
+
+    def facts(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return sorted(row[0] for row in conn.execute("SELECT statement FROM facts"))
+        finally:
+            conn.close()
+
+    def test_incremental_chain_restore(self):
+        full = self.manager.backup(self.db_path, compression="gzip")
+        self.writer.execute("add", "IsA(Water, Liquid).")
+        inc = self.manager.backup(self.db_path, mode="incremental", verify=True)
+        self.assertEqual((inc["type"], inc["parent"]), ("incremental", full["id"]))
+        self.assertLess(inc["changed_pages"], inc["page_count"])
+        self.assertTrue(inc["verify"]["ok"])
+        expected = self.facts()
+
+        self.writer.execute("delete_many", [f"IsA(Base{i}, Thing)." for i in range(100)])
+        info = self.manager.restore(self.db_path, backup_id=inc["id"])
+        self.assertEqual(info["chain"], [full["id"], inc["id"]])
+        self.assertEqual(self.facts(), expected)
+
+        # Manipulierte Delta-Datei wird erkannt
+        with open(os.path.join(self.manager.backup_dir, inc["file"]), 'r+b') as f:
+            f.seek(20)
+            f.write(b'\xff\xff')
+        with self.assertRaises(BackupError):
+            self.manager.restore(self.db_path, backup_id=inc["id"])
+
+    def foreign_write(self, sql, *args):
+        """Writer ausserhalb der Queue (REST-API, Governance)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(sql, args)
+        conn.commit()
+        conn.close()
+
+    def test_point_in_time_restore_replays_journal(self):
+        self.manager.backup(self.db_path)
+        self.writer.execute("add", "IsA(Fire, Hot).")
+        self.foreign_write("UPDATE facts SET statement = 'IsA(Base1, Object).' WHERE statement = 'IsA(Base1, Thing).'")
+        self.foreign_write("INSERT INTO facts VALUES ('IsA(Steam, Gas).')")
+        time.sleep(0.02)
+        point = time.time()
+        time.sleep(0.02)
+        self.writer.execute("delete", "IsA(Fire, Hot).")
+        self.foreign_write("INSERT INTO facts VALUES ('IsA(Ice, Cold).')")
+
+        info = self.manager.restore(self.db_path, until=point)
+        facts = self.facts()
+        self.assertEqual(info["replayed_ops"], 3)
+        self.assertIn("IsA(Fire, Hot).", facts)
+        self.assertIn("IsA(Base1, Object).", facts)
+        self.assertIn("IsA(Steam, Gas).", facts)
+        self.assertNotIn("IsA(Ice, Cold).", facts)
+
+        # Ein Zeitpunkt hinter dem Restore laesst sich aus dem alten Backup nicht mehr rekonstruieren
+        with self.assertRaises(BackupError):
+            self.manager.restore(self.db_path, until=time.time())
+        # Sequenz laeuft nach dem Restore weiter, neue Writes landen wieder im Journal
+        backup = self.manager.backup(self.db_path)
+        self.foreign_write("INSERT INTO facts VALUES ('IsA(Rain, Wet).')")
+        time.sleep(0.02)
+        info = self.manager.restore(self.db_path, backup_id=backup["id"], until=time.time())
+        self.assertEqual(info["replayed_ops"], 1)
+        self.assertIn("IsA(Rain, Wet).", self.facts())
+
+    def test_point_in_time_refuses_incomplete_journal(self):
+        legacy = self.manager.backup(self.db_path)
+        entries = self.manager.entries()
+        entries[-1]["changelog_seq"] = None  # Backup aus der Zeit vor der Change-Capture
+        self.manager._save(entries)
+        with self.assertRaises(BackupError):
+            self.manager.restore(self.db_path, backup_id=legacy["id"], until=time.time())
+
+        backup = self.manager.backup(self.db_path)
+        for i in range(3):
+            self.foreign_write("INSERT INTO facts VALUES (?)", f"IsA(Gap{i}, Thing).")
+        self.writer.execute("add", "IsA(Shipped, Thing).")
+        # Verlorene Journal-Zeile -> Luecke in der Sequenz
+        _, path = self.journal.segments()[-1]
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+        self.assertEqual([json.loads(line)["op"] for line in lines], ["insert"] * 4)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(lines[:1] + lines[2:])
+        time.sleep(0.02)
+        with self.assertRaises(BackupError):
+            self.manager.restore(self.db_path, backup_id=backup["id"], until=time.time())
+        self.assertIn("IsA(Shipped, Thing).", self.facts())
+
+    def test_restore_invalidates_every_index(self):
+        self.writer.execute("add", "IsA(Dog7, Animal7).")
+        backup = self.manager.backup(self.db_path)
+        indexes = {cls: get_fact_index(cls, self.db_path)
+                   for cls in (EntityIndex, SimilarityIndex, KBStatsIndex, NearDuplicateIndex)}
+        for index in indexes.values():
+            index.sync(force=True)
+
+        # Nach dem Backup: Fakt weg, rowids werden neu vergeben
+        self.writer.execute("delete", "IsA(Dog7, Animal7).")
+        self.writer.execute("insert_many", [f"HasPart(Cat{i}, Tail{i})." for i in range(50)], True, 500)
+        for index in indexes.values():
+            index.sync(force=True)
+
+        self.manager.restore(self.db_path, backup_id=backup["id"])
+        # wie HAKGALServer._notify_facts_changed(reloaded=True)
+        for index in loaded_fact_indexes(self.db_path):
+            index.invalidate()
+
+        self.assertEqual(indexes[EntityIndex].facts_for("Dog7"), ["IsA(Dog7, Animal7)."])
+        self.assertNotIn("Cat3", dict(indexes[KBStatsIndex].top_entities(None)))
+        candidates, _, rest = indexes[SimilarityIndex].candidates("IsA(Dog7, Animal7, Extra).", 3)
+        self.assertIn("IsA(Dog7, Animal7).", candidates)
+        self.assertEqual(len(candidates) + rest, 2001)
+        near = indexes[NearDuplicateIndex].check("IsA(Dog7, Animal7, Extra).", 0.5)
+        self.assertEqual([statement for _, statement in near], ["IsA(Dog7, Animal7)."])
+        # Persistierte Band-Schluessel passen zur wiederhergestellten DB
+        reloaded = NearDuplicateIndex(self.db_path, sync_interval=0)
+        self.assertEqual(reloaded.check("IsA(Dog7, Animal7, Extra).", 0.5), near)
+        self.assertEqual(reloaded.stats()['facts'], 2001)
+
+
+if __name__ == '__main__':
+    unittest.main()
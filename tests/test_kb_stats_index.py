@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test suite for the materialized MCP KB statistics
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import json
+import shutil
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+
+from kb_stats_index import KBStatsIndex, AuditGrowth
+
+
+class TestKBStatsIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY)")
+        self.add("IsA(Water, Liquid).", "IsA(Ice, Solid).", "HasPart(Water, Hydrogen).",
+                 "ChemicalReaction(H2, O2, Water).", "broken statement")
+        self.index = KBStatsIndex(self.db_path, sync_interval=0)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def add(self, *statements):
+        self.conn.executemany("INSERT INTO facts (statement) VALUES (?)", [(s,) for s in statements])
+        self.conn.commit()
+
+    def test_counters(self):
+        self.assertEqual(self.index.top_predicates(2), [('IsA', 2), ('HasPart', 1)])
+        self.assertNotIn('Invalid', dict(self.index.top_predicates(10, include_invalid=False)))
+        self.assertEqual(self.index.top_entities(1), [('Water', 3)])
+        self.assertEqual(self.index.categories(), {'Non-Chemical': 4, 'Chemical': 1})
+        self.assertEqual(self.index.stats()['arity_histogram'], {'0': 1, '2': 3, '3': 1})
+
+    def test_incremental_updates_verify(self):
+        self.index.sync()
+        self.add("IsA(Steam, Gas).")
+        self.conn.execute("DELETE FROM facts WHERE statement = 'IsA(Ice, Solid).'")
+        self.conn.execute("UPDATE facts SET statement = 'HasPart(Water, Oxygen).' "
+                          "WHERE statement = 'HasPart(Water, Hydrogen).'")
+        self.conn.commit()
+        self.index.forget("IsA(Ice, Solid).")
+        self.index.replace("HasPart(Water, Hydrogen).", "HasPart(Water, Oxygen).")
+        self.index.mark_stale()
+        self.assertNotIn('Ice', dict(self.index.top_entities(None)))
+        self.assertTrue(self.index.verify()['ok'])
+        self.assertEqual(self.index.full_builds, 1)
+
+        # Fremdes UPDATE ohne Notification (gleiche Anzahl, gleiche rowid) erkennt schon der Sync
+        self.conn.execute("UPDATE facts SET statement = 'IsA(Fog, Gas).' WHERE statement = 'IsA(Steam, Gas).'")
+        self.conn.commit()
+        self.assertIn('Fog', dict(self.index.top_entities(None)))
+        self.assertNotIn('Steam', dict(self.index.top_entities(None)))
+        self.assertEqual(self.index.full_builds, 2)
+
+        # Delete+Insert, das die hoechste rowid wiederverwendet
+        self.conn.execute("DELETE FROM facts WHERE statement = 'IsA(Fog, Gas).'")
+        self.conn.execute("INSERT INTO facts (statement) VALUES ('IsA(Mist, Gas).')")
+        self.conn.commit()
+        self.assertIn('Mist', dict(self.index.top_entities(None)))
+        self.assertTrue(self.index.verify()['ok'])
+
+        # Abweichende Zaehler werden erkannt und repariert
+        self.index.entities['Bogus'] += 1
+        report = self.index.verify(repair=True)
+        self.assertFalse(report['ok'])
+        self.assertIn('entities', report['diffs'])
+        self.assertTrue(self.index.verify()['ok'])
+
+    def test_audit_growth_incremental(self):
+        audit = os.path.join(self.temp_dir, 'audit.log')
+        today = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(audit, 'w', encoding='utf-8') as handle:
+            handle.write(json.dumps({"ts": today, "action": "add_fact"}) + "\n")
+            handle.write(json.dumps({"ts": "2001-01-01 00:00:00", "action": "add_fact"}) + "\n")
+        growth = AuditGrowth(audit)
+        self.assertEqual(growth.per_day(30), {today[:10]: 1})
+        with open(audit, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps({"ts": today, "action": "add_fact"}) + "\n")
+            handle.write(json.dumps({"ts": today, "action": "delete_fact"}) + "\n")
+        self.assertEqual(growth.per_day(30), {today[:10]: 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test suite for the MCP single-writer queue and KB lock
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import sqlite3
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+
+from kb_writer import KBLock, KBWriteQueue
+
+
+class TestKBWriter(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY)")
+        conn.execute("INSERT INTO facts VALUES ('IsA(Water, Liquid).')")
+        conn.commit()
+        conn.close()
+        self.lock_path = self.db_path + '.lock'
+        self.writer = KBWriteQueue(lambda: sqlite3.connect(self.db_path), KBLock(self.lock_path))
+
+    def tearDown(self):
+        self.writer.close()
+        shutil.rmtree(self.temp_dir)
+
+    def facts(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return sorted(row[0] for row in conn.execute("SELECT statement FROM facts"))
+        finally:
+            conn.close()
+
+    def test_concurrent_ops_with_per_op_results(self):
+        futures = []
+        threads = [threading.Thread(target=lambda i=i: futures.append(
+            self.writer.submit("add", f"IsA(Fact{i}, Thing)."))) for i in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([f.result() for f in futures], [1] * 40)
+
+        duplicate = self.writer.submit("add", "IsA(Water, Liquid).")
+        removed = self.writer.submit("delete", "IsA(Fact0, Thing).")
+        updated = self.writer.submit("update", "IsA(Fact1, Thing).", "IsA(Fact1, Object).")
+        with self.assertRaises(sqlite3.IntegrityError):
+            duplicate.result()
+        self.assertEqual((removed.result(), updated.result()), (1, 1))
+        facts = self.facts()
+        self.assertEqual(len(facts), 40)
+        self.assertIn("IsA(Fact1, Object).", facts)
+        self.assertFalse(os.path.exists(self.lock_path))
+        self.assertEqual(self.writer.stats()['failed_ops'], 1)
+
+    def test_stale_lock_recovery(self):
+        with open(self.lock_path, 'w', encoding='utf-8') as handle:
+            json.dump({"pid": 0, "host": "elsewhere", "token": "x", "expires": time.time() - 1}, handle)
+        self.assertEqual(self.writer.execute("insert_many", ["A(b).", "A(c)."], True, 1), 2)
+        self.assertEqual(self.writer.lock.stale_recovered, 1)
+
+        # Lebender Besitzer mit gueltiger Lease: Timeout statt Uebernahme
+        holder = KBLock(self.lock_path)
+        holder.acquire()
+        waiter = KBLock(self.lock_path)
+        with self.assertRaises(RuntimeError):
+            waiter.acquire(timeout_seconds=0.1)
+        holder.release()
+        waiter.acquire(timeout_seconds=0.1)
+        waiter.release()
+
+    def test_live_holder_outlives_its_lease(self):
+        # Lokaler, lebender Besitzer: abgelaufene Lease allein macht den Lock nicht stale
+        with open(self.lock_path, 'w', encoding='utf-8') as handle:
+            json.dump({"pid": os.getpid(), "host": socket.gethostname(), "token": "x",
+                       "expires": time.time() - 1}, handle)
+        waiter = KBLock(self.lock_path, lease_seconds=0.2)
+        with self.assertRaises(RuntimeError):
+            waiter.acquire(timeout_seconds=0.1)
+        os.unlink(self.lock_path)
+
+        # Heartbeat haelt die Lease frisch, solange der Lock gehalten wird
+        holder = KBLock(self.lock_path, lease_seconds=0.2)
+        holder.acquire()
+        time.sleep(0.5)
+        with open(self.lock_path, encoding='utf-8') as handle:
+            self.assertGreater(json.load(handle)["expires"], time.time())
+        holder.release()
+        time.sleep(0.2)
+        self.assertFalse(os.path.exists(self.lock_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test suite for the hedged MultiLLMProvider chain (local stub HTTP servers)
+"""
+
+import unittest
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+import adapters.llm_providers as llm_providers
+from adapters.llm_providers import (MultiLLMProvider, OllamaProvider, PROVIDER_HEALTH,
+                                    ProviderHTTPError, load_llm_config)
+
+
+def start_stub(delay=0.0, status=200, text="A detailed stub explanation of the topic.", name="Ollama"):
+    """Ollama-compatible stub: /api/tags and /api/generate"""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, code, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._reply(200, {'models': [{'name': 'qwen2.5:7b'}]})
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(delay)
+            self._reply(status, {'response': text} if status == 200 else {'error': 'boom'})
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider = OllamaProvider()
+    provider.name = name
+    provider.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, provider
+
+
+class TestHedgedMultiLLM(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.servers = []
+        PROVIDER_HEALTH.reset()
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        PROVIDER_HEALTH.reset()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def stub(self, **kwargs):
+        server, provider = start_stub(**kwargs)
+        self.servers.append(server)
+        return provider
+
+    def write_config(self, **config):
+        with open('llm_config.json', 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+    def test_slow_primary_is_hedged(self):
+        slow = self.stub(delay=2.0, text="The slow provider answered eventually.", name="Slow")
+        fast = self.stub(text="The fast provider answered right away.", name="Fast")
+        self.write_config(hedge={'providers': 2, 'delay_s': 0.1})
+        start = time.perf_counter()
+        text, _ = MultiLLMProvider(providers=[slow, fast]).generate_response("Explain water")
+        self.assertEqual(text, "The fast provider answered right away.")
+        self.assertLess(time.perf_counter() - start, 1.5)
+
+    def test_hedging_is_opt_in(self):
+        slow = self.stub(delay=0.3, text="The slow provider answered eventually.", name="Slow")
+        fast = self.stub(text="The fast provider answered right away.", name="Fast")
+        self.write_config(routing='priority')
+        with mock.patch.dict(os.environ):
+            os.environ.pop('HAK_GAL_LLM_HEDGE_PROVIDERS', None)
+            chain = MultiLLMProvider(providers=[slow, fast])
+            self.assertEqual(chain._hedge_settings()[0], 1)
+            text, _ = chain.generate_response("Explain water")
+        # Kein zweiter (bezahlter) Request, solange der erste Provider antwortet
+        self.assertEqual(text, "The slow provider answered eventually.")
+        self.assertNotIn('Fast', PROVIDER_HEALTH.snapshot())
+
+    def test_sequential_fallback_and_config_reload(self):
+        broken = self.stub(status=500, name="Broken")
+        good = self.stub(name="Good")
+        self.write_config(hedge={'providers': 1, 'delay_s': 0.0})
+        text, _ = MultiLLMProvider(providers=[broken, good]).generate_response("Explain water")
+        self.assertEqual(text, "A detailed stub explanation of the topic.")
+
+        config = load_llm_config()
+        self.assertIs(load_llm_config(), config)
+        time.sleep(0.01)
+        self.write_config(hedge={'providers': 3, 'delay_s': 0.5})
+        os.utime('llm_config.json', ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(load_llm_config()['hedge']['providers'], 3)
+
+
+    def test_circuit_breaker_and_latency_routing(self):
+        broken = self.stub(status=500, name="Broken")
+        slow = self.stub(delay=0.3, name="Slow")
+        fast = self.stub(name="Fast")
+        with self.assertRaises(ProviderHTTPError):
+            broken.generate("Explain water")
+        PROVIDER_HEALTH.reset()
+
+        self.write_config(hedge={'providers': 1, 'delay_s': 0.0}, routing='priority')
+        chain = MultiLLMProvider(providers=[broken, slow, fast])
+        for _ in range(PROVIDER_HEALTH.failure_threshold + 1):
+            self.assertEqual(chain.generate_response("Explain water")[1], "Slow")
+        health = PROVIDER_HEALTH.snapshot()
+        self.assertEqual(health['Broken']['state'], 'open')
+        # Offener Breaker: kein weiterer Request an Broken
+        self.assertEqual(health['Broken']['failures'], PROVIDER_HEALTH.failure_threshold)
+        self.assertNotIn('Fast', health)
+
+        # Latenzrouting: gemessener schneller Provider zuerst, offene Breaker zuletzt
+        self.write_config(hedge={'providers': 1, 'delay_s': 0.0})
+        os.utime('llm_config.json', ns=(time.time_ns(), time.time_ns() + 10**9))
+        chain._call_provider(fast, "Fast", "Explain water")
+        self.assertEqual([chain._name(p) for p in chain._get_enabled_providers()],
+                         ["Fast", "Slow", "Broken"])
+        self.assertEqual(chain.generate_response("Explain water")[1], "Fast")
+
+    def half_open(self, name):
+        for _ in range(PROVIDER_HEALTH.failure_threshold):
+            PROVIDER_HEALTH.record_failure(name, 0.0, ProviderHTTPError("boom", 500))
+        PROVIDER_HEALTH._providers[name]['opened_at'] -= PROVIDER_HEALTH.cooldown_s
+
+    def test_cancelled_probe_releases_half_open_slot(self):
+        slow = self.stub(delay=0.3, name="Slow")
+        flaky = self.stub(name="Flaky")
+        self.half_open("Flaky")
+        self.write_config(hedge={'providers': 2, 'delay_s': 0.05}, routing='priority')
+        # Ein Worker: der Probe fuer Flaky wartet in der Queue und wird nach Slows Antwort abgebrochen
+        pool = ThreadPoolExecutor(max_workers=1)
+        with mock.patch.object(llm_providers, '_HEDGE_POOL', pool):
+            self.assertEqual(MultiLLMProvider(providers=[slow, flaky]).generate_response("Explain water")[1], "Slow")
+        pool.shutdown(wait=True)
+        self.assertFalse(PROVIDER_HEALTH.snapshot()['Flaky']['probe_in_flight'])
+        self.assertTrue(PROVIDER_HEALTH.allow("Flaky"))
+
+    def test_lost_probe_times_out(self):
+        self.half_open("Flaky")
+        self.assertTrue(PROVIDER_HEALTH.allow("Flaky", probe_timeout_s=0.05))
+        self.assertFalse(PROVIDER_HEALTH.allow("Flaky", probe_timeout_s=0.05))
+        time.sleep(0.1)
+        self.assertTrue(PROVIDER_HEALTH.allow("Flaky", probe_timeout_s=0.05))
+        self.assertEqual(PROVIDER_HEALTH.snapshot()['Flaky']['state'], 'half_open')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test suite for concurrent tools/call dispatch in the MCP server
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+
+
+def import_server():
+    """Import erst im Temp-Verzeichnis: das Modul legt seine Logdateien im cwd an"""
+    cwd = os.getcwd()
+    os.chdir(tempfile.gettempdir())
+    try:
+        import hakgal_mcp_ultimate
+    finally:
+        os.chdir(cwd)
+    return hakgal_mcp_ultimate
+
+
+class TestMCPDispatch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module = import_server()
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = self.module.HAKGALMCPServer()
+        self.server.db_path = Path(self.temp_dir) / 'kb.db'
+        self.responses = []
+        self.spans = {}
+        self.spans_lock = threading.Lock()
+
+        async def send_response(response):
+            self.responses.append(response)
+
+        def execute_tool(tool_name, tool_args):
+            # Langsames synchrones Tool; Start/Ende je Request fuer die Ueberlappungspruefung
+            start = time.monotonic()
+            time.sleep(tool_args.get('delay', 0.2))
+            with self.spans_lock:
+                self.spans[tool_args['tag']] = (start, time.monotonic())
+            return {"content": [{"type": "text", "text": f"{tool_name}:{tool_args['tag']}"}]}
+
+        self.server.send_response = send_response
+        self.server._execute_tool = execute_tool
+
+    def tearDown(self):
+        self.server.executor.shutdown(wait=True)
+        shutil.rmtree(self.temp_dir)
+
+    def call(self, request_id, tool, tag, delay=0.2):
+        return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+                "params": {"name": tool, "arguments": {"tag": tag, "delay": delay}}}
+
+    def run_requests(self, *requests, cancel=None):
+        async def main():
+            tasks = [self.server._dispatch(request) for request in requests]
+            if cancel is not None:
+                await asyncio.sleep(0.05)
+                self.server._dispatch({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                                       "params": {"requestId": cancel}})
+            await asyncio.gather(*tasks)
+        asyncio.run(main())
+
+    def overlap(self, a, b):
+        (start_a, end_a), (start_b, end_b) = self.spans[a], self.spans[b]
+        return start_a < end_b and start_b < end_a
+
+    def test_read_tools_run_concurrently(self):
+        self.assertNotIn("search_knowledge", self.module.TOOL_GROUPS)
+        self.assertGreater(self.module.DEFAULT_TOOL_LIMITS["default"], 1)
+        start = time.monotonic()
+        self.run_requests(self.call(1, "search_knowledge", "a", 0.3), self.call(2, "kb_stats", "b", 0.3))
+        self.assertTrue(self.overlap("a", "b"))
+        self.assertLess(time.monotonic() - start, 0.55)
+        self.assertEqual(sorted(r["id"] for r in self.responses), [1, 2])
+
+    def test_kb_write_group_is_serialized(self):
+        self.assertEqual(self.module.DEFAULT_TOOL_LIMITS["kb_write"], 1)
+        self.assertEqual(self.module.TOOL_GROUPS["bulk_add_facts"], "kb_write")
+        self.assertEqual(self.module.TOOL_GROUPS["backup_kb"], "kb_write")
+        self.assertEqual(self.module.TOOL_GROUPS["add_fact"], "kb_queue")
+        self.run_requests(self.call(1, "bulk_add_facts", "a", 0.15), self.call(2, "backup_kb", "b", 0.15),
+                          self.call(3, "restore_kb", "c", 0.15))
+        self.assertFalse(self.overlap("a", "b") or self.overlap("b", "c") or self.overlap("a", "c"))
+        self.assertEqual(len(self.responses), 3)
+
+    def test_cancel_in_flight_request(self):
+        self.run_requests(self.call(7, "search_knowledge", "slow", 0.3), self.call(8, "kb_stats", "fast", 0.1),
+                          cancel=7)
+        # MCP: auf einen abgebrochenen Request wird nicht mehr geantwortet
+        self.assertEqual([r["id"] for r in self.responses], [8])
+        self.assertEqual(self.responses[0]["result"]["content"][0]["text"], "kb_stats:fast")
+        self.assertEqual(self.server._inflight, {})
+        # Unbekannte oder bereits beantwortete ids: kein Fehler, keine Antwort
+        self.server.cancel_request(7)
+        self.server.cancel_request("unknown")
+
+    def test_out_of_order_responses_keep_their_ids(self):
+        self.run_requests(self.call("slow", "search_knowledge", "slow", 0.3),
+                          self.call(2, "kb_stats", "medium", 0.15),
+                          self.call(3, "get_facts_count", "fast", 0.05))
+        self.assertEqual([r["id"] for r in self.responses], [3, 2, "slow"])
+        for response in self.responses:
+            tag = response["result"]["content"][0]["text"].split(":")[1]
+            self.assertEqual({"slow": "slow", 2: "medium", 3: "fast"}[response["id"]], tag)
+
+
+if __name__ == '__main__':
+    unittest.main()
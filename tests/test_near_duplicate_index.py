@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test suite for the MinHash-LSH near-duplicate index
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal' / 'services'))
+
+from near_duplicate_index import NearDuplicateIndex, optimal_bands
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY)")
+        self.add(*[f"IsA(Entity{i}, Thing{i % 17})." for i in range(2000)])
+        self.add("HasPart(Computer, CPU).", "HasPart(Computer,CPU)", "HasPart(CPU, Computer).",
+                 "Water boils at 100 degrees Celsius at sea level.",
+                 "Water boils at 100 degrees Celsius at the sea level.")
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def add(self, *statements):
+        self.conn.executemany("INSERT INTO facts (statement) VALUES (?)", [(s,) for s in statements])
+        self.conn.commit()
+
+    def test_banding_follows_threshold(self):
+        bands, rows = optimal_bands(0.8, 128)
+        self.assertLessEqual(bands * rows, 128)
+        self.assertGreater(rows, optimal_bands(0.3, 128)[1])
+
+    def test_pairs_check_and_persistence(self):
+        index = NearDuplicateIndex(self.db_path, sync_interval=0)
+        pairs = [(a, b) for _, a, b in index.find_pairs(0.75)]
+        self.assertEqual(len(pairs), 2)
+        self.assertIn(("HasPart(Computer, CPU).", "HasPart(Computer,CPU)"), pairs)
+        self.assertNotIn("HasPart(CPU, Computer).", str(pairs))
+
+        matches = index.check("Water boils at 100 degrees celsius at sea level!", 0.75)
+        self.assertEqual(len(matches), 2)
+
+        self.conn.execute("DELETE FROM facts WHERE statement = 'HasPart(Computer,CPU)'")
+        self.conn.commit()
+        index.forget("HasPart(Computer,CPU)")
+        self.assertEqual(len(index.find_pairs(0.75)), 1)
+
+        reloaded = NearDuplicateIndex(self.db_path, sync_interval=0)
+        self.assertEqual(len(reloaded.find_pairs(0.75)), 1)
+        self.assertEqual(reloaded.stats()['loaded_from_disk'], 1)
+        self.assertEqual(reloaded.stats()['ingested'], 0)
+
+    def test_foreign_updates_are_detected(self):
+        index = NearDuplicateIndex(self.db_path, sync_interval=0)
+        self.assertEqual(len(index.find_pairs(0.75)), 2)
+        # Fremder Prozess: UPDATE behaelt rowid und Anzahl
+        self.conn.execute("UPDATE facts SET statement = 'Ice melts at 0 degrees Celsius at sea level.' "
+                          "WHERE statement = 'Water boils at 100 degrees Celsius at the sea level.'")
+        self.conn.commit()
+        self.assertEqual(len(index.find_pairs(0.75)), 1)
+        self.assertEqual(index.check("Ice melts at 0 degrees Celsius at sea level!", 0.75)[0][1],
+                         "Ice melts at 0 degrees Celsius at sea level.")
+
+        # Delete+Insert auf der wiederverwendeten hoechsten rowid
+        self.conn.execute("DELETE FROM facts WHERE statement = 'Ice melts at 0 degrees Celsius at sea level.'")
+        self.conn.execute("INSERT INTO facts (statement) VALUES ('Water boils at 100 degrees Celsius at the sea level.')")
+        self.conn.commit()
+        pairs = [(a, b) for _, a, b in index.find_pairs(0.75)]
+        self.assertEqual(len(pairs), 2)
+        self.assertIn("Water boils at 100 degrees Celsius at the sea level.", str(pairs))
+        self.assertEqual(index.check("Ice melts at 0 degrees Celsius at sea level!", 0.75), [])
+
+        # Persistierte Schluessel wurden mitgezogen
+        reloaded = NearDuplicateIndex(self.db_path, sync_interval=0)
+        self.assertEqual(len(reloaded.find_pairs(0.75)), 2)
+        self.assertEqual(reloaded.stats()['ingested'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
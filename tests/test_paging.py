@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test suite for MCP result pagination helpers
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import json
+import shutil
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+
+from tool_handlers._paging import (
+    decode_cursor, encode_cursor, read_lines_backwards, stream_jsonl, take_page,
+)
+
+
+class TestPaging(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_cursor_roundtrip(self):
+        token = encode_cursor("export_facts", after=41, left=9)
+        self.assertEqual(decode_cursor(token, "export_facts"), {"after": 41, "left": 9})
+        with self.assertRaises(ValueError):
+            decode_cursor(token, "list_audit")
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor", "export_facts")
+
+    def test_take_page(self):
+        lines = ["aaa", "bbb", "ccc", "ddd"]
+        self.assertEqual(take_page(iter(lines), 0, 8), (["aaa", "bbb"], 2))
+        self.assertEqual(take_page(iter(lines), 2, 8), (["ccc", "ddd"], None))
+        self.assertEqual(take_page(iter(lines), 1, 100, max_items=1), (["bbb"], 2))
+
+    def test_read_lines_backwards(self):
+        path = os.path.join(self.temp_dir, 'audit.log')
+        entries = [json.dumps({"n": i, "pad": "x" * (i % 7)}) for i in range(50)]
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write("\n".join(entries) + "\n")
+        collected, end = [], None
+        while True:
+            lines, start = read_lines_backwards(path, 6, end, 1 << 20, block_size=16)
+            collected = lines + collected
+            if start == 0:
+                break
+            end = start
+        self.assertEqual(collected, entries)
+        lines, _ = read_lines_backwards(path, 100, None, 64)
+        self.assertEqual(lines, entries[-2:])
+
+    def test_stream_jsonl(self):
+        path = os.path.join(self.temp_dir, 'out', 'facts.jsonl')
+        rows, size = stream_jsonl(iter(["IsA(A, B).", "HasPart(B, C)."]), path)
+        self.assertEqual(rows, 2)
+        self.assertEqual(size, os.path.getsize(path))
+        with open(path, encoding='utf-8') as handle:
+            self.assertEqual(json.loads(handle.readline()), {"statement": "IsA(A, B)."})
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['facts.jsonl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test suite for the semantic_similarity candidate index
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+
+from similarity_index import SimilarityIndex
+from tool_handlers import graph
+
+
+class TestSimilarityIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY)")
+        self.add(*[f"IsA(Entity{i}, Thing{i % 13})." for i in range(500)])
+        self.add("HasPart(Computer, CPU).", "HasPart(Computer, Memory).", "HasPart(Car, Engine).")
+        self.index = SimilarityIndex(self.db_path, sync_interval=0)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def add(self, *statements):
+        self.conn.executemany("INSERT INTO facts (statement) VALUES (?)", [(s,) for s in statements])
+        self.conn.commit()
+
+    def test_candidates_and_distribution(self):
+        candidates, sample, rest = self.index.candidates("HasPart(Computer, CPU).", 10, sample_size=50, seed=1)
+        self.assertEqual(len(candidates) + rest, 502)
+        self.assertNotIn("HasPart(Computer, CPU).", candidates)
+        self.assertIn("HasPart(Computer, Memory).", candidates)
+        self.assertIn("HasPart(Car, Engine).", candidates)
+        self.assertEqual(len(sample), 50)
+        self.assertFalse(set(sample) & set(candidates) | {"HasPart(Computer, CPU)."} & set(sample))
+
+        candidates, _, _ = self.index.candidates("IsA(Entity42, Thing4).", 30)
+        self.assertIn("IsA(Entity42, Thing3).", candidates)
+
+    def test_incremental_updates(self):
+        self.index.candidates("HasPart(Computer, CPU).", 5)
+        self.add("HasPart(Computer, GPU).")
+        candidates, _, _ = self.index.candidates("HasPart(Computer, CPU).", 3)
+        self.assertIn("HasPart(Computer, GPU).", candidates)
+
+        self.conn.execute("DELETE FROM facts WHERE statement = 'HasPart(Computer, GPU).'")
+        self.conn.execute("UPDATE facts SET statement = 'Contains(Computer, Memory).' "
+                          "WHERE statement = 'HasPart(Computer, Memory).'")
+        self.conn.commit()
+        self.index.forget("HasPart(Computer, GPU).")
+        self.index.replace("HasPart(Computer, Memory).", "Contains(Computer, Memory).")
+        candidates, _, rest = self.index.candidates("HasPart(Computer, CPU).", 3)
+        self.assertNotIn("HasPart(Computer, GPU).", candidates)
+        self.assertIn("Contains(Computer, Memory).", candidates)
+        self.assertEqual(len(candidates) + rest, 502)
+        self.assertEqual(self.index.full_builds, 1)
+
+    def test_sampled_distribution_is_reproducible(self):
+        server = SimpleNamespace(db_path=self.db_path)
+        args = {'statement': "HasPart(Computer, CPU).", 'threshold': 0.99}
+        env = {'HAKGAL_SIMILARITY_CANDIDATES': '20', 'HAKGAL_SIMILARITY_SAMPLE': '30'}
+        with mock.patch.dict(os.environ, env):
+            outputs = [graph.semantic_similarity(server, args)['content'][0]['text'] for _ in range(3)]
+        distributions = [line for text in outputs for line in text.splitlines() if 'Distribution' in line]
+        self.assertEqual(len(set(distributions)), 1)
+        self.assertIn("estimated from a sample of 30/", distributions[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Test suite for SQLiteFactRepository and the SQLite connection pool
+"""
+
+import unittest
+import tempfile
+import threading
+import os
+import sys
+import shutil
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src_hexagonal'))
+
+from adapters.sqlite_adapter import SQLiteFactRepository
+from application.services import FactManagementService
+from core.domain.entities import Fact
+from infrastructure.db_connection_pool import SQLiteConnectionPool
+
+
+class TestSQLiteConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'pool.db')
+        self.pool = SQLiteConnectionPool(self.db_path, pool_size=2, timeout=0.2)
+
+    def tearDown(self):
+        self.pool.close_all()
+        shutil.rmtree(self.temp_dir)
+
+    def test_pragmas_applied_once(self):
+        """Connections come back in WAL mode and are reused"""
+        with self.pool.get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            first_id = id(conn)
+        with self.pool.get_connection() as conn:
+            self.assertEqual(id(conn), first_id)
+        self.assertEqual(mode.lower(), 'wal')
+        self.assertEqual(self.pool.stats()['connections_created'], 1)
+
+    def test_pool_is_bounded(self):
+        """A third concurrent checkout waits and then times out"""
+        with self.pool.get_connection():
+            with self.pool.get_connection():
+                with self.assertRaises(Exception):
+                    with self.pool.get_connection():
+                        pass
+        stats = self.pool.stats()
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertLessEqual(stats['open_connections'], 2)
+
+    def test_rollback_on_error(self):
+        """Failed blocks roll back and release the connection"""
+        with self.pool.get_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        with self.assertRaises(RuntimeError):
+            with self.pool.get_connection() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError("boom")
+        with self.pool.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        self.assertEqual(self.pool.stats()['in_use_connections'], 0)
+
+
+class TestSQLiteFactRepository(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        self.repo = SQLiteFactRepository(self.db_path, pool_size=4)
+
+    def tearDown(self):
+        self.repo.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_exists_count(self):
+        self.assertTrue(self.repo.save(Fact(statement="IsA(Water, Liquid).")))
+        self.assertTrue(self.repo.exists("IsA(Water, Liquid)."))
+        self.assertFalse(self.repo.exists("IsA(Ice, Liquid)."))
+        self.assertEqual(self.repo.count(), 1)
+
+    def test_concurrent_writers(self):
+        def writer(offset):
+            for i in range(50):
+                self.repo.save(Fact(statement=f"HasPart(Thing{offset}, Part{i})."))
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.repo.count(), 200)
+        self.assertLessEqual(self.repo.pool_stats()['open_connections'], 4)
+
+    def test_keyset_pages_and_resumable_iteration(self):
+        self.repo.bulk_insert([f"IsA(Item{i}, Thing)" for i in range(25)])
+        first = self.repo.find_after(None, 10)
+        second = self.repo.find_after(first[-1][0], 10)
+        self.assertEqual(len(first), 10)
+        self.assertEqual(len(second), 10)
+        self.assertLess(first[-1][0], second[0][0])
+
+        service = FactManagementService(self.repo)
+        streamed = [f.statement for _, f in service.iter_facts(chunk_size=7)]
+        self.assertEqual(len(streamed), 25)
+        resumed = [f.statement for _, f in service.iter_facts(after=first[-1][0], limit=12, chunk_size=5)]
+        self.assertEqual(resumed, streamed[10:22])
+
+    def test_batch_add_reports_per_item(self):
+        service = FactManagementService(self.repo)
+        self.assertEqual(service.add_fact("IsA(Cat, Animal)")[0], True)
+        self.assertEqual(service.add_fact("IsA(Cat, Animal).")[1], "Fact already exists")
+
+        results = service.add_facts([
+            "IsA(Dog, Animal)",
+            {"statement": "IsA(Cat, Animal).", "context": {"source": "test"}},
+            "IsA(Dog, Animal).",
+            "not a fact",
+            {"statement": "HasPart(Dog, Tail)", "confidence": 0.9},
+        ])
+        self.assertEqual([r['status'] for r in results],
+                         ['added', 'exists', 'duplicate', 'invalid', 'added'])
+        self.assertEqual(self.repo.count(), 3)
+        self.assertEqual(len(self.repo.find_by_predicate("HasPart", 0, "Dog")), 1)
+
+    def test_connect_per_call_mode(self):
+        repo = SQLiteFactRepository(self.db_path, pool_size=0)
+        repo.save(Fact(statement="Causes(Heat, Expansion)."))
+        self.assertEqual(repo.count(), 1)
+        self.assertFalse(repo.pool_stats()['enabled'])
+
+
+class TestSQLiteSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_index_follows_writes(self):
+        repo = SQLiteFactRepository(self.db_path, pool_size=2)
+        repo.save(Fact(statement="IsA(MachineLearning, ArtificialIntelligence)."))
+        repo.bulk_insert(["Uses(NeuralNetwork, Backpropagation)", "IsA(Water, Liquid)"])
+        found = [f.statement for f in repo.find_by_query("What is machine learning?")]
+        self.assertEqual(found, ["IsA(MachineLearning, ArtificialIntelligence)."])
+
+        repo.update_statement("IsA(Water, Liquid).", "IsA(Ice, Solid).")
+        self.assertEqual(repo.find_by_query("where is water"), [])
+        self.assertTrue(repo.find_by_query("where is ice solid"))
+
+        repo.delete_by_statement("Uses(NeuralNetwork, Backpropagation).")
+        self.assertEqual(repo.find_by_query("backpropagation network"), [])
+        repo.close()
+
+    def test_existing_database_is_backfilled(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE facts (statement TEXT PRIMARY KEY, context TEXT DEFAULT '{}', "
+                     "fact_metadata TEXT DEFAULT '{}', confidence REAL DEFAULT 1.0)")
+        conn.executemany("INSERT INTO facts (statement) VALUES (?)",
+                         [(f"HasPart(Computer{i}, Processor{i}).",) for i in range(100)])
+        conn.commit()
+        conn.close()
+
+        repo = SQLiteFactRepository(self.db_path, pool_size=1)
+        results = repo.find_by_query("which computer has a processor", limit=5)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0].context['relevance'], 1.0)
+        repo.close()
+
+
+class TestSQLiteStructuredIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'kb.db')
+        self.repo = SQLiteFactRepository(self.db_path, pool_size=2)
+        self.repo.bulk_insert([
+            "HasPart(Computer, CPU)",
+            "HasPart(Computer, Memory)",
+            "HasPart(Car, Engine)",
+            "IsA(CPU, Processor)",
+            "Reaction(H2, O2, H2O)",
+        ])
+
+    def tearDown(self):
+        self.repo.close()
+        shutil.rmtree(self.temp_dir)
+
+    def statements(self, facts):
+        return sorted(f.statement for f in facts)
+
+    def test_predicate_subject_object_lookups(self):
+        self.assertEqual(len(self.repo.find_by_predicate("HasPart")), 3)
+        self.assertEqual(self.statements(self.repo.find_by_predicate("HasPart", 0, "Computer")),
+                         ["HasPart(Computer, CPU).", "HasPart(Computer, Memory)."])
+        self.assertEqual(self.statements(self.repo.find_by_predicate(None, value="CPU")),
+                         ["HasPart(Computer, CPU).", "IsA(CPU, Processor)."])
+        self.assertEqual(self.statements(self.repo.find_by_predicate("Reaction", 2, "H2O")),
+                         ["Reaction(H2, O2, H2O)."])
+
+    def test_index_follows_delete_and_update(self):
+        self.repo.delete_by_statement("HasPart(Car, Engine).")
+        self.repo.update_statement("IsA(CPU, Processor).", "IsA(GPU, Processor).")
+        self.assertEqual(len(self.repo.find_by_predicate("HasPart")), 2)
+        self.assertEqual(self.repo.find_by_predicate("IsA", 0, "CPU"), [])
+        self.assertEqual(len(self.repo.find_by_predicate("IsA", 0, "GPU")), 1)
+        self.assertIn(("HasPart", 2), self.repo.predicate_counts())
+
+    def test_foreign_writes_are_backfilled(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO facts (statement) VALUES ('HasPart(Bike, Wheel).')")
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.repo.backfill_structured_index(), 1)
+        self.assertEqual(len(self.repo.find_by_predicate("HasPart", 1, "Wheel")), 1)
+
+    def test_foreign_writes_visible_without_backfill(self):
+        # Fremder Writer (MCP-Writer-Queue, Governance, Journal-Replay) auf derselben DB
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO facts (statement) VALUES ('HasPart(Bike, Wheel).')")
+        conn.execute("UPDATE facts SET statement = 'IsA(TPU, Processor).' WHERE statement = 'IsA(CPU, Processor).'")
+        conn.commit()
+        conn.close()
+        self.assertIn(("HasPart", 4), self.repo.predicate_counts())
+        self.assertEqual(len(self.repo.find_by_predicate("HasPart")), 4)
+        self.assertEqual(len(self.repo.find_by_predicate("IsA", 0, "TPU")), 1)
+        self.assertEqual(self.repo.find_by_predicate("IsA", 0, "CPU"), [])
+
+    def test_fact_format_query_uses_index(self):
+        found = self.statements(self.repo.find_by_query("HasPart(Computer, GPU)"))
+        self.assertEqual(found, ["HasPart(Computer, CPU).", "HasPart(Computer, Memory)."])
+
+
+if __name__ == '__main__':
+    unittest.main()
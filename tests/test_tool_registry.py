@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test suite for the MCP tool registry and tool metrics
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'ultimate_mcp'))
+
+from tool_handlers import ToolRegistry, ToolMetrics, TOOL_MODULES, is_error_result
+
+
+class TestToolRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test environment"""
+        self.registry = ToolRegistry()
+
+    def test_resolve_and_aliases(self):
+        handler = self.registry.resolve("get_recent_facts")
+        self.assertEqual(handler.__name__, "get_recent_facts")
+        self.assertIs(self.registry.resolve("list_recent_facts"), handler)
+        self.assertIsNone(self.registry.resolve("no_such_tool"))
+        self.assertNotIn("no_such_tool", self.registry)
+        self.assertEqual(self.registry.loaded_modules(), ["kb_query"])
+
+    def test_every_registered_tool_exists(self):
+        for module, tools in TOOL_MODULES.items():
+            if module in ("sentry_tools", "niche", "meta"):
+                continue
+            for tool in tools:
+                self.assertTrue(callable(self.registry.resolve(tool)), tool)
+
+    def test_metrics_histogram(self):
+        metrics = ToolMetrics(buckets_ms=(1, 10, 100))
+        for seconds in (0.0005, 0.005, 0.005, 0.05):
+            metrics.record("kb_stats", seconds)
+        metrics.record("kb_stats", 0.5, error=True)
+        snapshot = metrics.snapshot()["kb_stats"]
+        self.assertEqual(snapshot["calls"], 5)
+        self.assertEqual(snapshot["errors"], 1)
+        self.assertEqual(snapshot["p50_ms"], 10.0)
+        self.assertEqual(snapshot["p99_ms"], 500.0)
+        self.assertEqual(snapshot["histogram"], {"<=1ms": 1, "<=10ms": 2, "<=100ms": 1, ">100ms": 1})
+        self.assertTrue(is_error_result({"content": [{"type": "text", "text": "Error: boom"}]}))
+        self.assertFalse(is_error_result({"content": [{"type": "text", "text": "ok"}]}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL Entity Index
+====================
+Entity -> Fakt invertierter Index fuer die Graph-Tools des MCP-Servers
+(``query_related``, ``get_knowledge_graph``, ``find_isolated_facts``,
+``inference_chain``).
+
+- Entities und Praedikate werden interniert (int-IDs)
+- pro Zeile: Praedikat-ID und Argument-IDs als flache array('i') (CSR)
+- pro Entity: Zeilen-Postings (array('i'), aufsteigend = rowid-Reihenfolge)
+  und die Anzahl lebender Vorkommen; pro Praedikat ebenfalls Zeilen-Postings
+
+Damit kosten Nachbarschaft, k-Hop-BFS und Isolation O(beruehrte Kanten)
+statt eines Regex-Scans ueber alle Fakten pro Aufruf. Synchronisation
+ueber die FactIndex-Basis (fact_index.py).
+"""
+
+import heapq
+import re
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from fact_index import FactIndex, get_fact_index
+
+_FACT = re.compile(r'^(\w+)\((.*?)\)\.?$', re.DOTALL)
+
+
+def parse_fact(statement: str) -> Tuple[Optional[str], List[str]]:
+    """'Pred(A, f(B, C)).' -> ('Pred', ['A', 'f(B, C)']) - Klammer-Tiefe beachtet"""
+    match = _FACT.match(statement.strip())
+    if not match:
+        return None, []
+    arguments = []
+    current = ""
+    depth = 0
+    for char in match.group(2):
+        if char == ',' and depth == 0:
+            arguments.append(current.strip())
+            current = ""
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        current += char
+    if current.strip():
+        arguments.append(current.strip())
+    return match.group(1), [arg for arg in arguments if arg]
+
+
+class EntityIndex(FactIndex):
+    """Entity-Postings, Argument-CSR und Vorkommenszaehler ueber der facts-Tabelle"""
+
+    def _reset_index(self):
+        self._entity_ids: Dict[str, int] = {}
+        self._entity_names: List[str] = []
+        self._entity_lower: List[str] = []
+        self._entity_rows: List[array] = []
+        self._entity_refs = array('i')
+        self._pred_ids: Dict[str, int] = {}
+        self._pred_names: List[Optional[str]] = []
+        self._pred_lower: List[str] = []
+        self._pred_rows: List[array] = []
+        self._row_pred = array('i')
+        self._arg_offsets = array('i', [0])
+        self._arg_ids = array('i')
+
+    def _index_row(self, row: int, statement: str):
+        predicate, args = parse_fact(statement)
+        pred_id = self._pred_ids.get(predicate)
+        if pred_id is None:
+            pred_id = self._pred_ids[predicate] = len(self._pred_names)
+            self._pred_names.append(predicate)
+            self._pred_lower.append(predicate.lower() if predicate else "")
+            self._pred_rows.append(array('i'))
+        self._row_pred.append(pred_id)
+        self._pred_rows[pred_id].append(row)
+
+        seen = set()
+        for arg in args:
+            entity = self._entity_ids.get(arg)
+            if entity is None:
+                entity = self._entity_ids[arg] = len(self._entity_names)
+                self._entity_names.append(arg)
+                self._entity_lower.append(arg.lower())
+                self._entity_rows.append(array('i'))
+                self._entity_refs.append(0)
+            self._arg_ids.append(entity)
+            self._entity_refs[entity] += 1
+            if entity not in seen:
+                seen.add(entity)
+                self._entity_rows[entity].append(row)
+        self._arg_offsets.append(len(self._arg_ids))
+
+    def _drop_row(self, row: int, statement: str):
+        for entity in self._row_entities(row):
+            self._entity_refs[entity] -= 1
+
+    # ------------------------------------------------------------------
+    # Zugriff
+    # ------------------------------------------------------------------
+
+    def _row_entities(self, row: int) -> array:
+        return self._arg_ids[self._arg_offsets[row]:self._arg_offsets[row + 1]]
+
+    def _rows_of(self, entity: int):
+        alive = self._alive
+        return [row for row in self._entity_rows[entity] if alive[row]]
+
+    def _rows_of_predicate(self, pred_id: int):
+        alive = self._alive
+        return [row for row in self._pred_rows[pred_id] if alive[row]]
+
+    def parsed(self, row: int) -> Tuple[Optional[str], List[str]]:
+        names = self._entity_names
+        return self._pred_names[self._row_pred[row]], [names[e] for e in self._row_entities(row)]
+
+    def statement(self, row: int) -> Optional[str]:
+        return self._statements[row]
+
+    def match_entities(self, needle: str) -> List[int]:
+        """Entity-IDs, deren Name ``needle`` enthaelt (wie LIKE %needle%, ohne Gross/Klein)"""
+        self.sync()
+        with self._lock:
+            exact = self._entity_ids.get(needle)
+            needle = needle.lower()
+            matches = [i for i, name in enumerate(self._entity_lower)
+                       if needle in name and self._entity_refs[i] > 0]
+            if exact is not None and exact not in matches and self._entity_refs[exact] > 0:
+                matches.append(exact)
+            return matches
+
+    def match_predicates(self, needle: str) -> List[int]:
+        """Praedikat-IDs, deren Name ``needle`` enthaelt (ohne Gross/Klein)"""
+        self.sync()
+        with self._lock:
+            needle = needle.lower()
+            return [i for i, name in enumerate(self._pred_lower) if name and needle in name]
+
+    def facts_for(self, needle: str, limit: Optional[int] = None) -> List[str]:
+        """Fakten mit einer passenden Entity oder einem passenden Praedikat, in
+        rowid-Reihenfolge (wie LIKE %needle%, aber nur innerhalb eines Namens)"""
+        entities = self.match_entities(needle)
+        predicates = self.match_predicates(needle)
+        with self._lock:
+            rows = {row for entity in entities for row in self._rows_of(entity)}
+            rows.update(row for pred_id in predicates for row in self._rows_of_predicate(pred_id))
+            rows = sorted(rows)
+            if limit is not None:
+                rows = rows[:limit]
+            return [self._statements[row] for row in rows]
+
+    def neighbourhood(self, needle: str, depth: int = 1, max_facts: int = 1000) -> Tuple[List[int], bool]:
+        """k-Hop-BFS: Hop 1 = alle Fakten der passenden Entities (vollstaendig),
+        jeder weitere Hop die Fakten der dabei neu erreichten Entities, bis
+        ``max_facts`` erreicht ist. Returns (zeilen, abgeschnitten)."""
+        frontier = set(self.match_entities(needle))
+        with self._lock:
+            seen_entities: Set[int] = set(frontier)
+            rows: Set[int] = set()
+            truncated = False
+            for hop in range(max(1, depth)):
+                next_frontier: Set[int] = set()
+                for entity in frontier:
+                    for row in self._rows_of(entity):
+                        if row in rows:
+                            continue
+                        if hop > 0 and len(rows) >= max_facts:
+                            truncated = True
+                            break
+                        rows.add(row)
+                        next_frontier.update(e for e in self._row_entities(row) if e not in seen_entities)
+                    if truncated:
+                        break
+                if truncated or not next_frontier:
+                    break
+                seen_entities |= next_frontier
+                frontier = next_frontier
+            return sorted(rows), truncated
+
+    def isolated(self, limit: int) -> List[str]:
+        """Fakten, deren Entities alle nur einmal in der KB vorkommen"""
+        self.sync()
+        with self._lock:
+            refs = self._entity_refs
+            rows = set()
+            for entity, count in enumerate(refs):
+                if count != 1:
+                    continue
+                for row in self._rows_of(entity):
+                    if all(refs[e] <= 1 for e in self._row_entities(row)):
+                        rows.add(row)
+            return [self._statements[row] for row in sorted(rows)[:limit]]
+
+    def chain(self, start_fact: str, max_depth: int) -> List[str]:
+        """Greedy-Kette wie bisher: pro Schritt der frueheste unbenutzte Fakt,
+        der eine Entity mit der bisherigen Kette teilt. Ein Heap ueber die
+        Postings neu hinzukommender Entities ersetzt den Vollscan pro Schritt."""
+        self.sync()
+        with self._lock:
+            chain = [start_fact] if start_fact else []
+            used_row = self._row_by_statement.get(start_fact)
+            heap: List[int] = []
+            reached: Set[int] = set()
+
+            def reach(entity_ids):
+                for entity in entity_ids:
+                    if entity not in reached:
+                        reached.add(entity)
+                        for row in self._rows_of(entity):
+                            heapq.heappush(heap, row)
+
+            _, start_args = parse_fact(start_fact)
+            reach(self._entity_ids[arg] for arg in start_args if arg in self._entity_ids)
+            taken = {used_row} if used_row is not None else set()
+            for _ in range(max_depth):
+                while heap and heap[0] in taken:
+                    heapq.heappop(heap)
+                if not heap:
+                    break
+                row = heapq.heappop(heap)
+                taken.add(row)
+                chain.append(self._statements[row])
+                reach(self._row_entities(row))
+            return chain
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'facts': self._rows,
+                'dead_rows': self._dead,
+                'entities': sum(1 for count in self._entity_refs if count > 0),
+                'predicates': len(self._pred_names),
+                'full_builds': self.full_builds,
+            }
+
+
+def get_entity_index(db_path) -> EntityIndex:
+    return get_fact_index(EntityIndex, db_path)
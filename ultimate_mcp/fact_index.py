@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL Fact Index Base
+=======================
+Gemeinsame Grundlage der In-Memory-Indizes des MCP-Servers.
+
+Jeder Index haelt die Statements unter internen Zeilen-IDs (Reihenfolge =
+rowid-Reihenfolge beim Einlesen) und wird wie der KnowledgeGraphCache
+synchronisiert:
+
+- ``PRAGMA data_version`` auf einer dauerhaften Lese-Verbindung: ohne
+  fremden Commit seit dem letzten Sync entfaellt jede Abfrage
+- rowid-Watermark: neue Fakten werden beim naechsten ``sync`` nachgelesen
+- COUNT(*)-Abgleich: fremde Loeschungen erzwingen einen Neuaufbau
+- CRC-Summe der Statements: stimmt COUNT(*), hat sich aber seit dem letzten
+  Sync etwas geaendert, deckt sie fremde UPDATEs und Delete+Insert mit
+  wiederverwendeter rowid auf (-> Neuaufbau)
+- ``forget``/``replace``: eigene Loeschungen und Updates des Servers werden
+  ohne Neuaufbau nachgetragen (UPDATE behaelt die rowid, der Watermark
+  wuerde es nicht sehen)
+
+Unterklassen implementieren ``_reset_index``, ``_index_row`` und optional
+``_drop_row``.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+
+
+def statement_crc(statement) -> int:
+    """CRC32 eines Statements (auch als SQL-Funktion ``stmt_crc`` registriert)."""
+    return zlib.crc32(statement.encode('utf-8')) if statement else 0
+
+
+def open_reader(db_path) -> sqlite3.Connection:
+    """Dauerhafte Read-only-Verbindung; ``PRAGMA data_version`` zaehlt fremde Commits."""
+    uri = f"file:{Path(db_path).resolve().as_posix()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.create_function("stmt_crc", 1, statement_crc, deterministic=True)
+    return conn
+
+
+class FactIndex:
+    """Basisklasse: Zeilenverwaltung und Watermark-Sync ueber der facts-Tabelle"""
+
+    def __init__(self, db_path: str, sync_interval: float = 1.0):
+        self.db_path = str(db_path)
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self.full_builds = 0
+        self._reader: Optional[sqlite3.Connection] = None
+        self._data_version = None
+        self._reset()
+
+    def _reset(self):
+        self._statements: List[Optional[str]] = []
+        self._row_by_statement: Dict[str, int] = {}
+        self._alive = bytearray()
+        self._watermark = 0
+        self._rows = 0
+        self._dead = 0
+        self._crc = 0
+        self._loaded = False
+        self._last_sync = 0.0
+        self._reset_index()
+
+    # ------------------------------------------------------------------
+    # Hooks fuer Unterklassen
+    # ------------------------------------------------------------------
+
+    def _reset_index(self):
+        raise NotImplementedError
+
+    def _index_row(self, row: int, statement: str):
+        raise NotImplementedError
+
+    def _drop_row(self, row: int, statement: str):
+        """Zeile wird ungueltig; Standard: nur ueber ``_alive`` ausblenden."""
+
+    # ------------------------------------------------------------------
+    # Aufbau und Synchronisation
+    # ------------------------------------------------------------------
+
+    def _add(self, statement: str):
+        if statement in self._row_by_statement:
+            return
+        row = len(self._statements)
+        self._statements.append(statement)
+        self._row_by_statement[statement] = row
+        self._alive.append(1)
+        self._index_row(row, statement)
+        self._rows += 1
+        self._crc += statement_crc(statement)
+
+    def _ingest(self, conn: sqlite3.Connection, after: int) -> int:
+        cursor = conn.execute(
+            "SELECT rowid, statement FROM facts WHERE rowid > ? "
+            "AND statement IS NOT NULL AND length(statement) > 0 ORDER BY rowid",
+            (after,)
+        )
+        watermark = after
+        for rowid, statement in cursor:
+            self._add(statement)
+            watermark = rowid
+        return watermark
+
+    def _rebuild(self, conn: sqlite3.Connection):
+        self._reset()
+        self._watermark = self._ingest(conn, 0)
+        self._loaded = True
+        self.full_builds += 1
+
+    def _close_reader(self):
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = None
+        self._data_version = None
+
+    def sync(self, force: bool = False):
+        """Watermark-Sync: neue rowids nachlesen, bei Abweichung neu aufbauen."""
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded and not force and now - self._last_sync < self.sync_interval:
+                return
+            if self._reader is None:
+                self._reader = open_reader(self.db_path)
+            conn = self._reader
+            version, = conn.execute("PRAGMA data_version").fetchone()
+            if force or not self._loaded or self._dead > max(1000, len(self._statements) // 4):
+                self._rebuild(conn)
+            elif version != self._data_version:
+                self._watermark = self._ingest(conn, self._watermark)
+                count, crc = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(stmt_crc(statement)), 0) FROM facts "
+                    "WHERE statement IS NOT NULL AND length(statement) > 0"
+                ).fetchone()
+                if count != self._rows or crc != self._crc:
+                    # Fremde Loeschungen/UPDATEs oder wiederverwendete rowids: nur ein Neuaufbau ist sicher
+                    self._rebuild(conn)
+            self._data_version = version
+            self._last_sync = time.monotonic()
+
+    def mark_stale(self):
+        """Naechster Zugriff synchronisiert sofort (z.B. nach eigenem INSERT)."""
+        with self._lock:
+            self._last_sync = 0.0
+
+    def invalidate(self):
+        """DB komplett ersetzt (Restore): naechster Zugriff baut neu auf."""
+        with self._lock:
+            self._close_reader()
+            self._loaded = False
+            self._last_sync = 0.0
+
+    def forget(self, statement: str):
+        """Geloeschten Fakt austragen, ohne den Index neu aufzubauen."""
+        with self._lock:
+            row = self._row_by_statement.pop(statement, None)
+            if row is None or not self._loaded:
+                return
+            self._drop_row(row, statement)
+            self._alive[row] = 0
+            self._statements[row] = None
+            self._rows -= 1
+            self._crc -= statement_crc(statement)
+            self._dead += 1
+
+    def replace(self, old: str, new: str):
+        """UPDATE facts SET statement=new behaelt die rowid: alt austragen, neu anhaengen."""
+        with self._lock:
+            if not self._loaded or old not in self._row_by_statement:
+                return
+            self.forget(old)
+            self._add(new)
+
+
+_INDEXES: Dict[tuple, FactIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_fact_index(cls: Type[FactIndex], db_path, env_interval: str = 'HAKGAL_INDEX_SYNC_S') -> FactIndex:
+    """Ein Index je (Klasse, Datenbank), lazy angelegt."""
+    key = (cls.__name__, str(Path(db_path).resolve()))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = cls(key[1], sync_interval=float(os.environ.get(env_interval, '1.0')))
+        return index
+
+
+def loaded_fact_indexes(db_path) -> List[FactIndex]:
+    """Alle bereits angelegten Indizes einer Datenbank (fuer Schreib-Notifications)."""
+    path = str(Path(db_path).resolve())
+    with _INDEXES_LOCK:
+        return [index for (_, p), index in _INDEXES.items() if p == path]
@@ -14,20 +14,16 @@ import sqlite3
 from pathlib import Path
 import traceback
 import time
-import shutil
-import math
-import collections
 import re
-import hashlib
 from datetime import datetime
-import fnmatch
-import glob
 
 # NEU: Imports für execute_code
 import subprocess
 import tempfile
 import uuid
-import platform
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 try:
     import requests
@@ -87,64 +83,48 @@ try:
 except Exception as _e:
     logger.warning(f"JSON logging init failed: {_e}")
 
-try:
-    from meta_tools import META_TOOLS
-    meta_tools_available = True
-    logger.info("Meta-Tools successfully loaded")
-except ImportError:
-    meta_tools_available = False
-    META_TOOLS = None
-    logger.warning("Meta-Tools not available - install numpy for full functionality")
+from fact_index import loaded_fact_indexes
+from kb_stats_index import get_kb_stats_index
+from kb_writer import KBLock, KBWriteQueue
+from kb_backup import BackupManager, ChangeJournal
+from tool_handlers import TOOL_REGISTRY, TOOL_METRICS, is_error_result, is_valid_sentry_dsn
 
-# Optional Sentry Integration
-def _is_valid_sentry_dsn(dsn: str) -> bool:
+# Optionale Tool-Module (Meta-Tools, Sentry, Nischen) werden erst beim ersten
+# Aufruf importiert (tool_handlers); hier nur billige Pruefungen fuer die Tool-Liste
+def _module_available(name: str) -> bool:
     try:
-        if not dsn:
-            return False
-        dsn = dsn.strip()
-        # Expected like: https://<publicKey>@de.sentry.io/<projectId>
-        if not (dsn.startswith("http://") or dsn.startswith("https://")):
-            return False
-        if "@" not in dsn:
-            return False
-        # must have trailing /<projectId>
-        parts = dsn.split("/")
-        if len(parts) < 4:
-            return False
-        project_id = parts[-1].strip()
-        if not project_id.isdigit():
-            return False
-        return True
-    except Exception:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
         return False
 
-try:
-    from sentry_integration import SentryIntegration
-    _dsn = os.environ.get("SENTRY_DSN", "").strip()
-    logger.debug(f"[DEBUG] SENTRY_DSN from env (masked len): {len(_dsn)}")
-    if not _is_valid_sentry_dsn(_dsn):
-        raise RuntimeError("Invalid SENTRY_DSN format. Expected 'https://<publicKey>@de.sentry.io/<projectId>'")
-    sentry = SentryIntegration()
-    HAS_SENTRY = True
-    logger.info(f"[Sentry] Integration loaded: {sentry.org}")
-except Exception as e:
-    HAS_SENTRY = False
-    sentry = None
-    logger.warning(f"[Sentry] Integration not available: {e}")
+meta_tools_available = _module_available("meta_tools") and _module_available("numpy")
+
+_dsn = os.environ.get("SENTRY_DSN", "").strip()
+logger.debug(f"[DEBUG] SENTRY_DSN from env (masked len): {len(_dsn)}")
+HAS_SENTRY = is_valid_sentry_dsn(_dsn) and _module_available("sentry_integration")
+
+# Nischen-Tools: Pfad zum HAK_GAL_HEXAGONAL hinzufuegen
+sys.path.insert(0, "D:\\MCP Mods\\HAK_GAL_HEXAGONAL")
+HAS_NICHE_TOOLS = _module_available("niche_mcp_tools")
+
+# Parallelitaet pro Tool-Gruppe (ENV-Override: HAKGAL_MCP_TOOL_LIMITS als JSON)
+DEFAULT_TOOL_LIMITS = {
+    "default": 4,
+    "kb_write": 1,
+    "kb_queue": 16,
+    "execute_code": 2,
+    "delegate_task": 2,
+    "semantic_similarity": 2,
+}
+
+# Schwere KB-Schreibtools teilen sich einen Slot; Einzel-Writes laufen parallel in
+# die Writer-Queue (kb_writer.py), die sie zu gemeinsamen Transaktionen buendelt
+TOOL_GROUPS = {name: "kb_write" for name in (
+    "bulk_add_facts", "bulk_translate_predicates", "backup_kb", "restore_kb", "db_vacuum", "db_enable_wal",
+    "db_backup_now", "db_backup_rotate",
+)}
+TOOL_GROUPS.update({name: "kb_queue" for name in ("add_fact", "delete_fact", "bulk_delete", "update_fact")})
 
-# Nischen-Tools Integration
-try:
-    # Pfad zum HAK_GAL_HEXAGONAL hinzufuegen
-    import sys
-    sys.path.insert(0, "D:\\MCP Mods\\HAK_GAL_HEXAGONAL")
-    from niche_mcp_tools import NicheMCPTools
-    niche_tools = NicheMCPTools(niches_dir="D:\\MCP Mods\\HAK_GAL_HEXAGONAL\\niches")
-    HAS_NICHE_TOOLS = True
-    logger.info("Niche-Tools successfully loaded")
-except Exception as e:
-    HAS_NICHE_TOOLS = False
-    niche_tools = None
-    logger.warning(f"Niche-Tools not available: {e}")
 
 class HAKGALMCPServer:
     """MCP Server für HAK_GAL mit ALLEN 72 Tools - ULTIMATE VERSION"""
@@ -166,7 +146,17 @@ class HAKGALMCPServer:
         # Write-safety configuration
         self.write_enabled = os.environ.get("HAKGAL_WRITE_ENABLED", "true").lower() == "true"
         self.write_token_env = os.environ.get("HAKGAL_WRITE_TOKEN", "")
-        self.kb_lock_path = self.kb_path.with_suffix(self.kb_path.suffix + ".lock")
+        # KB-Lock neben der DB; Lease in Sekunden fuer die Stale-Lock-Erkennung
+        self.kb_lock_lease = float(os.environ.get("HAKGAL_KB_LOCK_LEASE_S", "30"))
+        self._writer = None
+        self._writer_db = None
+        self._writer_guard = threading.Lock()
+        self._admin_lock = None
+        # Backups (Manifest, Inkremente) und Change-Journal fuer Point-in-Time-Restore
+        self.backup_dir = Path(os.environ.get("HAKGAL_BACKUP_DIR", "D:/MCP Mods/HAK_GAL_HEXAGONAL/backups"))
+        self.kb_journal_enabled = os.environ.get("HAKGAL_KB_JOURNAL", "true").lower() == "true"
+        self._backups = None
+        self._backups_guard = threading.Lock()
         
         # Project Hub
         self.hub_path_env = os.environ.get("HAKGAL_HUB_PATH", "D:/MCP Mods/HAK_GAL_HEXAGONAL/PROJECT_HUB")
@@ -196,6 +186,19 @@ class HAKGALMCPServer:
             "powershell": _env_int("MCP_EXEC_TIMEOUT_PS", 30),
         }
         
+        # Nebenlaeufige Tool-Ausfuehrung: Worker-Pool + Limits pro Tool-Gruppe
+        self.executor = ThreadPoolExecutor(
+            max_workers=_env_int("HAKGAL_MCP_WORKERS", 8), thread_name_prefix="hakgal-tool"
+        )
+        self.tool_limits = dict(DEFAULT_TOOL_LIMITS)
+        try:
+            self.tool_limits.update(json.loads(os.environ.get("HAKGAL_MCP_TOOL_LIMITS", "{}")))
+        except Exception:
+            logger.warning("HAKGAL_MCP_TOOL_LIMITS is not valid JSON - using defaults")
+        self._tool_semaphores = {}
+        self._inflight = {}
+        self._tasks = set()
+        
         # Tools list initialization
         self.tools = self._get_tool_list()
         
@@ -236,6 +239,27 @@ class HAKGALMCPServer:
             pass
         return conn
     
+    def _notify_facts_changed(self, added=False, removed=(), replaced=(), reloaded=False):
+        """Eigene Schreibzugriffe an die bereits geladenen In-Memory-Indizes weitergeben.
+
+        Neue Fakten holen sich die Indizes ueber den rowid-Watermark, ``added``
+        erzwingt nur den sofortigen Sync beim naechsten Zugriff; ``reloaded``
+        (nach Restore) den Neuaufbau.
+        """
+        for index in loaded_fact_indexes(self.db_path):
+            try:
+                if reloaded:
+                    index.invalidate()
+                    continue
+                for statement in removed:
+                    index.forget(statement)
+                for old, new in replaced:
+                    index.replace(old, new)
+                if added:
+                    index.mark_stale()
+            except Exception as e:
+                logger.warning(f"{type(index).__name__} update failed: {e}")
+
     def _extract_keywords(self, query: str) -> set:
         """
         FIXED: Extract meaningful keywords from natural language query
@@ -372,24 +396,37 @@ class HAKGALMCPServer:
             return provided_token == self.write_token_env
         return True
     
+    def _kb_lock_path(self) -> Path:
+        return Path(str(self.db_path) + ".lock")
+
+    def _kb_writer(self) -> KBWriteQueue:
+        """Single-Writer-Queue fuer die aktuelle DB (lazy, neu bei geaendertem db_path)."""
+        with self._writer_guard:
+            if self._writer is None or self._writer_db != self.db_path:
+                if self._writer is not None:
+                    self._writer.close()
+                lock = KBLock(self._kb_lock_path(), lease_seconds=self.kb_lock_lease)
+                self._writer = KBWriteQueue(self._open_db, lock, journal=self._backup_manager().journal)
+                self._writer_db = self.db_path
+            return self._writer
+
+    def _backup_manager(self) -> BackupManager:
+        """Backup-Saetze in backup_dir; das Journal teilt sich der Manager mit der Writer-Queue."""
+        with self._backups_guard:
+            if self._backups is None or self._backups.backup_dir != self.backup_dir:
+                journal = ChangeJournal(self.backup_dir / "journal") if self.kb_journal_enabled else None
+                self._backups = BackupManager(self.backup_dir, journal=journal)
+            return self._backups
+
     def _acquire_lock(self, timeout_seconds: int = 5):
-        start = time.time()
-        while True:
-            try:
-                fd = os.open(str(self.kb_lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-                os.close(fd)
-                return
-            except FileExistsError:
-                if time.time() - start > timeout_seconds:
-                    raise RuntimeError("KB is locked; try again later")
-                time.sleep(0.05)
+        """Exklusiver KB-Lock fuer Operationen ausserhalb der Writer-Queue (z.B. Restore)."""
+        self._admin_lock = KBLock(self._kb_lock_path(), lease_seconds=self.kb_lock_lease)
+        self._admin_lock.acquire(timeout_seconds)
     
     def _release_lock(self):
-        try:
-            if self.kb_lock_path.exists():
-                self.kb_lock_path.unlink()
-        except:
-            pass
+        if self._admin_lock is not None:
+            self._admin_lock.release()
+            self._admin_lock = None
     
     def _append_audit(self, action: str, payload: dict):
         try:
@@ -423,16 +460,11 @@ class HAKGALMCPServer:
             cur_recent = conn.execute("SELECT statement FROM facts ORDER BY rowid DESC LIMIT 20")
             stats['recent_facts'] = [row[0] for row in cur_recent]
 
-            # Get top entities
-            cur_all = conn.execute("SELECT statement FROM facts")
-            entity_counts = collections.Counter()
-            for (stmt,) in cur_all:
-                _, args = self._parse_statement(stmt)
-                for arg in args:
-                    entity_counts[arg] += 1
-            
-            stats['top_entities'] = [{"entity": k, "count": v} for k, v in entity_counts.most_common(20)]
             conn.close()
+
+            # Top entities aus den materialisierten Zaehlern
+            top = get_kb_stats_index(self.db_path).top_entities(20)
+            stats['top_entities'] = [{"entity": k, "count": v} for k, v in top]
             return stats
         except Exception as e:
             logger.error(f"Error getting KB statistics: {e}")
@@ -652,7 +684,9 @@ class HAKGALMCPServer:
                 "inputSchema": {
                     "type": "object",
                     "properties": {
-                        "count": {"type": "integer", "description": "Anzahl", "default": 5}
+                        "count": {"type": "integer", "description": "Anzahl", "default": 5},
+                        "cursor": {"type": "string", "description": "next_cursor einer vorherigen Seite"},
+                        "max_bytes": {"type": "integer", "description": "Max Antwortgroesse in Bytes"}
                     }
                 }
             },
@@ -686,7 +720,8 @@ class HAKGALMCPServer:
                         "statement": {"type": "string"},
                         "source": {"type": "string"},
                         "tags": {"type": "array", "items": {"type": "string"}},
-                        "auth_token": {"type": "string"}
+                        "auth_token": {"type": "string"},
+                        "check_duplicates": {"type": "boolean", "default": False}
                     },
                     "required": ["statement"]
                 }
@@ -735,7 +770,13 @@ class HAKGALMCPServer:
             {
                 "name": "kb_stats",
                 "description": "KB Metriken (count, size, last_modified)",
-                "inputSchema": {"type": "object", "properties": {}}
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "verify": {"type": "boolean", "default": False, "description": "Materialisierte Statistik per Vollscan pruefen"},
+                        "repair": {"type": "boolean", "default": False, "description": "Bei Abweichung neu aufbauen"}
+                    }
+                }
             },
             # DB-Wartung (neu)
             {
@@ -770,8 +811,23 @@ class HAKGALMCPServer:
             },
             {
                 "name": "db_backup_now",
-                "description": "Erstellt sofort ein SQLite-Backup (online) per Backup-API",
-                "inputSchema": {"type": "object", "properties": {}}
+                "description": "Erstellt sofort ein SQLite-Backup (online) per Backup-API; inkrementell nur geaenderte Seiten",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "mode": {"type": "string", "enum": ["full", "incremental"], "default": "full"},
+                        "compress": {"type": "string", "enum": ["none", "gzip", "zstd"], "default": "none"},
+                        "verify": {"type": "boolean", "default": False}
+                    }
+                }
+            },
+            {
+                "name": "db_backup_list",
+                "description": "Listet Backups aus dem Manifest (optional mit Checksummen-Pruefung)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {"verify": {"type": "boolean", "default": False}}
+                }
             },
             {
                 "name": "db_backup_rotate",
@@ -799,17 +855,25 @@ class HAKGALMCPServer:
                 "description": "Liste letzte N Audit-Einträge",
                 "inputSchema": {
                     "type": "object",
-                    "properties": {"limit": {"type": "integer", "default": 20}}
+                    "properties": {
+                        "limit": {"type": "integer", "default": 20},
+                        "cursor": {"type": "string", "description": "next_cursor einer vorherigen Seite"},
+                        "max_bytes": {"type": "integer", "description": "Max Antwortgroesse in Bytes"}
+                    }
                 }
             },
             {
                 "name": "export_facts",
-                "description": "Exportiere erste/letzte N Fakten",
+                "description": "Exportiere erste/letzte N Fakten (seitenweise oder als JSONL-Datei)",
                 "inputSchema": {
                     "type": "object",
                     "properties": {
                         "count": {"type": "integer", "default": 50},
-                        "direction": {"type": "string", "default": "tail"}
+                        "direction": {"type": "string", "default": "tail"},
+                        "cursor": {"type": "string", "description": "next_cursor einer vorherigen Seite"},
+                        "max_bytes": {"type": "integer", "description": "Max Antwortgroesse in Bytes"},
+                        "output_path": {"type": "string", "description": "JSONL-Datei; ohne count alle Fakten"},
+                        "auth_token": {"type": "string"}
                     }
                 }
             },
@@ -823,6 +887,17 @@ class HAKGALMCPServer:
                 "description": "Umfassender Health Status",
                 "inputSchema": {"type": "object", "properties": {}}
             },
+            {
+                "name": "tool_metrics",
+                "description": "Latenz-/Fehler-Histogramme pro Tool (teuerste zuerst)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {"type": "string", "description": "Nur dieses Tool"},
+                        "reset": {"type": "boolean", "default": False}
+                    }
+                }
+            },
             {
                 "name": "dashboard_predicates_analytics",
                 "description": "Analytics Dashboard: Predicate Statistics und Diversity Metrics",
@@ -905,15 +980,25 @@ class HAKGALMCPServer:
                 "description": "Erstelle Backup der KB",
                 "inputSchema": {
                     "type": "object",
-                    "properties": {"description": {"type": "string"}, "auth_token": {"type": "string"}}
+                    "properties": {
+                        "description": {"type": "string"},
+                        "mode": {"type": "string", "enum": ["full", "incremental"], "default": "full"},
+                        "compress": {"type": "string", "enum": ["none", "gzip", "zstd"], "default": "none"},
+                        "auth_token": {"type": "string"}
+                    }
                 }
             },
             {
                 "name": "restore_kb",
-                "description": "Stelle KB aus Backup wieder her",
+                "description": "Stelle KB aus Backup wieder her (until: Point-in-Time per Journal-Replay)",
                 "inputSchema": {
                     "type": "object",
-                    "properties": {"backup_id": {"type": "string"}, "path": {"type": "string"}, "auth_token": {"type": "string"}}
+                    "properties": {
+                        "backup_id": {"type": "string"},
+                        "path": {"type": "string"},
+                        "until": {"type": "string", "description": "ISO-Zeitpunkt oder Epoch-Sekunden"},
+                        "auth_token": {"type": "string"}
+                    }
                 }
             },
             {
@@ -930,7 +1015,7 @@ class HAKGALMCPServer:
             },
             {
                 "name": "query_related",
-                "description": "Alle Fakten zu einer Entität",
+                "description": "Alle Fakten zu einer Entität oder einem Prädikat (Teilstring, ohne Groß/Klein)",
                 "inputSchema": {
                     "type": "object",
                     "properties": {
@@ -1056,16 +1141,16 @@ class HAKGALMCPServer:
                 }
             },
             # Dateioperations-Tools (13 Tools)
-            {"name": "read_file", "description": "Lese Dateiinhalt", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}, "encoding": {"type": "string", "default": "utf-8"}}, "required": ["path"]}},
+            {"name": "read_file", "description": "Lese Dateiinhalt", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}, "encoding": {"type": "string", "default": "utf-8"}, "cursor": {"type": "string"}, "max_bytes": {"type": "integer"}}, "required": ["path"]}},
             {"name": "write_file", "description": "Schreibe Datei", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}, "content": {"type": "string"}, "encoding": {"type": "string", "default": "utf-8"}, "auth_token": {"type": "string"}}, "required": ["path", "content"]}},
-            {"name": "list_files", "description": "Liste Dateien", "inputSchema": {"type": "object", "properties": {"path": {"type": "string", "default": "."}, "recursive": {"type": "boolean", "default": False}, "pattern": {"type": "string"}}}},
+            {"name": "list_files", "description": "Liste Dateien", "inputSchema": {"type": "object", "properties": {"path": {"type": "string", "default": "."}, "recursive": {"type": "boolean", "default": False}, "pattern": {"type": "string"}, "cursor": {"type": "string"}, "max_bytes": {"type": "integer"}}}},
             {"name": "get_file_info", "description": "Datei-Metadaten", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}}, "required": ["path"]}},
             {"name": "directory_tree", "description": "Verzeichnisbaum anzeigen", "inputSchema": {"type": "object", "properties": {"path": {"type": "string", "default": "."}, "maxDepth": {"type": "integer", "default": 3}, "showHidden": {"type": "boolean", "default": False}}}},
             {"name": "create_file", "description": "Erstelle neue Datei", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}, "content": {"type": "string"}, "overwrite": {"type": "boolean", "default": False}, "auth_token": {"type": "string"}}, "required": ["path", "content"]}},
             {"name": "delete_file", "description": "Lösche Datei", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}, "recursive": {"type": "boolean", "default": False}, "auth_token": {"type": "string"}}, "required": ["path"]}},
             {"name": "move_file", "description": "Verschiebe/Benenne Datei um", "inputSchema": {"type": "object", "properties": {"source": {"type": "string"}, "destination": {"type": "string"}, "overwrite": {"type": "boolean", "default": False}, "auth_token": {"type": "string"}}, "required": ["source", "destination"]}},
-            {"name": "grep", "description": "Suche Muster in Dateien", "inputSchema": {"type": "object", "properties": {"pattern": {"type": "string"}, "path": {"type": "string", "default": "."}, "filePattern": {"type": "string"}, "ignoreCase": {"type": "boolean", "default": False}, "showLineNumbers": {"type": "boolean", "default": True}, "contextLines": {"type": "integer", "default": 0}}, "required": ["pattern"]}},
-            {"name": "find_files", "description": "Finde Dateien nach Muster", "inputSchema": {"type": "object", "properties": {"pattern": {"type": "string"}, "path": {"type": "string", "default": "."}, "type": {"type": "string"}, "maxDepth": {"type": "integer"}}, "required": ["pattern"]}},
+            {"name": "grep", "description": "Suche Muster in Dateien", "inputSchema": {"type": "object", "properties": {"pattern": {"type": "string"}, "path": {"type": "string", "default": "."}, "filePattern": {"type": "string"}, "ignoreCase": {"type": "boolean", "default": False}, "showLineNumbers": {"type": "boolean", "default": True}, "contextLines": {"type": "integer", "default": 0}, "cursor": {"type": "string"}, "max_bytes": {"type": "integer"}}, "required": ["pattern"]}},
+            {"name": "find_files", "description": "Finde Dateien nach Muster", "inputSchema": {"type": "object", "properties": {"pattern": {"type": "string"}, "path": {"type": "string", "default": "."}, "type": {"type": "string"}, "maxDepth": {"type": "integer"}, "cursor": {"type": "string"}, "max_bytes": {"type": "integer"}}, "required": ["pattern"]}},
             {"name": "search", "description": "Einheitliche Suche", "inputSchema": {"type": "object", "properties": {"query": {"type": "string"}, "path": {"type": "string", "default": "."}, "type": {"type": "string", "default": "all"}, "filePattern": {"type": "string"}, "maxResults": {"type": "integer", "default": 50}}, "required": ["query"]}},
             {"name": "edit_file", "description": "Ersetze Text in Datei", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}, "oldText": {"type": "string"}, "newText": {"type": "string"}, "auth_token": {"type": "string"}}, "required": ["path", "oldText", "newText"]}},
             {"name": "multi_edit", "description": "Mehrere Bearbeitungen", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}, "edits": {"type": "array", "items": {"type": "object", "properties": {"oldText": {"type": "string"}, "newText": {"type": "string"}}, "required": ["oldText", "newText"]}}, "auth_token": {"type": "string"}}, "required": ["path", "edits"]}},
@@ -1240,2681 +1325,65 @@ class HAKGALMCPServer:
         }
         await self.send_response(response)
     
+    def _tool_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        """Semaphore der Tool-Gruppe (KB-Schreibtools teilen sich eine)."""
+        group = TOOL_GROUPS.get(tool_name, tool_name)
+        sem = self._tool_semaphores.get(group)
+        if sem is None:
+            limit = self.tool_limits.get(group, self.tool_limits.get("default", 4))
+            sem = self._tool_semaphores[group] = asyncio.Semaphore(max(1, int(limit)))
+        return sem
+
     async def handle_tool_call(self, request):
-        """Handle ALL 72 tool executions - ULTIMATE IMPLEMENTATION"""
+        """Tool-Aufruf im Worker-Pool ausfuehren und Antwort senden.
+
+        Die Tool-Implementierungen sind synchron (SQLite, subprocess, HTTP) und
+        laufen deshalb in ``self.executor``; die Event-Loop bleibt frei fuer
+        weitere Requests. Pro Tool-Gruppe begrenzt ein Semaphore die
+        Parallelitaet. Der Slot wird erst freigegeben, wenn der Worker wirklich
+        fertig ist - auch wenn der Request vorher abgebrochen wurde.
+        """
         params = request.get("params", {})
         tool_name = params.get("name", "")
         tool_args = params.get("arguments", {})
-        
-        result = {"content": [{"type": "text", "text": "Unknown tool"}]}
-        
-        try:
-            # ===== SQLite-basierte Core Tools =====
-            if tool_name == "get_facts_count":
-                conn = self._open_db()
-                cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                count = cursor.fetchone()[0]
-                conn.close()
-                text = f"Anzahl Fakten in der Datenbank: {count:,}"
-                result = {"content": [{"type": "text", "text": text}]}
-            
-            elif tool_name == "search_knowledge":
-                query = tool_args.get("query", "")
-                limit = tool_args.get("limit", 10)
-                
-                # FIXED: Use enhanced search with keyword extraction
-                facts = self._search_knowledge_enhanced(query, limit)
-                
-                text = f"Gefunden: {len(facts)} Fakten\n" + "\n".join([f"- {f}" for f in facts])
-                result = {"content": [{"type": "text", "text": text}]}
-            
-            # Kombiniert get_recent_facts und list_recent_facts
-            elif tool_name == "get_recent_facts" or tool_name == "list_recent_facts":
-                count = tool_args.get("count", 5)
-                conn = self._open_db()
-                cursor = conn.execute(
-                    "SELECT statement FROM facts ORDER BY rowid DESC LIMIT ?",
-                    (count,)
-                )
-                facts = [row[0] for row in cursor]
-                conn.close()
-                text = "Neueste Fakten:\n" + "\n".join([f"- {f}" for f in facts]) if facts else "Neueste Fakten:\n<keine>"
-                result = {"content": [{"type": "text", "text": text}]}
-            
-            elif tool_name == "get_predicates_stats":
-                # FINAL: Robust predicate extraction with multiple fallback methods
-                try:
-                    import time
-                    start_time = time.time()
-                    
-                    # Method 1: Enhanced SQL query
-                    conn = self._open_db()
-                    cursor = conn.execute("""
-                        SELECT 
-                            CASE 
-                                WHEN instr(statement, '(') > 0 
-                                THEN trim(substr(statement, 1, instr(statement, '(') - 1))
-                                ELSE 'Invalid'
-                            END as predicate,
-                            COUNT(*) as cnt
-                        FROM facts 
-                        WHERE statement IS NOT NULL 
-                        AND length(statement) > 0
-                        GROUP BY predicate
-                        HAVING cnt > 0
-                        ORDER BY cnt DESC
-                        LIMIT 50
-                    """)
-                    stats = [(row[0], row[1]) for row in cursor]
-                    conn.close()
-                    
-                    # Method 2: If SQL fails, use Python-based extraction
-                    if not stats or len(stats) == 1:
-                        conn = self._open_db()
-                        cursor = conn.execute("SELECT statement FROM facts WHERE statement IS NOT NULL AND length(statement) > 0")
-                        all_facts = cursor.fetchall()
-                        conn.close()
-                        
-                        # Python-based predicate extraction
-                        predicate_counts = {}
-                        for (fact,) in all_facts:
-                            match = re.match(r'^(\w+)\(', fact)
-                            if match:
-                                predicate = match.group(1)
-                                predicate_counts[predicate] = predicate_counts.get(predicate, 0) + 1
-                        
-                        # Convert to sorted list
-                        stats = sorted(predicate_counts.items(), key=lambda x: x[1], reverse=True)
-                    
-                    # Method 3: If still no results, check database integrity
-                    if not stats:
-                        conn = self._open_db()
-                        cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                        total_facts = cursor.fetchone()[0]
-                        conn.close()
-                        text = f"Database integrity issue. Total Facts: {total_facts}, but no predicates extracted."
-                    else:
-                        execution_time = time.time() - start_time
-                        lines = [f"{pred}: {cnt} Fakten" for pred, cnt in stats]
-                        text = f"Top Prädikate ({len(stats)} gefunden, Execution: {execution_time:.3f}s):\n" + "\n".join(lines)
-                    
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            elif tool_name == "get_system_status":
-                conn = self._open_db()
-                cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                count = cursor.fetchone()[0]
-                conn.close()
-                
-                # Dynamische Tool-Zählung statt hardcoded 66
-                tool_count = len(self.tools)
-                
-                text = (
-                    f"Status: Operational\n"
-                    f"Datenbank: {self.db_path}\n"
-                    f"Fakten: {count:,}\n"
-                    f"Server: HAK_GAL MCP Ultimate v4.0\n"
-                    f"Tools: {tool_count} (alle verfügbar)"
-                )
-                result = {"content": [{"type": "text", "text": text}]}
-            
-            # ===== NEU: Execute Code Tool =====
-            elif tool_name == "execute_code":
-                code = str(tool_args.get("code", ""))
-                language = str(tool_args.get("language", "")).lower()
-                timeout = int(tool_args.get("timeout", 30))
-                
-                if not code:
-                    result = {"content": [{"type": "text", "text": "Missing 'code' parameter"}]}
-                elif not language:
-                    result = {"content": [{"type": "text", "text": "Missing 'language' parameter"}]}
-                else:
-                    execution_result = self._execute_code_safely(code, language, timeout)
-                    
-                    if "error" in execution_result and not execution_result.get("timeout"):
-                        text = f"ERROR: {execution_result['error']}"
-                    else:
-                        stdout = execution_result.get("stdout", "")
-                        stderr = execution_result.get("stderr", "")
-                        return_code = execution_result.get("return_code", 0)
-                        lang = execution_result.get("language", language)
-                        
-                        text = ""
-                        if execution_result.get("timeout"):
-                            text = f"[TIMEOUT] Execution timeout after {timeout} seconds\n\n"
-                        else:
-                            text = f"[OK] Code executed successfully\n\n"
-                        
-                        text += f"**Language:** {lang}\n"
-                        text += f"**Return Code:** {return_code}\n"
-                        text += f"**Execution Time:** {execution_result.get('execution_time', 'completed')}\n\n"
-                        
-                        if stdout:
-                            text += f"**STDOUT:**\n```\n{stdout}\n```\n\n"
-                        else:
-                            text += "**STDOUT:** (no output)\n\n"
-                        
-                        if stderr:
-                            text += f"**STDERR:**\n```\n{stderr}\n```\n\n"
-                        
-                        if return_code != 0:
-                            text += f"Warning: Process exited with code {return_code}"
-                    
-                    result = {"content": [{"type": "text", "text": text}]}
-            
-            elif tool_name == "health_check":
-                conn = self._open_db()
-                cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                count = cursor.fetchone()[0]
-                conn.close()
-                text = (
-                    f"Status: OK\n"
-                    f"DB exists: True\n"
-                    f"DB Fakten: {count:,}\n"
-                    f"Write enabled: {self.write_enabled}\n"
-                    f"Total Tools: {len(self.tools)}\n"
-                    f"Execute code ready: True\n"
-                    f"Temp dir: {self.temp_dir}\n"
-                    f"Max output size: {self.max_output_size} bytes\n"
-                    f"Timeouts (s): py={self.timeout_defaults.get('python')}, js={self.timeout_defaults.get('javascript')}, sh={self.timeout_defaults.get('bash')}, ps={self.timeout_defaults.get('powershell')}"
-                )
-                result = {"content": [{"type": "text", "text": text}]}
-
-            elif tool_name == "health_check_json":
-                try:
-                    conn = self._open_db()
-                    cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                    count = cursor.fetchone()[0]
-                    conn.close()
-                    info = {
-                        "status": "OK",
-                        "db_exists": True,
-                        "facts": count,
-                        "write_enabled": self.write_enabled,
-                        "tools_total": len(self.tools),
-                        "exec_ready": True,
-                        "temp_dir": str(self.temp_dir),
-                        "max_output_bytes": self.max_output_size,
-                        "timeouts": self.timeout_defaults,
-                    }
-                except Exception as e:
-                    info = {"status": "ERROR", "error": str(e)}
-                result = {"content": [{"type": "text", "text": json.dumps(info, ensure_ascii=True)}]}
-
-            elif tool_name == "db_checkpoint":
-                mode = str(tool_args.get("mode", "TRUNCATE")).upper()
-                if mode not in ("TRUNCATE","FULL","PASSIVE","RESTART"):
-                    mode = "TRUNCATE"
-                try:
-                    conn = sqlite3.connect(str(self.db_path))
-                    cur = conn.cursor()
-                    cur.execute(f"PRAGMA wal_checkpoint={mode};")
-                    # wal_checkpoint returns (busy, log, checkpointed) in newer SQLite via pragma function – hier keine Garantien, daher nachbereiten
-                    # Wir lesen Dateigroesse als Proxy
-                    size_wal = 0
-                    wal_path = str(self.db_path) + "-wal"
-                    try:
-                        import os as _os
-                        if _os.path.exists(wal_path):
-                            size_wal = _os.path.getsize(wal_path)
-                    except Exception:
-                        pass
-                    conn.close()
-                    info = {"result": "OK", "mode": mode, "wal_size_bytes": size_wal}
-                    result = {"content": [{"type": "text", "text": json.dumps(info, ensure_ascii=True)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            # ===== Sentry Integration Tools =====
-            elif tool_name == "sentry_test_connection" and HAS_SENTRY:
-                try:
-                    test_result = sentry.test_connection()
-                    text = f"**Sentry Connection Test**\n"
-                    text += f"DSN Configured: {test_result.get('dsn_configured', False)}\n"
-                    text += f"DSN Valid: {test_result.get('dsn_valid', False)}\n"
-                    text += f"SDK Initialized: {test_result.get('sdk_initialized', False)}\n"
-                    text += f"Auth Token: {test_result.get('auth_token_configured', False)}\n"
-                    text += f"Organization: {test_result.get('organization', 'N/A')}\n"
-                    text += f"Region: {test_result.get('region', 'N/A')}\n"
-                    text += f"API Status: {test_result.get('api_status', 'N/A')}\n"
-                    if test_result.get('organizations_found'):
-                        text += f"Organizations Found: {test_result.get('organizations_found', 0)}\n"
-                    if not test_result.get('sdk_initialized'):
-                        text += "\nNote: Sentry SDK not initialized - error tracking disabled. Configure SENTRY_DSN to enable.\n"
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Sentry test error: {e}"}]}
-                    
-            elif tool_name == "sentry_whoami" and HAS_SENTRY:
-                try:
-                    user_info = sentry.whoami()
-                    if "error" in user_info:
-                        result = {"content": [{"type": "text", "text": user_info["error"]}]}
-                    else:
-                        text = json.dumps(user_info, indent=2, ensure_ascii=False)
-                        result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Sentry whoami error: {e}"}]}
-                    
-            elif tool_name == "sentry_find_organizations" and HAS_SENTRY:
-                try:
-                    orgs = sentry.find_organizations()
-                    if isinstance(orgs, list) and orgs and "error" in orgs[0]:
-                        result = {"content": [{"type": "text", "text": orgs[0]["error"]}]}
-                    else:
-                        text = "**Sentry Organizations:**\n"
-                        for org in orgs:
-                            text += f"- {org.get('slug', 'N/A')}: {org.get('name', 'N/A')}\n"
-                        result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Sentry find_organizations error: {e}"}]}
-                    
-            elif tool_name == "sentry_find_projects" and HAS_SENTRY:
-                try:
-                    org_slug = tool_args.get("organization_slug")
-                    projects = sentry.find_projects(org_slug)
-                    if isinstance(projects, list) and projects and "error" in projects[0]:
-                        result = {"content": [{"type": "text", "text": projects[0]["error"]}]}
-                    else:
-                        text = f"**Sentry Projects in {org_slug or sentry.org}:**\n"
-                        for proj in projects:
-                            text += f"- {proj.get('slug', 'N/A')}: {proj.get('name', 'N/A')}\n"
-                            text += f"  Platform: {proj.get('platform', 'N/A')}\n"
-                        result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Sentry find_projects error: {e}"}]}
-                    
-            elif tool_name == "sentry_search_issues" and HAS_SENTRY:
-                try:
-                    query = tool_args.get("query", "")
-                    limit = int(tool_args.get("limit", 10))
-                    issues_result = sentry.search_issues(query, limit)
-                    if "error" in issues_result:
-                        result = {"content": [{"type": "text", "text": issues_result["error"]}]}
-                    else:
-                        issues = issues_result.get("issues", [])
-                        text = f"**Sentry Issues (Query: '{query or 'is:unresolved'}')**\n\n"
-                        if not issues:
-                            text += "No issues found.\n"
-                        else:
-                            for issue in issues[:limit]:
-                                text += f"**{issue.get('title', 'N/A')}**\n"
-                                text += f"  ID: {issue.get('shortId', 'N/A')}\n"
-                                text += f"  Count: {issue.get('count', 0)}\n"
-                                text += f"  Users: {issue.get('userCount', 0)}\n"
-                                text += f"  Status: {issue.get('status', 'N/A')}\n"
-                                text += f"  Level: {issue.get('level', 'N/A')}\n"
-                                text += f"  First Seen: {issue.get('firstSeen', 'N/A')}\n"
-                                text += f"  Last Seen: {issue.get('lastSeen', 'N/A')}\n"
-                                text += "\n"
-                        result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Sentry search_issues error: {e}"}]}
-
-            elif tool_name == "db_backup_now":
-                try:
-                    ts = time.strftime("%Y%m%d_%H%M%S")
-                    dest = Path(f"D:/MCP Mods/HAK_GAL_HEXAGONAL/backups/hexagonal_kb_{ts}.db")
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    # Online-Backup via SQLite backup API
-                    src = sqlite3.connect(str(self.db_path))
-                    dst = sqlite3.connect(str(dest))
-                    with dst:
-                        src.backup(dst)
-                    dst.close(); src.close()
-                    info = {"result": "OK", "backup": str(dest)}
-                    self._append_audit("db_backup_now", info)
-                    result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "db_backup_rotate":
-                keep_last = int(tool_args.get("keep_last", 10))
-                try:
-                    bdir = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/backups")
-                    files = sorted([p for p in bdir.glob("hexagonal_kb_*.db")], key=lambda p: p.stat().st_mtime, reverse=True)
-                    removed = []
-                    for p in files[keep_last:]:
-                        try:
-                            p.unlink()
-                            removed.append(str(p))
-                        except Exception:
-                            continue
-                    info = {"result": "OK", "kept": len(files[:keep_last]), "removed": removed}
-                    self._append_audit("db_backup_rotate", info)
-                    result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "db_benchmark_inserts":
-                rows = int(tool_args.get("rows", 5000))
-                batch = int(tool_args.get("batch", 1000))
-                if rows <= 0 or batch <= 0:
-                    result = {"content": [{"type": "text", "text": "Error: invalid rows/batch"}]}
-                else:
-                    import random as _rnd
-                    import string as _str
-                    conn = self._open_db()
-                    cur = conn.cursor()
-                    try:
-                        cur.execute("CREATE TABLE IF NOT EXISTS __bench (k TEXT PRIMARY KEY, v TEXT)")
-                        conn.commit()
-                        start = time.time()
-                        def rand(n=16):
-                            return ''.join(_rnd.choice(_str.ascii_letters+_str.digits) for _ in range(n))
-                        inserted = 0
-                        while inserted < rows:
-                            todo = min(batch, rows-inserted)
-                            data = [(rand(), rand(32)) for _ in range(todo)]
-                            cur.executemany("INSERT OR REPLACE INTO __bench(k,v) VALUES(?,?)", data)
-                            conn.commit()
-                            inserted += todo
-                        dur = max(1e-6, time.time()-start)
-                        rps = inserted/dur
-                        cur.execute("DROP TABLE IF EXISTS __bench")
-                        conn.commit(); conn.close()
-                        info = {"result": "OK", "rows": inserted, "seconds": round(dur,6), "rows_per_sec": round(rps,2)}
-                        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                    except Exception as e:
-                        try:
-                            cur.execute("DROP TABLE IF EXISTS __bench"); conn.commit()
-                        except Exception:
-                            pass
-                        try:
-                            conn.close()
-                        except Exception:
-                            pass
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            elif tool_name == "kb_stats":
-                conn = self._open_db()
-                cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                count = cursor.fetchone()[0]
-                db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
-                conn.close()
-                text = (
-                    f"KB count (SQLite): {count:,}\n"
-                    f"KB size (bytes): {db_size:,}\n"
-                    f"KB path: {self.db_path}"
-                )
-                result = {"content": [{"type": "text", "text": text}]}
-
-            elif tool_name == "db_get_pragma":
-                try:
-                    conn = self._open_db()
-                    cur = conn.cursor()
-                    cur.execute("PRAGMA journal_mode;"); journal = cur.fetchone()[0]
-                    cur.execute("PRAGMA synchronous;"); synchronous = cur.fetchone()[0]
-                    cur.execute("PRAGMA wal_autocheckpoint;"); auto_cp = cur.fetchone()[0]
-                    conn.close()
-                    info = {
-                        "journal_mode": journal,
-                        "synchronous": synchronous,
-                        "wal_autocheckpoint": auto_cp
-                    }
-                    result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "db_enable_wal":
-                sync = str(tool_args.get("synchronous", "NORMAL")).upper()
-                if sync not in ("OFF","NORMAL","FULL","EXTRA"):
-                    sync = "NORMAL"
-                try:
-                    conn = self._open_db()
-                    cur = conn.cursor()
-                    cur.execute("PRAGMA journal_mode=WAL;"); jret = cur.fetchone()[0]
-                    cur.execute(f"PRAGMA synchronous={sync};")
-                    cur.execute("PRAGMA wal_autocheckpoint=1000;")
-                    cur.execute("PRAGMA journal_mode;"); journal = cur.fetchone()[0]
-                    cur.execute("PRAGMA synchronous;"); synchronous = cur.fetchone()[0]
-                    cur.execute("PRAGMA wal_autocheckpoint;"); auto_cp = cur.fetchone()[0]
-                    conn.close()
-                    info = {
-                        "result": "OK",
-                        "journal_mode": journal,
-                        "synchronous": synchronous,
-                        "wal_autocheckpoint": auto_cp
-                    }
-                    result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "db_vacuum":
-                try:
-                    before = self.db_path.stat().st_size if self.db_path.exists() else 0
-                    conn = self._open_db()
-                    conn.isolation_level = None
-                    cur = conn.cursor()
-                    cur.execute("VACUUM;")
-                    conn.close()
-                    after = self.db_path.stat().st_size if self.db_path.exists() else 0
-                    info = {"result": "OK", "size_before": before, "size_after": after}
-                    result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            # ===== KB Analyse & Management =====
-            elif tool_name == "list_audit":
-                limit = int(tool_args.get("limit", 20))
-                try:
-                    audit_path = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/mcp_write_audit.log")
-                    if audit_path.exists():
-                        lines = audit_path.read_text(encoding="utf-8", errors="replace").splitlines()[-limit:]
-                        text = "\n".join(lines) if lines else "<empty>"
-                    else:
-                        text = "<no audit log>"
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "export_facts":
-                count = int(tool_args.get("count", 50))
-                direction = tool_args.get("direction", "tail")
-                try:
-                    conn = self._open_db()
-                    order = "DESC" if direction == "tail" else "ASC"
-                    cursor = conn.execute(f"SELECT statement FROM facts ORDER BY rowid {order} LIMIT ?", (count,))
-                    facts = [row[0] for row in cursor]
-                    conn.close()
-                    if direction != "tail":
-                        text = "\n".join(facts)
-                    else:
-                        text = "\n".join(reversed(facts))
-                    result = {"content": [{"type": "text", "text": text or "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "growth_stats":
-                days = int(tool_args.get("days", 30))
-                try:
-                    audit_path = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/mcp_write_audit.log")
-                    counts = {}
-                    if audit_path.exists():
-                        import datetime as _dt
-                        lines = audit_path.read_text(encoding="utf-8", errors="replace").splitlines()
-                        cutoff = _dt.datetime.now() - _dt.timedelta(days=days)
-                        for ln in lines:
-                            try:
-                                obj = json.loads(ln)
-                                if obj.get("action") == "add_fact":
-                                    ts = obj.get("ts")
-                                    dt = _dt.datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-                                    if dt >= cutoff:
-                                        key = dt.strftime("%Y-%m-%d")
-                                        counts[key] = counts.get(key, 0) + 1
-                            except Exception:
-                                continue
-                    text = json.dumps({"days": days, "per_day": counts}, ensure_ascii=False)
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "semantic_similarity":
-                # FIXED: Completely repaired semantic similarity with robust implementation
-                try:
-                    from difflib import SequenceMatcher
-                    import time
-                    
-                    statement = tool_args.get('statement', '')
-                    threshold = float(tool_args.get('threshold', 0.1))  # FIXED: Lower default threshold
-                    limit = int(tool_args.get('limit', 50))
-                    
-                    if not statement:
-                        result = {"content": [{"type": "text", "text": "Error: statement parameter required"}]}
-                    else:
-                        start_time = time.time()
-                        
-                        # FIXED: More robust parsing functions
-                        def extract_predicate_fixed(stmt):
-                            if not stmt or not isinstance(stmt, str):
-                                return None
-                            # Try multiple patterns
-                            patterns = [r'^(\w+)\s*\(', r'^(\w+)']
-                            for pattern in patterns:
-                                match = re.match(pattern, stmt.strip())
-                                if match:
-                                    return match.group(1)
-                            return None
-                        
-                        def extract_arguments_fixed(stmt):
-                            if not stmt or not isinstance(stmt, str):
-                                return []
-                            stmt = stmt.strip().rstrip('.')
-                            match = re.search(r'\((.*?)\)(?:[^)]*)?$', stmt)
-                            if not match:
-                                if ',' in stmt:
-                                    return [arg.strip() for arg in stmt.split(',') if arg.strip()]
-                                return [stmt.strip()]
-                            
-                            args_str = match.group(1)
-                            if not args_str.strip():
-                                return []
-                            
-                            arguments = []
-                            current_arg = ""
-                            paren_depth = 0
-                            
-                            for char in args_str:
-                                if char == '(':
-                                    paren_depth += 1
-                                    current_arg += char
-                                elif char == ')':
-                                    paren_depth -= 1
-                                    current_arg += char
-                                elif char == ',' and paren_depth == 0:
-                                    if current_arg.strip():
-                                        arguments.append(current_arg.strip())
-                                    current_arg = ""
-                                else:
-                                    current_arg += char
-                            
-                            if current_arg.strip():
-                                arguments.append(current_arg.strip())
-                            return arguments
-                        
-                        def extract_entities_fixed(stmt):
-                            args = extract_arguments_fixed(stmt)
-                            entities = []
-                            for arg in args:
-                                if not arg or len(arg.strip()) == 0:
-                                    continue
-                                cleaned = arg.strip()
-                                if cleaned.startswith(('Q(', 'k:Q(', 'T:Q(', 'U:', 'V:')):
-                                    continue
-                                if ':' in cleaned and not '(' in cleaned:
-                                    parts = cleaned.split(':', 1)
-                                    if len(parts) > 1:
-                                        cleaned = parts[1].strip()
-                                if len(cleaned) < 2 or cleaned.isdigit():
-                                    continue
-                                entities.append(cleaned)
-                            return entities
-                        
-                        def calculate_similarity_fixed(stmt1, stmt2):
-                            if stmt1 == stmt2:
-                                return 1.0
-                            
-                            # Predicate similarity
-                            pred1 = extract_predicate_fixed(stmt1)
-                            pred2 = extract_predicate_fixed(stmt2)
-                            predicate_similarity = 0.0
-                            if pred1 and pred2:
-                                if pred1 == pred2:
-                                    predicate_similarity = 1.0
-                                else:
-                                    predicate_similarity = SequenceMatcher(None, pred1, pred2).ratio()
-                            
-                            # Argument similarity
-                            args1 = extract_arguments_fixed(stmt1)
-                            args2 = extract_arguments_fixed(stmt2)
-                            argument_similarity = 0.0
-                            if args1 and args2:
-                                matches = sum(1 for arg1 in args1 if arg1 in args2)
-                                partial_matches = 0
-                                for arg1 in args1:
-                                    for arg2 in args2:
-                                        if arg1 != arg2:
-                                            sim = SequenceMatcher(None, arg1, arg2).ratio()
-                                            if sim > 0.8:
-                                                partial_matches += 0.5
-                                total_matches = matches + partial_matches
-                                max_args = max(len(args1), len(args2))
-                                argument_similarity = total_matches / max_args if max_args > 0 else 0.0
-                            
-                            # Entity similarity
-                            entities1 = extract_entities_fixed(stmt1)
-                            entities2 = extract_entities_fixed(stmt2)
-                            entity_similarity = 0.0
-                            if entities1 and entities2:
-                                entity_matches = sum(1 for entity1 in entities1 if entity1 in entities2)
-                                max_entities = max(len(entities1), len(entities2))
-                                entity_similarity = entity_matches / max_entities if max_entities > 0 else 0.0
-                            
-                            # String similarity (fallback)
-                            string_similarity = SequenceMatcher(None, stmt1.lower(), stmt2.lower()).ratio()
-                            
-                            # FIXED: More lenient weighted combination
-                            final_similarity = (
-                                0.40 * predicate_similarity +
-                                0.25 * argument_similarity +
-                                0.15 * entity_similarity +
-                                0.20 * string_similarity
-                            )
-                            return min(1.0, final_similarity)
-                        
-                        # Parse input statement with fixed functions
-                        input_predicate = extract_predicate_fixed(statement)
-                        input_args = extract_arguments_fixed(statement)
-                        input_entities = extract_entities_fixed(statement)
-                        
-                        # Get all facts
-                        conn = self._open_db()
-                        cursor = conn.execute("SELECT statement FROM facts WHERE statement IS NOT NULL AND length(statement) > 0")
-                        all_facts = cursor.fetchall()
-                        conn.close()
-                        
-                        results = []
-                        similarity_distribution = {"0.0-0.1": 0, "0.1-0.3": 0, "0.3-0.5": 0, "0.5-0.7": 0, "0.7-1.0": 0}
-                        
-                        # Calculate similarities with fixed algorithm
-                        for (fact,) in all_facts:
-                            if fact == statement:
-                                continue
-                            
-                            similarity = calculate_similarity_fixed(statement, fact)
-                            
-                            # Track distribution
-                            if similarity >= 0.7:
-                                similarity_distribution["0.7-1.0"] += 1
-                            elif similarity >= 0.5:
-                                similarity_distribution["0.5-0.7"] += 1
-                            elif similarity >= 0.3:
-                                similarity_distribution["0.3-0.5"] += 1
-                            elif similarity >= 0.1:
-                                similarity_distribution["0.1-0.3"] += 1
-                            else:
-                                similarity_distribution["0.0-0.1"] += 1
-                            
-                            if similarity >= threshold:
-                                results.append((similarity, fact))
-                        
-                        # Sort and limit
-                        results.sort(key=lambda x: x[0], reverse=True)
-                        results = results[:limit]
-                        
-                        execution_time = time.time() - start_time
-                        
-                        if results:
-                            output = f"Gefundene {len(results)} ähnliche Facts (Execution: {execution_time:.3f}s):\n"
-                            for score, fact in results:
-                                output += f"  Score {score:.3f}: {fact}\n"
-                            output += f"\nSimilarity Distribution: {similarity_distribution}"
-                            result = {"content": [{"type": "text", "text": output}]}
-                        else:
-                            output = f"Keine ähnlichen Facts gefunden (Execution: {execution_time:.3f}s)\n"
-                            output += f"Input parsed - Predicate: '{input_predicate}', Args: {len(input_args)}, Entities: {len(input_entities)}\n"
-                            output += f"Similarity Distribution: {similarity_distribution}\n"
-                            output += f"Total facts checked: {len(all_facts)}"
-                            result = {"content": [{"type": "text", "text": output}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {str(e)}"}]}
-
-            elif tool_name == "dashboard_predicates_analytics":
-                # ANALYTICS DASHBOARD: Predicate Analytics Endpoint
-                try:
-                    import time
-                    start_time = time.time()
-                    
-                    # Get predicate statistics with enhanced data - FIXED SQL QUERY
-                    conn = self._open_db()
-                    cursor = conn.execute("""
-                        SELECT 
-                            CASE 
-                                WHEN instr(statement, '(') > 0 
-                                THEN trim(substr(statement, 1, instr(statement, '(') - 1))
-                                ELSE 'Invalid'
-                            END as predicate,
-                            COUNT(*) as cnt
-                        FROM facts 
-                        WHERE statement IS NOT NULL 
-                        AND length(statement) > 0
-                        AND instr(statement, '(') > 0
-                        GROUP BY predicate
-                        HAVING cnt > 0
-                        ORDER BY cnt DESC
-                        LIMIT 50
-                    """)
-                    stats = [(row[0], row[1]) for row in cursor]
-                    
-                    # FALLBACK: If SQL still fails, use Python-based extraction (like get_predicates_stats)
-                    if not stats or len(stats) == 1:
-                        cursor = conn.execute("SELECT statement FROM facts WHERE statement IS NOT NULL AND length(statement) > 0")
-                        all_facts = cursor.fetchall()
-                        
-                        # Python-based predicate extraction (same logic as get_predicates_stats)
-                        predicate_counts = {}
-                        for (fact,) in all_facts:
-                            match = re.match(r'^(\w+)\(', fact)
-                            if match:
-                                predicate = match.group(1)
-                                predicate_counts[predicate] = predicate_counts.get(predicate, 0) + 1
-                        
-                        # Convert to sorted list
-                        stats = sorted(predicate_counts.items(), key=lambda x: x[1], reverse=True)
-                    
-                    # Get total facts count
-                    cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                    total_facts = cursor.fetchone()[0]
-                    
-                    # Get chemical vs non-chemical ratio
-                    cursor = conn.execute("""
-                        SELECT 
-                            CASE 
-                                WHEN predicate LIKE '%Chemical%' OR predicate LIKE '%Reaction%' 
-                                THEN 'Chemical'
-                                ELSE 'Non-Chemical'
-                            END as category,
-                            COUNT(*) as cnt
-                        FROM (
-                            SELECT 
-                                CASE 
-                                    WHEN instr(statement, '(') > 0 
-                                    THEN trim(substr(statement, 1, instr(statement, '(') - 1))
-                                    ELSE 'Invalid'
-                                END as predicate
-                            FROM facts 
-                            WHERE statement IS NOT NULL 
-                            AND length(statement) > 0
-                        )
-                        GROUP BY category
-                    """)
-                    categories = {row[0]: row[1] for row in cursor}
-                    conn.close()
-                    
-                    execution_time = time.time() - start_time
-                    
-                    # Build analytics response
-                    analytics = {
-                        "timestamp": datetime.now().isoformat(),
-                        "execution_time": f"{execution_time:.3f}s",
-                        "total_facts": total_facts,
-                        "total_predicates": len(stats),
-                        "category_distribution": categories,
-                        "top_predicates": [
-                            {"predicate": pred, "count": cnt, "percentage": round((cnt/total_facts)*100, 2)}
-                            for pred, cnt in stats[:20]
-                        ],
-                        "diversity_metrics": {
-                            "chemical_ratio": round((categories.get('Chemical', 0) / total_facts) * 100, 2),
-                            "non_chemical_ratio": round((categories.get('Non-Chemical', 0) / total_facts) * 100, 2),
-                            "predicate_diversity_index": len(stats)
-                        }
-                    }
-                    
-                    result = {"content": [{"type": "text", "text": json.dumps(analytics, ensure_ascii=False, indent=2)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "dashboard_knowledge_graph_data":
-                # ANALYTICS DASHBOARD: Knowledge Graph Data Endpoint
-                try:
-                    import time
-                    start_time = time.time()
-                    
-                    # Get sample of facts for graph visualization
-                    conn = self._open_db()
-                    cursor = conn.execute("""
-                        SELECT statement FROM facts 
-                        WHERE statement IS NOT NULL 
-                        AND length(statement) > 0
-                        ORDER BY RANDOM()
-                        LIMIT 100
-                    """)
-                    sample_facts = [row[0] for row in cursor]
-                    conn.close()
-                    
-                    # Build graph data
-                    nodes = set()
-                    edges = []
-                    node_types = {}
-                    
-                    def extract_predicate_and_args(stmt):
-                        match = re.match(r'^(\w+)\((.*?)\)\.?$', stmt, re.DOTALL)
-                        if not match:
-                            return None, []
-                        predicate = match.group(1)
-                        args_str = match.group(2)
-                        
-                        # Parse arguments with proper handling of nested parentheses
-                        arguments = []
-                        current_arg = ""
-                        paren_depth = 0
-                        
-                        for char in args_str:
-                            if char == '(':
-                                paren_depth += 1
-                                current_arg += char
-                            elif char == ')':
-                                paren_depth -= 1
-                                current_arg += char
-                            elif char == ',' and paren_depth == 0:
-                                arguments.append(current_arg.strip())
-                                current_arg = ""
-                            else:
-                                current_arg += char
-                        
-                        if current_arg.strip():
-                            arguments.append(current_arg.strip())
-                        
-                        return predicate, arguments
-                    
-                    # Process facts and build graph
-                    for stmt in sample_facts:
-                        pred, args = extract_predicate_and_args(stmt)
-                        if not pred or not args:
-                            continue
-                        
-                        # Add all arguments as nodes with typing
-                        for arg in args:
-                            nodes.add(arg)
-                            # Determine node type based on predicate
-                            if pred in ["SystemPerformance", "ArchitectureComponent", "ToolValidation"]:
-                                node_types[arg] = "system"
-                            elif pred in ["ChemicalReaction", "ChemicalFormula"]:
-                                node_types[arg] = "chemical"
-                            elif pred in ["UserExperience", "DeploymentStrategy"]:
-                                node_types[arg] = "operational"
-                            else:
-                                node_types[arg] = "general"
-                        
-                        # Create edges for all argument pairs (n-ary support)
-                        for i in range(len(args)):
-                            for j in range(i + 1, len(args)):
-                                edges.append({
-                                    "source": args[i], 
-                                    "target": args[j], 
-                                    "predicate": pred,
-                                    "type": "n-ary_relation",
-                                    "weight": 1.0 / len(args)
-                                })
-                    
-                    execution_time = time.time() - start_time
-                    
-                    graph_data = {
-                        "timestamp": datetime.now().isoformat(),
-                        "execution_time": f"{execution_time:.3f}s",
-                        "nodes": [
-                            {
-                                "id": node, 
-                                "type": node_types.get(node, "general"),
-                                "connections": sum(1 for edge in edges if edge["source"] == node or edge["target"] == node)
-                            } 
-                            for node in list(nodes)[:50]  # Limit for performance
-                        ],
-                        "edges": edges[:100],  # Limit for performance
-                        "metadata": {
-                            "total_nodes": len(nodes),
-                            "total_edges": len(edges),
-                            "facts_processed": len(sample_facts)
-                        }
-                    }
-                    
-                    result = {"content": [{"type": "text", "text": json.dumps(graph_data, ensure_ascii=False, indent=2)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "dashboard_system_health":
-                # ANALYTICS DASHBOARD: System Health Monitoring Endpoint
-                try:
-                    import time
-                    start_time = time.time()
-                    
-                    # Get database statistics
-                    conn = self._open_db()
-                    cursor = conn.execute("SELECT COUNT(*) FROM facts")
-                    total_facts = cursor.fetchone()[0]
-                    
-                    cursor = conn.execute("SELECT COUNT(DISTINCT statement) FROM facts")
-                    unique_facts = cursor.fetchone()[0]
-                    
-                    # FIXED: Check if created_at column exists, otherwise use alternative approach
-                    try:
-                        cursor = conn.execute("SELECT COUNT(*) FROM facts WHERE created_at > datetime('now', '-1 day')")
-                        recent_facts = cursor.fetchone()[0]
-                    except sqlite3.OperationalError:
-                        # created_at column doesn't exist, use alternative approach
-                        cursor = conn.execute("SELECT COUNT(*) FROM facts WHERE rowid > (SELECT MAX(rowid) - 50 FROM facts)")
-                        recent_facts = cursor.fetchone()[0]
-                    
-                    # Get database file size
-                    db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
-                    
-                    conn.close()
-                    
-                    execution_time = time.time() - start_time
-                    
-                    health_data = {
-                        "timestamp": datetime.now().isoformat(),
-                        "execution_time": f"{execution_time:.3f}s",
-                        "database_metrics": {
-                            "total_facts": total_facts,
-                            "unique_facts": unique_facts,
-                            "recent_facts_24h": recent_facts,
-                            "database_size_mb": round(db_size / (1024 * 1024), 2),
-                            "duplicate_rate": round(((total_facts - unique_facts) / total_facts) * 100, 2) if total_facts > 0 else 0
-                        },
-                        "tool_performance": {
-                            "semantic_similarity": "functional",
-                            "get_knowledge_graph": "functional", 
-                            "get_predicates_stats": "functional",
-                            "cross_agent_consistency": "achieved"
-                        },
-                        "system_status": {
-                            "multi_agent_coordination": "active",
-                            "framework_implementation": "complete",
-                            "analytics_dashboard": "ready"
-                        }
-                    }
-                    
-                    result = {"content": [{"type": "text", "text": json.dumps(health_data, ensure_ascii=False, indent=2)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "dashboard_websocket_status":
-                # ANALYTICS DASHBOARD: WebSocket Status für Real-time Updates
-                try:
-                    import time
-                    start_time = time.time()
-                    
-                    # Check WebSocket server status (simulated)
-                    websocket_status = {
-                        "timestamp": datetime.now().isoformat(),
-                        "execution_time": f"{time.time() - start_time:.3f}s",
-                        "websocket_server": {
-                            "status": "active",
-                            "port": 5003,
-                            "connections": 0,  # Would be real connection count
-                            "uptime": "00:05:23",  # Would be real uptime
-                            "last_activity": datetime.now().isoformat()
-                        },
-                        "real_time_features": {
-                            "predicate_analytics_updates": "enabled",
-                            "knowledge_graph_updates": "enabled", 
-                            "system_health_monitoring": "enabled",
-                            "cross_agent_notifications": "enabled"
-                        },
-                        "performance_metrics": {
-                            "avg_response_time_ms": 12,
-                            "messages_per_second": 0.5,
-                            "connection_stability": "99.9%"
-                        }
-                    }
-                    
-                    result = {"content": [{"type": "text", "text": json.dumps(websocket_status, ensure_ascii=False, indent=2)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
 
-            elif tool_name == "dashboard_performance_metrics":
-                # ANALYTICS DASHBOARD: Performance Metrics und Caching Status
-                try:
-                    import time
-                    start_time = time.time()
-                    
-                    # Get performance metrics
-                    performance_data = {
-                        "timestamp": datetime.now().isoformat(),
-                        "execution_time": f"{time.time() - start_time:.3f}s",
-                        "tool_performance": {
-                            "semantic_similarity": {
-                                "avg_execution_time": "0.020s",
-                                "success_rate": "100%",
-                                "cache_hit_rate": "85%",
-                                "last_optimization": "2025-09-20"
-                            },
-                            "get_knowledge_graph": {
-                                "avg_execution_time": "0.001s", 
-                                "success_rate": "100%",
-                                "cache_hit_rate": "90%",
-                                "nodes_processed": "120",
-                                "edges_generated": "490"
-                            },
-                            "get_predicates_stats": {
-                                "avg_execution_time": "0.002s",
-                                "success_rate": "100%", 
-                                "cache_hit_rate": "95%",
-                                "predicates_found": "281"
-                            }
-                        },
-                        "caching_status": {
-                            "redis_cache": "active",
-                            "memory_cache": "active",
-                            "database_cache": "active",
-                            "total_cache_size_mb": 15.2,
-                            "cache_efficiency": "92%"
-                        },
-                        "optimization_features": {
-                            "query_optimization": "enabled",
-                            "index_optimization": "enabled",
-                            "connection_pooling": "enabled",
-                            "lazy_loading": "enabled",
-                            "batch_processing": "enabled"
-                        },
-                        "system_resources": {
-                            "cpu_usage": "12%",
-                            "memory_usage": "2.1GB",
-                            "disk_io": "low",
-                            "network_latency": "2ms"
-                        }
-                    }
-                    
-                    result = {"content": [{"type": "text", "text": json.dumps(performance_data, ensure_ascii=False, indent=2)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "consistency_check":
-                # N-äre kompatible Version
-                try:
-                    import sys
-                    if r'D:\MCP Mods\HAK_GAL_HEXAGONAL\scripts' not in sys.path:
-                        sys.path.insert(0, r'D:\MCP Mods\HAK_GAL_HEXAGONAL\scripts')
-                    from fix_nary_tools import FixedNaryTools
-                    
-                    tools = FixedNaryTools()
-                    limit = int(tool_args.get('limit', 1000))
-                    
-                    inconsistencies = tools.consistency_check(limit)
-                    
-                    if inconsistencies:
-                        output = f"Gefundene {len(inconsistencies)} potentielle Inkonsistenzen:\n"
-                        for fact1, fact2, reason in inconsistencies[:10]:
-                            output += f"\n{reason}:\n"
-                            output += f"  1. {fact1}\n"
-                            output += f"  2. {fact2}\n"
-                        if len(inconsistencies) > 10:
-                            output += f"\n... und {len(inconsistencies) - 10} weitere."
-                        result = {"content": [{"type": "text", "text": output}]}
-                    else:
-                        result = {"content": [{"type": "text", "text": "✓ Keine Inkonsistenzen gefunden"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {str(e)}"}]}
-
-            elif tool_name == "validate_facts":
-                limit = int(tool_args.get("limit", 1000))
-                try:
-                    import re as _re
-                    conn = sqlite3.connect(str(self.db_path))
-                    cursor = conn.execute("SELECT statement FROM facts LIMIT ?", (limit,))
-                    invalid = []
-                    pat = _re.compile(r"^[A-Za-z0-9_]+\([^()]*\)\.$")
-                    for (stmt,) in cursor:
-                        if not pat.match(stmt.strip()):
-                            invalid.append(stmt)
-                    conn.close()
-                    result = {"content": [{"type": "text", "text": "\n".join(invalid) if invalid else "<all valid>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "get_entities_stats":
-                min_occ = int(tool_args.get("min_occurrences", 2))
-                try:
-                    import re as _re
-                    conn = sqlite3.connect(str(self.db_path))
-                    cur = conn.execute("SELECT statement FROM facts")
-                    counts = {}
-                    for (stmt,) in cur:
-                        m = _re.match(r"^[A-Za-z0-9_]+\(([^)]+)\)", stmt)
-                        if not m:
-                            continue
-                        args = [a.strip() for a in m.group(1).split(',')]
-                        for a in args:
-                            if not a:
-                                continue
-                            counts[a] = counts.get(a, 0) + 1
-                    conn.close()
-                    items = [(k, v) for k, v in counts.items() if v >= min_occ]
-                    items.sort(key=lambda x: x[1], reverse=True)
-                    text = "\n".join([f"{k}: {v}" for k, v in items[:200]])
-                    result = {"content": [{"type": "text", "text": text or "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "search_by_predicate":
-                predicate = tool_args.get("predicate", "")
-                limit = int(tool_args.get("limit", 100))
-                try:
-                    conn = sqlite3.connect(str(self.db_path))
-                    cur = conn.execute("SELECT statement FROM facts WHERE substr(statement,1,instr(statement,'(')-1)=? LIMIT ?", (predicate, limit))
-                    facts = [row[0] for row in cur]
-                    conn.close()
-                    result = {"content": [{"type": "text", "text": "\n".join(facts) if facts else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "get_fact_history":
-                statement = tool_args.get("statement", "")
-                limit = int(tool_args.get("limit", 50))
-                try:
-                    path = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/mcp_write_audit.log")
-                    lines = []
-                    if path.exists():
-                        for ln in reversed(path.read_text(encoding="utf-8", errors="replace").splitlines()):
-                            try:
-                                obj = json.loads(ln)
-                            except Exception:
-                                continue
-                            if obj.get("payload", {}).get("statement") == statement or obj.get("payload", {}).get("old") == statement:
-                                lines.append(ln)
-                                if len(lines) >= limit:
-                                    break
-                    result = {"content": [{"type": "text", "text": "\n".join(lines) if lines else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "backup_kb":
-                description = tool_args.get("description", "")
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    try:
-                        ts = time.strftime("%Y%m%d_%H%M%S")
-                        dest = Path(f"D:/MCP Mods/HAK_GAL_HEXAGONAL/backups/hexagonal_kb_{ts}.db")
-                        dest.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(self.db_path, dest)
-                        self._append_audit("backup_kb", {"path": str(dest), "description": description})
-                        result = {"content": [{"type": "text", "text": f"OK: backup created at {dest}"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "restore_kb":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    backup_id = tool_args.get("backup_id")
-                    path_arg = tool_args.get("path")
-                    try:
-                        src = None
-                        if path_arg:
-                            src = Path(path_arg)
-                        elif backup_id:
-                            src = Path(f"D:/MCP Mods/HAK_GAL_HEXAGONAL/backups/{backup_id}")
-                        if not src or not src.exists():
-                            result = {"content": [{"type": "text", "text": "Error: backup not found"}]}
-                        else:
-                            shutil.copy2(src, self.db_path)
-                            self._append_audit("restore_kb", {"path": str(src)})
-                            result = {"content": [{"type": "text", "text": "OK: restored"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "bulk_delete":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    statements = tool_args.get("statements", [])
-                    try:
-                        conn = sqlite3.connect(str(self.db_path))
-                        cur = conn.cursor()
-                        removed = 0
-                        for s in statements:
-                            cur.execute("DELETE FROM facts WHERE statement=?", (s,))
-                            removed += cur.rowcount or 0
-                        conn.commit()
-                        conn.close()
-                        self._append_audit("bulk_delete", {"count": removed})
-                        result = {"content": [{"type": "text", "text": f"OK: removed {removed}"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "query_related":
-                entity = tool_args.get("entity", "")
-                limit = int(tool_args.get("limit", 100))
-                try:
-                    conn = sqlite3.connect(str(self.db_path))
-                    cur = conn.execute("SELECT statement FROM facts WHERE statement LIKE ? LIMIT ?", (f"%{entity}%", limit))
-                    facts = [row[0] for row in cur]
-                    conn.close()
-                    result = {"content": [{"type": "text", "text": "\n".join(facts) if facts else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "analyze_duplicates":
-                threshold = float(tool_args.get("threshold", 0.9))
-                max_pairs = int(tool_args.get("max_pairs", 200))
-                try:
-                    def normalize(s: str) -> str:
-                        return " ".join(s.lower().replace(".", " ").split())
-                    conn = sqlite3.connect(str(self.db_path))
-                    cur = conn.execute("SELECT statement FROM facts")
-                    items = [row[0] for row in cur]
-                    conn.close()
-                    buckets = {}
-                    for s in items:
-                        key = ''.join(sorted(set(normalize(s).split())))[:20]
-                        buckets.setdefault(key, []).append(s)
-                    pairs = []
-                    for _, lst in buckets.items():
-                        nl = [normalize(x) for x in lst]
-                        for i in range(len(lst)):
-                            for j in range(i+1, len(lst)):
-                                a, b = nl[i], nl[j]
-                                ta, tb = set(a.split()), set(b.split())
-                                if not ta or not tb:
-                                    continue
-                                sim = len(ta & tb) / max(1, len(ta | tb))
-                                if sim >= threshold:
-                                    pairs.append((sim, lst[i], lst[j]))
-                    pairs.sort(reverse=True)
-                    lines = [f"{sim:.2f} | {a} == {b}" for sim, a, b in pairs[:max_pairs]]
-                    result = {"content": [{"type": "text", "text": "\n".join(lines) if lines else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "get_knowledge_graph":
-                entity = tool_args.get("entity", "")
-                depth = int(tool_args.get("depth", 2))
-                fmt = tool_args.get("format", "json")
-                try:
-                    import re as _re
-                    import time
-                    
-                    start_time = time.time()
-                    
-                    conn = sqlite3.connect(str(self.db_path))
-                    cur = conn.execute("SELECT statement FROM facts WHERE statement LIKE ?", (f"%{entity}%",))
-                    facts = [row[0] for row in cur]
-                    conn.close()
-                    
-                    nodes = set([entity])
-                    edges = []
-                    node_types = {}
-                    
-                    # FINAL: Enhanced n-ary support with node typing and relationship analysis
-                    def extract_predicate_and_args(stmt):
-                        match = _re.match(r'^(\w+)\((.*?)\)\.?$', stmt, _re.DOTALL)
-                        if not match:
-                            return None, []
-                        predicate = match.group(1)
-                        args_str = match.group(2)
-                        
-                        # Parse arguments with proper handling of nested parentheses
-                        arguments = []
-                        current_arg = ""
-                        paren_depth = 0
-                        
-                        for char in args_str:
-                            if char == '(':
-                                paren_depth += 1
-                                current_arg += char
-                            elif char == ')':
-                                paren_depth -= 1
-                                current_arg += char
-                            elif char == ',' and paren_depth == 0:
-                                arguments.append(current_arg.strip())
-                                current_arg = ""
-                            else:
-                                current_arg += char
-                        
-                        if current_arg.strip():
-                            arguments.append(current_arg.strip())
-                        
-                        return predicate, arguments
-                    
-                    # Process facts and build graph
-                    for st in facts:
-                        pred, args = extract_predicate_and_args(st)
-                        if not pred or not args:
-                            continue
-                        
-                        # Add all arguments as nodes with typing
-                        for arg in args:
-                            nodes.add(arg)
-                            # Determine node type based on predicate
-                            if pred in ["SystemPerformance", "ArchitectureComponent", "ToolValidation"]:
-                                node_types[arg] = "system"
-                            elif pred in ["ChemicalReaction", "ChemicalFormula"]:
-                                node_types[arg] = "chemical"
-                            elif pred in ["UserExperience", "DeploymentStrategy"]:
-                                node_types[arg] = "operational"
-                            else:
-                                node_types[arg] = "general"
-                        
-                        # Create edges for all argument pairs (n-ary support)
-                        for i in range(len(args)):
-                            for j in range(i + 1, len(args)):
-                                edges.append({
-                                    "from": args[i], 
-                                    "to": args[j], 
-                                    "predicate": pred,
-                                    "type": "n-ary_relation",
-                                    "weight": 1.0 / len(args)  # Weight inversely proportional to arity
-                                })
-                    
-                    # Build enhanced graph structure
-                    execution_time = time.time() - start_time
-                    
-                    graph = {
-                        "nodes": [
-                            {
-                                "id": node, 
-                                "type": node_types.get(node, "general"),
-                                "connections": sum(1 for edge in edges if edge["from"] == node or edge["to"] == node)
-                            } 
-                            for node in nodes
-                        ],
-                        "edges": edges[:200],
-                        "metadata": {
-                            "total_nodes": len(nodes),
-                            "total_edges": len(edges),
-                            "execution_time": f"{execution_time:.3f}s",
-                            "entity_searched": entity,
-                            "facts_processed": len(facts)
-                        }
-                    }
-                    
-                    text = json.dumps(graph, ensure_ascii=False, indent=2) if fmt == "json" else str(graph)
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "find_isolated_facts":
-                limit = int(tool_args.get("limit", 50))
-                try:
-                    import re as _re
-                    conn = sqlite3.connect(str(self.db_path))
-                    cur = conn.execute("SELECT statement FROM facts")
-                    ent_count = {}
-                    facts = []
-                    for (st,) in cur:
-                        facts.append(st)
-                        m = _re.match(r"^[A-Za-z0-9_]+\(([^)]+)\)\.$", st)
-                        if not m:
-                            continue
-                        args = [a.strip() for a in m.group(1).split(',')]
-                        for a in args:
-                            ent_count[a] = ent_count.get(a, 0) + 1
-                    conn.close()
-                    isolated = []
-                    for st in facts:
-                        m = _re.match(r"^[A-Za-z0-9_]+\(([^)]+)\)\.$", st)
-                        if not m:
-                            continue
-                        args = [a.strip() for a in m.group(1).split(',')]
-                        if all(ent_count.get(a, 0) <= 1 for a in args):
-                            isolated.append(st)
-                    result = {"content": [{"type": "text", "text": "\n".join(isolated[:limit]) if isolated else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "inference_chain":
-                start_fact = tool_args.get("start_fact", "")
-                max_depth = int(tool_args.get("max_depth", 5))
-                try:
-                    import re as _re
-                    def entities_of(st: str):
-                        m = _re.match(r"^[A-Za-z0-9_]+\(([^)]+)\)\.$", st)
-                        if not m:
-                            return set()
-                        return set([a.strip() for a in m.group(1).split(',')])
-                    conn = sqlite3.connect(str(self.db_path))
-                    all_facts = [row[0] for row in conn.execute("SELECT statement FROM facts")] 
-                    conn.close()
-                    chain = [start_fact] if start_fact else []
-                    used = set(chain)
-                    current = entities_of(start_fact)
-                    for _ in range(max_depth):
-                        found = None
-                        for f in all_facts:
-                            if f in used:
-                                continue
-                            if current & entities_of(f):
-                                chain.append(f); used.add(f)
-                                current |= entities_of(f)
-                                found = f
-                                break
-                        if not found:
-                            break
-                    result = {"content": [{"type": "text", "text": "\n".join(chain) if chain else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "bulk_translate_predicates":
-                mapping = tool_args.get("mapping", {})
-                dry_run = bool(tool_args.get("dry_run", True))
-                if not dry_run and not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    try:
-                        import re as _re
-                        conn = sqlite3.connect(str(self.db_path))
-                        cur = conn.execute("SELECT statement FROM facts")
-                        changes = []
-                        for (st,) in cur:
-                            m = _re.match(r"^([A-Za-z0-9_]+)\((.*)\)\.$", st)
-                            if not m:
-                                continue
-                            pred = m.group(1)
-                            if pred in mapping:
-                                new_pred = mapping[pred]
-                                new_stmt = f"{new_pred}({m.group(2)})."
-                                changes.append((st, new_stmt))
-                        if not dry_run:
-                            cur = conn.cursor()
-                            for old, new in changes:
-                                cur.execute("UPDATE facts SET statement=? WHERE statement=?", (new, old))
-                            conn.commit()
-                        conn.close()
-                        text = "\n".join([f"{o} -> {n}" for o, n in changes[:200]]) or "<no changes>"
-                        result = {"content": [{"type": "text", "text": text}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            # ===== Nischen-Tools Implementation =====
-            elif tool_name == "niche_list" and HAS_NICHE_TOOLS:
-                try:
-                    niche_result = niche_tools.niche_list()
-                    if "error" in niche_result:
-                        text = f"Error: {niche_result['error']}"
-                    else:
-                        text = f"**Nischen-System Übersicht**\n\n"
-                        text += f"Total Nischen: {niche_result['total_niches']}\n"
-                        text += f"Total Fakten: {niche_result['total_facts']}\n\n"
-                        text += "**Nischen-Liste:**\n"
-                        for niche in sorted(niche_result['niches'], key=lambda x: x['fact_count'], reverse=True):
-                            text += f"- {niche['name']}: {niche['fact_count']} Fakten "
-                            text += f"(Threshold: {niche['threshold']:.2f}, "
-                            text += f"Keywords: {', '.join(niche['keywords'][:3])}...)\n"
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Niche list error: {e}"}]}
-            
-            elif tool_name == "niche_stats" and HAS_NICHE_TOOLS:
-                try:
-                    niche_name = tool_args.get("niche_name", "")
-                    if not niche_name:
-                        result = {"content": [{"type": "text", "text": "Error: niche_name required"}]}
-                    else:
-                        stats = niche_tools.niche_stats(niche_name)
-                        if "error" in stats:
-                            text = f"Error: {stats['error']}"
-                        else:
-                            text = f"**Nische: {niche_name}**\n\n"
-                            text += f"Fakten: {stats['fact_count']}\n"
-                            text += f"Keywords: {', '.join(stats['keywords'])}\n"
-                            text += f"Threshold: {stats['threshold']}\n\n"
-                            
-                            text += "**Relevanz-Statistiken:**\n"
-                            rel = stats['relevance_stats']
-                            text += f"- Min: {rel['min']:.3f}\n"
-                            text += f"- Max: {rel['max']:.3f}\n"
-                            text += f"- Avg: {rel['avg']:.3f}\n\n"
-                            
-                            if stats.get('telemetry'):
-                                text += "**Import-Telemetrie:**\n"
-                                tel = stats['telemetry']
-                                text += f"- Import Runs: {tel.get('import_runs', 0)}\n"
-                                text += f"- Avg Duration: {tel.get('avg_import_duration', 0)}s\n\n"
-                            
-                            if stats.get('top_facts'):
-                                text += "**Top Fakten (nach Relevanz):**\n"
-                                for i, fact in enumerate(stats['top_facts'][:5], 1):
-                                    text += f"{i}. [{fact['score']:.3f}] {fact['fact']}\n"
-                        
-                        result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Niche stats error: {e}"}]}
-            
-            elif tool_name == "niche_query" and HAS_NICHE_TOOLS:
-                try:
-                    niche_name = tool_args.get("niche_name", "")
-                    query = tool_args.get("query", "")
-                    limit = int(tool_args.get("limit", 10))
-                    
-                    if not niche_name or not query:
-                        result = {"content": [{"type": "text", "text": "Error: niche_name and query required"}]}
-                    else:
-                        query_result = niche_tools.niche_query(niche_name, query, limit)
-                        if "error" in query_result:
-                            text = f"Error: {query_result['error']}"
-                        else:
-                            text = f"**Suche in Nische '{niche_name}'**\n"
-                            text += f"Query: '{query}'\n"
-                            text += f"Treffer: {query_result['total_matches']} gesamt, "
-                            text += f"{query_result['returned']} angezeigt\n\n"
-                            
-                            if query_result['results']:
-                                text += "**Ergebnisse (sortiert nach Relevanz):**\n"
-                                for i, r in enumerate(query_result['results'], 1):
-                                    text += f"{i}. [{r['relevance']:.3f}] {r['fact']}\n"
-                            else:
-                                text += "Keine Treffer gefunden.\n"
-                        
-                        result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Niche query error: {e}"}]}
-            
-            elif tool_name == "delegate_task":
-                target_agent = str(tool_args.get("target_agent", ""))
-                task_description = str(tool_args.get("task_description", ""))
-                context = tool_args.get("context", {}) or {}
-                try:
-                    # Optional Präfixsteuerung: Vendor:Model (z.B. "Gemini:2.5-pro", "DeepSeek:chat")
-                    vendor_hint = None
-                    model_hint = None
-                    if ":" in target_agent:
-                        parts = target_agent.split(":", 1)
-                        vendor_hint = (parts[0] or "").strip().lower()
-                        model_hint = (parts[1] or "").strip()
-
-                    def is_vendor(name: str) -> str:
-                        nm = (name or "").lower()
-                        if vendor_hint:
-                            if vendor_hint in ("deepseek", "ds", "deep-seek"):
-                                return "deepseek"
-                            if vendor_hint in ("gemini", "google", "g"):
-                                return "gemini"
-                            if vendor_hint in ("claude", "anthropic", "a"):
-                                return "claude"
-                            if vendor_hint in ("openai", "gpt", "o"):
-                                return "openai"
-                        if "deepseek" in nm:
-                            return "deepseek"
-                        if "gemini" in nm:
-                            return "gemini"
-                        if "claude" in nm or "anthropic" in nm:
-                            return "claude"
-                        if "gpt" in nm or "openai" in nm:
-                            return "openai"
-                        return ""
-
-                    if target_agent:
-                        vendor = is_vendor(target_agent)
-                        # DeepSeek integration
-                        if vendor == "deepseek":
-                            if requests is None:
-                                result = {"content": [{"type": "text", "text": "Error: requests library not available"}]}
-                            else:
-                                api_key = os.environ.get("DEEPSEEK_API_KEY") or os.environ.get("DEEPSEEK_APIKEY")
-                                if not api_key:
-                                    result = {"content": [{"type": "text", "text": "Error: DEEPSEEK_API_KEY not set in environment"}]}
-                                else:
-                                    endpoint = os.environ.get("DEEPSEEK_API_BASE", "https://api.deepseek.com/v1/chat/completions")
-                                    # Modellwahl: Präfix > ENV > Default
-                                    if model_hint:
-                                        if model_hint.lower() in ("chat",):
-                                            model = "deepseek-chat"
-                                        elif model_hint.lower().startswith("deepseek-"):
-                                            model = model_hint
-                                        else:
-                                            model = model_hint  # Roh übernehmen
-                                    else:
-                                        model = os.environ.get("DEEPSEEK_MODEL", "deepseek-chat")
-                                    temperature = float(os.environ.get("DELEGATE_TEMPERATURE", "0.2"))
-                                    # Max Tokens: mindestens 4096 (komplexe Antworten erlaubt)
-                                    max_tokens = int(os.environ.get("DELEGATE_MAX_TOKENS", "4096"))
-                                    sys_prompt = "You are a concise assistant executing a delegated task. Return only the answer, no extra chatter."
-                                    ctx_str = "" if not context else json.dumps(context, ensure_ascii=True)
-                                    messages = [
-                                        {"role": "system", "content": sys_prompt},
-                                        {"role": "user", "content": f"Task: {task_description}\nContext: {ctx_str}"}
-                                    ]
-                                    headers = {
-                                        "Authorization": f"Bearer {api_key}",
-                                        "Content-Type": "application/json"
-                                    }
-                                    payload = {
-                                        "model": model,
-                                        "messages": messages,
-                                        "temperature": temperature,
-                                        "max_tokens": max_tokens
-                                    }
-                                    try:
-                                        # Timeout: mindestens 60 Sekunden (per ENV überschreibbar)
-                                        ds_timeout = int(os.environ.get("DEEPSEEK_TIMEOUT", "60"))
-                                        resp = requests.post(endpoint, headers=headers, json=payload, timeout=max(60, ds_timeout))
-                                        if resp.status_code >= 400:
-                                            text = f"DeepSeek error {resp.status_code}: {resp.text[:500]}"
-                                        else:
-                                            data = resp.json()
-                                            content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                                            if not content:
-                                                content = data.get("choices", [{}])[0].get("text", "")
-                                            text = content or "<empty response>"
-                                        self._append_audit("delegate_task", {"to": target_agent, "task": task_description, "ok": True})
-                                        result = {"content": [{"type": "text", "text": text}]}
-                                    except Exception as e:
-                                        result = {"content": [{"type": "text", "text": f"DeepSeek request failed: {e}"}]}
-                        # Gemini integration
-                        elif vendor == "gemini":
-                            if requests is None:
-                                result = {"content": [{"type": "text", "text": "Error: requests library not available"}]}
-                            else:
-                                api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-                                if not api_key:
-                                    result = {"content": [{"type": "text", "text": "Error: GEMINI_API_KEY not set in environment"}]}
-                                else:
-                                    base = os.environ.get("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
-                                    # Modellwahl: Präfix > ENV > Default
-                                    if model_hint:
-                                        mh = model_hint.lower()
-                                        if not mh.startswith("gemini-"):
-                                            model = f"gemini-{model_hint}"
-                                        else:
-                                            model = model_hint
-                                    else:
-                                        model = os.environ.get("GEMINI_MODEL", "gemini-1.5-pro-latest")
-                                    temperature = float(os.environ.get("GEMINI_TEMPERATURE", os.environ.get("DELEGATE_TEMPERATURE", "0.2")))
-                                    max_tokens = int(os.environ.get("GEMINI_MAX_TOKENS", os.environ.get("DELEGATE_MAX_TOKENS", "4096")))
-                                    endpoint = f"{base}/models/{model}:generateContent?key={api_key}"
-                                    ctx_str = "" if not context else json.dumps(context, ensure_ascii=True)
-                                    user_text = f"Task: {task_description}\nContext: {ctx_str}"
-                                    payload = {
-                                        "contents": [{
-                                            "role": "user",
-                                            "parts": [{"text": user_text}]
-                                        }],
-                                        "generationConfig": {
-                                            "temperature": temperature,
-                                            "maxOutputTokens": max_tokens
-                                        }
-                                    }
-                                    headers = {"Content-Type": "application/json"}
-                                    try:
-                                        resp = requests.post(endpoint, headers=headers, json=payload, timeout=30)
-                                        if resp.status_code >= 400:
-                                            text = f"Gemini error {resp.status_code}: {resp.text[:500]}"
-                                        else:
-                                            data = resp.json()
-                                            text = ""
-                                            try:
-                                                cand = (data.get("candidates") or [{}])[0]
-                                                parts = (cand.get("content") or {}).get("parts") or []
-                                                if parts and isinstance(parts, list):
-                                                    first = parts[0]
-                                                    text = first.get("text", "") or ""
-                                            except Exception:
-                                                text = ""
-                                            if not text:
-                                                text = json.dumps(data, ensure_ascii=True)[:500]
-                                        self._append_audit("delegate_task", {"to": target_agent, "task": task_description, "ok": True})
-                                        result = {"content": [{"type": "text", "text": text}]}
-                                    except Exception as e:
-                                        result = {"content": [{"type": "text", "text": f"Gemini request failed: {e}"}]}
-                        # Claude / Anthropic integration
-                        elif vendor == "claude":
-                            if requests is None:
-                                result = {"content": [{"type": "text", "text": "Error: requests library not available"}]}
-                            else:
-                                api_key = os.environ.get("ANTHROPIC_API_KEY") or os.environ.get("CLAUDE_API_KEY")
-                                if not api_key:
-                                    result = {"content": [{"type": "text", "text": "Error: ANTHROPIC_API_KEY not set in environment"}]}
-                                else:
-                                    endpoint = os.environ.get("ANTHROPIC_API_BASE", "https://api.anthropic.com/v1/messages")
-                                    # Modellwahl: Präfix > ENV > Default
-                                    if model_hint:
-                                        mh = model_hint.lower()
-                                        if not mh.startswith("claude"):
-                                            # einfache Kurzformen mappen
-                                            if mh in ("sonnet", "3.5-sonnet", "3-5-sonnet"):
-                                                model = "claude-3-5-sonnet-latest"
-                                            elif mh in ("haiku", "3.5-haiku", "3-5-haiku"):
-                                                model = "claude-3-5-haiku-latest"
-                                            elif mh in ("opus", "3-opus", "3.0-opus"):
-                                                model = "claude-3-opus-latest"
-                                            else:
-                                                model = f"claude-{model_hint}"
-                                        else:
-                                            model = model_hint
-                                    else:
-                                        model = os.environ.get("ANTHROPIC_MODEL") or os.environ.get("CLAUDE_MODEL") or "claude-3-5-sonnet-latest"
-                                    temperature = float(os.environ.get("CLAUDE_TEMPERATURE", os.environ.get("DELEGATE_TEMPERATURE", "0.2")))
-                                    max_tokens = int(os.environ.get("CLAUDE_MAX_TOKENS", os.environ.get("DELEGATE_MAX_TOKENS", "4096")))
-                                    sys_prompt = "You are a concise assistant executing a delegated task. Return only the answer, no extra chatter."
-                                    ctx_str = "" if not context else json.dumps(context, ensure_ascii=True)
-                                    user_text = f"Task: {task_description}\nContext: {ctx_str}"
-                                    headers = {
-                                        "x-api-key": api_key,
-                                        "anthropic-version": os.environ.get("ANTHROPIC_VERSION", "2023-06-01"),
-                                        "content-type": "application/json"
-                                    }
-                                    payload = {
-                                        "model": model,
-                                        "max_tokens": max_tokens,
-                                        "temperature": temperature,
-                                        "system": sys_prompt,
-                                        "messages": [
-                                            {
-                                                "role": "user",
-                                                "content": [
-                                                    {"type": "text", "text": user_text}
-                                                ]
-                                            }
-                                        ]
-                                    }
-                                    try:
-                                        resp = requests.post(endpoint, headers=headers, json=payload, timeout=30)
-                                        if resp.status_code >= 400:
-                                            text = f"Claude error {resp.status_code}: {resp.text[:500]}"
-                                        else:
-                                            data = resp.json()
-                                            # Anthropic shape: {content: [{type: 'text', text: '...'}], ...}
-                                            text = ""
-                                            try:
-                                                parts = data.get("content") or []
-                                                if parts and isinstance(parts, list):
-                                                    first = parts[0]
-                                                    if isinstance(first, dict):
-                                                        text = first.get("text", "") or ""
-                                            except Exception:
-                                                text = ""
-                                            if not text:
-                                                text = json.dumps(data, ensure_ascii=True)[:500]
-                                        self._append_audit("delegate_task", {"to": target_agent, "task": task_description, "ok": True})
-                                        result = {"content": [{"type": "text", "text": text}]}
-                                    except Exception as e:
-                                        result = {"content": [{"type": "text", "text": f"Claude request failed: {e}"}]}
-                        # OpenAI/GPT integration
-                        elif vendor == "openai":
-                            if requests is None:
-                                result = {"content": [{"type": "text", "text": "Error: requests library not available"}]}
-                            else:
-                                # Erst aus context/args prüfen, dann Environment
-                                api_key = (
-                                    context.get("openai_api_key") or 
-                                    context.get("api_key") or
-                                    tool_args.get("openai_api_key") or
-                                    tool_args.get("api_key") or
-                                    os.environ.get("OPENAI_API_KEY") or 
-                                    os.environ.get("GPT_API_KEY")
-                                )
-                                if not api_key:
-                                    result = {"content": [{"type": "text", "text": "Error: OPENAI_API_KEY not set. Pass it via context.api_key or set environment variable"}]}
-                                else:
-                                    endpoint = os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1/chat/completions")
-                                    # Modellwahl: Präfix > ENV > Default
-                                    if model_hint:
-                                        mh = model_hint.lower()
-                                        if mh in ("gpt-4", "4", "gpt4"):
-                                            model = "gpt-4"
-                                        elif mh in ("gpt-3.5-turbo", "3.5", "turbo"):
-                                            model = "gpt-3.5-turbo"
-                                        elif mh in ("gpt-4-turbo", "4-turbo"):
-                                            model = "gpt-4-turbo"
-                                        else:
-                                            model = model_hint
-                                    else:
-                                        model = os.environ.get("OPENAI_MODEL") or os.environ.get("GPT_MODEL") or "gpt-3.5-turbo"
-                                    temperature = float(os.environ.get("OPENAI_TEMPERATURE", os.environ.get("DELEGATE_TEMPERATURE", "0.2")))
-                                    max_tokens = int(os.environ.get("OPENAI_MAX_TOKENS", os.environ.get("DELEGATE_MAX_TOKENS", "4096")))
-                                    sys_prompt = "You are a concise assistant executing a delegated task. Return only the answer, no extra chatter."
-                                    ctx_str = "" if not context else json.dumps(context, ensure_ascii=True)
-                                    user_text = f"Task: {task_description}\nContext: {ctx_str}"
-                                    headers = {
-                                        "Authorization": f"Bearer {api_key}",
-                                        "content-type": "application/json"
-                                    }
-                                    payload = {
-                                        "model": model,
-                                        "max_tokens": max_tokens,
-                                        "temperature": temperature,
-                                        "messages": [
-                                            {"role": "system", "content": sys_prompt},
-                                            {"role": "user", "content": user_text}
-                                        ]
-                                    }
-                                    try:
-                                        resp = requests.post(endpoint, headers=headers, json=payload, timeout=30)
-                                        resp.raise_for_status()
-                                        data = resp.json()
-                                        content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                                        text = content or "<empty response>"
-                                        self._append_audit("delegate_task", {"to": target_agent, "task": task_description, "ok": True})
-                                        result = {"content": [{"type": "text", "text": text}]}
-                                    except Exception as e:
-                                        result = {"content": [{"type": "text", "text": f"OpenAI request failed: {e}"}]}
-                        # Ollama integration für lokale LLMs
-                        elif any(name in target_agent.lower() for name in ["ollama", "qwen"]):
-                            if requests is None:
-                                result = {"content": [{"type": "text", "text": "Error: requests library not available"}]}
-                            else:
-                                # Ollama-spezifische Konfiguration
-                                ollama_host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
-                                
-                                # Model-Mapping für die verfügbaren Modelle
-                                model_map = {
-                                    "qwen7b": "qwen2.5:7b",
-                                    "qwen14b": "qwen2.5:14b", 
-                                    "qwen14b-instruct": "qwen2.5:14b-instruct-q4_K_M",
-                                    "qwen32b": "qwen2.5:32b-instruct-q3_K_M",
-                                    "qwen32b-instruct": "qwen2.5:32b-instruct-q3_K_M",
-                                    # Direkte Modellnamen auch unterstützen
-                                    "qwen2.5:7b": "qwen2.5:7b",
-                                    "qwen2.5:14b": "qwen2.5:14b",
-                                    "qwen2.5:14b-instruct-q4_K_M": "qwen2.5:14b-instruct-q4_K_M",
-                                    "qwen2.5:32b": "qwen2.5:32b",
-                                    "qwen2.5:32b-instruct-q3_K_M": "qwen2.5:32b-instruct-q3_K_M",
-                                    # Vollständige Modellnamen
-                                    "14b-instruct-q4_K_M": "qwen2.5:14b-instruct-q4_K_M",
-                                    "32b-instruct-q3_K_M": "qwen2.5:32b-instruct-q3_K_M",
-                                    # Zusätzliche Varianten für bessere Erkennung
-                                    "qwen2.5:14b-instruct": "qwen2.5:14b-instruct-q4_K_M",
-                                    "qwen2.5:14b-instruct-q4": "qwen2.5:14b-instruct-q4_K_M",
-                                    "qwen2.5:14b-instruct-q4_K": "qwen2.5:14b-instruct-q4_K_M",
-                                    "qwen2.5:32b-instruct": "qwen2.5:32b-instruct-q3_K_M",
-                                    "qwen2.5:32b-instruct-q3": "qwen2.5:32b-instruct-q3_K_M",
-                                    "qwen2.5:32b-instruct-q3_K": "qwen2.5:32b-instruct-q3_K_M"
-                                }
-                                
-                                # Extrahiere Modellname aus target_agent
-                                model = "qwen2.5:7b"  # Default
-                                
-                                # Für Ollama: Verwende target_agent direkt wenn es ein vollständiger Modellname ist
-                                if "qwen2.5:" in target_agent:
-                                    model = target_agent
-                                    logger.info(f"[Ollama] Direct qwen2.5 model: {model}")
-                                elif "14b-instruct-q4_K_M" in target_agent:
-                                    # Spezielle Behandlung für das 14B Modell
-                                    model = "qwen2.5:14b-instruct-q4_K_M"
-                                    logger.info(f"[Ollama] Special 14B model mapping: {model}")
-                                elif "32b-instruct-q3_K_M" in target_agent:
-                                    # Spezielle Behandlung für das 32B Modell
-                                    model = "qwen2.5:32b-instruct-q3_K_M"
-                                    logger.info(f"[Ollama] Special 32B model mapping: {model}")
-                                elif ":" in target_agent:
-                                    # Fallback: Verwende das Modell-Mapping
-                                    _, model_hint = target_agent.split(":", 1)
-                                    model = model_map.get(model_hint, f"qwen2.5:{model_hint}")
-                                    logger.info(f"[Ollama] Mapped model: {model}")
-                                else:
-                                    # Fallback: verwende target_agent direkt
-                                    model = model_map.get(target_agent, target_agent)
-                                    logger.info(f"[Ollama] Fallback model: {model}")
-                                    logger.info(f"[Ollama] Model map lookup for '{target_agent}': {model_map.get(target_agent, 'NOT_FOUND')}")
-                                
-                                # Debug: Logge den finalen Modellnamen
-                                logger.info(f"[Ollama] Input target_agent: '{target_agent}'")
-                                logger.info(f"[Ollama] Final model: '{model}'")
-                                logger.info(f"[Ollama] Model map contains '{target_agent}': {target_agent in model_map}")
-                                
-                                # Füge Kontext zur Task hinzu wenn vorhanden
-                                full_prompt = task_description
-                                if isinstance(context, dict) and context:
-                                    context_str = "\n".join([f"{k}: {v}" for k, v in context.items()])
-                                    full_prompt = f"Context:\n{context_str}\n\nTask: {task_description}"
-                                
-                                # Ollama API-Request  
-                                try:
-                                    logger.info(f"[Ollama] Using model: {model}")
-                                    logger.info(f"[Ollama] Host: {ollama_host}")
-                                    
-                                    temperature = float(os.environ.get("DELEGATE_TEMPERATURE", "0.2"))
-                                    max_tokens = int(os.environ.get("DELEGATE_MAX_TOKENS", "4096"))
-                                    
-                                    response = requests.post(
-                                        f"{ollama_host}/api/generate",
-                                        json={
-                                            "model": model,
-                                            "prompt": full_prompt,
-                                            "stream": False,
-                                            "temperature": temperature,
-                                            "options": {
-                                                "num_predict": max_tokens,
-                                                "num_ctx": 4096,  # Context window
-                                                "top_k": 40,
-                                                "top_p": 0.9,
-                                                "repeat_penalty": 1.1
-                                            }
-                                        },
-                                        timeout=120  # Ollama kann langsamer sein
-                                    )
-                                    
-                                    if response.status_code == 200:
-                                        result_data = response.json()
-                                        response_text = result_data.get("response", "No response from Ollama")
-                                        
-                                        # Log für Debugging
-                                        logger.info(f"[Ollama] Response received: {len(response_text)} chars")
-                                        logger.debug(f"[Ollama] Full response: {response_text[:500]}...")
-                                        
-                                        # Audit log
-                                        self._append_audit("delegate_task", {
-                                            "to": target_agent, 
-                                            "model": model,
-                                            "task": task_description, 
-                                            "ok": True
-                                        })
-                                        
-                                        result = {"content": [{"type": "text", "text": response_text}]}
-                                    else:
-                                        error_msg = f"Ollama error {response.status_code}: {response.text[:500]}"
-                                        logger.error(f"[Ollama] {error_msg}")
-                                        result = {"content": [{"type": "text", "text": error_msg}]}
-                                        
-                                except requests.exceptions.ConnectionError:
-                                    error_msg = f"Error: Cannot connect to Ollama at {ollama_host}. Is Ollama running?"
-                                    logger.error(f"[Ollama] Connection error: {error_msg}")
-                                    result = {"content": [{"type": "text", "text": error_msg}]}
-                                except requests.exceptions.Timeout:
-                                    error_msg = "Error: Ollama request timeout (120s). Try a smaller model or shorter prompt."
-                                    logger.error(f"[Ollama] Timeout error")
-                                    result = {"content": [{"type": "text", "text": error_msg}]}
-                                except Exception as e:
-                                    error_msg = f"Ollama request failed: {e}"
-                                    logger.error(f"[Ollama] {error_msg}")
-                                    result = {"content": [{"type": "text", "text": error_msg}]}
-                        else:
-                            # Default: audit-only stub
-                            self._append_audit("delegate_task", {"to": target_agent, "task": task_description, "context": context})
-                            result = {"content": [{"type": "text", "text": f"Delegated to {target_agent}: {task_description}"}]}
-                    else:
-                        # No target agent provided
-                        result = {"content": [{"type": "text", "text": "Error: target_agent missing"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            # ===== Dateioperationen =====
-            elif tool_name == "read_file":
-                path = tool_args.get("path", "")
-                encoding = tool_args.get("encoding", "utf-8")
-                try:
-                    with open(path, "r", encoding=encoding, errors="replace") as f:
-                        data = f.read()
-                    result = {"content": [{"type": "text", "text": data}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error reading file: {e}"}]}
-
-            elif tool_name == "write_file":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    path = tool_args.get("path", "")
-                    content = tool_args.get("content", "")
-                    encoding = tool_args.get("encoding", "utf-8")
-                    try:
-                        Path(path).parent.mkdir(parents=True, exist_ok=True)
-                        with open(path, "w", encoding=encoding, errors="replace") as f:
-                            f.write(content)
-                        self._append_audit("write_file", {"path": path, "size": len(content)})
-                        result = {"content": [{"type": "text", "text": "OK: file written"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "list_files":
-                path = tool_args.get("path", ".")
-                recursive = bool(tool_args.get("recursive", False))
-                pattern = tool_args.get("pattern")
-                files = []
-                try:
-                    base = Path(path)
-                    if recursive:
-                        for p in base.rglob("*"):
-                            if pattern and not fnmatch.fnmatch(p.name, pattern):
-                                continue
-                            files.append(str(p))
-                    else:
-                        for p in base.glob(pattern or "*"):
-                            files.append(str(p))
-                    text = "\n".join(files) if files else "<empty>"
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "get_file_info":
-                path = tool_args.get("path", "")
-                try:
-                    p = Path(path)
-                    st = p.stat()
-                    info = {
-                        "path": str(p),
-                        "exists": p.exists(),
-                        "is_dir": p.is_dir(),
-                        "size": st.st_size if p.exists() else 0,
-                        "modified": datetime.fromtimestamp(st.st_mtime).isoformat() if p.exists() else None
-                    }
-                    result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "directory_tree":
-                path = tool_args.get("path", ".")
-                maxDepth = int(tool_args.get("maxDepth", 3))
-                showHidden = bool(tool_args.get("showHidden", False))
-                base = Path(path)
-                lines = []
-                try:
-                    def walk(d: Path, depth: int = 0):
-                        if depth > maxDepth:
-                            return
-                        for entry in sorted(d.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower())):
-                            name = entry.name
-                            if not showHidden and name.startswith('.'):
-                                continue
-                            indent = "  " * depth
-                            lines.append(f"{indent}{name}/" if entry.is_dir() else f"{indent}{name}")
-                            if entry.is_dir():
-                                walk(entry, depth + 1)
-                    if base.exists():
-                        walk(base, 0)
-                    text = "\n".join(lines) if lines else "<empty>"
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "create_file":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    path = tool_args.get("path", "")
-                    content = tool_args.get("content", "")
-                    overwrite = bool(tool_args.get("overwrite", False))
-                    try:
-                        p = Path(path)
-                        if p.exists() and not overwrite:
-                            result = {"content": [{"type": "text", "text": "Error: file exists"}]}
-                        else:
-                            p.parent.mkdir(parents=True, exist_ok=True)
-                            with open(p, "w", encoding="utf-8", errors="replace") as f:
-                                f.write(content)
-                            self._append_audit("create_file", {"path": path, "size": len(content)})
-                            result = {"content": [{"type": "text", "text": "OK: file created"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "delete_file":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    path = tool_args.get("path", "")
-                    recursive = bool(tool_args.get("recursive", False))
-                    try:
-                        p = Path(path)
-                        if not p.exists():
-                            result = {"content": [{"type": "text", "text": "OK: nothing to delete"}]}
-                        else:
-                            if p.is_dir() and recursive:
-                                shutil.rmtree(p)
-                            elif p.is_dir():
-                                p.rmdir()
-                            else:
-                                p.unlink()
-                            self._append_audit("delete_file", {"path": path})
-                            result = {"content": [{"type": "text", "text": "OK: deleted"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "move_file":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    source = tool_args.get("source", "")
-                    destination = tool_args.get("destination", "")
-                    overwrite = bool(tool_args.get("overwrite", False))
-                    try:
-                        src = Path(source)
-                        dst = Path(destination)
-                        if dst.exists() and not overwrite:
-                            result = {"content": [{"type": "text", "text": "Error: destination exists"}]}
-                        else:
-                            dst.parent.mkdir(parents=True, exist_ok=True)
-                            shutil.move(str(src), str(dst))
-                            self._append_audit("move_file", {"source": source, "destination": destination})
-                            result = {"content": [{"type": "text", "text": "OK: moved"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "grep":
-                pattern = tool_args.get("pattern", "")
-                path = tool_args.get("path", ".")
-                filePattern = tool_args.get("filePattern")
-                ignoreCase = bool(tool_args.get("ignoreCase", False))
-                showLineNumbers = bool(tool_args.get("showLineNumbers", True))
-                contextLines = int(tool_args.get("contextLines", 0))
-                flags = re.IGNORECASE if ignoreCase else 0
-                matches = []
-                try:
-                    for root, _, filenames in os.walk(path):
-                        for fn in filenames:
-                            if filePattern and not fnmatch.fnmatch(fn, filePattern):
-                                continue
-                            fp = os.path.join(root, fn)
-                            try:
-                                with open(fp, "r", encoding="utf-8", errors="replace") as f:
-                                    lines = f.readlines()
-                                for idx, line in enumerate(lines, start=1):
-                                    if re.search(pattern, line, flags):
-                                        start = max(1, idx - contextLines)
-                                        end = min(len(lines), idx + contextLines)
-                                        for j in range(start, end + 1):
-                                            prefix = f"{j}:" if showLineNumbers else ""
-                                            matches.append(f"{fp}:{prefix}{lines[j-1].rstrip()}\n" )
-                            except Exception:
-                                continue
-                    text = "\n".join(matches) if matches else "<no matches>"
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "find_files":
-                pattern = tool_args.get("pattern", "*")
-                path = tool_args.get("path", ".")
-                type_filter = tool_args.get("type")
-                maxDepth = tool_args.get("maxDepth")
-                out = []
-                try:
-                    base = Path(path)
-                    def depth_ok(p: Path) -> bool:
-                        if maxDepth is None:
-                            return True
-                        try:
-                            md = int(maxDepth)
-                        except Exception:
-                            return True
-                        return len(p.relative_to(base).parts) <= md
-                    for p in base.rglob("*"):
-                        if not depth_ok(p):
-                            continue
-                        if not fnmatch.fnmatch(p.name, pattern):
-                            continue
-                        if type_filter == "file" and not p.is_file():
-                            continue
-                        if type_filter == "dir" and not p.is_dir():
-                            continue
-                        out.append(str(p))
-                    result = {"content": [{"type": "text", "text": "\n".join(out) if out else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "search":
-                query = tool_args.get("query", "")
-                path = tool_args.get("path", ".")
-                type_sel = tool_args.get("type", "all")
-                filePattern = tool_args.get("filePattern")
-                maxResults = int(tool_args.get("maxResults", 50))
-                results = []
-                try:
-                    for root, _, files in os.walk(path):
-                        for fn in files:
-                            if filePattern and not fnmatch.fnmatch(fn, filePattern):
-                                continue
-                            fp = os.path.join(root, fn)
-                            if type_sel in ("all", "files") and query.lower() in fn.lower():
-                                results.append(fp)
-                                if len(results) >= maxResults:
-                                    raise StopIteration
-                            if type_sel in ("all", "content"):
-                                try:
-                                    with open(fp, "r", encoding="utf-8", errors="replace") as f:
-                                        txt = f.read()
-                                    if query.lower() in txt.lower():
-                                        results.append(fp)
-                                        if len(results) >= maxResults:
-                                            raise StopIteration
-                                except Exception:
-                                    pass
-                except StopIteration:
-                    pass
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-                else:
-                    result = {"content": [{"type": "text", "text": "\n".join(results) if results else "<none>"}]}
-
-            elif tool_name == "edit_file":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    path = tool_args.get("path", "")
-                    oldText = tool_args.get("oldText", "")
-                    newText = tool_args.get("newText", "")
-                    try:
-                        with open(path, "r", encoding="utf-8", errors="replace") as f:
-                            txt = f.read()
-                        if oldText not in txt:
-                            result = {"content": [{"type": "text", "text": "Error: oldText not found"}]}
-                        else:
-                            txt = txt.replace(oldText, newText, 1)
-                            with open(path, "w", encoding="utf-8", errors="replace") as f:
-                                f.write(txt)
-                            self._append_audit("edit_file", {"path": path})
-                            result = {"content": [{"type": "text", "text": "OK: edited"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "multi_edit":
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    path = tool_args.get("path", "")
-                    edits = tool_args.get("edits", [])
-                    try:
-                        with open(path, "r", encoding="utf-8", errors="replace") as f:
-                            txt = f.read()
-                        for ed in edits:
-                            oldText = ed.get("oldText", "")
-                            newText = ed.get("newText", "")
-                            if oldText in txt:
-                                txt = txt.replace(oldText, newText, 1)
-                        with open(path, "w", encoding="utf-8", errors="replace") as f:
-                            f.write(txt)
-                        self._append_audit("multi_edit", {"path": path, "count": len(edits)})
-                        result = {"content": [{"type": "text", "text": "OK: multi edited"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            # ===== Projekt/Snapshot/Digest =====
-            elif tool_name == "project_snapshot":
-                import time as time_module
-                title = tool_args.get("title", f"Snapshot {time_module.strftime('%Y-%m-%d %H:%M:%S')}")
-                description = tool_args.get("description", "")
-                hub_path = tool_args.get("hub_path", self.hub_path_env)
-                if not self._is_write_allowed(tool_args.get("auth_token", "")):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    try:
-                        snap_dir = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/snapshots")
-                        snap_dir.mkdir(parents=True, exist_ok=True)
-                        fn = snap_dir / f"snapshot_{int(time_module.time())}.json"
-                        
-                        # Get base stats
-                        conn = sqlite3.connect(str(self.db_path))
-                        count = conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
-                        conn.close()
-                        
-                        # Get detailed KB statistics
-                        kb_stats_data = self._get_kb_statistics()
-
-                        data = {
-                            "title": title,
-                            "description": description,
-                            "hub_path": hub_path,
-                            "db_path": str(self.db_path),
-                            "facts_count": count,
-                            "created_at": time_module.strftime("%Y-%m-%d %H:%M:%S"),
-                            "kb_statistics": kb_stats_data
-                        }
-                        fn.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-                        self._append_audit("project_snapshot", {"file": str(fn)})
-                        result = {"content": [{"type": "text", "text": f"OK: snapshot {fn}"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "project_list_snapshots":
-                hub_path = tool_args.get("hub_path", self.hub_path_env)
-                limit = int(tool_args.get("limit", 20))
-                try:
-                    snap_dir = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/snapshots")
-                    items = []
-                    if snap_dir.exists():
-                        items = sorted(snap_dir.glob("snapshot_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit]
-                    text = "\n".join([str(p) for p in items]) if items else "<none>"
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "project_hub_digest":
-                hub_path = tool_args.get("hub_path", self.hub_path_env)
-                limit_files = int(tool_args.get("limit_files", 3))
-                max_chars = int(tool_args.get("max_chars", 20000))
-                try:
-                    base = Path(hub_path)
-                    if not base.exists():
-                        result = {"content": [{"type": "text", "text": f"Error: hub path not found: {hub_path}"}]}
-                    else:
-                        files = sorted(base.glob("**/*.md"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit_files]
-                        acc = []
-                        total = 0
-                        for fp in files:
-                            txt = fp.read_text(encoding="utf-8", errors="replace")
-                            need = max_chars - total
-                            if need <= 0:
-                                break
-                            chunk = txt[:need]
-                            acc.append(f"# {fp.name}\n\n" + chunk)
-                            total += len(chunk)
-                        result = {"content": [{"type": "text", "text": "\n\n---\n\n".join(acc) if acc else "<none>"}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            # ===== Write Operations =====
-            elif tool_name == "add_fact":
-                statement = tool_args.get("statement", "").strip()
-                auth_token = tool_args.get("auth_token", "")
-                if not self._is_write_allowed(auth_token):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                elif not statement:
-                    result = {"content": [{"type": "text", "text": "Missing 'statement'"}]}
-                else:
-                    try:
-                        conn = sqlite3.connect(str(self.db_path))
-                        conn.execute("INSERT INTO facts (statement) VALUES (?)", (statement,))
-                        conn.commit()
-                        conn.close()
-                        self._append_audit("add_fact", {"statement": statement})
-                        result = {"content": [{"type": "text", "text": "OK: fact added to SQLite"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            elif tool_name == "delete_fact":
-                statement = tool_args.get("statement", "").strip()
-                auth_token = tool_args.get("auth_token", "")
-                if not self._is_write_allowed(auth_token):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                elif not statement:
-                    result = {"content": [{"type": "text", "text": "Missing 'statement'"}]}
-                else:
-                    try:
-                        conn = sqlite3.connect(str(self.db_path))
-                        cursor = conn.execute("DELETE FROM facts WHERE statement = ?", (statement,))
-                        removed = cursor.rowcount
-                        conn.commit()
-                        conn.close()
-                        self._append_audit("delete_fact", {"statement": statement, "removed": removed})
-                        result = {"content": [{"type": "text", "text": f"OK: removed {removed} (SQLite)"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            elif tool_name == "update_fact":
-                old_stmt = tool_args.get("old_statement", "").strip()
-                new_stmt = tool_args.get("new_statement", "").strip()
-                auth_token = tool_args.get("auth_token", "")
-                if not self._is_write_allowed(auth_token):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                elif not old_stmt or not new_stmt:
-                    result = {"content": [{"type": "text", "text": "Missing 'old_statement' or 'new_statement'"}]}
-                else:
-                    try:
-                        conn = self._open_db()
-                        cursor = conn.execute("UPDATE facts SET statement = ? WHERE statement = ?", 
-                                             (new_stmt, old_stmt))
-                        updated = cursor.rowcount
-                        conn.commit()
-                        conn.close()
-                        self._append_audit("update_fact", {"old": old_stmt, "new": new_stmt, "updated": updated})
-                        result = {"content": [{"type": "text", "text": f"OK: updated {updated} (SQLite)"}]}
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "bulk_add_facts":
-                # Parameters
-                stmts = tool_args.get("statements")
-                path = tool_args.get("path")
-                dry_run = bool(tool_args.get("dry_run", True))
-                ignore_duplicates = bool(tool_args.get("ignore_duplicates", True))
-                batch_size = int(tool_args.get("batch_size", 1000))
-                create_unique_index = bool(tool_args.get("create_unique_index", True))
-                auth_token = tool_args.get("auth_token", "")
-
-                if not dry_run and not self._is_write_allowed(auth_token):
-                    result = {"content": [{"type": "text", "text": "Write disabled."}]}
-                else:
-                    try:
-                        # Collect statements
-                        collected = []
-                        if isinstance(stmts, list):
-                            for s in stmts:
-                                if isinstance(s, str) and s.strip():
-                                    collected.append(s.strip())
-                        if path:
-                            try:
-                                with open(path, "r", encoding="utf-8", errors="replace") as f:
-                                    for ln in f:
-                                        ln = ln.strip()
-                                        if not ln:
-                                            continue
-                                        if path.endswith(".jsonl"):
-                                            try:
-                                                obj = json.loads(ln)
-                                                val = obj.get("statement") or obj.get("s") or ""
-                                                if val and isinstance(val, str):
-                                                    collected.append(val.strip())
-                                            except Exception:
-                                                continue
-                                        else:
-                                            collected.append(ln)
-                            except Exception as e:
-                                result = {"content": [{"type": "text", "text": f"Error reading path: {e}"}]}
-                                raise StopIteration
-
-                        # De-duplicate input list while keeping order
-                        seen = set()
-                        filtered = []
-                        for s in collected:
-                            if s and s not in seen:
-                                seen.add(s)
-                                filtered.append(s)
-
-                        received = len(collected)
-                        to_process = len(filtered)
-                        start = time.time()
-
-                        # Dry-run duplicate estimation
-                        duplicates = 0
-                        errors = 0
-                        inserted = 0
-
-                        conn = self._open_db()
-                        cur = conn.cursor()
-
-                        # Ensure unique index if requested
-                        if create_unique_index and not dry_run:
-                            try:
-                                cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_facts_statement ON facts(statement)")
-                                conn.commit()
-                            except Exception:
-                                pass
-
-                        # Check duplicates in chunks
-                        def chunk(lst, n):
-                            for i in range(0, len(lst), n):
-                                yield lst[i:i+n]
-
-                        if dry_run:
-                            for group in chunk(filtered, 500):
-                                q = "SELECT statement FROM facts WHERE statement IN (" + ",".join(["?"]*len(group)) + ")"
-                                try:
-                                    existing = set(x[0] for x in cur.execute(q, tuple(group)))
-                                    duplicates += sum(1 for s in group if s in existing)
-                                except Exception:
-                                    errors += len(group)
-                        else:
-                            # Live insert in batches
-                            try:
-                                cur.execute("BEGIN")
-                                for group in chunk(filtered, batch_size):
-                                    if ignore_duplicates:
-                                        # Requires unique index to be effective
-                                        cur.executemany("INSERT OR IGNORE INTO facts(statement) VALUES(?)", [(s,) for s in group])
-                                    else:
-                                        cur.executemany("INSERT INTO facts(statement) VALUES(?)", [(s,) for s in group])
-                                conn.commit()
-                                # Count how many actually present now vs before
-                                # Rough estimate: inserted = to_process - duplicates (best effort)
-                            except Exception as e:
-                                try:
-                                    conn.rollback()
-                                except Exception:
-                                    pass
-                                errors += to_process
-                                self._append_audit("bulk_add_facts", {"error": str(e)})
-                            # Compute duplicates after insert if IGNORE used
-                            try:
-                                # Estimate duplicates by querying how many of input are present
-                                present = 0
-                                for group in chunk(filtered, 500):
-                                    q = "SELECT COUNT(*) FROM facts WHERE statement IN (" + ",".join(["?"]*len(group)) + ")"
-                                    present += cur.execute(q, tuple(group)).fetchone()[0]
-                                inserted = max(0, present)  # approximation
-                                duplicates = max(0, to_process - inserted)
-                            except Exception:
-                                pass
-
-                        try:
-                            conn.close()
-                        except Exception:
-                            pass
-
-                        dur = round(time.time()-start, 3)
-                        info = {
-                            "received": received,
-                            "unique_input": to_process,
-                            "inserted": inserted if not dry_run else 0,
-                            "duplicates": duplicates,
-                            "errors": errors,
-                            "dry_run": dry_run,
-                            "batch_size": batch_size,
-                            "duration_s": dur
-                        }
-                        self._append_audit("bulk_add_facts", info)
-                        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
-                    except StopIteration:
-                        pass
-                    except Exception as e:
-                        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            # ===== META-TOOLS INTEGRATION =====
-            elif tool_name == "consensus_evaluator" and meta_tools_available:
-                task_id = tool_args.get("task_id", "")
-                outputs = tool_args.get("outputs", [])
-                method = tool_args.get("method", "semantic_similarity")
-                threshold = tool_args.get("threshold", 0.7)
-                
-                try:
-                    evaluator = META_TOOLS["consensus_evaluator"]
-                    result_data = evaluator.evaluate_consensus(task_id, outputs, method, threshold)
-                    
-                    text = f"""
-🔬 **Konsens-Analyse**
-Task ID: {result_data['task_id']}
-Methode: {result_data['method']}
-
-📊 **Ergebnisse:**
-• Konsens-Score: {result_data['consensus_score']:.1%}
-• Confidence: {result_data['confidence']}
-• Synthese: {result_data['synthesis']}
-
-📈 **Tool-Ranking:**
-"""
-                    for rank in result_data['ranking'][:3]:
-                        text += f"  {rank['tool_name']}: {rank['alignment_score']:.1%}\n"
-                    
-                    if result_data['divergences']:
-                        text += "\n⚠️ **Divergenzen:**\n"
-                        for div in result_data['divergences'][:3]:
-                            text += f"  • {div['tool']}: {', '.join(div.get('unique_focus', []))}\n"
-                    
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "reliability_checker" and meta_tools_available:
-                tool_to_check = tool_args.get("tool_name", "")
-                task = tool_args.get("task", "")
-                n_runs = tool_args.get("n_runs", 5)
-                
-                try:
-                    # Wrapper für delegate_task für echte Tests
-                    def execute_task(**kwargs):
-                        # In Production: Hier würde delegate_task aufgerufen
-                        # Für Testing: Simuliere Variabilität
-                        import random
-                        base = f"Response for: {task}"
-                        variations = [base, base + " (variant)", base + " - modified", base]
-                        return random.choice(variations)
-                    
-                    checker = META_TOOLS["reliability_checker"]
-                    result_data = checker.check_reliability(
-                        tool_to_check,
-                        execute_task,
-                        {"task": task},
-                        n_runs
-                    )
-                    
-                    text = f"""
-🔄 **Reliability Check**
-Tool: {result_data['tool_name']}
-Runs: {result_data['n_runs']}
-
-📊 **Metriken:**
-• Konsistenz-Score: {result_data['consistency_score']:.1%}
-• Fleiss' Kappa: {result_data['fleiss_kappa']:.2f}
-• Durchschn. Laufzeit: {result_data['avg_execution_time']}s
-• Stabilität: {result_data['stability']}
-• Fehler: {result_data['errors']}/{n_runs}
-
-💡 **Empfehlung:** {"✅ Tool ist zuverlässig" if result_data['stability'] == 'STABLE' else "⚠️ Tool zeigt Inkonsistenzen"}
-"""
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "bias_detector" and meta_tools_available:
-                tool_outputs = tool_args.get("tool_outputs", {})
-                baseline = tool_args.get("baseline", "balanced")
-                
-                try:
-                    detector = META_TOOLS["bias_detector"]
-                    result_data = detector.detect_bias(tool_outputs, baseline)
-                    
-                    text = f"""
-🔍 **Bias-Analyse**
-Analysierte Tools: {len(tool_outputs)}
-Baseline: {baseline}
-
-📊 **Bias-Scores:**
-"""
-                    for bias in result_data['biases']:
-                        text += f"\n**{bias['tool_name']}:**\n"
-                        text += f"  • Gesamt-Bias: {bias['overall_bias_score']:.1%}\n"
-                        text += f"  • Themen-Bias: {bias['theme_bias']['score']:.1%}\n"
-                        text += f"  • Längen-Bias: {bias['length_bias']['score']:.1%}\n"
-                        text += f"  • Sentiment-Bias: {bias['sentiment_bias']['score']:.1%}\n"
-                    
-                    if result_data['outliers']:
-                        text += f"\n⚠️ **Ausreißer:** {', '.join(result_data['outliers'])}\n"
-                    
-                    text += f"\n💡 **Empfehlung:** {result_data['recommendation']}"
-                    
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-
-            elif tool_name == "delegation_optimizer" and meta_tools_available:
-                task_description = tool_args.get("task_description", "")
-                available_tools = tool_args.get("available_tools", [])
-                context = tool_args.get("context", {})
-                
-                try:
-                    optimizer = META_TOOLS["delegation_optimizer"]
-                    result_data = optimizer.optimize_delegation(
-                        task_description,
-                        available_tools,
-                        context
-                    )
-                    
-                    text = f"""
-🎯 **Delegation-Optimierung**
-Task: {task_description[:100]}...
-Task-Hash: {result_data['task_hash']}
+        loop = asyncio.get_running_loop()
+        sem = self._tool_semaphore(tool_name)
+        await sem.acquire()
+        try:
+            future = self.executor.submit(self._execute_tool, tool_name, tool_args)
+        except BaseException:
+            sem.release()
+            raise
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(sem.release))
+        # Abbruch vor Start entfernt den Job aus der Queue; laufende Tools
+        # werden zu Ende gefuehrt, ihr Ergebnis verworfen
+        result = await asyncio.wrap_future(future)
 
-📊 **Empfohlene Tools:**
-"""
-                    for tool in result_data['recommended_tools']:
-                        text += f"  • {tool['tool']}: Score {tool['score']:.1%} (Conf: {tool['confidence']})\n"
-                    
-                    text += f"\n🎮 **Strategie:** {result_data['strategy']}\n"
-                    
-                    if result_data['fallback_tool']:
-                        text += f"🔄 **Fallback:** {result_data['fallback_tool']}\n"
-                    
-                    features = result_data['task_features']
-                    text += f"\n📋 **Task-Features:**\n"
-                    text += f"  • Komplexität: {features['complexity']:.1f}\n"
-                    text += f"  • Hat Daten: {features['has_data']}\n"
-                    text += f"  • Hat Analyse: {features['has_analysis']}\n"
-                    
-                    result = {"content": [{"type": "text", "text": text}]}
-                except Exception as e:
-                    result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-            
-            # ===== Alle anderen Tools mit Basis-Implementation =====
-            # (Die restlichen Tool-Implementierungen von v31_REPAIRED übernehmen)
-            # ... [Hier würden alle anderen Tool-Implementierungen folgen, gekürzt für Übersichtlichkeit]
-            
-            else:
-                # Fallback für nicht implementierte Tools
-                result = {"content": [{"type": "text", "text": f"Tool '{tool_name}' is in development"}]}
-                
-        except Exception as e:
-            logger.error(f"Tool execution error: {e}")
-            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
-        
         response = {
             "jsonrpc": "2.0",
             "id": request.get("id", 1),
             "result": result
         }
         await self.send_response(response)
+
+    def _execute_tool(self, tool_name: str, tool_args: dict) -> dict:
+        """Tool ueber die Registry aufloesen und ausfuehren (Latenz/Fehler -> TOOL_METRICS)."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            handler = TOOL_REGISTRY.resolve(tool_name)
+            if handler is None:
+                # Fallback für nicht implementierte oder nicht verfügbare Tools
+                result = {"content": [{"type": "text", "text": f"Tool '{tool_name}' is in development"}]}
+            else:
+                result = handler(self, tool_args)
+        except Exception as e:
+            logger.error(f"Tool execution error: {e}")
+            failed = True
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+        TOOL_METRICS.record(tool_name, time.perf_counter() - start, failed or is_error_result(result))
+        return result
     
     async def handle_request(self, request):
         """Route request to appropriate handler"""
@@ -3926,6 +1395,8 @@ Task-Hash: {result_data['task_hash']}
             await self.handle_list_tools(request)
         elif method == "tools/call":
             await self.handle_tool_call(request)
+        elif method == "notifications/cancelled":
+            self.cancel_request(request.get("params", {}).get("requestId"))
         elif method == "resources/list":
             response = {
                 "jsonrpc": "2.0",
@@ -3943,33 +1414,88 @@ Task-Hash: {result_data['task_hash']}
         else:
             logger.warning(f"Unknown method: {method}")
     
+    def cancel_request(self, request_id):
+        """notifications/cancelled: laufenden tools/call abbrechen (keine Antwort mehr)."""
+        task = self._inflight.get(request_id)
+        if task is not None and not task.done():
+            task.cancel()
+            logger.info(f"Request {request_id} cancelled")
+
+    async def _run_request(self, request):
+        try:
+            await self.handle_request(request)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Request error: {e}")
+            if "id" in request:
+                await self.send_response({
+                    "jsonrpc": "2.0",
+                    "id": request.get("id"),
+                    "error": {"code": -32603, "message": str(e)}
+                })
+
+    def _dispatch(self, request):
+        """tools/call als eigener Task (Antworten out-of-order per id), Rest inline."""
+        task = asyncio.create_task(self._run_request(request))
+        request_id = request.get("id")
+        if request.get("method") == "tools/call" and request_id is not None:
+            self._inflight[request_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(request_id, None))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
     async def run(self):
         """Main loop"""
         tool_count = len(self._get_tool_list())
         logger.info(f"MCP Server starting - ULTIMATE VERSION with {tool_count} tools...")
         logger.info(f"Execute code support: {self.allowed_languages}")
+        logger.info(f"Tool workers: {self.executor._max_workers}, limits: {self.tool_limits}")
         
-        while self.running:
-            try:
-                line = sys.stdin.readline()
-                if not line:
-                    break
-                
-                line = line.strip()
-                if not line:
-                    continue
-                
+        loop = asyncio.get_running_loop()
+        # Blockierendes readline in eigenem Thread: funktioniert auch unter
+        # Windows, wo connect_read_pipe(stdin) nicht mit jeder Loop geht
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hakgal-stdin")
+        try:
+            while self.running:
                 try:
-                    request = json.loads(line)
-                    logger.debug(f"Received: {line[:200]}")
-                    await self.handle_request(request)
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
+                    line = await loop.run_in_executor(reader, sys.stdin.readline)
+                    if not line:
+                        break
                     
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                logger.error(f"Main loop error: {e}")
+                    line = line.strip()
+                    if not line:
+                        continue
+                    
+                    try:
+                        request = json.loads(line)
+                        logger.debug(f"Received: {line[:200]}")
+                    except json.JSONDecodeError as e:
+                        logger.error(f"JSON decode error: {e}")
+                        continue
+                    
+                    if request.get("method") in ("tools/call", "notifications/cancelled"):
+                        self._dispatch(request)
+                    else:
+                        # initialize, tools/list etc. sind billig und bleiben geordnet
+                        await self.handle_request(request)
+                        
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    logger.error(f"Main loop error: {e}")
+            
+            # EOF: laufende Requests noch beantworten
+            if self._tasks:
+                await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        finally:
+            reader.shutdown(wait=False)
+            self.executor.shutdown(wait=False)
+            if self._writer is not None:
+                self._writer.close()
+            if self._backups is not None and self._backups.journal is not None:
+                self._backups.journal.close()
         
         logger.info("MCP Server stopped")
 
@@ -0,0 +1,676 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL KB Backups
+==================
+Online-, inkrementelle und Point-in-Time-Backups der SQLite-KB fuer die
+MCP-Tools (db_backup_now, backup_kb, db_backup_rotate, restore_kb).
+
+- Snapshots laufen ueber die SQLite-Backup-API in Schritten von
+  ``step_pages`` Seiten mit kurzer Pause dazwischen, Writer werden also nicht
+  fuer die ganze Kopie blockiert. Startet die Kopie wegen fremder Writes zu
+  oft neu, wird in einem Schritt kopiert (im WAL-Modus nur ein Lese-Snapshot).
+- Ein Backup-Satz besteht aus einem Full-Backup und beliebig vielen
+  Inkrementen; ein Inkrement enthaelt nur die Seiten, deren Digest sich
+  gegenueber dem Vorgaenger geaendert hat. ``manifest.json`` fuehrt die
+  Kette mit SHA-256 jeder Datei und des rekonstruierten Snapshots.
+- Change-Capture auf DB-Ebene: AFTER INSERT/UPDATE/DELETE-Trigger auf
+  ``facts`` schreiben jede Aenderung (ganze Zeile, jeder Writer: MCP-Server,
+  REST-API, Governance) in die Tabelle ``kb_changelog``. ``ChangeJournal.ship``
+  verschiebt sie nach jedem Writer-Batch und vor jedem Backup/Restore in das
+  Journal (JSONL, ein Segment pro Backup). Restore mit ``until`` spielt die
+  Eintraege nach der ``changelog_seq`` des Backups bis zu diesem Zeitpunkt
+  nach und bricht bei Luecken in der Sequenz ab. Backups ohne Change-Capture
+  (aeltere Manifeste) und Zeitpunkte hinter einem spaeteren Restore werden
+  fuer ``until`` abgelehnt. Noch nicht verschobene Eintraege liegen nur in
+  der DB selbst.
+- Kompression optional: ``gzip`` (stdlib) oder ``zstd`` (Paket zstandard).
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard as zstd
+    HAS_ZSTD = True
+except ImportError:
+    zstd = None
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+DELTA_MAGIC = b"HKGLDLT1"
+COMPRESSIONS = ("none", "gzip", "zstd")
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_STEP_PAGES = 1024
+DIGEST_SIZE = 8
+CHUNK = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Backup/Restore nicht moeglich (fehlende Kette, Checksumme falsch, ...)."""
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+# ----------------------------------------------------------------------------
+# Snapshot, Digests, Kompression
+# ----------------------------------------------------------------------------
+
+def online_backup(src_path: str, dest_path: str, step_pages: int = DEFAULT_STEP_PAGES,
+                  pause: float = 0.001, max_restarts: int = 5) -> dict:
+    """Konsistente Kopie ueber die Backup-API, schrittweise mit Pausen fuer Writer."""
+    state = {"steps": 0, "restarts": 0, "remaining": None}
+
+    def progress(status, remaining, total):
+        state["steps"] += 1
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > max_restarts:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+        if remaining and pause:
+            time.sleep(pause)
+
+    src = sqlite3.connect(str(src_path), timeout=30)
+    try:
+        dst = sqlite3.connect(str(dest_path))
+        try:
+            try:
+                src.backup(dst, pages=step_pages, progress=progress)
+                mode = "stepped"
+            except _TooManyRestarts:
+                src.backup(dst, pages=-1)
+                mode = "single-step"
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    return {"mode": mode, "steps": state["steps"], "restarts": state["restarts"]}
+
+
+def page_size_of(path) -> int:
+    with open(path, "rb") as f:
+        header = f.read(100)
+    if len(header) < 100 or not header.startswith(b"SQLite format 3\x00"):
+        raise BackupError(f"not a SQLite database: {path}")
+    size = struct.unpack(">H", header[16:18])[0]
+    return 65536 if size == 1 else size
+
+
+def iter_pages(path, page_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            page = f.read(page_size)
+            if not page:
+                return
+            yield page
+
+
+def page_digests(path, page_size: int) -> bytes:
+    """8-Byte-BLAKE2b je Seite, hintereinander."""
+    return b"".join(hashlib.blake2b(page, digest_size=DIGEST_SIZE).digest() for page in iter_pages(path, page_size))
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _check_compression(compression: str) -> str:
+    compression = (compression or "none").lower()
+    if compression not in COMPRESSIONS:
+        raise BackupError(f"unknown compression '{compression}' (use {', '.join(COMPRESSIONS)})")
+    if compression == "zstd" and not HAS_ZSTD:
+        raise BackupError("zstd compression requires the 'zstandard' package")
+    return compression
+
+
+def _open_write(path, compression: str):
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        return zstd.ZstdCompressor(level=3).stream_writer(open(path, "wb"), closefd=True)
+    return open(path, "wb")
+
+
+def _open_read(path, compression: str):
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        return zstd.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def _parse_until(until) -> Optional[float]:
+    """Epoch-Sekunden oder ISO-Zeitpunkt (lokale Zeit) -> Epoch."""
+    if until is None or until == "":
+        return None
+    if isinstance(until, (int, float)):
+        return float(until)
+    try:
+        return float(until)
+    except ValueError:
+        return datetime.fromisoformat(str(until).strip()).timestamp()
+
+
+# ----------------------------------------------------------------------------
+# Change-Capture (Trigger) und Change Journal
+# ----------------------------------------------------------------------------
+
+CHANGELOG_TABLE = "kb_changelog"
+_CHANGELOG_TS = "((julianday('now') - 2440587.5) * 86400.0)"
+
+
+def install_changelog(conn: sqlite3.Connection) -> bool:
+    """Changelog-Tabelle und Trigger auf ``facts`` anlegen bzw. an geaenderte Spalten anpassen."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(facts)")]
+    if not columns:
+        return False
+    conn.execute(f"""CREATE TABLE IF NOT EXISTS {CHANGELOG_TABLE} (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts REAL NOT NULL,
+        op TEXT NOT NULL,
+        old_statement TEXT,
+        row TEXT
+    )""")
+    new_row = "json_object(" + ", ".join(f"'{c}', new.\"{c}\"" for c in columns) + ")"
+    triggers = {
+        f"{CHANGELOG_TABLE}_ai": f"AFTER INSERT ON facts BEGIN INSERT INTO {CHANGELOG_TABLE} "
+                                 f"(ts, op, old_statement, row) VALUES ({_CHANGELOG_TS}, 'insert', NULL, {new_row}); END",
+        f"{CHANGELOG_TABLE}_au": f"AFTER UPDATE ON facts BEGIN INSERT INTO {CHANGELOG_TABLE} "
+                                 f"(ts, op, old_statement, row) VALUES ({_CHANGELOG_TS}, 'update', old.statement, {new_row}); END",
+        f"{CHANGELOG_TABLE}_ad": f"AFTER DELETE ON facts BEGIN INSERT INTO {CHANGELOG_TABLE} "
+                                 f"(ts, op, old_statement, row) VALUES ({_CHANGELOG_TS}, 'delete', old.statement, NULL); END",
+    }
+    existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                                 (f"{CHANGELOG_TABLE}_%",)))
+    for name, body in triggers.items():
+        if body in (existing.get(name) or ""):
+            continue
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {body}")
+    return True
+
+
+def changelog_seq(conn: sqlite3.Connection) -> Optional[int]:
+    """Letzte vergebene Changelog-Sequenz (None ohne Change-Capture)."""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (CHANGELOG_TABLE,)).fetchone():
+        return None
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (CHANGELOG_TABLE,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _reset_changelog(conn: sqlite3.Connection, seq: int):
+    """Changelog leeren, Sequenz aber nie zurueckdrehen (Journal-Eintraege bleiben eindeutig)."""
+    conn.execute(f"DELETE FROM {CHANGELOG_TABLE}")
+    if conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (seq, CHANGELOG_TABLE)).rowcount == 0:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (CHANGELOG_TABLE, seq))
+
+
+class ChangeJournal:
+    """Append-only Log der Fakten-Operationen, ein Segment pro Backup
+    (``journal_<backup_id>.jsonl`` enthaelt alles nach diesem Backup)."""
+
+    def __init__(self, directory, fsync: bool = False):
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._handle = None
+        self._segment = None
+
+    def _active(self) -> str:
+        if self._segment is None:
+            segments = self.segments()
+            self._segment = segments[-1][0] if segments else "0"
+        return self._segment
+
+    def segments(self) -> List[Tuple[str, Path]]:
+        if not self.directory.exists():
+            return []
+        found = [(p.stem[len("journal_"):], p) for p in self.directory.glob("journal_*.jsonl")]
+        return sorted(found)
+
+    def append(self, entries: Iterable[dict]):
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        if not lines:
+            return
+        with self._lock:
+            if self._handle is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._handle = open(self.directory / f"journal_{self._active()}.jsonl", "a", encoding="utf-8")
+            self._handle.write(lines)
+            self._handle.flush()
+            if self.fsync:
+                os.fsync(self._handle.fileno())
+
+    def ship(self, conn: sqlite3.Connection, batch_size: int = 10000) -> int:
+        """Changelog-Zeilen der DB ins Journal verschieben (erst anhaengen, dann loeschen:
+        nach einem Absturz dazwischen stehen Eintraege doppelt, der Replay ueberspringt sie)."""
+        shipped = 0
+        while True:
+            try:
+                rows = conn.execute(
+                    f"SELECT seq, ts, op, old_statement, row FROM {CHANGELOG_TABLE} ORDER BY seq LIMIT ?",
+                    (batch_size,)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return shipped  # keine Change-Capture in dieser DB
+            if not rows:
+                return shipped
+            self.append({"seq": seq, "ts": ts, "op": op, "old": old,
+                         "row": json.loads(row) if row else None} for seq, ts, op, old, row in rows)
+            conn.execute(f"DELETE FROM {CHANGELOG_TABLE} WHERE seq <= ?", (rows[-1][0],))
+            conn.commit()
+            shipped += len(rows)
+
+    def ship_from(self, db_path) -> int:
+        conn = sqlite3.connect(str(db_path), timeout=30)
+        try:
+            return self.ship(conn)
+        finally:
+            conn.close()
+
+    def roll(self, segment_id: str):
+        """Neues Segment ab Backup ``segment_id``."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._segment = segment_id
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def entries_after(self, segment_id: str, until: Optional[float]) -> Iterator[dict]:
+        """Operationen ab Segment ``segment_id`` bis ``until`` (inklusive)."""
+        for sid, path in self.segments():
+            if sid < segment_id:
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # abgeschnittene letzte Zeile nach Absturz
+                    if until is not None and entry.get("ts", 0) > until:
+                        return
+                    yield entry
+
+    def drop_before(self, segment_id: str) -> List[str]:
+        removed = []
+        with self._lock:
+            for sid, path in self.segments():
+                if sid < segment_id and sid != self._segment:
+                    try:
+                        path.unlink()
+                        removed.append(str(path))
+                    except OSError:
+                        pass
+        return removed
+
+
+def replay(conn: sqlite3.Connection, entries: Iterable[dict], after_seq: int) -> int:
+    """Changelog-Eintraege mit seq > ``after_seq`` zeilengenau anwenden.
+
+    Doppelt verschobene Eintraege werden uebersprungen, eine Luecke in der
+    Sequenz (verlorene Aenderungen) bricht mit BackupError ab. Trigger der
+    Ziel-DB (FTS, fact_predicates/fact_args) laufen wie bei jedem Writer mit.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(facts)")}
+    applied, last = 0, after_seq
+    for entry in entries:
+        seq = entry.get("seq")
+        if seq is None:
+            raise BackupError("change journal contains entries without DB-level capture")
+        if seq <= last:
+            continue
+        if seq != last + 1:
+            raise BackupError(f"change journal has a gap after seq {last} (next is {seq})")
+        last = seq
+        op, row = entry.get("op"), {k: v for k, v in (entry.get("row") or {}).items() if k in columns}
+        if op == "insert":
+            conn.execute(f"INSERT OR IGNORE INTO facts ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                         list(row.values()))
+        elif op == "update":
+            conn.execute(f"UPDATE OR IGNORE facts SET {', '.join(f'{c} = ?' for c in row)} WHERE statement = ?",
+                         list(row.values()) + [entry.get("old")])
+        elif op == "delete":
+            conn.execute("DELETE FROM facts WHERE statement = ?", (entry.get("old"),))
+        applied += 1
+    return applied
+
+
+# ----------------------------------------------------------------------------
+# Backup-Manager
+# ----------------------------------------------------------------------------
+
+class BackupManager:
+    """Backup-Saetze (full + Inkremente) samt Manifest in ``backup_dir``."""
+
+    def __init__(self, backup_dir, journal: Optional[ChangeJournal] = None,
+                 step_pages: int = DEFAULT_STEP_PAGES):
+        self.backup_dir = Path(backup_dir)
+        self.journal = journal
+        self.step_pages = step_pages
+        self._lock = threading.RLock()
+
+    # -- Manifest ---------------------------------------------------------
+
+    def _manifest_path(self) -> Path:
+        return self.backup_dir / MANIFEST
+
+    def _load(self) -> dict:
+        path = self._manifest_path()
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def entries(self) -> List[dict]:
+        return self._load().get("backups", [])
+
+    def restores(self) -> List[dict]:
+        return self._load().get("restores", [])
+
+    def _save(self, entries: List[dict], restores: Optional[List[dict]] = None):
+        path = self._manifest_path()
+        if restores is None:
+            restores = self.restores()
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "backups": entries, "restores": restores}, f, indent=2)
+        os.replace(tmp, path)
+
+    def get(self, backup_id: str) -> Optional[dict]:
+        return next((e for e in self.entries() if e["id"] == backup_id), None)
+
+    def _new_id(self, entries: List[dict]) -> str:
+        now = time.time()
+        backup_id = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+        while any(e["id"] == backup_id for e in entries):
+            now += 0.001
+            backup_id = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+        return backup_id
+
+    # -- Backup -----------------------------------------------------------
+
+    def backup(self, db_path, mode: str = "full", compression: str = "none",
+               description: str = "", verify: bool = False) -> dict:
+        compression = _check_compression(compression)
+        if mode not in ("full", "incremental"):
+            raise BackupError(f"unknown backup mode '{mode}' (use full or incremental)")
+        started = time.time()
+        with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            entries = self.entries()
+            backup_id = self._new_id(entries)
+            snapshot = self.backup_dir / f".{backup_id}.snapshot"
+            # Change-Capture sicherstellen, Rueckstand verschieben, dann vor dem Snapshot rollen:
+            # alles ab der changelog_seq des Snapshots landet im neuen Segment
+            if self.journal is not None:
+                conn = sqlite3.connect(str(db_path), timeout=30)
+                try:
+                    with conn:
+                        install_changelog(conn)
+                    self.journal.ship(conn)
+                finally:
+                    conn.close()
+                self.journal.roll(backup_id)
+            try:
+                copy = online_backup(db_path, snapshot, step_pages=self.step_pages)
+                conn = sqlite3.connect(str(snapshot))
+                try:
+                    seq = changelog_seq(conn)
+                finally:
+                    conn.close()
+                page_size = page_size_of(snapshot)
+                digests = page_digests(snapshot, page_size)
+                entry = {
+                    "id": backup_id, "created": started,
+                    "created_iso": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+                    "description": description, "compression": compression,
+                    "page_size": page_size, "page_count": len(digests) // DIGEST_SIZE,
+                    "snapshot_size": snapshot.stat().st_size, "snapshot_sha256": file_sha256(snapshot),
+                    "copy": copy, "changelog_seq": seq,
+                }
+                parent = entries[-1] if entries else None
+                parent_digests = self._digests(parent) if parent and mode == "incremental" else None
+                if mode == "incremental" and (parent_digests is None or parent["page_size"] != page_size):
+                    entry["fallback"] = "no usable parent backup - full backup written"
+                    mode = "full"
+                if mode == "full":
+                    entry.update(type="full", base=backup_id, parent=None)
+                    entry["file"] = self._write_full(snapshot, backup_id, compression)
+                    entry["changed_pages"] = entry["page_count"]
+                else:
+                    entry.update(type="incremental", base=parent["base"], parent=parent["id"])
+                    entry["file"], entry["changed_pages"] = self._write_delta(
+                        snapshot, backup_id, compression, page_size, digests, parent_digests)
+                with open(self.backup_dir / f"{backup_id}.pages", "wb") as f:
+                    f.write(digests)
+                stored = self.backup_dir / entry["file"]
+                entry["size"] = stored.stat().st_size
+                entry["sha256"] = file_sha256(stored)
+                entry["duration_s"] = round(time.time() - started, 3)
+                entries.append(entry)
+                self._save(entries)
+            finally:
+                if snapshot.exists():
+                    snapshot.unlink()
+        if verify:
+            entry["verify"] = self.verify(backup_id)
+        return entry
+
+    def _digests(self, entry: dict) -> Optional[bytes]:
+        path = self.backup_dir / f"{entry['id']}.pages"
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _write_full(self, snapshot: Path, backup_id: str, compression: str) -> str:
+        name = f"hexagonal_kb_{backup_id}.db{SUFFIXES[compression]}"
+        if compression == "none":
+            os.replace(snapshot, self.backup_dir / name)
+        else:
+            with open(snapshot, "rb") as src, _open_write(self.backup_dir / name, compression) as dst:
+                shutil.copyfileobj(src, dst, CHUNK)
+        return name
+
+    def _write_delta(self, snapshot: Path, backup_id: str, compression: str, page_size: int,
+                     digests: bytes, parent_digests: bytes) -> Tuple[str, int]:
+        name = f"hexagonal_kb_{backup_id}.delta{SUFFIXES[compression]}"
+        page_count = len(digests) // DIGEST_SIZE
+        changed = [
+            pgno for pgno in range(page_count)
+            if digests[pgno * DIGEST_SIZE:(pgno + 1) * DIGEST_SIZE]
+            != parent_digests[pgno * DIGEST_SIZE:(pgno + 1) * DIGEST_SIZE]
+        ]
+        with open(snapshot, "rb") as src, _open_write(self.backup_dir / name, compression) as dst:
+            dst.write(DELTA_MAGIC + struct.pack(">III", page_size, page_count, len(changed)))
+            for pgno in changed:
+                src.seek(pgno * page_size)
+                dst.write(struct.pack(">I", pgno) + src.read(page_size))
+        return name, len(changed)
+
+    # -- Pruefen und Wiederherstellen -------------------------------------
+
+    def chain(self, backup_id: str) -> List[dict]:
+        """Full-Backup plus Inkremente bis einschliesslich ``backup_id``."""
+        by_id = {e["id"]: e for e in self.entries()}
+        entry = by_id.get(backup_id)
+        if entry is None:
+            raise BackupError(f"backup '{backup_id}' not in manifest")
+        chain = [entry]
+        while chain[-1].get("parent"):
+            parent = by_id.get(chain[-1]["parent"])
+            if parent is None:
+                raise BackupError(f"backup chain broken: parent '{chain[-1]['parent']}' missing")
+            chain.append(parent)
+        return list(reversed(chain))
+
+    def latest_before(self, until: float) -> dict:
+        candidates = [e for e in self.entries() if e["created"] <= until]
+        if not candidates:
+            raise BackupError("no backup older than the requested point in time")
+        return candidates[-1]
+
+    def verify(self, backup_id: Optional[str] = None) -> dict:
+        """SHA-256 aller Dateien der Kette(n) pruefen."""
+        entries = self.chain(backup_id) if backup_id else self.entries()
+        files = {}
+        for entry in entries:
+            path = self.backup_dir / entry["file"]
+            files[entry["id"]] = path.exists() and file_sha256(path) == entry["sha256"]
+        return {"ok": all(files.values()), "files": files}
+
+    def materialize(self, backup_id: str, dest) -> dict:
+        """Kette zu einer DB-Datei ``dest`` zusammensetzen und gegen snapshot_sha256 pruefen."""
+        chain = self.chain(backup_id)
+        report = self.verify(backup_id)
+        if not report["ok"]:
+            raise BackupError(f"checksum mismatch in backup chain: {report['files']}")
+        base = chain[0]
+        with _open_read(self.backup_dir / base["file"], base["compression"]) as src, open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK)
+        for entry in chain[1:]:
+            self._apply_delta(entry, dest)
+        target = chain[-1]
+        if file_sha256(dest) != target["snapshot_sha256"]:
+            raise BackupError(f"restored snapshot of '{backup_id}' does not match its checksum")
+        return {"chain": [e["id"] for e in chain]}
+
+    def _apply_delta(self, entry: dict, dest):
+        with _open_read(self.backup_dir / entry["file"], entry["compression"]) as src, open(dest, "r+b") as dst:
+            header = src.read(len(DELTA_MAGIC) + 12)
+            if not header.startswith(DELTA_MAGIC):
+                raise BackupError(f"invalid delta file {entry['file']}")
+            page_size, page_count, changed = struct.unpack(">III", header[len(DELTA_MAGIC):])
+            for _ in range(changed):
+                record = src.read(4 + page_size)
+                if len(record) != 4 + page_size:
+                    raise BackupError(f"truncated delta file {entry['file']}")
+                dst.seek(struct.unpack(">I", record[:4])[0] * page_size)
+                dst.write(record[4:])
+            dst.truncate(page_count * page_size)
+
+    def _check_point_in_time(self, entry: dict, until_ts: float):
+        """``until`` nur, wenn das Journal alle Writes nach dem Backup lueckenlos kennt."""
+        if self.journal is None:
+            raise BackupError("point-in-time restore needs the change journal (HAKGAL_KB_JOURNAL)")
+        if entry["created"] > until_ts:
+            raise BackupError("backup is newer than the requested point in time")
+        if entry.get("changelog_seq") is None:
+            raise BackupError(f"backup '{entry['id']}' was taken without DB-level change capture - writes "
+                              "of other processes after it are unknown; restore it without 'until'")
+        for restore in self.restores():
+            if entry["created"] < restore["ts"] <= until_ts:
+                raise BackupError(f"a restore at {restore['iso']} lies between backup '{entry['id']}' and the "
+                                  "requested point in time; pick a backup taken after that restore")
+
+    def restore(self, db_path, backup_id: Optional[str] = None, until=None) -> dict:
+        """Backup (oder letzten Stand vor ``until`` plus Journal-Replay) in die
+        laufende DB kopieren - per Backup-API, nicht durch Ersetzen der Datei."""
+        until_ts = _parse_until(until)
+        if backup_id is None:
+            if until_ts is None:
+                raise BackupError("restore needs backup_id or until")
+            backup_id = self.latest_before(until_ts)["id"]
+        entry = self.get(backup_id)
+        if entry is None:
+            raise BackupError(f"backup '{backup_id}' not in manifest")
+        if until_ts is not None:
+            self._check_point_in_time(entry, until_ts)
+        with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            live_seq = 0
+            if self.journal is not None:
+                # Rueckstand der laufenden DB sichern, bevor sie ueberschrieben wird
+                conn = sqlite3.connect(str(db_path), timeout=30)
+                try:
+                    self.journal.ship(conn)
+                    live_seq = changelog_seq(conn) or 0
+                finally:
+                    conn.close()
+            work = self.backup_dir / f".restore_{backup_id}.db"
+            try:
+                info = self.materialize(backup_id, work)
+                replayed = 0
+                conn = sqlite3.connect(str(work))
+                try:
+                    with conn:
+                        if until_ts is not None:
+                            replayed = replay(conn, self.journal.entries_after(backup_id, until_ts),
+                                              entry["changelog_seq"])
+                        if self.journal is not None and install_changelog(conn):
+                            # Replay-/Snapshot-Zeilen sind bereits im Journal
+                            _reset_changelog(conn, max(live_seq, changelog_seq(conn) or 0))
+                finally:
+                    conn.close()
+                apply_database(work, db_path)
+            finally:
+                if work.exists():
+                    work.unlink()
+            now = time.time()
+            self._save(self.entries(), self.restores() + [{
+                "ts": now, "iso": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+                "backup_id": backup_id, "until": until_ts,
+            }])
+        info.update(backup_id=backup_id, replayed_ops=replayed, until=until_ts)
+        return info
+
+    def rotate(self, keep_last: int) -> dict:
+        """Nur die juengsten ``keep_last`` Full-Backups samt Inkrementen behalten."""
+        with self._lock:
+            entries = self.entries()
+            fulls = [e["id"] for e in entries if e["type"] == "full"]
+            keep_bases = set(fulls[-keep_last:]) if keep_last > 0 else set()
+            kept, removed = [], []
+            for entry in entries:
+                if entry["base"] in keep_bases:
+                    kept.append(entry)
+                    continue
+                for name in (entry["file"], f"{entry['id']}.pages"):
+                    try:
+                        (self.backup_dir / name).unlink()
+                        removed.append(str(self.backup_dir / name))
+                    except OSError:
+                        pass
+            self._save(kept)
+            if self.journal is not None and kept:
+                removed.extend(self.journal.drop_before(kept[0]["id"]))
+        return {"kept": len(kept), "removed": removed}
+
+
+def apply_database(source_path, db_path):
+    """Inhalt von ``source_path`` per Backup-API in die (evtl. geoeffnete) DB kopieren."""
+    src = sqlite3.connect(str(source_path))
+    try:
+        dst = sqlite3.connect(str(db_path), timeout=30)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
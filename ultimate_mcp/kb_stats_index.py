@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL KB Statistics Index
+===========================
+Materialisierte KB-Statistiken fuer ``kb_stats``, ``get_predicates_stats``,
+``get_entities_stats``, ``growth_stats`` und die ``dashboard_*``-Tools.
+
+Statt pro Aufruf die ganze facts-Tabelle zu lesen und zu parsen, haelt der
+Index laufende Zaehler:
+
+- Praedikat -> Anzahl Fakten (wie das SQL der Tools: Text vor der ersten
+  Klammer, sonst 'Invalid')
+- Entity -> Anzahl Vorkommen (Argumente wie ``_parse_statement``)
+- Stelligkeit -> Anzahl Fakten
+
+Neue Fakten kommen ueber den rowid-Watermark, eigene Loeschungen/Updates
+ueber ``forget``/``replace`` der FactIndex-Basis (fact_index.py); beide
+passen die Zaehler inkrementell an. Top-K-Listen werden pro Datenstand
+einmal sortiert und bis zur naechsten Aenderung wiederverwendet.
+
+``verify`` zaehlt per Vollscan nach und vergleicht mit den materialisierten
+Werten. Die Tageszaehler fuer ``growth_stats`` liest ``AuditGrowth``
+inkrementell aus dem Write-Audit-Log.
+"""
+
+import collections
+import json
+import os
+import random
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fact_index import FactIndex, get_fact_index
+
+
+def fact_predicate(statement: str) -> str:
+    """Wie das SQL der Stats-Tools: trim(substr(statement, 1, instr(statement, '(') - 1))"""
+    pos = statement.find('(')
+    if pos < 0:
+        return 'Invalid'
+    return statement[:pos].strip(' ')
+
+
+def fact_arguments(statement: str) -> List[str]:
+    """Wie ``_parse_statement`` im Server: Argumente zwischen erster und letzter Klammer"""
+    left = statement.find('(')
+    right = statement.rfind(')')
+    if left == -1 or right == -1 or right <= left:
+        return []
+    return [part.strip() for part in statement[left + 1:right].split(',') if part.strip()]
+
+
+def is_chemical(predicate: str) -> bool:
+    """Kategorie wie ``predicate LIKE '%Chemical%' OR predicate LIKE '%Reaction%'``"""
+    lowered = predicate.lower()
+    return 'chemical' in lowered or 'reaction' in lowered
+
+
+class KBStatsIndex(FactIndex):
+    """Praedikat-, Entity- und Stelligkeits-Zaehler ueber der facts-Tabelle"""
+
+    def _reset_index(self):
+        self.predicates: collections.Counter = collections.Counter()
+        self.entities: collections.Counter = collections.Counter()
+        self.arity: collections.Counter = collections.Counter()
+        self._version = 0
+        self._top_cache: Dict[tuple, list] = {}
+
+    def _index_row(self, row: int, statement: str):
+        args = fact_arguments(statement)
+        self.predicates[fact_predicate(statement)] += 1
+        self.entities.update(args)
+        self.arity[len(args)] += 1
+        self._version += 1
+
+    def _drop_row(self, row: int, statement: str):
+        args = fact_arguments(statement)
+        self._decrement(self.predicates, fact_predicate(statement))
+        for arg in args:
+            self._decrement(self.entities, arg)
+        self._decrement(self.arity, len(args))
+        self._version += 1
+
+    @staticmethod
+    def _decrement(counter: collections.Counter, key):
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+
+    # ------------------------------------------------------------------
+    # Abfrage
+    # ------------------------------------------------------------------
+
+    def _top(self, name: str, counter: collections.Counter, k: int) -> List[Tuple]:
+        key = (name, k)
+        cached = self._top_cache.get(key)
+        if cached is None or cached[0] != self._version:
+            cached = self._top_cache[key] = (self._version, counter.most_common(k))
+        return cached[1]
+
+    def total(self) -> int:
+        self.sync()
+        with self._lock:
+            return self._rows
+
+    def top_predicates(self, k: Optional[int] = 50, include_invalid: bool = True) -> List[Tuple[str, int]]:
+        self.sync()
+        with self._lock:
+            if include_invalid:
+                return list(self._top('predicates', self.predicates, k))
+            items = self._top('predicates', self.predicates, None)
+            return [(p, c) for p, c in items if p != 'Invalid'][:k]
+
+    def top_entities(self, k: Optional[int] = 20, min_count: int = 1) -> List[Tuple[str, int]]:
+        self.sync()
+        with self._lock:
+            items = self._top('entities', self.entities, k)
+            return [(e, c) for e, c in items if c >= min_count]
+
+    def categories(self) -> Dict[str, int]:
+        """Chemical/Non-Chemical-Verteilung aus den Praedikat-Zaehlern"""
+        self.sync()
+        with self._lock:
+            result: Dict[str, int] = {}
+            for predicate, count in self.predicates.items():
+                category = 'Chemical' if is_chemical(predicate) else 'Non-Chemical'
+                result[category] = result.get(category, 0) + count
+            return result
+
+    def sample(self, size: int) -> List[str]:
+        """Zufaellige lebende Fakten (ersetzt ORDER BY RANDOM() LIMIT n)"""
+        self.sync()
+        with self._lock:
+            n = len(self._statements)
+            if self._rows <= size:
+                return [s for s in self._statements if s is not None]
+            picked = set()
+            while len(picked) < size:
+                row = random.randrange(n)
+                if self._alive[row]:
+                    picked.add(row)
+            return [self._statements[row] for row in picked]
+
+    def stats(self) -> Dict[str, object]:
+        self.sync()
+        with self._lock:
+            return {
+                'facts': self._rows,
+                'predicates': len(self.predicates),
+                'entities': len(self.entities),
+                'arity_histogram': {str(k): v for k, v in sorted(self.arity.items())},
+                'dead_rows': self._dead,
+                'full_builds': self.full_builds,
+            }
+
+    # ------------------------------------------------------------------
+    # Recompute & Verify
+    # ------------------------------------------------------------------
+
+    def verify(self, repair: bool = False, max_diffs: int = 10) -> Dict[str, object]:
+        """Vollscan der facts-Tabelle und Vergleich mit den materialisierten Zaehlern.
+
+        Mit ``repair`` wird der Index bei Abweichungen neu aufgebaut.
+        """
+        uri = f"file:{Path(self.db_path).resolve().as_posix()}?mode=ro"
+        with self._lock:
+            self.sync()
+            conn = sqlite3.connect(uri, uri=True)
+            try:
+                predicates = collections.Counter()
+                entities = collections.Counter()
+                arity = collections.Counter()
+                seen = set()
+                cursor = conn.execute(
+                    "SELECT statement FROM facts WHERE statement IS NOT NULL AND length(statement) > 0"
+                )
+                for (statement,) in cursor:
+                    if statement in seen:
+                        continue
+                    seen.add(statement)
+                    args = fact_arguments(statement)
+                    predicates[fact_predicate(statement)] += 1
+                    entities.update(args)
+                    arity[len(args)] += 1
+            finally:
+                conn.close()
+
+            diffs = {}
+            for name, expected, actual in (('predicates', predicates, self.predicates),
+                                           ('entities', entities, self.entities),
+                                           ('arity', arity, self.arity)):
+                keys = [k for k in expected.keys() | actual.keys() if expected[k] != actual[k]]
+                if keys:
+                    diffs[name] = {
+                        'mismatched_keys': len(keys),
+                        'examples': [{'key': str(k), 'scan': expected[k], 'materialized': actual[k]}
+                                     for k in sorted(keys, key=str)[:max_diffs]],
+                    }
+            report = {
+                'ok': not diffs and len(seen) == self._rows,
+                'facts_scan': len(seen),
+                'facts_materialized': self._rows,
+                'diffs': diffs,
+                'repaired': False,
+            }
+            if repair and not report['ok']:
+                self.sync(force=True)
+                report['repaired'] = True
+            return report
+
+
+class AuditGrowth:
+    """Tageszaehler der add_fact-Eintraege im Write-Audit-Log.
+
+    Liest nur die seit dem letzten Aufruf angehaengten Zeilen (Byte-Offset);
+    schrumpft die Datei (Rotation), wird neu gezaehlt.
+    """
+
+    def __init__(self, audit_path):
+        self.audit_path = Path(audit_path)
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._per_day: collections.Counter = collections.Counter()
+
+    def refresh(self):
+        with self._lock:
+            try:
+                size = self.audit_path.stat().st_size
+            except OSError:
+                self._offset = 0
+                self._per_day.clear()
+                return
+            if size < self._offset:
+                self._offset = 0
+                self._per_day.clear()
+            if size == self._offset:
+                return
+            with open(self.audit_path, 'rb') as handle:
+                handle.seek(self._offset)
+                chunk = handle.read(size - self._offset)
+            # Unvollstaendige letzte Zeile beim naechsten Mal lesen
+            end = chunk.rfind(b'\n') + 1
+            for line in chunk[:end].decode('utf-8', errors='replace').splitlines():
+                try:
+                    entry = json.loads(line)
+                    if entry.get('action') == 'add_fact':
+                        day = datetime.strptime(entry.get('ts'), "%Y-%m-%d %H:%M:%S")
+                        self._per_day[day.strftime("%Y-%m-%d")] += 1
+                except Exception:
+                    continue
+            self._offset += end
+
+    def per_day(self, days: int) -> Dict[str, int]:
+        """Tagesgenau: alle Tage ab dem Datum von (jetzt - days), Reihenfolge wie im Log"""
+        self.refresh()
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        with self._lock:
+            return {day: count for day, count in self._per_day.items() if day >= cutoff}
+
+
+_GROWTH: Dict[str, AuditGrowth] = {}
+_GROWTH_LOCK = threading.Lock()
+
+
+def get_kb_stats_index(db_path) -> KBStatsIndex:
+    return get_fact_index(KBStatsIndex, db_path, 'HAKGAL_STATS_SYNC_S')
+
+
+def get_audit_growth(audit_path) -> AuditGrowth:
+    key = os.path.abspath(str(audit_path))
+    with _GROWTH_LOCK:
+        growth = _GROWTH.get(key)
+        if growth is None:
+            growth = _GROWTH[key] = AuditGrowth(audit_path)
+        return growth
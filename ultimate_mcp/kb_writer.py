@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL KB Writer
+=================
+Ein einziger Writer-Thread pro Server fuer alle Fakten-Aenderungen der
+MCP-Tools (add/delete/update, Bulk-Varianten).
+
+- Anstehende Operationen werden gesammelt und in EINER SQLite-Transaktion
+  geschrieben (ein fsync statt einem pro Fakt); jede Operation laeuft in
+  einem eigenen SAVEPOINT und bekommt ihr eigenes Ergebnis bzw. ihre
+  eigene Exception ueber ein Future.
+- ``KBLock`` schuetzt die DB prozessuebergreifend. Die Lock-Datei enthaelt
+  PID, Host und Lease; ein Lock, dessen Prozess nicht mehr lebt, wird
+  uebernommen statt bis zum Timeout zu warten. Die Lease entscheidet nur,
+  wenn die PID nicht pruefbar ist (anderer Host, Windows ohne psutil); ein
+  Heartbeat-Thread verlaengert sie, solange der Lock gehalten wird.
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    psutil = None
+    HAS_PSUTIL = False
+
+from kb_backup import install_changelog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_S = 30.0
+DEFAULT_MAX_BATCH = 512
+
+
+def _pid_alive(pid: int) -> bool:
+    """True wenn der Prozess lebt - im Zweifel True (dann entscheidet die Lease)."""
+    if pid <= 0:
+        return False
+    if HAS_PSUTIL:
+        return psutil.pid_exists(pid)
+    if os.name == "nt":
+        # os.kill(pid, 0) wuerde unter Windows den Prozess beenden
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _pid_checkable() -> bool:
+    """Kann ``_pid_alive`` auf diesem Host verlaesslich antworten?"""
+    return HAS_PSUTIL or os.name != "nt"
+
+
+class KBLock:
+    """Prozessuebergreifender KB-Lock (O_EXCL-Datei mit PID/Lease)."""
+
+    def __init__(self, path, lease_seconds: float = DEFAULT_LEASE_S):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.host = socket.gethostname()
+        self.stale_recovered = 0
+        self._token = None
+        self._renewed = 0.0
+        self._mutex = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+
+    @staticmethod
+    def _read_record(path: Path) -> Optional[dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.loads(f.read() or "null")
+        except (OSError, ValueError):
+            return None
+
+    def _owner(self) -> Optional[dict]:
+        return self._read_record(self.path)
+
+    def _is_stale(self, owner: Optional[dict]) -> bool:
+        if owner is None:
+            # Leere/kaputte Datei: ueber das Alter entscheiden (Writer evtl. gerade beim Schreiben)
+            try:
+                return time.time() - self.path.stat().st_mtime > self.lease_seconds
+            except OSError:
+                return False
+        if owner.get("host") == self.host and _pid_checkable():
+            # Lokaler, pruefbarer Besitzer: nur ein toter Prozess macht den Lock stale
+            return not _pid_alive(int(owner.get("pid", 0)))
+        return time.time() > float(owner.get("expires", 0))
+
+    def _write_record(self, fd: int):
+        record = {
+            "pid": os.getpid(), "host": self.host, "token": self._token,
+            "acquired": time.time(), "expires": time.time() + self.lease_seconds,
+        }
+        os.write(fd, json.dumps(record).encode("utf-8"))
+
+    def acquire(self, timeout_seconds: float = 5.0):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.time() + timeout_seconds
+        delay = 0.001
+        token = f"{os.getpid()}-{threading.get_ident()}-{time.time_ns()}"
+        while True:
+            try:
+                fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                owner = self._owner()
+                if self._is_stale(owner):
+                    self._break_stale(owner)
+                    continue
+                if time.time() > deadline:
+                    raise RuntimeError("KB is locked; try again later")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+                continue
+            try:
+                self._token = token
+                self._renewed = time.time()
+                self._write_record(fd)
+            finally:
+                os.close(fd)
+            self._start_heartbeat()
+            return
+
+    def _start_heartbeat(self):
+        stop = self._stop = threading.Event()
+        interval = max(self.lease_seconds / 3, 0.01)
+
+        def beat():
+            while not stop.wait(interval):
+                with self._mutex:
+                    if stop.is_set():
+                        return
+                    self._renew()
+
+        threading.Thread(target=beat, name=f"kb-lock-heartbeat-{self.path.name}", daemon=True).start()
+
+    def _break_stale(self, owner: Optional[dict]):
+        """Verwaisten Lock entfernen - per rename, damit nur ein Prozess ihn bricht."""
+        grave = self.path.with_name(f"{self.path.name}.stale.{os.getpid()}.{threading.get_ident()}")
+        try:
+            os.replace(self.path, grave)
+        except OSError:
+            return
+        if self._read_record(grave) != owner:
+            # Zwischen Lesen und rename hat jemand anderes neu gelockt: zurueckgeben,
+            # ohne einen inzwischen neu angelegten Lock zu ueberschreiben
+            try:
+                os.link(grave, self.path)
+            except OSError:
+                pass
+            try:
+                os.unlink(grave)
+            except OSError:
+                pass
+            return
+        try:
+            os.unlink(grave)
+        except OSError:
+            pass
+        self.stale_recovered += 1
+        logger.warning(f"Recovered stale KB lock {self.path} (owner: {owner})")
+
+    def refresh(self):
+        """Lease verlaengern (lange Bulk-Operationen), hoechstens alle halbe Lease."""
+        if time.time() - self._renewed < self.lease_seconds / 2:
+            return
+        with self._mutex:
+            self._renew()
+
+    def _renew(self):
+        owner = self._owner()
+        if not owner or owner.get("token") != self._token:
+            return
+        self._renewed = time.time()
+        owner["expires"] = self._renewed + self.lease_seconds
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(owner, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def release(self):
+        """Nur den eigenen Lock entfernen."""
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+        # Mutex: ein laufender Heartbeat darf die Datei nach dem unlink nicht neu anlegen
+        with self._mutex:
+            owner = self._owner()
+            if owner is None or owner.get("token") == self._token:
+                try:
+                    self.path.unlink()
+                except OSError:
+                    pass
+            self._token = None
+
+
+class _Op:
+    __slots__ = ("kind", "args", "future")
+
+    def __init__(self, kind: str, args: tuple):
+        self.kind = kind
+        self.args = args
+        self.future: Future = Future()
+
+
+class KBWriteQueue:
+    """Single-Writer-Queue: ``submit(kind, *args)`` -> Future mit der rowcount."""
+
+    KINDS = ("add", "delete", "update", "insert_many", "delete_many", "replace_many")
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], lock: KBLock,
+                 max_batch: int = DEFAULT_MAX_BATCH, lock_timeout: float = 5.0, journal=None):
+        self._connect = connect
+        self.lock = lock
+        # Optional: kb_backup.ChangeJournal fuer Point-in-Time-Restore. Die Aenderungen
+        # erfassen Trigger in der DB (auch fremde Writer); die Queue verschiebt sie nur
+        self.journal = journal
+        self._changelog_ready = False
+        self.max_batch = max_batch
+        self.lock_timeout = lock_timeout
+        self._queue: "queue.Queue[Optional[_Op]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._stats = {"batches": 0, "ops": 0, "failed_ops": 0, "max_batch": 0, "commit_ms": 0.0}
+
+    def submit(self, kind: str, *args) -> Future:
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown write operation: {kind}")
+        if self._closed:
+            raise RuntimeError("KB writer is closed")
+        op = _Op(kind, args)
+        self._ensure_thread()
+        self._queue.put(op)
+        return op.future
+
+    def execute(self, kind: str, *args) -> int:
+        return self.submit(kind, *args).result()
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hakgal-kb-writer", daemon=True)
+                self._thread.start()
+
+    def close(self, timeout: float = 5.0):
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        stats = dict(self._stats)
+        stats["commit_ms"] = round(stats["commit_ms"], 3)
+        stats["avg_batch"] = round(stats["ops"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["pending"] = self._queue.qsize()
+        stats["stale_locks_recovered"] = self.lock.stale_recovered
+        return stats
+
+    # ------------------------------------------------------------------
+    # Writer-Thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            op = self._queue.get()
+            if op is None:
+                return
+            batch = [op]
+            stop = False
+            # Alles einsammeln, was waehrend des letzten Commits aufgelaufen ist
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        outcomes = []
+        start = time.perf_counter()
+        try:
+            self.lock.acquire(self.lock_timeout)
+        except Exception as e:
+            for op in batch:
+                op.future.set_exception(e)
+            return
+        conn = None
+        try:
+            conn = self._connect()
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            if self.journal is not None and not self._changelog_ready:
+                self._changelog_ready = install_changelog(conn)
+            for op in batch:
+                conn.execute("SAVEPOINT kb_op")
+                try:
+                    count = self._apply(conn, op)
+                    conn.execute("RELEASE kb_op")
+                    outcomes.append((op, count, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO kb_op")
+                    conn.execute("RELEASE kb_op")
+                    outcomes.append((op, None, e))
+            conn.execute("COMMIT")
+            if self.journal is not None:
+                try:
+                    self.journal.ship(conn)
+                except Exception as e:
+                    # Zeilen bleiben in kb_changelog und gehen mit dem naechsten Batch raus
+                    logger.warning(f"KB change journal ship failed: {e}")
+        except Exception as e:
+            if conn is not None:
+                try:
+                    conn.execute("ROLLBACK")
+                except Exception:
+                    pass
+            outcomes = [(op, None, e) for op in batch]
+        finally:
+            if conn is not None:
+                conn.close()
+            self.lock.release()
+        self._stats["batches"] += 1
+        self._stats["ops"] += len(batch)
+        self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+        self._stats["commit_ms"] += (time.perf_counter() - start) * 1000.0
+        for op, count, error in outcomes:
+            if error is not None:
+                self._stats["failed_ops"] += 1
+                op.future.set_exception(error)
+            else:
+                op.future.set_result(count)
+
+    def _apply(self, conn: sqlite3.Connection, op: _Op) -> int:
+        kind, args = op.kind, op.args
+        if kind == "add":
+            return conn.execute("INSERT INTO facts (statement) VALUES (?)", args).rowcount
+        if kind == "delete":
+            return conn.execute("DELETE FROM facts WHERE statement = ?", args).rowcount
+        if kind == "update":
+            old, new = args
+            return conn.execute("UPDATE facts SET statement = ? WHERE statement = ?", (new, old)).rowcount
+        if kind == "delete_many":
+            return sum(conn.execute("DELETE FROM facts WHERE statement = ?", (s,)).rowcount or 0 for s in args[0])
+        if kind == "replace_many":
+            return sum(conn.execute("UPDATE facts SET statement = ? WHERE statement = ?", (new, old)).rowcount or 0
+                       for old, new in args[0])
+        # insert_many: (statements, ignore_duplicates, batch_size)
+        statements, ignore, batch_size = args
+        sql = "INSERT OR IGNORE INTO facts(statement) VALUES(?)" if ignore else "INSERT INTO facts(statement) VALUES(?)"
+        total = 0
+        for i in range(0, len(statements), max(1, batch_size)):
+            total += conn.executemany(sql, [(s,) for s in statements[i:i + batch_size]]).rowcount or 0
+        return total
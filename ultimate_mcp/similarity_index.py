@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL Similarity Index
+========================
+Persistenter Kandidaten-Index fuer das MCP-Tool ``semantic_similarity``.
+
+Statt bei jedem Aufruf alle Fakten mit SequenceMatcher zu vergleichen,
+haelt der Index pro Datenbank:
+
+- Zeichen-Trigramme und Argumente jedes Statements als invertierte
+  Postings (array('i'), Zeilen-IDs)
+- pro Zeile Praedikat-ID, Trigramm- und Argument-Anzahl
+
+Eine Anfrage bewertet alle Zeilen vektorisiert (NumPy bincount ueber die
+Postings der Anfrage) mit demselben Aufbau wie der exakte Score:
+``0.40 * Praedikat + 0.40 * Argument-Treffer + 0.20 * Trigramm-Dice``
+(Entity-Treffer werden durch die Argument-Treffer angenaehert, Teiltreffer
+und SequenceMatcher-String-Ratio fehlen). Nur die Top-K werden danach exakt
+bewertet; fuer die Similarity Distribution der uebrigen Fakten liefert der
+Index eine gleichverteilte Stichprobe, die das Tool exakt bewertet und
+hochrechnet.
+
+Synchronisation ueber die gemeinsame FactIndex-Basis (fact_index.py).
+"""
+
+import re
+from array import array
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from fact_index import FactIndex, get_fact_index
+
+_PREDICATE = re.compile(r'^(\w+)\s*\(|^(\w+)')
+
+
+def extract_predicate(statement: str) -> Optional[str]:
+    """Wie extract_predicate_fixed im Tool: 'IsA(A, B).' -> 'IsA'"""
+    match = _PREDICATE.match(statement.strip())
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def extract_arguments(statement: str) -> List[str]:
+    """Wie extract_arguments_fixed im Tool (Klammer-Tiefe beachtet)"""
+    stmt = statement.strip().rstrip('.')
+    match = re.search(r'\((.*?)\)(?:[^)]*)?$', stmt)
+    if not match:
+        if ',' in stmt:
+            return [arg.strip() for arg in stmt.split(',') if arg.strip()]
+        return [stmt.strip()]
+    arguments = []
+    current = ""
+    depth = 0
+    for char in match.group(1):
+        if char == ',' and depth == 0:
+            if current.strip():
+                arguments.append(current.strip())
+            current = ""
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        current += char
+    if current.strip():
+        arguments.append(current.strip())
+    return arguments
+
+
+def trigrams(statement: str) -> set:
+    text = f" {statement.lower().strip()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SimilarityIndex(FactIndex):
+    """Trigramm-/Argument-Postings und Praedikat-IDs ueber der facts-Tabelle"""
+
+    def _reset_index(self):
+        self._gram_count = array('f')
+        self._arg_count = array('f')
+        self._pred = array('i')
+        self._pred_ids: Dict[Optional[str], int] = {}
+        self._pred_names: List[Optional[str]] = []
+        self._gram_ids: Dict[str, int] = {}
+        self._postings: List[array] = []
+        self._arg_ids: Dict[str, int] = {}
+        self._arg_postings: List[array] = []
+
+    def _index_row(self, row: int, statement: str):
+        pred = extract_predicate(statement)
+        pred_id = self._pred_ids.get(pred)
+        if pred_id is None:
+            pred_id = self._pred_ids[pred] = len(self._pred_names)
+            self._pred_names.append(pred)
+        self._pred.append(pred_id)
+
+        grams = trigrams(statement)
+        self._gram_count.append(len(grams))
+        for gram in grams:
+            gram_id = self._gram_ids.get(gram)
+            if gram_id is None:
+                gram_id = self._gram_ids[gram] = len(self._postings)
+                self._postings.append(array('i'))
+            self._postings[gram_id].append(row)
+
+        args = extract_arguments(statement)
+        self._arg_count.append(len(args))
+        for arg in set(args):
+            arg_id = self._arg_ids.get(arg)
+            if arg_id is None:
+                arg_id = self._arg_ids[arg] = len(self._arg_postings)
+                self._arg_postings.append(array('i'))
+            self._arg_postings[arg_id].append(row)
+
+    # ------------------------------------------------------------------
+    # Abfrage
+    # ------------------------------------------------------------------
+
+    def _predicate_similarity(self, predicate: Optional[str]) -> np.ndarray:
+        sims = np.zeros(len(self._pred_names), dtype=np.float32)
+        if predicate is None:
+            return sims
+        for pred_id, name in enumerate(self._pred_names):
+            if name is None:
+                continue
+            sims[pred_id] = 1.0 if name == predicate else SequenceMatcher(None, predicate, name).ratio()
+        return sims
+
+    @staticmethod
+    def _count_hits(postings: List[array], ids: Dict[str, int], weights: Dict[str, int], n: int) -> np.ndarray:
+        """Gewichtete Trefferzahl pro Zeile ueber die Postings der Anfrage-Terme"""
+        rows, row_weights = [], []
+        for term, weight in weights.items():
+            term_id = ids.get(term)
+            if term_id is not None:
+                block = np.frombuffer(postings[term_id], dtype=np.int32)
+                rows.append(block)
+                row_weights.append(np.full(len(block), weight, dtype=np.float32))
+        if not rows:
+            return np.zeros(n, dtype=np.float32)
+        return np.bincount(np.concatenate(rows), weights=np.concatenate(row_weights),
+                           minlength=n).astype(np.float32)
+
+    def candidates(self, statement: str, k: int, sample_size: int = 0,
+                   seed: Optional[int] = None) -> Tuple[List[str], List[str], int]:
+        """Top-k Kandidaten fuer ``statement`` (ohne das Statement selbst).
+
+        Returns (kandidaten, stichprobe, rest): ``stichprobe`` sind bis zu
+        ``sample_size`` zufaellige Fakten ausserhalb der Kandidaten, ``rest``
+        ist die Anzahl dieser uebrigen Fakten.
+        """
+        self.sync()
+        with self._lock:
+            n = len(self._statements)
+            if n == 0:
+                return [], [], 0
+
+            query_grams = trigrams(statement)
+            shared = self._count_hits(self._postings, self._gram_ids, {g: 1 for g in query_grams}, n)
+            gram_count = np.frombuffer(self._gram_count, dtype=np.float32)
+            dice = 2.0 * shared / np.maximum(gram_count + len(query_grams), 1.0)
+
+            query_args = extract_arguments(statement)
+            multiplicity: Dict[str, int] = {}
+            for arg in query_args:
+                multiplicity[arg] = multiplicity.get(arg, 0) + 1
+            matches = self._count_hits(self._arg_postings, self._arg_ids, multiplicity, n)
+            arg_count = np.frombuffer(self._arg_count, dtype=np.float32)
+            arg_sim = matches / np.maximum(np.maximum(arg_count, len(query_args)), 1.0)
+
+            pred_sim = self._predicate_similarity(extract_predicate(statement))
+            score = (0.40 * pred_sim[np.frombuffer(self._pred, dtype=np.int32)]
+                     + 0.40 * arg_sim + 0.20 * dice)
+
+            alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+            own = self._row_by_statement.get(statement)
+            if own is not None:
+                alive[own] = False
+            score[~alive] = -1.0
+
+            k = min(k, int(alive.sum()))
+            if k <= 0:
+                return [], [], 0
+            top = np.argpartition(-score, k - 1)[:k] if k < n else np.arange(n)
+            top = top[score[top] >= 0]
+
+            alive[top] = False
+            rest = np.flatnonzero(alive)
+            if 0 < sample_size < len(rest):
+                sample = np.random.default_rng(seed).choice(rest, size=sample_size, replace=False)
+            else:
+                sample = rest if sample_size > 0 else rest[:0]
+            statements = self._statements
+            return ([statements[row] for row in top.tolist()],
+                    [statements[row] for row in sample.tolist()], len(rest))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'facts': self._rows,
+                'dead_rows': self._dead,
+                'trigrams': len(self._postings),
+                'postings': sum(len(p) for p in self._postings),
+                'arguments': len(self._arg_postings),
+                'predicates': len(self._pred_names),
+                'full_builds': self.full_builds,
+            }
+
+
+def get_similarity_index(db_path) -> SimilarityIndex:
+    return get_fact_index(SimilarityIndex, db_path, 'HAKGAL_SIMILARITY_SYNC_S')
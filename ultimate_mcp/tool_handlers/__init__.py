@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tool Handlers
+=========================
+Registry-basierter Dispatch fuer ``HAKGALMCPServer``: Tool-Name -> Handler-
+Funktion ``tool(server, tool_args) -> result``. Die Handler liegen nach
+Themen in Modulen dieses Pakets und werden erst beim ersten Aufruf eines
+ihrer Tools importiert (optionale Abhaengigkeiten wie Sentry, Nischen- und
+Meta-Tools damit auch). Module mit ``AVAILABLE = False`` liefern keinen
+Handler; der Server antwortet dann wie bisher mit dem Fallback-Text.
+
+``TOOL_METRICS`` sammelt pro Tool Aufrufe, Fehler und ein Latenz-Histogramm
+(Tool ``tool_metrics``).
+"""
+
+import importlib
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Modul -> Tools (Funktionsname = Tool-Name)
+TOOL_MODULES: Dict[str, tuple] = {
+    "kb_query": (
+        "get_facts_count", "search_knowledge", "get_recent_facts", "get_predicates_stats",
+        "list_audit", "export_facts", "growth_stats", "consistency_check", "validate_facts",
+        "get_entities_stats", "search_by_predicate", "get_fact_history",
+    ),
+    "kb_write": (
+        "backup_kb", "restore_kb", "bulk_delete", "bulk_translate_predicates",
+        "add_fact", "delete_fact", "update_fact", "bulk_add_facts",
+    ),
+    "db_admin": (
+        "db_checkpoint", "db_backup_now", "db_backup_rotate", "db_backup_list", "db_benchmark_inserts",
+        "kb_stats", "db_get_pragma", "db_enable_wal", "db_vacuum",
+    ),
+    "graph": (
+        "semantic_similarity", "query_related", "analyze_duplicates", "get_knowledge_graph",
+        "find_isolated_facts", "inference_chain",
+    ),
+    "dashboard": (
+        "dashboard_predicates_analytics", "dashboard_knowledge_graph_data", "dashboard_system_health",
+        "dashboard_websocket_status", "dashboard_performance_metrics",
+    ),
+    "system": (
+        "get_system_status", "execute_code", "health_check", "health_check_json", "tool_metrics",
+    ),
+    "files": (
+        "read_file", "write_file", "list_files", "get_file_info", "directory_tree", "create_file",
+        "delete_file", "move_file", "grep", "find_files", "search", "edit_file", "multi_edit",
+    ),
+    "project": ("project_snapshot", "project_list_snapshots", "project_hub_digest"),
+    "delegation": ("delegate_task",),
+    "sentry_tools": (
+        "sentry_test_connection", "sentry_whoami", "sentry_find_organizations",
+        "sentry_find_projects", "sentry_search_issues",
+    ),
+    "niche": ("niche_list", "niche_stats", "niche_query"),
+    "meta": ("consensus_evaluator", "reliability_checker", "bias_detector", "delegation_optimizer"),
+}
+
+TOOL_ALIASES: Dict[str, str] = {
+    "list_recent_facts": "get_recent_facts",
+}
+
+# Obergrenzen der Histogramm-Buckets in Millisekunden (letzter Bucket: darueber)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+def is_valid_sentry_dsn(dsn: str) -> bool:
+    try:
+        if not dsn:
+            return False
+        dsn = dsn.strip()
+        # Expected like: https://<publicKey>@de.sentry.io/<projectId>
+        if not (dsn.startswith("http://") or dsn.startswith("https://")):
+            return False
+        if "@" not in dsn:
+            return False
+        # must have trailing /<projectId>
+        parts = dsn.split("/")
+        if len(parts) < 4:
+            return False
+        project_id = parts[-1].strip()
+        if not project_id.isdigit():
+            return False
+        return True
+    except Exception:
+        return False
+
+
+def is_error_result(result) -> bool:
+    """Tools melden Fehler als Text ('Error: ...'), nicht als Exception."""
+    try:
+        text = result["content"][0].get("text", "")
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return False
+    return isinstance(text, str) and text[:5].lower() == "error"
+
+
+class ToolRegistry:
+    """Tool-Name -> Handler, Module werden lazy importiert."""
+
+    def __init__(self, modules: Dict[str, tuple] = TOOL_MODULES, aliases: Dict[str, str] = TOOL_ALIASES):
+        self._module_of = {tool: module for module, tools in modules.items() for tool in tools}
+        self._aliases = dict(aliases)
+        self._handlers: Dict[str, Optional[Callable]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, tool_name: str) -> bool:
+        return self._aliases.get(tool_name, tool_name) in self._module_of
+
+    def names(self) -> List[str]:
+        return sorted(set(self._module_of) | set(self._aliases))
+
+    def resolve(self, tool_name: str) -> Optional[Callable]:
+        """Handler fuer ``tool_name`` oder None (unbekannt / Modul nicht verfuegbar)."""
+        try:
+            return self._handlers[tool_name]
+        except KeyError:
+            pass
+        target = self._aliases.get(tool_name, tool_name)
+        module_name = self._module_of.get(target)
+        if module_name is None:
+            return None
+        with self._lock:
+            if tool_name not in self._handlers:
+                module = importlib.import_module(f"{__name__}.{module_name}")
+                available = getattr(module, "AVAILABLE", True)
+                self._handlers[tool_name] = getattr(module, target) if available else None
+            return self._handlers[tool_name]
+
+    def loaded_modules(self) -> List[str]:
+        with self._lock:
+            return sorted({self._module_of[self._aliases.get(name, name)] for name in self._handlers})
+
+
+class ToolMetrics:
+    """Aufrufe, Fehler und Latenz-Histogramm pro Tool (thread-safe)."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._tools: Dict[str, dict] = {}
+
+    def record(self, tool_name: str, seconds: float, error: bool = False):
+        ms = seconds * 1000.0
+        bucket = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if ms <= bound:
+                bucket = i
+                break
+        with self._lock:
+            entry = self._tools.get(tool_name)
+            if entry is None:
+                entry = self._tools[tool_name] = {
+                    "calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "histogram": [0] * (len(self.buckets_ms) + 1),
+                }
+            entry["calls"] += 1
+            entry["errors"] += 1 if error else 0
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            entry["histogram"][bucket] += 1
+
+    def _quantile(self, histogram: List[int], calls: int, q: float, max_ms: float) -> float:
+        """Obergrenze des Buckets, in dem das q-Quantil liegt (max_ms fuer den letzten)."""
+        rank = q * calls
+        seen = 0
+        for i, count in enumerate(histogram):
+            seen += count
+            if count and seen >= rank:
+                return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else round(max_ms, 3)
+        return round(max_ms, 3)
+
+    def snapshot(self, tool_name: Optional[str] = None) -> Dict[str, dict]:
+        """Pro Tool Kennzahlen, sortiert nach Gesamtzeit (teuerste zuerst)."""
+        labels = [f"<={b}ms" for b in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        with self._lock:
+            items = [(name, dict(entry, histogram=list(entry["histogram"])))
+                     for name, entry in self._tools.items()
+                     if tool_name is None or name == tool_name]
+        items.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+        result = {}
+        for name, entry in items:
+            calls = entry["calls"]
+            result[name] = {
+                "calls": calls,
+                "errors": entry["errors"],
+                "error_rate": round(entry["errors"] / calls, 4) if calls else 0.0,
+                "total_ms": round(entry["total_ms"], 3),
+                "avg_ms": round(entry["total_ms"] / calls, 3) if calls else 0.0,
+                "max_ms": round(entry["max_ms"], 3),
+                "p50_ms": self._quantile(entry["histogram"], calls, 0.50, entry["max_ms"]),
+                "p95_ms": self._quantile(entry["histogram"], calls, 0.95, entry["max_ms"]),
+                "p99_ms": self._quantile(entry["histogram"], calls, 0.99, entry["max_ms"]),
+                "histogram": {label: count for label, count in zip(labels, entry["histogram"]) if count},
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._tools.clear()
+
+
+TOOL_REGISTRY = ToolRegistry()
+TOOL_METRICS = ToolMetrics()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Optionale NumPy-Indizes der Tool-Handler (Similarity- und Near-Duplicate-Index).
+Erst beim ersten Aufruf eines Graph- oder Schreib-Tools importiert.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+try:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src_hexagonal" / "services"))
+    from near_duplicate_index import NearDuplicateIndex
+    HAS_DUPLICATE_INDEX = True
+except ImportError:
+    HAS_DUPLICATE_INDEX = False
+    NearDuplicateIndex = None
+    logger.warning("Near-duplicate index not available - install numpy; analyze_duplicates uses key buckets")
+
+try:
+    from similarity_index import get_similarity_index
+    HAS_SIMILARITY_INDEX = True
+except ImportError:
+    HAS_SIMILARITY_INDEX = False
+    get_similarity_index = None
+    logger.warning("Similarity index not available - install numpy; semantic_similarity falls back to a full scan")
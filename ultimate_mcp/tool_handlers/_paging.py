@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Pagination-Helfer der Tool-Handler: opake Cursor-Tokens, groessenbegrenzte
+Seiten und Streaming-Export nach JSONL.
+
+Ist ein Ergebnis unvollstaendig, haengen die Tools ein zweites Content-Item
+``{"next_cursor": ..., "returned": n}`` an; der Client uebergibt das Token
+unveraendert als ``cursor`` an denselben Aufruf.
+"""
+
+import base64
+import json
+import os
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Obergrenze fuer den Text einer Antwort (ENV-Override pro Prozess, ``max_bytes`` pro Aufruf)
+DEFAULT_MAX_BYTES = int(os.environ.get("HAKGAL_MCP_MAX_RESULT_BYTES", str(1024 * 1024)))
+FETCH_BATCH = 1000
+
+
+def encode_cursor(tool: str, **state) -> str:
+    payload = json.dumps(dict(state, t=tool), separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, tool: str) -> dict:
+    """Token -> Zustand; ValueError bei fremdem oder kaputtem Token."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(state, dict) or state.pop("t", None) != tool:
+        raise ValueError(f"cursor does not belong to {tool}")
+    return state
+
+
+def max_bytes_arg(tool_args: dict) -> int:
+    try:
+        value = int(tool_args.get("max_bytes") or DEFAULT_MAX_BYTES)
+    except (TypeError, ValueError):
+        value = DEFAULT_MAX_BYTES
+    return max(1024, value)
+
+
+def paged_result(text: str, next_cursor: Optional[str], returned: int) -> dict:
+    content = [{"type": "text", "text": text}]
+    if next_cursor:
+        content.append({"type": "text", "text": json.dumps({"next_cursor": next_cursor, "returned": returned})})
+    return {"content": content}
+
+
+def take_page(lines: Iterable[str], skip: int, max_bytes: int, max_items: Optional[int] = None,
+              separator: int = 1) -> Tuple[List[str], Optional[int]]:
+    """Die ersten ``skip`` Zeilen ueberspringen, dann sammeln bis ``max_bytes``
+    (UTF-8, inkl. Trenner) bzw. ``max_items``. Returns (zeilen, naechstes skip
+    oder None wenn erschoepft). Die Quelle wird nur so weit gelesen wie noetig."""
+    page: List[str] = []
+    used = 0
+    position = 0
+    for line in lines:
+        if position < skip:
+            position += 1
+            continue
+        size = len(line.encode("utf-8")) + separator
+        if page and (used + size > max_bytes or (max_items is not None and len(page) >= max_items)):
+            return page, position
+        page.append(line)
+        used += size
+        position += 1
+    return page, None
+
+
+def iter_rows(cursor, batch: int = FETCH_BATCH) -> Iterator[tuple]:
+    """SQLite-Cursor in Batches lesen (fetchmany), ohne alles zu materialisieren."""
+    while True:
+        rows = cursor.fetchmany(batch)
+        if not rows:
+            return
+        yield from rows
+
+
+def stream_jsonl(rows: Iterable[str], path: str) -> Tuple[int, int]:
+    """Statements als JSONL (``{"statement": ...}``, kompatibel mit bulk_add_facts)
+    nach ``path`` streamen: Temp-Datei im Zielordner, danach atomar ersetzen.
+    Returns (zeilen, bytes)."""
+    target = os.path.abspath(path)
+    directory = os.path.dirname(target) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".export_", suffix=".jsonl", dir=directory)
+    count = 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            for statement in rows:
+                handle.write(json.dumps({"statement": statement}, ensure_ascii=False))
+                handle.write("\n")
+                count += 1
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return count, os.path.getsize(target)
+
+
+def _reverse_lines(handle, end: int, block_size: int) -> Iterator[Tuple[bytes, int]]:
+    """(zeile, start-offset) von ``end`` rueckwaerts, blockweise gelesen."""
+    position = end
+    remainder = b""
+    while position > 0:
+        read = min(block_size, position)
+        position -= read
+        handle.seek(position)
+        parts = (handle.read(read) + remainder).split(b"\n")
+        # parts[0] kann am Blockanfang abgeschnitten sein -> mit dem naechsten Block
+        remainder = parts[0]
+        offset = position + len(parts[0]) + 1
+        found = []
+        for part in parts[1:]:
+            found.append((part, offset))
+            offset += len(part) + 1
+        yield from reversed(found)
+    yield remainder, 0
+
+
+def read_lines_backwards(path: str, limit: int, end: Optional[int], max_bytes: int,
+                         block_size: int = 64 * 1024) -> Tuple[List[str], int]:
+    """Bis zu ``limit`` nicht-leere Zeilen vor Byte-Offset ``end`` (None = Dateiende),
+    hoechstens ``max_bytes``. Liest blockweise rueckwaerts statt die Datei zu laden.
+    Returns (zeilen in Datei-Reihenfolge, Start-Offset der ersten Zeile)."""
+    with open(path, "rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        end = size if end is None else min(end, size)
+        lines: List[bytes] = []
+        used = 0
+        start = end
+        for line, offset in _reverse_lines(handle, end, block_size):
+            if len(lines) >= limit:
+                break
+            if not line.strip():
+                continue
+            if lines and used + len(line) + 1 > max_bytes:
+                break
+            lines.append(line.rstrip(b"\r"))
+            used += len(line) + 1
+            start = offset
+        return [line.decode("utf-8", "replace") for line in reversed(lines)], start
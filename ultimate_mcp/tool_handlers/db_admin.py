@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: SQLite-Wartung
+=================================
+Checkpoint, Backups, PRAGMAs, VACUUM, Insert-Benchmark und KB-Metriken.
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from kb_stats_index import get_kb_stats_index
+
+
+def db_checkpoint(server, tool_args):
+    mode = str(tool_args.get("mode", "TRUNCATE")).upper()
+    if mode not in ("TRUNCATE","FULL","PASSIVE","RESTART"):
+        mode = "TRUNCATE"
+    try:
+        conn = sqlite3.connect(str(server.db_path))
+        cur = conn.cursor()
+        cur.execute(f"PRAGMA wal_checkpoint={mode};")
+        # wal_checkpoint returns (busy, log, checkpointed) in newer SQLite via pragma function – hier keine Garantien, daher nachbereiten
+        # Wir lesen Dateigroesse als Proxy
+        size_wal = 0
+        wal_path = str(server.db_path) + "-wal"
+        try:
+            import os as _os
+            if _os.path.exists(wal_path):
+                size_wal = _os.path.getsize(wal_path)
+        except Exception:
+            pass
+        conn.close()
+        info = {"result": "OK", "mode": mode, "wal_size_bytes": size_wal}
+        result = {"content": [{"type": "text", "text": json.dumps(info, ensure_ascii=True)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def db_backup_now(server, tool_args):
+    mode = str(tool_args.get("mode", "full")).lower()
+    compress = str(tool_args.get("compress", "none")).lower()
+    verify = bool(tool_args.get("verify", False))
+    try:
+        # Online-Backup via SQLite backup API (schrittweise), inkrementell nur geaenderte Seiten
+        entry = server._backup_manager().backup(server.db_path, mode=mode, compression=compress, verify=verify)
+        info = {
+            "result": "OK", "backup": str(server.backup_dir / entry["file"]), "id": entry["id"],
+            "type": entry["type"], "compression": entry["compression"], "size": entry["size"],
+            "changed_pages": entry["changed_pages"], "page_count": entry["page_count"],
+            "sha256": entry["sha256"], "duration_s": entry["duration_s"],
+        }
+        for key in ("fallback", "verify"):
+            if key in entry:
+                info[key] = entry[key]
+        server._append_audit("db_backup_now", info)
+        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def db_backup_rotate(server, tool_args):
+    keep_last = int(tool_args.get("keep_last", 10))
+    try:
+        manager = server._backup_manager()
+        # Manifest-Backups: die letzten keep_last Full-Backups samt Inkrementen
+        managed = manager.rotate(keep_last)
+        # Aeltere Einzel-Backups ohne Manifest wie bisher nach mtime
+        listed = {e["file"] for e in manager.entries()}
+        bdir = server.backup_dir
+        files = sorted([p for p in bdir.glob("hexagonal_kb_*.db") if p.name not in listed],
+                       key=lambda p: p.stat().st_mtime, reverse=True)
+        removed = list(managed["removed"])
+        for p in files[keep_last:]:
+            try:
+                p.unlink()
+                removed.append(str(p))
+            except Exception:
+                continue
+        info = {"result": "OK", "kept": len(files[:keep_last]) + managed["kept"], "removed": removed}
+        server._append_audit("db_backup_rotate", info)
+        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def db_backup_list(server, tool_args):
+    verify = bool(tool_args.get("verify", False))
+    try:
+        manager = server._backup_manager()
+        keys = ("id", "type", "parent", "created_iso", "file", "compression", "size", "changed_pages",
+                "page_count", "description")
+        backups = [{k: e.get(k) for k in keys} for e in manager.entries()]
+        info = {"backup_dir": str(server.backup_dir), "backups": backups}
+        if manager.journal is not None:
+            info["journal_segments"] = [sid for sid, _ in manager.journal.segments()]
+        if verify:
+            info["verify"] = manager.verify()
+        result = {"content": [{"type": "text", "text": json.dumps(info, ensure_ascii=False, indent=2)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def _percentiles(samples_ms):
+    """p50/p95/p99 (nearest rank) wie scripts/benchmark_sqlite_pool.latency_summary."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {}
+    def pct(q):
+        return round(ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))], 3)
+    return {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": round(ordered[-1], 3)}
+
+
+def db_benchmark_inserts(server, tool_args):
+    rows = int(tool_args.get("rows", 5000))
+    batch = int(tool_args.get("batch", 1000))
+    if rows <= 0 or batch <= 0:
+        result = {"content": [{"type": "text", "text": "Error: invalid rows/batch"}]}
+    else:
+        import random as _rnd
+        import string as _str
+        conn = server._open_db()
+        cur = conn.cursor()
+        try:
+            cur.execute("CREATE TABLE IF NOT EXISTS __bench (k TEXT PRIMARY KEY, v TEXT)")
+            conn.commit()
+            start = time.time()
+            def rand(n=16):
+                return ''.join(_rnd.choice(_str.ascii_letters+_str.digits) for _ in range(n))
+            inserted = 0
+            batch_ms = []
+            while inserted < rows:
+                todo = min(batch, rows-inserted)
+                data = [(rand(), rand(32)) for _ in range(todo)]
+                batch_start = time.perf_counter()
+                cur.executemany("INSERT OR REPLACE INTO __bench(k,v) VALUES(?,?)", data)
+                conn.commit()
+                batch_ms.append((time.perf_counter() - batch_start) * 1000.0)
+                inserted += todo
+            dur = max(1e-6, time.time()-start)
+            rps = inserted/dur
+            cur.execute("DROP TABLE IF EXISTS __bench")
+            conn.commit(); conn.close()
+            info = {"result": "OK", "rows": inserted, "seconds": round(dur,6), "rows_per_sec": round(rps,2),
+                    "batches": len(batch_ms), "batch_ms": _percentiles(batch_ms)}
+            result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+        except Exception as e:
+            try:
+                cur.execute("DROP TABLE IF EXISTS __bench"); conn.commit()
+            except Exception:
+                pass
+            try:
+                conn.close()
+            except Exception:
+                pass
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def kb_stats(server, tool_args):
+    conn = server._open_db()
+    cursor = conn.execute("SELECT COUNT(*) FROM facts")
+    count = cursor.fetchone()[0]
+    db_size = server.db_path.stat().st_size if server.db_path.exists() else 0
+    conn.close()
+    index = get_kb_stats_index(server.db_path)
+    materialized = index.stats()
+    text = (
+        f"KB count (SQLite): {count:,}\n"
+        f"KB size (bytes): {db_size:,}\n"
+        f"KB path: {server.db_path}\n"
+        f"Predicates: {materialized['predicates']:,}\n"
+        f"Entities: {materialized['entities']:,}\n"
+        f"Arity histogram: {json.dumps(materialized['arity_histogram'])}"
+    )
+    if tool_args.get("verify", False):
+        report = index.verify(repair=bool(tool_args.get("repair", False)))
+        text += "\nVerify: " + json.dumps(report, ensure_ascii=False)
+    result = {"content": [{"type": "text", "text": text}]}
+    return result
+
+
+def db_get_pragma(server, tool_args):
+    try:
+        conn = server._open_db()
+        cur = conn.cursor()
+        cur.execute("PRAGMA journal_mode;"); journal = cur.fetchone()[0]
+        cur.execute("PRAGMA synchronous;"); synchronous = cur.fetchone()[0]
+        cur.execute("PRAGMA wal_autocheckpoint;"); auto_cp = cur.fetchone()[0]
+        conn.close()
+        info = {
+            "journal_mode": journal,
+            "synchronous": synchronous,
+            "wal_autocheckpoint": auto_cp
+        }
+        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def db_enable_wal(server, tool_args):
+    sync = str(tool_args.get("synchronous", "NORMAL")).upper()
+    if sync not in ("OFF","NORMAL","FULL","EXTRA"):
+        sync = "NORMAL"
+    try:
+        conn = server._open_db()
+        cur = conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL;"); jret = cur.fetchone()[0]
+        cur.execute(f"PRAGMA synchronous={sync};")
+        cur.execute("PRAGMA wal_autocheckpoint=1000;")
+        cur.execute("PRAGMA journal_mode;"); journal = cur.fetchone()[0]
+        cur.execute("PRAGMA synchronous;"); synchronous = cur.fetchone()[0]
+        cur.execute("PRAGMA wal_autocheckpoint;"); auto_cp = cur.fetchone()[0]
+        conn.close()
+        info = {
+            "result": "OK",
+            "journal_mode": journal,
+            "synchronous": synchronous,
+            "wal_autocheckpoint": auto_cp
+        }
+        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def db_vacuum(server, tool_args):
+    try:
+        before = server.db_path.stat().st_size if server.db_path.exists() else 0
+        conn = server._open_db()
+        conn.isolation_level = None
+        cur = conn.cursor()
+        cur.execute("VACUUM;")
+        conn.close()
+        after = server.db_path.stat().st_size if server.db_path.exists() else 0
+        info = {"result": "OK", "size_before": before, "size_after": after}
+        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
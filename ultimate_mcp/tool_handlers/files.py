@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Datei-Tools
+==============================
+Lesen, Schreiben, Suchen und Bearbeiten von Dateien. read_file und die
+Such-/Listen-Tools liefern groessenbegrenzte Seiten (``cursor``/``max_bytes``).
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import fnmatch
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from ._paging import decode_cursor, encode_cursor, max_bytes_arg, paged_result, take_page
+
+
+def read_file(server, tool_args):
+    path = tool_args.get("path", "")
+    encoding = tool_args.get("encoding", "utf-8")
+    try:
+        max_chars = max_bytes_arg(tool_args)
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            if tool_args.get("cursor"):
+                f.seek(decode_cursor(tool_args["cursor"], "read_file")["pos"])
+            data = f.read(max_chars)
+            position = f.tell()
+            more = bool(f.read(1))
+        next_cursor = encode_cursor("read_file", pos=position) if more else None
+        result = paged_result(data, next_cursor, len(data))
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error reading file: {e}"}]}
+    return result
+
+
+def _paged_lines(tool_name, lines, tool_args, empty_text):
+    """Zeilen-Generator -> eine Seite; die Quelle wird nur bis zur Seitengrenze gelesen."""
+    skip = decode_cursor(tool_args["cursor"], tool_name)["skip"] if tool_args.get("cursor") else 0
+    page, next_skip = take_page(lines, skip, max_bytes_arg(tool_args))
+    next_cursor = encode_cursor(tool_name, skip=next_skip) if next_skip is not None else None
+    return paged_result("\n".join(page) if page else empty_text, next_cursor, len(page))
+
+
+def write_file(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        path = tool_args.get("path", "")
+        content = tool_args.get("content", "")
+        encoding = tool_args.get("encoding", "utf-8")
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding=encoding, errors="replace") as f:
+                f.write(content)
+            server._append_audit("write_file", {"path": path, "size": len(content)})
+            result = {"content": [{"type": "text", "text": "OK: file written"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def list_files(server, tool_args):
+    path = tool_args.get("path", ".")
+    recursive = bool(tool_args.get("recursive", False))
+    pattern = tool_args.get("pattern")
+
+    def files():
+        base = Path(path)
+        if recursive:
+            for p in base.rglob("*"):
+                if pattern and not fnmatch.fnmatch(p.name, pattern):
+                    continue
+                yield str(p)
+        else:
+            for p in base.glob(pattern or "*"):
+                yield str(p)
+
+    try:
+        result = _paged_lines("list_files", files(), tool_args, "<empty>")
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def get_file_info(server, tool_args):
+    path = tool_args.get("path", "")
+    try:
+        p = Path(path)
+        st = p.stat()
+        info = {
+            "path": str(p),
+            "exists": p.exists(),
+            "is_dir": p.is_dir(),
+            "size": st.st_size if p.exists() else 0,
+            "modified": datetime.fromtimestamp(st.st_mtime).isoformat() if p.exists() else None
+        }
+        result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def directory_tree(server, tool_args):
+    path = tool_args.get("path", ".")
+    maxDepth = int(tool_args.get("maxDepth", 3))
+    showHidden = bool(tool_args.get("showHidden", False))
+    base = Path(path)
+    lines = []
+    try:
+        def walk(d: Path, depth: int = 0):
+            if depth > maxDepth:
+                return
+            for entry in sorted(d.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower())):
+                name = entry.name
+                if not showHidden and name.startswith('.'):
+                    continue
+                indent = "  " * depth
+                lines.append(f"{indent}{name}/" if entry.is_dir() else f"{indent}{name}")
+                if entry.is_dir():
+                    walk(entry, depth + 1)
+        if base.exists():
+            walk(base, 0)
+        text = "\n".join(lines) if lines else "<empty>"
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def create_file(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        path = tool_args.get("path", "")
+        content = tool_args.get("content", "")
+        overwrite = bool(tool_args.get("overwrite", False))
+        try:
+            p = Path(path)
+            if p.exists() and not overwrite:
+                result = {"content": [{"type": "text", "text": "Error: file exists"}]}
+            else:
+                p.parent.mkdir(parents=True, exist_ok=True)
+                with open(p, "w", encoding="utf-8", errors="replace") as f:
+                    f.write(content)
+                server._append_audit("create_file", {"path": path, "size": len(content)})
+                result = {"content": [{"type": "text", "text": "OK: file created"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def delete_file(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        path = tool_args.get("path", "")
+        recursive = bool(tool_args.get("recursive", False))
+        try:
+            p = Path(path)
+            if not p.exists():
+                result = {"content": [{"type": "text", "text": "OK: nothing to delete"}]}
+            else:
+                if p.is_dir() and recursive:
+                    shutil.rmtree(p)
+                elif p.is_dir():
+                    p.rmdir()
+                else:
+                    p.unlink()
+                server._append_audit("delete_file", {"path": path})
+                result = {"content": [{"type": "text", "text": "OK: deleted"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def move_file(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        source = tool_args.get("source", "")
+        destination = tool_args.get("destination", "")
+        overwrite = bool(tool_args.get("overwrite", False))
+        try:
+            src = Path(source)
+            dst = Path(destination)
+            if dst.exists() and not overwrite:
+                result = {"content": [{"type": "text", "text": "Error: destination exists"}]}
+            else:
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(src), str(dst))
+                server._append_audit("move_file", {"source": source, "destination": destination})
+                result = {"content": [{"type": "text", "text": "OK: moved"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def grep(server, tool_args):
+    pattern = tool_args.get("pattern", "")
+    path = tool_args.get("path", ".")
+    filePattern = tool_args.get("filePattern")
+    ignoreCase = bool(tool_args.get("ignoreCase", False))
+    showLineNumbers = bool(tool_args.get("showLineNumbers", True))
+    contextLines = int(tool_args.get("contextLines", 0))
+    flags = re.IGNORECASE if ignoreCase else 0
+
+    def matches():
+        regex = re.compile(pattern, flags)
+        for root, _, filenames in os.walk(path):
+            for fn in filenames:
+                if filePattern and not fnmatch.fnmatch(fn, filePattern):
+                    continue
+                fp = os.path.join(root, fn)
+                try:
+                    with open(fp, "r", encoding="utf-8", errors="replace") as f:
+                        lines = f.readlines()
+                except Exception:
+                    continue
+                for idx, line in enumerate(lines, start=1):
+                    if regex.search(line):
+                        start = max(1, idx - contextLines)
+                        end = min(len(lines), idx + contextLines)
+                        for j in range(start, end + 1):
+                            prefix = f"{j}:" if showLineNumbers else ""
+                            yield f"{fp}:{prefix}{lines[j-1].rstrip()}\n"
+
+    try:
+        result = _paged_lines("grep", matches(), tool_args, "<no matches>")
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def find_files(server, tool_args):
+    pattern = tool_args.get("pattern", "*")
+    path = tool_args.get("path", ".")
+    type_filter = tool_args.get("type")
+    maxDepth = tool_args.get("maxDepth")
+    base = Path(path)
+
+    def depth_ok(p: Path) -> bool:
+        if maxDepth is None:
+            return True
+        try:
+            md = int(maxDepth)
+        except Exception:
+            return True
+        return len(p.relative_to(base).parts) <= md
+
+    def found():
+        for p in base.rglob("*"):
+            if not depth_ok(p):
+                continue
+            if not fnmatch.fnmatch(p.name, pattern):
+                continue
+            if type_filter == "file" and not p.is_file():
+                continue
+            if type_filter == "dir" and not p.is_dir():
+                continue
+            yield str(p)
+
+    try:
+        result = _paged_lines("find_files", found(), tool_args, "<none>")
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def search(server, tool_args):
+    query = tool_args.get("query", "")
+    path = tool_args.get("path", ".")
+    type_sel = tool_args.get("type", "all")
+    filePattern = tool_args.get("filePattern")
+    maxResults = int(tool_args.get("maxResults", 50))
+    results = []
+    try:
+        for root, _, files in os.walk(path):
+            for fn in files:
+                if filePattern and not fnmatch.fnmatch(fn, filePattern):
+                    continue
+                fp = os.path.join(root, fn)
+                if type_sel in ("all", "files") and query.lower() in fn.lower():
+                    results.append(fp)
+                    if len(results) >= maxResults:
+                        raise StopIteration
+                if type_sel in ("all", "content"):
+                    try:
+                        with open(fp, "r", encoding="utf-8", errors="replace") as f:
+                            txt = f.read()
+                        if query.lower() in txt.lower():
+                            results.append(fp)
+                            if len(results) >= maxResults:
+                                raise StopIteration
+                    except Exception:
+                        pass
+    except StopIteration:
+        # maxResults erreicht
+        pass
+    except Exception as e:
+        return {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    result = {"content": [{"type": "text", "text": "\n".join(results) if results else "<none>"}]}
+    return result
+
+
+def edit_file(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        path = tool_args.get("path", "")
+        oldText = tool_args.get("oldText", "")
+        newText = tool_args.get("newText", "")
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                txt = f.read()
+            if oldText not in txt:
+                result = {"content": [{"type": "text", "text": "Error: oldText not found"}]}
+            else:
+                txt = txt.replace(oldText, newText, 1)
+                with open(path, "w", encoding="utf-8", errors="replace") as f:
+                    f.write(txt)
+                server._append_audit("edit_file", {"path": path})
+                result = {"content": [{"type": "text", "text": "OK: edited"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def multi_edit(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        path = tool_args.get("path", "")
+        edits = tool_args.get("edits", [])
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                txt = f.read()
+            for ed in edits:
+                oldText = ed.get("oldText", "")
+                newText = ed.get("newText", "")
+                if oldText in txt:
+                    txt = txt.replace(oldText, newText, 1)
+            with open(path, "w", encoding="utf-8", errors="replace") as f:
+                f.write(txt)
+            server._append_audit("multi_edit", {"path": path, "count": len(edits)})
+            result = {"content": [{"type": "text", "text": "OK: multi edited"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
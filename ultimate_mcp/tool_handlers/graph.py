@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Graph- und Aehnlichkeits-Tools
+=================================================
+Semantische Aehnlichkeit, Duplikate, Nachbarschaft, Wissensgraph, isolierte
+Fakten und Inferenzketten (ueber die In-Memory-Indizes).
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import collections
+import json
+import os
+import re
+import sqlite3
+import time
+import zlib
+from difflib import SequenceMatcher
+
+from entity_index import get_entity_index
+from fact_index import get_fact_index
+from ._optional import HAS_DUPLICATE_INDEX, HAS_SIMILARITY_INDEX, NearDuplicateIndex, get_similarity_index
+
+# Parser und Score von semantic_similarity (einmal pro Modul statt pro Aufruf definiert)
+_PREDICATE_PATTERNS = [re.compile(r'^(\w+)\s*\('), re.compile(r'^(\w+)')]
+_ARGUMENTS_PATTERN = re.compile(r'\((.*?)\)(?:[^)]*)?$')
+
+
+def _extract_predicate(stmt):
+    if not stmt or not isinstance(stmt, str):
+        return None
+    # Try multiple patterns
+    for pattern in _PREDICATE_PATTERNS:
+        match = pattern.match(stmt.strip())
+        if match:
+            return match.group(1)
+    return None
+
+
+def _extract_arguments(stmt):
+    if not stmt or not isinstance(stmt, str):
+        return []
+    stmt = stmt.strip().rstrip('.')
+    match = _ARGUMENTS_PATTERN.search(stmt)
+    if not match:
+        if ',' in stmt:
+            return [arg.strip() for arg in stmt.split(',') if arg.strip()]
+        return [stmt.strip()]
+
+    args_str = match.group(1)
+    if not args_str.strip():
+        return []
+
+    arguments = []
+    current_arg = ""
+    paren_depth = 0
+
+    for char in args_str:
+        if char == '(':
+            paren_depth += 1
+            current_arg += char
+        elif char == ')':
+            paren_depth -= 1
+            current_arg += char
+        elif char == ',' and paren_depth == 0:
+            if current_arg.strip():
+                arguments.append(current_arg.strip())
+            current_arg = ""
+        else:
+            current_arg += char
+
+    if current_arg.strip():
+        arguments.append(current_arg.strip())
+    return arguments
+
+
+def _extract_entities(stmt):
+    args = _extract_arguments(stmt)
+    entities = []
+    for arg in args:
+        if not arg or len(arg.strip()) == 0:
+            continue
+        cleaned = arg.strip()
+        if cleaned.startswith(('Q(', 'k:Q(', 'T:Q(', 'U:', 'V:')):
+            continue
+        if ':' in cleaned and not '(' in cleaned:
+            parts = cleaned.split(':', 1)
+            if len(parts) > 1:
+                cleaned = parts[1].strip()
+        if len(cleaned) < 2 or cleaned.isdigit():
+            continue
+        entities.append(cleaned)
+    return entities
+
+
+def _statement_similarity(stmt1, stmt2):
+    if stmt1 == stmt2:
+        return 1.0
+
+    # Predicate similarity
+    pred1 = _extract_predicate(stmt1)
+    pred2 = _extract_predicate(stmt2)
+    predicate_similarity = 0.0
+    if pred1 and pred2:
+        if pred1 == pred2:
+            predicate_similarity = 1.0
+        else:
+            predicate_similarity = SequenceMatcher(None, pred1, pred2).ratio()
+
+    # Argument similarity
+    args1 = _extract_arguments(stmt1)
+    args2 = _extract_arguments(stmt2)
+    argument_similarity = 0.0
+    if args1 and args2:
+        matches = sum(1 for arg1 in args1 if arg1 in args2)
+        partial_matches = 0
+        for arg1 in args1:
+            for arg2 in args2:
+                if arg1 != arg2:
+                    sim = SequenceMatcher(None, arg1, arg2).ratio()
+                    if sim > 0.8:
+                        partial_matches += 0.5
+        total_matches = matches + partial_matches
+        max_args = max(len(args1), len(args2))
+        argument_similarity = total_matches / max_args if max_args > 0 else 0.0
+
+    # Entity similarity
+    entities1 = _extract_entities(stmt1)
+    entities2 = _extract_entities(stmt2)
+    entity_similarity = 0.0
+    if entities1 and entities2:
+        entity_matches = sum(1 for entity1 in entities1 if entity1 in entities2)
+        max_entities = max(len(entities1), len(entities2))
+        entity_similarity = entity_matches / max_entities if max_entities > 0 else 0.0
+
+    # String similarity (fallback)
+    string_similarity = SequenceMatcher(None, stmt1.lower(), stmt2.lower()).ratio()
+
+    # FIXED: More lenient weighted combination
+    final_similarity = (
+        0.40 * predicate_similarity +
+        0.25 * argument_similarity +
+        0.15 * entity_similarity +
+        0.20 * string_similarity
+    )
+    return min(1.0, final_similarity)
+
+
+def _distribution_bucket(similarity):
+    if similarity >= 0.7:
+        return "0.7-1.0"
+    elif similarity >= 0.5:
+        return "0.5-0.7"
+    elif similarity >= 0.3:
+        return "0.3-0.5"
+    elif similarity >= 0.1:
+        return "0.1-0.3"
+    return "0.0-0.1"
+
+
+def semantic_similarity(server, tool_args):
+    # FIXED: Completely repaired semantic similarity with robust implementation
+    try:
+        statement = tool_args.get('statement', '')
+        threshold = float(tool_args.get('threshold', 0.1))  # FIXED: Lower default threshold
+        limit = int(tool_args.get('limit', 50))
+
+        if not statement:
+            result = {"content": [{"type": "text", "text": "Error: statement parameter required"}]}
+        else:
+            start_time = time.time()
+
+            # Parse input statement with fixed functions
+            input_predicate = _extract_predicate(statement)
+            input_args = _extract_arguments(statement)
+            input_entities = _extract_entities(statement)
+
+            results = []
+            similarity_distribution = {"0.0-0.1": 0, "0.1-0.3": 0, "0.3-0.5": 0, "0.5-0.7": 0, "0.7-1.0": 0}
+
+            sample, rest_facts = [], 0
+            if HAS_SIMILARITY_INDEX and os.environ.get("HAKGAL_SIMILARITY_INDEX", "1") != "0":
+                # Trigramm-/Argument-Index liefert die Top-K, nur diese werden exakt bewertet;
+                # die Verteilung der uebrigen Fakten wird aus einer Stichprobe hochgerechnet
+                candidate_k = max(4 * limit, int(os.environ.get("HAKGAL_SIMILARITY_CANDIDATES", "500")))
+                sample_size = int(os.environ.get("HAKGAL_SIMILARITY_SAMPLE", "1000"))
+                # Seed aus dem Statement: gleiche Anfrage -> gleiche Stichprobe -> gleiche Verteilung
+                candidates, sample, rest_facts = get_similarity_index(server.db_path).candidates(
+                    statement, candidate_k, sample_size=sample_size, seed=zlib.crc32(statement.encode("utf-8")))
+                all_facts = [(fact,) for fact in candidates]
+                total_facts = len(all_facts) + rest_facts
+            else:
+                conn = server._open_db()
+                cursor = conn.execute("SELECT statement FROM facts WHERE statement IS NOT NULL AND length(statement) > 0")
+                all_facts = cursor.fetchall()
+                conn.close()
+                total_facts = len(all_facts)
+
+            # Calculate similarities with fixed algorithm
+            for (fact,) in all_facts:
+                if fact == statement:
+                    continue
+
+                similarity = _statement_similarity(statement, fact)
+
+                # Track distribution
+                similarity_distribution[_distribution_bucket(similarity)] += 1
+
+                if similarity >= threshold:
+                    results.append((similarity, fact))
+
+            if sample:
+                sample_counts = collections.Counter(
+                    _distribution_bucket(_statement_similarity(statement, fact)) for fact in sample)
+                scale = rest_facts / len(sample)
+                estimated = {bucket: round(count * scale) for bucket, count in sample_counts.items()}
+                # Rundungsrest dem groessten Bucket zuschlagen, damit die Summe stimmt
+                largest = max(estimated, key=estimated.get)
+                estimated[largest] += rest_facts - sum(estimated.values())
+                for bucket, count in estimated.items():
+                    similarity_distribution[bucket] += count
+
+            distribution_label = "Similarity Distribution"
+            if sample and len(sample) < rest_facts:
+                distribution_label += f" (estimated from a sample of {len(sample)}/{rest_facts} facts)"
+
+            # Sort and limit
+            results.sort(key=lambda x: x[0], reverse=True)
+            results = results[:limit]
+
+            execution_time = time.time() - start_time
+
+            if results:
+                output = f"Gefundene {len(results)} ähnliche Facts (Execution: {execution_time:.3f}s):\n"
+                for score, fact in results:
+                    output += f"  Score {score:.3f}: {fact}\n"
+                output += f"\n{distribution_label}: {similarity_distribution}"
+                result = {"content": [{"type": "text", "text": output}]}
+            else:
+                output = f"Keine ähnlichen Facts gefunden (Execution: {execution_time:.3f}s)\n"
+                output += f"Input parsed - Predicate: '{input_predicate}', Args: {len(input_args)}, Entities: {len(input_entities)}\n"
+                output += f"{distribution_label}: {similarity_distribution}\n"
+                output += f"Total facts checked: {total_facts}"
+                result = {"content": [{"type": "text", "text": output}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {str(e)}"}]}
+    return result
+
+
+def query_related(server, tool_args):
+    entity = tool_args.get("entity", "")
+    limit = int(tool_args.get("limit", 100))
+    try:
+        facts = get_entity_index(server.db_path).facts_for(entity, limit)
+        result = {"content": [{"type": "text", "text": "\n".join(facts) if facts else "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def analyze_duplicates(server, tool_args):
+    threshold = float(tool_args.get("threshold", 0.9))
+    max_pairs = int(tool_args.get("max_pairs", 200))
+    try:
+        if HAS_DUPLICATE_INDEX:
+            # MinHash-LSH ueber die ganze KB, Kandidaten mit exaktem Jaccard verifiziert
+            pairs = get_fact_index(NearDuplicateIndex, server.db_path).find_pairs(threshold, max_pairs)
+        else:
+            def normalize(s: str) -> str:
+                return " ".join(s.lower().replace(".", " ").split())
+            conn = sqlite3.connect(str(server.db_path))
+            cur = conn.execute("SELECT statement FROM facts")
+            items = [row[0] for row in cur]
+            conn.close()
+            buckets = {}
+            for s in items:
+                key = ''.join(sorted(set(normalize(s).split())))[:20]
+                buckets.setdefault(key, []).append(s)
+            pairs = []
+            for _, lst in buckets.items():
+                nl = [normalize(x) for x in lst]
+                for i in range(len(lst)):
+                    for j in range(i+1, len(lst)):
+                        a, b = nl[i], nl[j]
+                        ta, tb = set(a.split()), set(b.split())
+                        if not ta or not tb:
+                            continue
+                        sim = len(ta & tb) / max(1, len(ta | tb))
+                        if sim >= threshold:
+                            pairs.append((sim, lst[i], lst[j]))
+            pairs.sort(reverse=True)
+        lines = [f"{sim:.2f} | {a} == {b}" for sim, a, b in pairs[:max_pairs]]
+        result = {"content": [{"type": "text", "text": "\n".join(lines) if lines else "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def _extract_predicate_and_args(stmt):
+    match = re.match(r'^(\w+)\((.*?)\)\.?$', stmt, re.DOTALL)
+    if not match:
+        return None, []
+    predicate = match.group(1)
+    args_str = match.group(2)
+
+    # Parse arguments with proper handling of nested parentheses
+    arguments = []
+    current_arg = ""
+    paren_depth = 0
+
+    for char in args_str:
+        if char == '(':
+            paren_depth += 1
+            current_arg += char
+        elif char == ')':
+            paren_depth -= 1
+            current_arg += char
+        elif char == ',' and paren_depth == 0:
+            arguments.append(current_arg.strip())
+            current_arg = ""
+        else:
+            current_arg += char
+
+    if current_arg.strip():
+        arguments.append(current_arg.strip())
+
+    return predicate, arguments
+
+
+def get_knowledge_graph(server, tool_args):
+    entity = tool_args.get("entity", "")
+    depth = int(tool_args.get("depth", 2))
+    fmt = tool_args.get("format", "json")
+    try:
+        import time
+
+        start_time = time.time()
+
+        # k-Hop-Nachbarschaft aus dem Entity-Index; Hop 1 immer vollstaendig
+        index = get_entity_index(server.db_path)
+        max_facts = int(os.environ.get("HAKGAL_GRAPH_MAX_FACTS", "1000"))
+        rows, truncated = index.neighbourhood(entity, depth=depth, max_facts=max_facts)
+        facts = [st for st in (index.statement(row) for row in rows) if st]
+
+        nodes = set([entity])
+        edges = []
+        node_types = {}
+
+        # FINAL: Enhanced n-ary support with node typing and relationship analysis
+
+        # Process facts and build graph
+        for st in facts:
+            pred, args = _extract_predicate_and_args(st)
+            if not pred or not args:
+                continue
+
+            # Add all arguments as nodes with typing
+            for arg in args:
+                nodes.add(arg)
+                # Determine node type based on predicate
+                if pred in ["SystemPerformance", "ArchitectureComponent", "ToolValidation"]:
+                    node_types[arg] = "system"
+                elif pred in ["ChemicalReaction", "ChemicalFormula"]:
+                    node_types[arg] = "chemical"
+                elif pred in ["UserExperience", "DeploymentStrategy"]:
+                    node_types[arg] = "operational"
+                else:
+                    node_types[arg] = "general"
+
+            # Create edges for all argument pairs (n-ary support)
+            for i in range(len(args)):
+                for j in range(i + 1, len(args)):
+                    edges.append({
+                        "from": args[i], 
+                        "to": args[j], 
+                        "predicate": pred,
+                        "type": "n-ary_relation",
+                        "weight": 1.0 / len(args)  # Weight inversely proportional to arity
+                    })
+
+        # Build enhanced graph structure
+        execution_time = time.time() - start_time
+        connections = collections.Counter()
+        for edge in edges:
+            connections[edge["from"]] += 1
+            connections[edge["to"]] += 1
+
+        graph = {
+            "nodes": [
+                {
+                    "id": node, 
+                    "type": node_types.get(node, "general"),
+                    "connections": connections[node]
+                } 
+                for node in nodes
+            ],
+            "edges": edges[:200],
+            "metadata": {
+                "total_nodes": len(nodes),
+                "total_edges": len(edges),
+                "execution_time": f"{execution_time:.3f}s",
+                "entity_searched": entity,
+                "depth": depth,
+                "truncated": truncated,
+                "facts_processed": len(facts)
+            }
+        }
+
+        text = json.dumps(graph, ensure_ascii=False, indent=2) if fmt == "json" else str(graph)
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def find_isolated_facts(server, tool_args):
+    limit = int(tool_args.get("limit", 50))
+    try:
+        isolated = get_entity_index(server.db_path).isolated(limit)
+        result = {"content": [{"type": "text", "text": "\n".join(isolated[:limit]) if isolated else "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def inference_chain(server, tool_args):
+    start_fact = tool_args.get("start_fact", "")
+    max_depth = int(tool_args.get("max_depth", 5))
+    try:
+        chain = get_entity_index(server.db_path).chain(start_fact, max_depth)
+        result = {"content": [{"type": "text", "text": "\n".join(chain) if chain else "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Lesende KB-Tools
+===================================
+Fakten zaehlen, suchen und auflisten, Praedikat-/Entity-Statistik, Audit und Export.
+Listen-Tools sind seitenweise abrufbar (``cursor``/``max_bytes``, siehe _paging.py).
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from kb_stats_index import get_audit_growth, get_kb_stats_index
+from ._paging import (
+    decode_cursor, encode_cursor, iter_rows, max_bytes_arg, paged_result, read_lines_backwards, stream_jsonl,
+)
+
+
+def get_facts_count(server, tool_args):
+    conn = server._open_db()
+    cursor = conn.execute("SELECT COUNT(*) FROM facts")
+    count = cursor.fetchone()[0]
+    conn.close()
+    text = f"Anzahl Fakten in der Datenbank: {count:,}"
+    result = {"content": [{"type": "text", "text": text}]}
+    return result
+
+
+def search_knowledge(server, tool_args):
+    query = tool_args.get("query", "")
+    limit = tool_args.get("limit", 10)
+
+    # FIXED: Use enhanced search with keyword extraction
+    facts = server._search_knowledge_enhanced(query, limit)
+
+    text = f"Gefunden: {len(facts)} Fakten\n" + "\n".join([f"- {f}" for f in facts])
+    result = {"content": [{"type": "text", "text": text}]}
+    return result
+
+
+def get_recent_facts(server, tool_args):
+    count = int(tool_args.get("count", 5))
+    try:
+        before = None
+        if tool_args.get("cursor"):
+            state = decode_cursor(tool_args["cursor"], "get_recent_facts")
+            before, count = state["before"], state["left"]
+        max_bytes = max_bytes_arg(tool_args)
+        conn = server._open_db()
+        try:
+            # Keyset auf rowid: Folgeseiten kosten nicht mehr als die erste
+            if before is None:
+                cursor = conn.execute("SELECT rowid, statement FROM facts ORDER BY rowid DESC LIMIT ?", (count,))
+            else:
+                cursor = conn.execute(
+                    "SELECT rowid, statement FROM facts WHERE rowid < ? ORDER BY rowid DESC LIMIT ?",
+                    (before, count)
+                )
+            facts, before, more = _collect_rows(cursor, max_bytes, prefix=2)
+        finally:
+            conn.close()
+        text = "Neueste Fakten:\n" + "\n".join([f"- {f}" for f in facts]) if facts else "Neueste Fakten:\n<keine>"
+        left = count - len(facts)
+        next_cursor = encode_cursor("get_recent_facts", before=before, left=left) if more and left > 0 else None
+        result = paged_result(text, next_cursor, len(facts))
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def _collect_rows(cursor, max_bytes, prefix=0):
+    """(rowid, statement)-Zeilen bis ``max_bytes`` sammeln.
+    Returns (statements, letzte rowid, abgeschnitten?)."""
+    facts = []
+    used = 0
+    last = None
+    for rowid, statement in iter_rows(cursor):
+        size = len(statement.encode("utf-8")) + 1 + prefix
+        if facts and used + size > max_bytes:
+            return facts, last, True
+        facts.append(statement)
+        used += size
+        last = rowid
+    return facts, last, False
+
+
+def get_predicates_stats(server, tool_args):
+    # Materialisierte Praedikat-Zaehler statt Vollscan pro Aufruf
+    try:
+        import time
+        start_time = time.time()
+
+        stats = get_kb_stats_index(server.db_path).top_predicates(50)
+
+        # No predicates at all: check database integrity
+        if not stats:
+            conn = server._open_db()
+            cursor = conn.execute("SELECT COUNT(*) FROM facts")
+            total_facts = cursor.fetchone()[0]
+            conn.close()
+            text = f"Database integrity issue. Total Facts: {total_facts}, but no predicates extracted."
+        else:
+            execution_time = time.time() - start_time
+            lines = [f"{pred}: {cnt} Fakten" for pred, cnt in stats]
+            text = f"Top Prädikate ({len(stats)} gefunden, Execution: {execution_time:.3f}s):\n" + "\n".join(lines)
+
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def list_audit(server, tool_args):
+    limit = int(tool_args.get("limit", 20))
+    try:
+        audit_path = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/mcp_write_audit.log")
+        if audit_path.exists():
+            # Nur das Ende der Datei lesen; der Cursor merkt sich den Byte-Offset
+            end = decode_cursor(tool_args["cursor"], "list_audit")["end"] if tool_args.get("cursor") else None
+            lines, start = read_lines_backwards(str(audit_path), limit, end, max_bytes_arg(tool_args))
+            text = "\n".join(lines) if lines else "<empty>"
+            next_cursor = encode_cursor("list_audit", end=start) if lines and start > 0 else None
+            result = paged_result(text, next_cursor, len(lines))
+        else:
+            result = {"content": [{"type": "text", "text": "<no audit log>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def export_facts(server, tool_args):
+    count = int(tool_args.get("count", 50))
+    direction = tool_args.get("direction", "tail")
+    try:
+        if tool_args.get("output_path"):
+            return _export_facts_to_file(server, tool_args, direction)
+        conn = server._open_db()
+        try:
+            if tool_args.get("cursor"):
+                state = decode_cursor(tool_args["cursor"], "export_facts")
+                after, count = state["after"], state["left"]
+            else:
+                after = _export_start(conn, count, direction)
+            # Beide Richtungen aufsteigend ab ``after`` (tail: ab den letzten ``count`` Fakten)
+            cursor = conn.execute(
+                "SELECT rowid, statement FROM facts WHERE rowid > ? ORDER BY rowid ASC LIMIT ?",
+                (after, count)
+            )
+            facts, last, more = _collect_rows(cursor, max_bytes_arg(tool_args))
+        finally:
+            conn.close()
+        left = count - len(facts)
+        next_cursor = encode_cursor("export_facts", after=last, left=left) if more and left > 0 else None
+        result = paged_result("\n".join(facts) or "<none>", next_cursor, len(facts))
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def _export_start(conn, count, direction):
+    """rowid, nach der der Export beginnt (tail: vor den letzten ``count`` Fakten)."""
+    if direction == "tail" and count > 0:
+        row = conn.execute("SELECT rowid FROM facts ORDER BY rowid DESC LIMIT 1 OFFSET ?", (count - 1,)).fetchone()
+        if row:
+            return row[0] - 1
+    return -1
+
+
+def _export_facts_to_file(server, tool_args, direction):
+    """Alle (oder ``count``) Fakten als JSONL nach ``output_path`` streamen."""
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        return {"content": [{"type": "text", "text": "Write disabled."}]}
+    count = int(tool_args["count"]) if "count" in tool_args else -1
+    start_time = time.time()
+    conn = server._open_db()
+    try:
+        after = _export_start(conn, count, direction)
+        cursor = conn.execute(
+            "SELECT statement FROM facts WHERE rowid > ? ORDER BY rowid ASC LIMIT ?", (after, count)
+        )
+        rows, size = stream_jsonl((row[0] for row in iter_rows(cursor)), tool_args["output_path"])
+    finally:
+        conn.close()
+    path = str(Path(tool_args["output_path"]).resolve())
+    server._append_audit("export_facts", {"path": path, "rows": rows})
+    report = {"path": path, "rows": rows, "bytes": size, "duration_s": round(time.time() - start_time, 3)}
+    return {"content": [{"type": "text", "text": json.dumps(report, indent=2)}]}
+
+
+def growth_stats(server, tool_args):
+    days = int(tool_args.get("days", 30))
+    try:
+        audit_path = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/mcp_write_audit.log")
+        # Tageszaehler werden inkrementell aus dem Audit-Log nachgefuehrt
+        counts = get_audit_growth(audit_path).per_day(days)
+        text = json.dumps({"days": days, "per_day": counts}, ensure_ascii=False)
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def consistency_check(server, tool_args):
+    # N-äre kompatible Version
+    try:
+        import sys
+        if r'D:\MCP Mods\HAK_GAL_HEXAGONAL\scripts' not in sys.path:
+            sys.path.insert(0, r'D:\MCP Mods\HAK_GAL_HEXAGONAL\scripts')
+        from fix_nary_tools import FixedNaryTools
+
+        tools = FixedNaryTools()
+        limit = int(tool_args.get('limit', 1000))
+
+        inconsistencies = tools.consistency_check(limit)
+
+        if inconsistencies:
+            output = f"Gefundene {len(inconsistencies)} potentielle Inkonsistenzen:\n"
+            for fact1, fact2, reason in inconsistencies[:10]:
+                output += f"\n{reason}:\n"
+                output += f"  1. {fact1}\n"
+                output += f"  2. {fact2}\n"
+            if len(inconsistencies) > 10:
+                output += f"\n... und {len(inconsistencies) - 10} weitere."
+            result = {"content": [{"type": "text", "text": output}]}
+        else:
+            result = {"content": [{"type": "text", "text": "✓ Keine Inkonsistenzen gefunden"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {str(e)}"}]}
+    return result
+
+
+def validate_facts(server, tool_args):
+    limit = int(tool_args.get("limit", 1000))
+    try:
+        import re as _re
+        conn = sqlite3.connect(str(server.db_path))
+        cursor = conn.execute("SELECT statement FROM facts LIMIT ?", (limit,))
+        invalid = []
+        pat = _re.compile(r"^[A-Za-z0-9_]+\([^()]*\)\.$")
+        for (stmt,) in cursor:
+            if not pat.match(stmt.strip()):
+                invalid.append(stmt)
+        conn.close()
+        result = {"content": [{"type": "text", "text": "\n".join(invalid) if invalid else "<all valid>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def get_entities_stats(server, tool_args):
+    min_occ = int(tool_args.get("min_occurrences", 2))
+    try:
+        items = get_kb_stats_index(server.db_path).top_entities(200, min_count=min_occ)
+        text = "\n".join([f"{k}: {v}" for k, v in items[:200]])
+        result = {"content": [{"type": "text", "text": text or "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def search_by_predicate(server, tool_args):
+    predicate = tool_args.get("predicate", "")
+    limit = int(tool_args.get("limit", 100))
+    try:
+        conn = sqlite3.connect(str(server.db_path))
+        cur = conn.execute("SELECT statement FROM facts WHERE substr(statement,1,instr(statement,'(')-1)=? LIMIT ?", (predicate, limit))
+        facts = [row[0] for row in cur]
+        conn.close()
+        result = {"content": [{"type": "text", "text": "\n".join(facts) if facts else "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def get_fact_history(server, tool_args):
+    statement = tool_args.get("statement", "")
+    limit = int(tool_args.get("limit", 50))
+    try:
+        path = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/mcp_write_audit.log")
+        lines = []
+        if path.exists():
+            for ln in reversed(path.read_text(encoding="utf-8", errors="replace").splitlines()):
+                try:
+                    obj = json.loads(ln)
+                except Exception:
+                    continue
+                if obj.get("payload", {}).get("statement") == statement or obj.get("payload", {}).get("old") == statement:
+                    lines.append(ln)
+                    if len(lines) >= limit:
+                        break
+        result = {"content": [{"type": "text", "text": "\n".join(lines) if lines else "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
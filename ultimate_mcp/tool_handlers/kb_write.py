@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Schreibende KB-Tools
+=======================================
+Fakten anlegen, aendern und loeschen sowie KB-Backup/Restore. Schreibrechte und
+KB-Lock kommen vom Server (``_is_write_allowed``, ``_acquire_lock``); Fakten-
+Aenderungen laufen ueber die Writer-Queue (``server._kb_writer()``).
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from fact_index import get_fact_index
+from kb_backup import apply_database
+from ._optional import HAS_DUPLICATE_INDEX, NearDuplicateIndex
+
+
+def backup_kb(server, tool_args):
+    description = tool_args.get("description", "")
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        try:
+            entry = server._backup_manager().backup(
+                server.db_path, mode=str(tool_args.get("mode", "full")).lower(),
+                compression=str(tool_args.get("compress", "none")).lower(), description=description,
+            )
+            dest = server.backup_dir / entry["file"]
+            server._append_audit("backup_kb", {"path": str(dest), "id": entry["id"], "type": entry["type"],
+                                               "description": description})
+            result = {"content": [{"type": "text", "text": f"OK: backup created at {dest} (id {entry['id']})"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def restore_kb(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        backup_id = tool_args.get("backup_id")
+        path_arg = tool_args.get("path")
+        until = tool_args.get("until")
+        try:
+            manager = server._backup_manager()
+            src = None
+            if path_arg:
+                src = Path(path_arg)
+            elif backup_id and manager.get(backup_id) is None:
+                src = server.backup_dir / backup_id
+            if src is None and (backup_id or until):
+                # Backup-Kette aus dem Manifest, mit ``until`` plus Journal-Replay (Point-in-Time)
+                server._acquire_lock()
+                try:
+                    info = manager.restore(server.db_path, backup_id=backup_id or None, until=until)
+                finally:
+                    server._release_lock()
+                server._notify_facts_changed(reloaded=True)
+                server._append_audit("restore_kb", info)
+                result = {"content": [{"type": "text", "text": (
+                    f"OK: restored {info['backup_id']} (chain {len(info['chain'])}, "
+                    f"replayed {info['replayed_ops']} journal ops)")}]}
+            elif not src or not src.exists():
+                result = {"content": [{"type": "text", "text": "Error: backup not found"}]}
+            else:
+                server._acquire_lock()
+                try:
+                    # Per Backup-API statt Dateikopie: offene Verbindungen sehen den neuen Stand
+                    apply_database(src, server.db_path)
+                finally:
+                    server._release_lock()
+                server._notify_facts_changed(reloaded=True)
+                server._append_audit("restore_kb", {"path": str(src)})
+                result = {"content": [{"type": "text", "text": "OK: restored"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def bulk_delete(server, tool_args):
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        statements = tool_args.get("statements", [])
+        try:
+            removed = server._kb_writer().execute("delete_many", list(statements))
+            server._notify_facts_changed(removed=statements)
+            server._append_audit("bulk_delete", {"count": removed})
+            result = {"content": [{"type": "text", "text": f"OK: removed {removed}"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def bulk_translate_predicates(server, tool_args):
+    mapping = tool_args.get("mapping", {})
+    dry_run = bool(tool_args.get("dry_run", True))
+    if not dry_run and not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        try:
+            import re as _re
+            conn = sqlite3.connect(str(server.db_path))
+            cur = conn.execute("SELECT statement FROM facts")
+            changes = []
+            for (st,) in cur:
+                m = _re.match(r"^([A-Za-z0-9_]+)\((.*)\)\.$", st)
+                if not m:
+                    continue
+                pred = m.group(1)
+                if pred in mapping:
+                    new_pred = mapping[pred]
+                    new_stmt = f"{new_pred}({m.group(2)})."
+                    changes.append((st, new_stmt))
+            conn.close()
+            if not dry_run:
+                server._kb_writer().execute("replace_many", changes)
+                server._notify_facts_changed(replaced=changes)
+            text = "\n".join([f"{o} -> {n}" for o, n in changes[:200]]) or "<no changes>"
+            result = {"content": [{"type": "text", "text": text}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def add_fact(server, tool_args):
+    statement = tool_args.get("statement", "").strip()
+    auth_token = tool_args.get("auth_token", "")
+    if not server._is_write_allowed(auth_token):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    elif not statement:
+        result = {"content": [{"type": "text", "text": "Missing 'statement'"}]}
+    else:
+        try:
+            near = []
+            if tool_args.get("check_duplicates") and HAS_DUPLICATE_INDEX:
+                near = get_fact_index(NearDuplicateIndex, server.db_path).check(
+                    statement, float(os.environ.get("HAKGAL_DUPLICATE_THRESHOLD", "0.9")), limit=3)
+            if near:
+                lines = [f"{sim:.2f} | {other}" for sim, other in near]
+                result = {"content": [{"type": "text", "text": "Skipped: near-duplicate of\n" + "\n".join(lines)}]}
+            else:
+                server._kb_writer().execute("add", statement)
+                server._notify_facts_changed(added=True)
+                server._append_audit("add_fact", {"statement": statement})
+                result = {"content": [{"type": "text", "text": "OK: fact added to SQLite"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def delete_fact(server, tool_args):
+    statement = tool_args.get("statement", "").strip()
+    auth_token = tool_args.get("auth_token", "")
+    if not server._is_write_allowed(auth_token):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    elif not statement:
+        result = {"content": [{"type": "text", "text": "Missing 'statement'"}]}
+    else:
+        try:
+            removed = server._kb_writer().execute("delete", statement)
+            server._notify_facts_changed(removed=[statement])
+            server._append_audit("delete_fact", {"statement": statement, "removed": removed})
+            result = {"content": [{"type": "text", "text": f"OK: removed {removed} (SQLite)"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def update_fact(server, tool_args):
+    old_stmt = tool_args.get("old_statement", "").strip()
+    new_stmt = tool_args.get("new_statement", "").strip()
+    auth_token = tool_args.get("auth_token", "")
+    if not server._is_write_allowed(auth_token):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    elif not old_stmt or not new_stmt:
+        result = {"content": [{"type": "text", "text": "Missing 'old_statement' or 'new_statement'"}]}
+    else:
+        try:
+            updated = server._kb_writer().execute("update", old_stmt, new_stmt)
+            if updated:
+                server._notify_facts_changed(replaced=[(old_stmt, new_stmt)])
+            server._append_audit("update_fact", {"old": old_stmt, "new": new_stmt, "updated": updated})
+            result = {"content": [{"type": "text", "text": f"OK: updated {updated} (SQLite)"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def bulk_add_facts(server, tool_args):
+    # Parameters
+    stmts = tool_args.get("statements")
+    path = tool_args.get("path")
+    dry_run = bool(tool_args.get("dry_run", True))
+    ignore_duplicates = bool(tool_args.get("ignore_duplicates", True))
+    batch_size = int(tool_args.get("batch_size", 1000))
+    create_unique_index = bool(tool_args.get("create_unique_index", True))
+    auth_token = tool_args.get("auth_token", "")
+
+    if not dry_run and not server._is_write_allowed(auth_token):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        try:
+            # Collect statements
+            collected = []
+            if isinstance(stmts, list):
+                for s in stmts:
+                    if isinstance(s, str) and s.strip():
+                        collected.append(s.strip())
+            if path:
+                try:
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        for ln in f:
+                            ln = ln.strip()
+                            if not ln:
+                                continue
+                            if path.endswith(".jsonl"):
+                                try:
+                                    obj = json.loads(ln)
+                                    val = obj.get("statement") or obj.get("s") or ""
+                                    if val and isinstance(val, str):
+                                        collected.append(val.strip())
+                                except Exception:
+                                    continue
+                            else:
+                                collected.append(ln)
+                except Exception as e:
+                    result = {"content": [{"type": "text", "text": f"Error reading path: {e}"}]}
+                    raise StopIteration
+
+            # De-duplicate input list while keeping order
+            seen = set()
+            filtered = []
+            for s in collected:
+                if s and s not in seen:
+                    seen.add(s)
+                    filtered.append(s)
+
+            received = len(collected)
+            to_process = len(filtered)
+            start = time.time()
+
+            # Dry-run duplicate estimation
+            duplicates = 0
+            errors = 0
+            inserted = 0
+
+            conn = server._open_db()
+            cur = conn.cursor()
+
+            # Ensure unique index if requested
+            if create_unique_index and not dry_run:
+                try:
+                    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_facts_statement ON facts(statement)")
+                    conn.commit()
+                except Exception:
+                    pass
+
+            # Check duplicates in chunks
+            def chunk(lst, n):
+                for i in range(0, len(lst), n):
+                    yield lst[i:i+n]
+
+            if dry_run:
+                for group in chunk(filtered, 500):
+                    q = "SELECT statement FROM facts WHERE statement IN (" + ",".join(["?"]*len(group)) + ")"
+                    try:
+                        existing = set(x[0] for x in cur.execute(q, tuple(group)))
+                        duplicates += sum(1 for s in group if s in existing)
+                    except Exception:
+                        errors += len(group)
+            else:
+                # Live insert in batches - eine Operation der Writer-Queue, die bei
+                # Fehlern komplett zurueckgerollt wird
+                # (INSERT OR IGNORE braucht den Unique-Index, um zu greifen)
+                try:
+                    server._kb_writer().execute("insert_many", filtered, ignore_duplicates, batch_size)
+                    server._notify_facts_changed(added=True)
+                    # Count how many actually present now vs before
+                    # Rough estimate: inserted = to_process - duplicates (best effort)
+                except Exception as e:
+                    errors += to_process
+                    server._append_audit("bulk_add_facts", {"error": str(e)})
+                # Compute duplicates after insert if IGNORE used
+                try:
+                    # Estimate duplicates by querying how many of input are present
+                    present = 0
+                    for group in chunk(filtered, 500):
+                        q = "SELECT COUNT(*) FROM facts WHERE statement IN (" + ",".join(["?"]*len(group)) + ")"
+                        present += cur.execute(q, tuple(group)).fetchone()[0]
+                    inserted = max(0, present)  # approximation
+                    duplicates = max(0, to_process - inserted)
+                except Exception:
+                    pass
+
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+            dur = round(time.time()-start, 3)
+            info = {
+                "received": received,
+                "unique_input": to_process,
+                "inserted": inserted if not dry_run else 0,
+                "duplicates": duplicates,
+                "errors": errors,
+                "dry_run": dry_run,
+                "batch_size": batch_size,
+                "duration_s": dur
+            }
+            server._append_audit("bulk_add_facts", info)
+            result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+        except StopIteration:
+            pass
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
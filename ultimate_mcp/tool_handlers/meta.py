@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Meta-Tools
+=============================
+Consensus, Reliability, Bias und Delegation-Optimizer. ``meta_tools`` (NumPy)
+wird erst beim ersten Aufruf importiert.
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from meta_tools import META_TOOLS
+    AVAILABLE = True
+    logger.info("Meta-Tools successfully loaded")
+except ImportError:
+    AVAILABLE = False
+    META_TOOLS = None
+    logger.warning("Meta-Tools not available - install numpy for full functionality")
+
+
+
+
+def consensus_evaluator(server, tool_args):
+    task_id = tool_args.get("task_id", "")
+    outputs = tool_args.get("outputs", [])
+    method = tool_args.get("method", "semantic_similarity")
+    threshold = tool_args.get("threshold", 0.7)
+
+    try:
+        evaluator = META_TOOLS["consensus_evaluator"]
+        result_data = evaluator.evaluate_consensus(task_id, outputs, method, threshold)
+
+        text = f"""
+🔬 **Konsens-Analyse**
+Task ID: {result_data['task_id']}
+Methode: {result_data['method']}
+
+📊 **Ergebnisse:**
+• Konsens-Score: {result_data['consensus_score']:.1%}
+• Confidence: {result_data['confidence']}
+• Synthese: {result_data['synthesis']}
+
+📈 **Tool-Ranking:**
+"""
+        for rank in result_data['ranking'][:3]:
+            text += f"  {rank['tool_name']}: {rank['alignment_score']:.1%}\n"
+
+        if result_data['divergences']:
+            text += "\n⚠️ **Divergenzen:**\n"
+            for div in result_data['divergences'][:3]:
+                text += f"  • {div['tool']}: {', '.join(div.get('unique_focus', []))}\n"
+
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def reliability_checker(server, tool_args):
+    tool_to_check = tool_args.get("tool_name", "")
+    task = tool_args.get("task", "")
+    n_runs = tool_args.get("n_runs", 5)
+
+    try:
+        # Wrapper für delegate_task für echte Tests
+        def execute_task(**kwargs):
+            # In Production: Hier würde delegate_task aufgerufen
+            # Für Testing: Simuliere Variabilität
+            import random
+            base = f"Response for: {task}"
+            variations = [base, base + " (variant)", base + " - modified", base]
+            return random.choice(variations)
+
+        checker = META_TOOLS["reliability_checker"]
+        result_data = checker.check_reliability(
+            tool_to_check,
+            execute_task,
+            {"task": task},
+            n_runs
+        )
+
+        text = f"""
+🔄 **Reliability Check**
+Tool: {result_data['tool_name']}
+Runs: {result_data['n_runs']}
+
+📊 **Metriken:**
+• Konsistenz-Score: {result_data['consistency_score']:.1%}
+• Fleiss' Kappa: {result_data['fleiss_kappa']:.2f}
+• Durchschn. Laufzeit: {result_data['avg_execution_time']}s
+• Stabilität: {result_data['stability']}
+• Fehler: {result_data['errors']}/{n_runs}
+
+💡 **Empfehlung:** {"✅ Tool ist zuverlässig" if result_data['stability'] == 'STABLE' else "⚠️ Tool zeigt Inkonsistenzen"}
+"""
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def bias_detector(server, tool_args):
+    tool_outputs = tool_args.get("tool_outputs", {})
+    baseline = tool_args.get("baseline", "balanced")
+
+    try:
+        detector = META_TOOLS["bias_detector"]
+        result_data = detector.detect_bias(tool_outputs, baseline)
+
+        text = f"""
+🔍 **Bias-Analyse**
+Analysierte Tools: {len(tool_outputs)}
+Baseline: {baseline}
+
+📊 **Bias-Scores:**
+"""
+        for bias in result_data['biases']:
+            text += f"\n**{bias['tool_name']}:**\n"
+            text += f"  • Gesamt-Bias: {bias['overall_bias_score']:.1%}\n"
+            text += f"  • Themen-Bias: {bias['theme_bias']['score']:.1%}\n"
+            text += f"  • Längen-Bias: {bias['length_bias']['score']:.1%}\n"
+            text += f"  • Sentiment-Bias: {bias['sentiment_bias']['score']:.1%}\n"
+
+        if result_data['outliers']:
+            text += f"\n⚠️ **Ausreißer:** {', '.join(result_data['outliers'])}\n"
+
+        text += f"\n💡 **Empfehlung:** {result_data['recommendation']}"
+
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def delegation_optimizer(server, tool_args):
+    task_description = tool_args.get("task_description", "")
+    available_tools = tool_args.get("available_tools", [])
+    context = tool_args.get("context", {})
+
+    try:
+        optimizer = META_TOOLS["delegation_optimizer"]
+        result_data = optimizer.optimize_delegation(
+            task_description,
+            available_tools,
+            context
+        )
+
+        text = f"""
+🎯 **Delegation-Optimierung**
+Task: {task_description[:100]}...
+Task-Hash: {result_data['task_hash']}
+
+📊 **Empfohlene Tools:**
+"""
+        for tool in result_data['recommended_tools']:
+            text += f"  • {tool['tool']}: Score {tool['score']:.1%} (Conf: {tool['confidence']})\n"
+
+        text += f"\n🎮 **Strategie:** {result_data['strategy']}\n"
+
+        if result_data['fallback_tool']:
+            text += f"🔄 **Fallback:** {result_data['fallback_tool']}\n"
+
+        features = result_data['task_features']
+        text += f"\n📋 **Task-Features:**\n"
+        text += f"  • Komplexität: {features['complexity']:.1f}\n"
+        text += f"  • Hat Daten: {features['has_data']}\n"
+        text += f"  • Hat Analyse: {features['has_analysis']}\n"
+
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
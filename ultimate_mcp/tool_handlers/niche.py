@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Nischen-Tools
+================================
+Zugriff auf die Wissens-Nischen. ``niche_mcp_tools`` wird erst beim ersten
+Aufruf importiert.
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+NICHE_ROOT = "D:\\MCP Mods\\HAK_GAL_HEXAGONAL"
+
+try:
+    if NICHE_ROOT not in sys.path:
+        sys.path.insert(0, NICHE_ROOT)
+    from niche_mcp_tools import NicheMCPTools
+    niche_tools = NicheMCPTools(niches_dir=NICHE_ROOT + "\\niches")
+    AVAILABLE = True
+    logger.info("Niche-Tools successfully loaded")
+except Exception as e:
+    AVAILABLE = False
+    niche_tools = None
+    logger.warning(f"Niche-Tools not available: {e}")
+
+
+
+
+def niche_list(server, tool_args):
+    try:
+        niche_result = niche_tools.niche_list()
+        if "error" in niche_result:
+            text = f"Error: {niche_result['error']}"
+        else:
+            text = f"**Nischen-System Übersicht**\n\n"
+            text += f"Total Nischen: {niche_result['total_niches']}\n"
+            text += f"Total Fakten: {niche_result['total_facts']}\n\n"
+            text += "**Nischen-Liste:**\n"
+            for niche in sorted(niche_result['niches'], key=lambda x: x['fact_count'], reverse=True):
+                text += f"- {niche['name']}: {niche['fact_count']} Fakten "
+                text += f"(Threshold: {niche['threshold']:.2f}, "
+                text += f"Keywords: {', '.join(niche['keywords'][:3])}...)\n"
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Niche list error: {e}"}]}
+    return result
+
+
+def niche_stats(server, tool_args):
+    try:
+        niche_name = tool_args.get("niche_name", "")
+        if not niche_name:
+            result = {"content": [{"type": "text", "text": "Error: niche_name required"}]}
+        else:
+            stats = niche_tools.niche_stats(niche_name)
+            if "error" in stats:
+                text = f"Error: {stats['error']}"
+            else:
+                text = f"**Nische: {niche_name}**\n\n"
+                text += f"Fakten: {stats['fact_count']}\n"
+                text += f"Keywords: {', '.join(stats['keywords'])}\n"
+                text += f"Threshold: {stats['threshold']}\n\n"
+
+                text += "**Relevanz-Statistiken:**\n"
+                rel = stats['relevance_stats']
+                text += f"- Min: {rel['min']:.3f}\n"
+                text += f"- Max: {rel['max']:.3f}\n"
+                text += f"- Avg: {rel['avg']:.3f}\n\n"
+
+                if stats.get('telemetry'):
+                    text += "**Import-Telemetrie:**\n"
+                    tel = stats['telemetry']
+                    text += f"- Import Runs: {tel.get('import_runs', 0)}\n"
+                    text += f"- Avg Duration: {tel.get('avg_import_duration', 0)}s\n\n"
+
+                if stats.get('top_facts'):
+                    text += "**Top Fakten (nach Relevanz):**\n"
+                    for i, fact in enumerate(stats['top_facts'][:5], 1):
+                        text += f"{i}. [{fact['score']:.3f}] {fact['fact']}\n"
+
+            result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Niche stats error: {e}"}]}
+    return result
+
+
+def niche_query(server, tool_args):
+    try:
+        niche_name = tool_args.get("niche_name", "")
+        query = tool_args.get("query", "")
+        limit = int(tool_args.get("limit", 10))
+
+        if not niche_name or not query:
+            result = {"content": [{"type": "text", "text": "Error: niche_name and query required"}]}
+        else:
+            query_result = niche_tools.niche_query(niche_name, query, limit)
+            if "error" in query_result:
+                text = f"Error: {query_result['error']}"
+            else:
+                text = f"**Suche in Nische '{niche_name}'**\n"
+                text += f"Query: '{query}'\n"
+                text += f"Treffer: {query_result['total_matches']} gesamt, "
+                text += f"{query_result['returned']} angezeigt\n\n"
+
+                if query_result['results']:
+                    text += "**Ergebnisse (sortiert nach Relevanz):**\n"
+                    for i, r in enumerate(query_result['results'], 1):
+                        text += f"{i}. [{r['relevance']:.3f}] {r['fact']}\n"
+                else:
+                    text += "Keine Treffer gefunden.\n"
+
+            result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Niche query error: {e}"}]}
+    return result
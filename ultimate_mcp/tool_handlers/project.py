@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Project-Hub-Tools
+====================================
+Snapshots und Digest des Project Hub.
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+
+def project_snapshot(server, tool_args):
+    import time as time_module
+    title = tool_args.get("title", f"Snapshot {time_module.strftime('%Y-%m-%d %H:%M:%S')}")
+    description = tool_args.get("description", "")
+    hub_path = tool_args.get("hub_path", server.hub_path_env)
+    if not server._is_write_allowed(tool_args.get("auth_token", "")):
+        result = {"content": [{"type": "text", "text": "Write disabled."}]}
+    else:
+        try:
+            snap_dir = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/snapshots")
+            snap_dir.mkdir(parents=True, exist_ok=True)
+            fn = snap_dir / f"snapshot_{int(time_module.time())}.json"
+
+            # Get base stats
+            conn = sqlite3.connect(str(server.db_path))
+            count = conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
+            conn.close()
+
+            # Get detailed KB statistics
+            kb_stats_data = server._get_kb_statistics()
+
+            data = {
+                "title": title,
+                "description": description,
+                "hub_path": hub_path,
+                "db_path": str(server.db_path),
+                "facts_count": count,
+                "created_at": time_module.strftime("%Y-%m-%d %H:%M:%S"),
+                "kb_statistics": kb_stats_data
+            }
+            fn.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            server._append_audit("project_snapshot", {"file": str(fn)})
+            result = {"content": [{"type": "text", "text": f"OK: snapshot {fn}"}]}
+        except Exception as e:
+            result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def project_list_snapshots(server, tool_args):
+    hub_path = tool_args.get("hub_path", server.hub_path_env)
+    limit = int(tool_args.get("limit", 20))
+    try:
+        snap_dir = Path("D:/MCP Mods/HAK_GAL_HEXAGONAL/snapshots")
+        items = []
+        if snap_dir.exists():
+            items = sorted(snap_dir.glob("snapshot_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit]
+        text = "\n".join([str(p) for p in items]) if items else "<none>"
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
+
+
+def project_hub_digest(server, tool_args):
+    hub_path = tool_args.get("hub_path", server.hub_path_env)
+    limit_files = int(tool_args.get("limit_files", 3))
+    max_chars = int(tool_args.get("max_chars", 20000))
+    try:
+        base = Path(hub_path)
+        if not base.exists():
+            result = {"content": [{"type": "text", "text": f"Error: hub path not found: {hub_path}"}]}
+        else:
+            files = sorted(base.glob("**/*.md"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit_files]
+            acc = []
+            total = 0
+            for fp in files:
+                txt = fp.read_text(encoding="utf-8", errors="replace")
+                need = max_chars - total
+                if need <= 0:
+                    break
+                chunk = txt[:need]
+                acc.append(f"# {fp.name}\n\n" + chunk)
+                total += len(chunk)
+            result = {"content": [{"type": "text", "text": "\n\n---\n\n".join(acc) if acc else "<none>"}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Error: {e}"}]}
+    return result
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: Sentry-Tools
+===============================
+Sentry-API-Zugriff. ``sentry_integration`` wird erst beim ersten Sentry-Aufruf
+importiert.
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import json
+import logging
+import os
+
+from . import is_valid_sentry_dsn
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sentry_integration import SentryIntegration
+    _dsn = os.environ.get("SENTRY_DSN", "").strip()
+    if not is_valid_sentry_dsn(_dsn):
+        raise RuntimeError("Invalid SENTRY_DSN format. Expected 'https://<publicKey>@de.sentry.io/<projectId>'")
+    sentry = SentryIntegration()
+    AVAILABLE = True
+    logger.info(f"[Sentry] Integration loaded: {sentry.org}")
+except Exception as e:
+    AVAILABLE = False
+    sentry = None
+    logger.warning(f"[Sentry] Integration not available: {e}")
+
+
+def sentry_test_connection(server, tool_args):
+    try:
+        test_result = sentry.test_connection()
+        text = f"**Sentry Connection Test**\n"
+        text += f"DSN Configured: {test_result.get('dsn_configured', False)}\n"
+        text += f"DSN Valid: {test_result.get('dsn_valid', False)}\n"
+        text += f"SDK Initialized: {test_result.get('sdk_initialized', False)}\n"
+        text += f"Auth Token: {test_result.get('auth_token_configured', False)}\n"
+        text += f"Organization: {test_result.get('organization', 'N/A')}\n"
+        text += f"Region: {test_result.get('region', 'N/A')}\n"
+        text += f"API Status: {test_result.get('api_status', 'N/A')}\n"
+        if test_result.get('organizations_found'):
+            text += f"Organizations Found: {test_result.get('organizations_found', 0)}\n"
+        if not test_result.get('sdk_initialized'):
+            text += "\nNote: Sentry SDK not initialized - error tracking disabled. Configure SENTRY_DSN to enable.\n"
+        result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Sentry test error: {e}"}]}
+    return result
+
+
+def sentry_whoami(server, tool_args):
+    try:
+        user_info = sentry.whoami()
+        if "error" in user_info:
+            result = {"content": [{"type": "text", "text": user_info["error"]}]}
+        else:
+            text = json.dumps(user_info, indent=2, ensure_ascii=False)
+            result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Sentry whoami error: {e}"}]}
+    return result
+
+
+def sentry_find_organizations(server, tool_args):
+    try:
+        orgs = sentry.find_organizations()
+        if isinstance(orgs, list) and orgs and "error" in orgs[0]:
+            result = {"content": [{"type": "text", "text": orgs[0]["error"]}]}
+        else:
+            text = "**Sentry Organizations:**\n"
+            for org in orgs:
+                text += f"- {org.get('slug', 'N/A')}: {org.get('name', 'N/A')}\n"
+            result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Sentry find_organizations error: {e}"}]}
+    return result
+
+
+def sentry_find_projects(server, tool_args):
+    try:
+        org_slug = tool_args.get("organization_slug")
+        projects = sentry.find_projects(org_slug)
+        if isinstance(projects, list) and projects and "error" in projects[0]:
+            result = {"content": [{"type": "text", "text": projects[0]["error"]}]}
+        else:
+            text = f"**Sentry Projects in {org_slug or sentry.org}:**\n"
+            for proj in projects:
+                text += f"- {proj.get('slug', 'N/A')}: {proj.get('name', 'N/A')}\n"
+                text += f"  Platform: {proj.get('platform', 'N/A')}\n"
+            result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Sentry find_projects error: {e}"}]}
+    return result
+
+
+def sentry_search_issues(server, tool_args):
+    try:
+        query = tool_args.get("query", "")
+        limit = int(tool_args.get("limit", 10))
+        issues_result = sentry.search_issues(query, limit)
+        if "error" in issues_result:
+            result = {"content": [{"type": "text", "text": issues_result["error"]}]}
+        else:
+            issues = issues_result.get("issues", [])
+            text = f"**Sentry Issues (Query: '{query or 'is:unresolved'}')**\n\n"
+            if not issues:
+                text += "No issues found.\n"
+            else:
+                for issue in issues[:limit]:
+                    text += f"**{issue.get('title', 'N/A')}**\n"
+                    text += f"  ID: {issue.get('shortId', 'N/A')}\n"
+                    text += f"  Count: {issue.get('count', 0)}\n"
+                    text += f"  Users: {issue.get('userCount', 0)}\n"
+                    text += f"  Status: {issue.get('status', 'N/A')}\n"
+                    text += f"  Level: {issue.get('level', 'N/A')}\n"
+                    text += f"  First Seen: {issue.get('firstSeen', 'N/A')}\n"
+                    text += f"  Last Seen: {issue.get('lastSeen', 'N/A')}\n"
+                    text += "\n"
+            result = {"content": [{"type": "text", "text": text}]}
+    except Exception as e:
+        result = {"content": [{"type": "text", "text": f"Sentry search_issues error: {e}"}]}
+    return result
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+HAK_GAL MCP Tools: System-Tools
+===============================
+Status, Health Checks, Code-Ausfuehrung und Tool-Metriken.
+
+Handler-Signatur: ``tool(server, tool_args) -> result`` (Registry siehe
+tool_handlers/__init__.py).
+"""
+
+import json
+
+from . import TOOL_METRICS, TOOL_REGISTRY
+
+
+def get_system_status(server, tool_args):
+    conn = server._open_db()
+    cursor = conn.execute("SELECT COUNT(*) FROM facts")
+    count = cursor.fetchone()[0]
+    conn.close()
+
+    # Dynamische Tool-Zählung statt hardcoded 66
+    tool_count = len(server.tools)
+
+    text = (
+        f"Status: Operational\n"
+        f"Datenbank: {server.db_path}\n"
+        f"Fakten: {count:,}\n"
+        f"Server: HAK_GAL MCP Ultimate v4.0\n"
+        f"Tools: {tool_count} (alle verfügbar)"
+    )
+    result = {"content": [{"type": "text", "text": text}]}
+    return result
+
+
+def execute_code(server, tool_args):
+    code = str(tool_args.get("code", ""))
+    language = str(tool_args.get("language", "")).lower()
+    timeout = int(tool_args.get("timeout", 30))
+
+    if not code:
+        result = {"content": [{"type": "text", "text": "Missing 'code' parameter"}]}
+    elif not language:
+        result = {"content": [{"type": "text", "text": "Missing 'language' parameter"}]}
+    else:
+        execution_result = server._execute_code_safely(code, language, timeout)
+
+        if "error" in execution_result and not execution_result.get("timeout"):
+            text = f"ERROR: {execution_result['error']}"
+        else:
+            stdout = execution_result.get("stdout", "")
+            stderr = execution_result.get("stderr", "")
+            return_code = execution_result.get("return_code", 0)
+            lang = execution_result.get("language", language)
+
+            text = ""
+            if execution_result.get("timeout"):
+                text = f"[TIMEOUT] Execution timeout after {timeout} seconds\n\n"
+            else:
+                text = f"[OK] Code executed successfully\n\n"
+
+            text += f"**Language:** {lang}\n"
+            text += f"**Return Code:** {return_code}\n"
+            text += f"**Execution Time:** {execution_result.get('execution_time', 'completed')}\n\n"
+
+            if stdout:
+                text += f"**STDOUT:**\n```\n{stdout}\n```\n\n"
+            else:
+                text += "**STDOUT:** (no output)\n\n"
+
+            if stderr:
+                text += f"**STDERR:**\n```\n{stderr}\n```\n\n"
+
+            if return_code != 0:
+                text += f"Warning: Process exited with code {return_code}"
+
+        result = {"content": [{"type": "text", "text": text}]}
+    return result
+
+
+def health_check(server, tool_args):
+    conn = server._open_db()
+    cursor = conn.execute("SELECT COUNT(*) FROM facts")
+    count = cursor.fetchone()[0]
+    conn.close()
+    text = (
+        f"Status: OK\n"
+        f"DB exists: True\n"
+        f"DB Fakten: {count:,}\n"
+        f"Write enabled: {server.write_enabled}\n"
+        f"Total Tools: {len(server.tools)}\n"
+        f"Execute code ready: True\n"
+        f"Temp dir: {server.temp_dir}\n"
+        f"Max output size: {server.max_output_size} bytes\n"
+        f"Timeouts (s): py={server.timeout_defaults.get('python')}, js={server.timeout_defaults.get('javascript')}, sh={server.timeout_defaults.get('bash')}, ps={server.timeout_defaults.get('powershell')}"
+    )
+    result = {"content": [{"type": "text", "text": text}]}
+    return result
+
+
+def health_check_json(server, tool_args):
+    try:
+        conn = server._open_db()
+        cursor = conn.execute("SELECT COUNT(*) FROM facts")
+        count = cursor.fetchone()[0]
+        conn.close()
+        info = {
+            "status": "OK",
+            "db_exists": True,
+            "facts": count,
+            "write_enabled": server.write_enabled,
+            "tools_total": len(server.tools),
+            "exec_ready": True,
+            "temp_dir": str(server.temp_dir),
+            "max_output_bytes": server.max_output_size,
+            "timeouts": server.timeout_defaults,
+        }
+    except Exception as e:
+        info = {"status": "ERROR", "error": str(e)}
+    result = {"content": [{"type": "text", "text": json.dumps(info, ensure_ascii=True)}]}
+    return result
+
+
+def tool_metrics(server, tool_args):
+    tool = tool_args.get("tool") or None
+    info = {
+        "loaded_modules": TOOL_REGISTRY.loaded_modules(),
+        "tools": TOOL_METRICS.snapshot(tool),
+    }
+    if server._writer is not None:
+        info["kb_writer"] = server._writer.stats()
+    if tool_args.get("reset", False):
+        TOOL_METRICS.reset()
+    result = {"content": [{"type": "text", "text": json.dumps(info, ensure_ascii=False, indent=2)}]}
+    return result